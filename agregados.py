@@ -0,0 +1,143 @@
+"""
+Módulo: agregados.py
+Descripción: Agregados de citas por día y por mes (ingresos, minutos ocupados, citas y
+             cancelaciones), por servicio, por empleado y del negocio entero. Se actualizan
+             en cada alta o cambio de una cita y permiten resumir cualquier rango de fechas
+             sumando cubos en lugar de recorrer citas.
+"""
+
+from typing import Dict, List, Optional
+from tiempo import MINUTOS_DIA, mes_de_dia, primer_dia_mes
+
+
+# Medidas de cada cubo, en este orden
+MEDIDAS = ("citas", "canceladas", "minutos", "ingresos", "previstos")
+# Agrupaciones disponibles ("total" es el negocio entero, con clave "")
+DIMENSIONES = ("servicio", "empleado", "total")
+
+
+def _aportacion(cita, estado: str) -> tuple:
+    """
+    Calcula lo que suma una cita a cada medida según su estado (función privada).
+
+    Las citas no canceladas cuentan en "citas" y ocupan sus minutos; las
+    completadas suman "ingresos" y las pendientes o confirmadas "previstos".
+
+    Args:
+        cita: Objeto Cita
+        estado (str): Estado con el que se cuenta
+
+    Returns:
+        tuple: Valores en el orden de MEDIDAS
+    """
+    if estado == "cancelada":
+        return 0, 1, 0, 0, 0
+    minutos = cita.fin - cita.inicio
+    precio = cita.servicio.precio
+    if estado == "completada":
+        return 1, 0, minutos, precio, 0
+    return 1, 0, minutos, 0, precio
+
+
+class AgregadosCitas:
+    """
+    Cubos de medidas por día y por mes, para cada servicio, empleado y el total.
+
+    Cada cita suma en el cubo del día y en el del mes en que empieza. Un rango
+    de días se resume con los cubos mensuales de los meses completos y los
+    diarios de los extremos, así que el coste depende del número de meses y
+    no del número de citas. Las citas archivadas siguen contando, porque el
+    archivo no modifica los cubos.
+
+    Atributos:
+        _dias (Dict): dimensión -> día -> clave -> medidas
+        _meses (Dict): dimensión -> mes (año * 12 + mes - 1) -> clave -> medidas
+    """
+
+    def __init__(self):
+        """Inicializa los agregados vacíos."""
+        self._dias: Dict[str, Dict[int, Dict[str, List]]] = {d: {} for d in DIMENSIONES}
+        self._meses: Dict[str, Dict[int, Dict[str, List]]] = {d: {} for d in DIMENSIONES}
+
+    def registrar(self, cita, signo: int = 1, estado: str = None, inicio: int = None):
+        """
+        Suma (o resta) una cita en sus cubos.
+
+        Para reflejar un cambio se resta la cita con sus datos anteriores y se
+        vuelve a sumar con los nuevos.
+
+        Args:
+            cita: Objeto Cita
+            signo (int): 1 para sumar, -1 para restar
+            estado (str): Estado con el que se cuenta (por defecto, el actual)
+            inicio (int): Inicio con el que se cuenta (por defecto, el actual)
+        """
+        aportacion = _aportacion(cita, cita.estado if estado is None else estado)
+        dia = (cita.inicio if inicio is None else inicio) // MINUTOS_DIA
+        mes = mes_de_dia(dia)
+        for dimension, clave in (("servicio", cita.servicio.id),
+                                 ("empleado", cita.empleado.id), ("total", "")):
+            for cubos, periodo in ((self._dias[dimension], dia),
+                                   (self._meses[dimension], mes)):
+                cubo = cubos.get(periodo)
+                if cubo is None:
+                    cubo = cubos[periodo] = {}
+                valores = cubo.get(clave)
+                if valores is None:
+                    valores = cubo[clave] = [0] * len(MEDIDAS)
+                for i, valor in enumerate(aportacion):
+                    if valor:
+                        valores[i] += signo * valor
+
+    @staticmethod
+    def _acumular(total: Dict[str, List], cubo: Optional[Dict[str, List]]):
+        """
+        Suma un cubo a un acumulado (método privado).
+
+        Args:
+            total (Dict): Acumulado clave -> medidas, se modifica
+            cubo (Dict): Cubo a sumar (None si el periodo no tiene citas)
+        """
+        if not cubo:
+            return
+        for clave, valores in cubo.items():
+            acumulado = total.get(clave)
+            if acumulado is None:
+                total[clave] = list(valores)
+            else:
+                for i, valor in enumerate(valores):
+                    acumulado[i] += valor
+
+    def resumir(self, desde_dia: int, hasta_dia: int,
+                por: str = "total") -> Dict[str, Dict[str, float]]:
+        """
+        Resume las medidas de las citas que empiezan en los días [desde_dia, hasta_dia).
+
+        Args:
+            desde_dia (int): Primer día, contado desde 1970-01-01
+            hasta_dia (int): Día siguiente al último (excluido)
+            por (str): "servicio", "empleado" o "total"
+
+        Returns:
+            Dict: Clave (ID, o "" para el total) -> medida -> valor
+
+        Raises:
+            ValueError: Si la agrupación no es válida
+        """
+        if por not in DIMENSIONES:
+            raise ValueError(f"Agrupación '{por}' no válida")
+        dias, meses = self._dias[por], self._meses[por]
+        total: Dict[str, List] = {}
+        dia = desde_dia
+        while dia < hasta_dia:
+            mes = mes_de_dia(dia)
+            inicio_mes, fin_mes = primer_dia_mes(mes), primer_dia_mes(mes + 1)
+            if dia == inicio_mes and fin_mes <= hasta_dia:
+                self._acumular(total, meses.get(mes))
+                dia = fin_mes
+                continue
+            fin = min(fin_mes, hasta_dia)
+            for d in range(dia, fin):
+                self._acumular(total, dias.get(d))
+            dia = fin
+        return {clave: dict(zip(MEDIDAS, valores)) for clave, valores in total.items()}
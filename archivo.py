@@ -0,0 +1,346 @@
+"""
+Módulo: archivo.py
+Descripción: Archivo columnar de citas terminadas (completadas o canceladas). Cada campo se
+             guarda en un array compacto en lugar de conservar un objeto Cita por registro,
+             y los informes se calculan recorriendo columnas enteras.
+"""
+
+from array import array
+from bisect import bisect_left
+from itertools import compress, repeat
+from operator import eq
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union
+from tiempo import minutos_a_fecha
+
+
+# Códigos de estado guardados en la columna de estados (posición en la tupla)
+ESTADOS = ("pendiente", "confirmada", "cancelada", "completada")
+COMPLETADA = ESTADOS.index("completada")
+# Los IDs de cita son "CIT" + número; en el archivo solo se guarda el número
+PREFIJO_ID = "CIT"
+
+
+def _numero_id(cita_id: str) -> Optional[int]:
+    """
+    Número que se guarda en el archivo para un ID de cita (función privada).
+
+    Args:
+        cita_id (str): ID de la cita
+
+    Returns:
+        int: Número del ID, o None si el ID no es "CIT" + número sin ceros a la
+            izquierda (no podría reconstruirse igual a partir del número)
+    """
+    cifras = cita_id[len(PREFIJO_ID):]
+    if not cita_id.startswith(PREFIJO_ID) or not cifras.isdigit() or str(int(cifras)) != cifras:
+        return None
+    numero = int(cifras)
+    return numero if numero < 2 ** 63 else None
+
+
+class CitaArchivada(NamedTuple):
+    """
+    Registro de una cita archivada.
+
+    Atributos:
+        id (str): Identificador de la cita
+        cliente_id (str): ID del cliente
+        empleado_id (str): ID del empleado
+        servicio_id (str): ID del servicio
+        inicio (int): Inicio en minutos desde 1970-01-01 00:00
+        duracion (int): Duración en minutos
+        precio (float): Precio del servicio al archivarla
+        estado (str): "completada" o "cancelada"
+    """
+
+    id: str
+    cliente_id: str
+    empleado_id: str
+    servicio_id: str
+    inicio: int
+    duracion: int
+    precio: float
+    estado: str
+
+    @property
+    def fin(self) -> int:
+        """Fin en minutos desde la época."""
+        return self.inicio + self.duracion
+
+    @property
+    def fecha_hora_inicio(self) -> str:
+        """Fecha y hora de inicio "YYYY-MM-DD HH:MM"."""
+        return minutos_a_fecha(self.inicio)
+
+    def __str__(self) -> str:
+        """Representación en texto de la cita archivada."""
+        return (f"CitaArchivada(ID: {self.id}, Cliente: {self.cliente_id}, "
+                f"Empleado: {self.empleado_id}, Servicio: {self.servicio_id}, "
+                f"Inicio: {self.fecha_hora_inicio}, Estado: {self.estado})")
+
+
+class _Catalogo:
+    """
+    Asigna a cada ID un código entero pequeño para guardarlo en una columna (clase privada).
+
+    Atributos:
+        ids (List[str]): ID de cada código, por orden de código
+    """
+
+    def __init__(self):
+        """Inicializa un catálogo vacío."""
+        self.ids: List[str] = []
+        self._codigos: Dict[str, int] = {}
+
+    def codigo(self, id: str) -> int:
+        """
+        Obtiene (o asigna) el código de un ID.
+
+        Args:
+            id (str): ID a codificar
+
+        Returns:
+            int: Código del ID
+        """
+        codigo = self._codigos.get(id)
+        if codigo is None:
+            codigo = self._codigos[id] = len(self.ids)
+            self.ids.append(id)
+        return codigo
+
+
+class ArchivoCitas:
+    """
+    Citas terminadas guardadas por columnas y ordenadas por (inicio, id).
+
+    Cada registro ocupa unos 45 bytes repartidos en arrays de tipo fijo: inicio,
+    número de ID, duración, códigos de empleado, servicio y cliente, precio y
+    estado. Los empleados, servicios y clientes se guardan como códigos de un
+    catálogo, no como referencias a los objetos.
+
+    Al estar ordenado por inicio, un rango de fechas es un trozo contiguo de
+    cada columna que se localiza con búsqueda binaria; los totales se calculan
+    sobre ese trozo con sum/compress, que recorren la columna en C, y los
+    recuentos por estado se llevan al archivar. La búsqueda por ID usa una
+    permutación ordenada por ID que se reconstruye tras cada archivado.
+    """
+
+    def __init__(self):
+        """Inicializa un archivo vacío."""
+        self._inicios = array("q")
+        self._ids = array("q")
+        self._duraciones = array("i")
+        self._empleados = array("i")
+        self._servicios = array("i")
+        self._clientes = array("i")
+        self._precios = array("d")
+        self._estados = array("b")
+        self._catalogo_empleados = _Catalogo()
+        self._catalogo_servicios = _Catalogo()
+        self._catalogo_clientes = _Catalogo()
+        self._por_estado = [0] * len(ESTADOS)
+        # Posiciones ordenadas por ID (None = hay que reconstruirla)
+        self._por_id: Optional[array] = None
+
+    def __len__(self) -> int:
+        """Número de citas archivadas."""
+        return len(self._inicios)
+
+    def __contains__(self, cita_id: str) -> bool:
+        """Indica si una cita está archivada."""
+        return self._posicion(cita_id) is not None
+
+    def _columnas(self) -> Tuple[array, ...]:
+        """Columnas del archivo, en el orden de las filas de agregar (método privado)."""
+        return (self._inicios, self._ids, self._duraciones, self._empleados,
+                self._servicios, self._clientes, self._precios, self._estados)
+
+    @staticmethod
+    def admite(cita_id: str) -> bool:
+        """
+        Indica si una cita con ese ID puede archivarse.
+
+        Args:
+            cita_id (str): ID de la cita
+
+        Returns:
+            bool: True si el ID es "CIT" + número (sin ceros a la izquierda)
+        """
+        return _numero_id(cita_id) is not None
+
+    def agregar(self, citas: Iterable) -> int:
+        """
+        Archiva citas terminadas.
+
+        Si todas empiezan después de la última archivada (lo normal al archivar
+        por antigüedad) se añaden al final; si no, se vuelven a ordenar las columnas.
+
+        Args:
+            citas (Iterable[Cita]): Citas a archivar
+
+        Returns:
+            int: Número de citas archivadas
+
+        Raises:
+            ValueError: Si alguna cita tiene un ID que no se puede archivar (ver admite);
+                en ese caso no se archiva ninguna
+        """
+        citas = list(citas)
+        for cita in citas:
+            if not self.admite(cita.id):
+                raise ValueError(f"La cita {cita.id} no tiene un ID archivable")
+        filas = sorted(
+            (cita.inicio, _numero_id(cita.id), cita.fin - cita.inicio,
+             self._catalogo_empleados.codigo(cita.empleado.id),
+             self._catalogo_servicios.codigo(cita.servicio.id),
+             self._catalogo_clientes.codigo(cita.cliente.id),
+             cita.servicio.precio, ESTADOS.index(cita.estado))
+            for cita in citas)
+        if not filas:
+            return 0
+        for fila in filas:
+            self._por_estado[fila[-1]] += 1
+        columnas = self._columnas()
+        if self._inicios and (filas[0][0], filas[0][1]) < (self._inicios[-1], self._ids[-1]):
+            filas = sorted([*zip(*columnas), *filas])
+            for columna in columnas:
+                del columna[:]
+        for columna, valores in zip(columnas, zip(*filas)):
+            columna.extend(valores)
+        self._por_id = None
+        return len(filas)
+
+    def _posicion(self, cita_id: str) -> Optional[int]:
+        """
+        Busca la posición de una cita por su ID (método privado).
+
+        Args:
+            cita_id (str): ID de la cita
+
+        Returns:
+            int: Posición en las columnas o None si no está archivada
+        """
+        numero = _numero_id(cita_id)
+        if numero is None:
+            return None
+        if self._por_id is None:
+            self._por_id = array("i", sorted(range(len(self._ids)),
+                                             key=self._ids.__getitem__))
+        i = bisect_left(self._por_id, numero, key=self._ids.__getitem__)
+        if i < len(self._por_id) and self._ids[self._por_id[i]] == numero:
+            return self._por_id[i]
+        return None
+
+    def _registro(self, i: int) -> CitaArchivada:
+        """Reconstruye el registro de la posición i (método privado)."""
+        return CitaArchivada(f"{PREFIJO_ID}{self._ids[i]}",
+                             self._catalogo_clientes.ids[self._clientes[i]],
+                             self._catalogo_empleados.ids[self._empleados[i]],
+                             self._catalogo_servicios.ids[self._servicios[i]],
+                             self._inicios[i], self._duraciones[i], self._precios[i],
+                             ESTADOS[self._estados[i]])
+
+    def obtener(self, cita_id: str) -> Optional[CitaArchivada]:
+        """
+        Obtiene una cita archivada por su ID, en O(log n).
+
+        Args:
+            cita_id (str): ID de la cita
+
+        Returns:
+            CitaArchivada: Registro de la cita o None si no está archivada
+        """
+        i = self._posicion(cita_id)
+        return None if i is None else self._registro(i)
+
+    def __iter__(self) -> Iterator[CitaArchivada]:
+        """Recorre las citas archivadas por orden de inicio."""
+        return (self._registro(i) for i in range(len(self._inicios)))
+
+    def contar_por_estado(self) -> Dict[str, int]:
+        """
+        Cuenta las citas archivadas de cada estado, en O(1).
+
+        Returns:
+            Dict[str, int]: Estado -> número de citas (todos los estados, aunque sea 0)
+        """
+        return dict(zip(ESTADOS, self._por_estado))
+
+    def _rango(self, desde: Optional[int], hasta: Optional[int]) -> slice:
+        """
+        Trozo de las columnas con las citas que empiezan en [desde, hasta) (método privado).
+
+        Args:
+            desde (int): Minuto inicial (None = sin límite)
+            hasta (int): Minuto final, excluido (None = sin límite)
+
+        Returns:
+            slice: Trozo correspondiente
+        """
+        a = 0 if desde is None else bisect_left(self._inicios, desde)
+        b = len(self._inicios) if hasta is None else bisect_left(self._inicios, hasta)
+        return slice(a, max(a, b))
+
+    def _sumar(self, valores: array, desde: Optional[int], hasta: Optional[int],
+               por: Optional[str]) -> Union[float, Dict[str, float]]:
+        """
+        Suma una columna sobre las citas completadas de un rango (método privado).
+
+        Args:
+            valores (array): Columna a sumar
+            desde (int): Minuto inicial o None
+            hasta (int): Minuto final (excluido) o None
+            por (str): None para el total, o "empleado", "servicio" o "cliente"
+
+        Returns:
+            float o Dict[str, float]: Total, o ID -> total del grupo
+
+        Raises:
+            ValueError: Si la agrupación no es válida
+        """
+        rango = self._rango(desde, hasta)
+        completadas = map(eq, self._estados[rango], repeat(COMPLETADA))
+        if por is None:
+            return sum(compress(valores[rango], completadas))
+        if por == "empleado":
+            codigos, catalogo = self._empleados, self._catalogo_empleados
+        elif por == "servicio":
+            codigos, catalogo = self._servicios, self._catalogo_servicios
+        elif por == "cliente":
+            codigos, catalogo = self._clientes, self._catalogo_clientes
+        else:
+            raise ValueError(f"Agrupación '{por}' no válida")
+        totales = [0] * len(catalogo.ids)
+        for codigo, valor in compress(zip(codigos[rango], valores[rango]), completadas):
+            totales[codigo] += valor
+        return {catalogo.ids[codigo]: total for codigo, total in enumerate(totales) if total}
+
+    def ingresos(self, desde: int = None, hasta: int = None,
+                 por: str = None) -> Union[float, Dict[str, float]]:
+        """
+        Ingresos de las citas completadas que empiezan en [desde, hasta).
+
+        Args:
+            desde (int): Minuto inicial (None = desde el principio)
+            hasta (int): Minuto final, excluido (None = hasta el final)
+            por (str): None para el total, o "empleado", "servicio" o "cliente"
+
+        Returns:
+            float o Dict[str, float]: Total, o ID -> ingresos
+        """
+        return self._sumar(self._precios, desde, hasta, por)
+
+    def minutos_ocupados(self, desde: int = None, hasta: int = None,
+                         por: str = "empleado") -> Union[int, Dict[str, int]]:
+        """
+        Minutos de las citas completadas que empiezan en [desde, hasta).
+
+        Args:
+            desde (int): Minuto inicial (None = desde el principio)
+            hasta (int): Minuto final, excluido (None = hasta el final)
+            por (str): None para el total, o "empleado", "servicio" o "cliente"
+
+        Returns:
+            int o Dict[str, int]: Total, o ID -> minutos
+        """
+        return self._sumar(self._duraciones, desde, hasta, por)
@@ -0,0 +1,350 @@
+"""
+Módulo: asignacion.py
+Descripción: Asignación automática de empleado y hora a un conjunto de solicitudes de cita.
+             Cada solicitud indica servicio, franja admisible y empleados preferidos; el
+             planificador reparte las solicitudes entre los huecos libres de los empleados
+             que pueden atenderlas, intentando llenar el mayor número y equilibrar la carga.
+"""
+
+import time
+from bisect import bisect_right
+from typing import Dict, FrozenSet, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+
+class Solicitud(NamedTuple):
+    """
+    Petición de cita sin empleado ni hora fijados.
+
+    Atributos:
+        cliente_id (str): ID del cliente
+        servicio_id (str): ID del servicio
+        desde: Primer inicio admisible ("YYYY-MM-DD HH:MM" o minutos desde la época)
+        hasta: Hora a la que la cita debe haber terminado (mismo formato)
+        preferidos (Tuple[str, ...]): Empleados preferidos por el cliente, si los hay
+    """
+
+    cliente_id: str
+    servicio_id: str
+    desde: Union[str, int]
+    hasta: Union[str, int]
+    preferidos: Tuple[str, ...] = ()
+
+
+class Peticion(NamedTuple):
+    """
+    Solicitud ya resuelta a minutos y empleados candidatos.
+
+    Atributos:
+        duracion (int): Duración del servicio en minutos
+        desde (int): Primer inicio admisible
+        hasta (int): Fin máximo de la cita
+        candidatos (Tuple[str, ...]): Empleados que pueden atenderla
+        preferidos (FrozenSet[str]): Candidatos preferidos por el cliente
+    """
+
+    duracion: int
+    desde: int
+    hasta: int
+    candidatos: Tuple[str, ...]
+    preferidos: FrozenSet[str] = frozenset()
+
+
+class ResultadoAsignacion(NamedTuple):
+    """
+    Reparto calculado por PlanificadorAsignaciones.
+
+    Atributos:
+        asignaciones (Dict[int, Tuple[str, int]]): Nº de solicitud -> (empleado_id, inicio)
+        sin_asignar (List[int]): Solicitudes que no caben en ningún hueco
+        carga (Dict[str, int]): Minutos ocupados de cada empleado en el horizonte, con el reparto
+        preferidas (int): Asignaciones hechas a un empleado preferido por el cliente
+        mejoras (int): Movimientos de la búsqueda local que han mejorado el reparto
+        segundos (float): Tiempo de cálculo
+    """
+
+    asignaciones: Dict[int, Tuple[str, int]]
+    sin_asignar: List[int]
+    carga: Dict[str, int]
+    preferidas: int
+    mejoras: int
+    segundos: float
+
+
+class PlanificadorAsignaciones:
+    """
+    Reparte peticiones entre los huecos libres de los empleados.
+
+    El objetivo es, por este orden, asignar el mayor número de peticiones,
+    respetar las preferencias de los clientes y equilibrar la carga (minimizar
+    la suma de los cuadrados de los minutos ocupados de cada empleado).
+
+    1. Voraz: las peticiones más restringidas (menos candidatos, franja más
+       justa) se colocan primero, cada una en el hueco más ajustado de sus
+       candidatos (primero los preferidos), en su primer inicio posible.
+       Repartir siempre al menos cargado trocea todas las agendas y deja sin
+       sitio a las peticiones largas; el equilibrio se busca después.
+    2. Búsqueda local, mientras quede presupuesto de tiempo:
+       - cada petición sin asignar intenta entrar en un empleado desalojando
+         a una petición ya colocada que pueda recolocarse en otro sitio;
+       - las peticiones de los empleados más cargados se pasan a candidatos
+         con menos carga si el cambio reduce el desequilibrio sin perder una
+         preferencia.
+
+    Los inicios se alinean, como en BookMeService.buscar_huecos, a múltiplos
+    de `paso` minutos desde el principio de cada hueco (o desde el primer
+    inicio admisible de la petición si es posterior).
+
+    Atributos:
+        paso (int): Separación en minutos entre inicios posibles
+        carga (Dict[str, int]): Minutos ocupados de cada empleado
+        _inicios (Dict[str, List[int]]): Inicios de los huecos libres de cada empleado, ordenados
+        _fines (Dict[str, List[int]]): Fines de esos huecos, en el mismo orden
+    """
+
+    def __init__(self, huecos: Dict[str, Sequence[Tuple[int, int]]],
+                 carga: Dict[str, int] = None, paso: int = 30):
+        """
+        Inicializa el planificador con los huecos libres de cada empleado.
+
+        Args:
+            huecos (Dict): empleado_id -> huecos (inicio, fin) ordenados y sin solapamientos
+            carga (Dict): empleado_id -> minutos ya ocupados en el horizonte (por defecto, 0)
+            paso (int): Separación en minutos entre inicios posibles
+        """
+        if paso < 1:
+            raise ValueError("paso debe ser al menos 1")
+        self.paso = paso
+        self._inicios: Dict[str, List[int]] = {}
+        self._fines: Dict[str, List[int]] = {}
+        for empleado_id, tramos in huecos.items():
+            self._inicios[empleado_id] = [inicio for inicio, _ in tramos]
+            self._fines[empleado_id] = [fin for _, fin in tramos]
+        self.carga: Dict[str, int] = {empleado_id: (carga or {}).get(empleado_id, 0)
+                                      for empleado_id in huecos}
+        self._peticiones: List[Peticion] = []
+        self._colocadas: Dict[int, Tuple[str, int]] = {}
+        self._por_empleado: Dict[str, Dict[int, int]] = {e: {} for e in huecos}
+
+    # HUECOS
+
+    def _hueco(self, empleado_id: str, peticion: Peticion) -> Optional[Tuple[int, int]]:
+        """
+        Primer inicio en el que la petición cabe en los huecos del empleado (método privado).
+
+        Args:
+            empleado_id (str): ID del empleado
+            peticion (Peticion): Petición a colocar
+
+        Returns:
+            Tuple[int, int]: (inicio, minutos del hueco que quedan libres) o None si no cabe
+        """
+        inicios = self._inicios.get(empleado_id)
+        if not inicios:
+            return None
+        fines = self._fines[empleado_id]
+        i = max(bisect_right(inicios, peticion.desde) - 1, 0)
+        while i < len(inicios) and inicios[i] + peticion.duracion <= peticion.hasta:
+            inicio = inicios[i]
+            if inicio < peticion.desde:
+                inicio += -(-(peticion.desde - inicio) // self.paso) * self.paso
+            if inicio + peticion.duracion <= min(fines[i], peticion.hasta):
+                return inicio, fines[i] - inicios[i] - peticion.duracion
+            i += 1
+        return None
+
+    def _ocupar(self, empleado_id: str, inicio: int, fin: int):
+        """Quita [inicio, fin) del hueco que lo contiene (método privado)."""
+        inicios, fines = self._inicios[empleado_id], self._fines[empleado_id]
+        i = bisect_right(inicios, inicio) - 1
+        hueco_inicio, hueco_fin = inicios[i], fines[i]
+        partes = [(a, b) for a, b in ((hueco_inicio, inicio), (fin, hueco_fin)) if a < b]
+        inicios[i:i + 1] = [a for a, _ in partes]
+        fines[i:i + 1] = [b for _, b in partes]
+
+    def _liberar(self, empleado_id: str, inicio: int, fin: int):
+        """Devuelve [inicio, fin) a los huecos, uniéndolo con los contiguos (método privado)."""
+        inicios, fines = self._inicios[empleado_id], self._fines[empleado_id]
+        i = bisect_right(inicios, inicio)
+        if i > 0 and fines[i - 1] == inicio:
+            i -= 1
+            inicio = inicios[i]
+            del inicios[i], fines[i]
+        if i < len(inicios) and inicios[i] == fin:
+            fin = fines[i]
+            del inicios[i], fines[i]
+        inicios.insert(i, inicio)
+        fines.insert(i, fin)
+
+    def _poner(self, n: int, empleado_id: str, inicio: int):
+        """Coloca la petición n (método privado)."""
+        duracion = self._peticiones[n].duracion
+        self._ocupar(empleado_id, inicio, inicio + duracion)
+        self._colocadas[n] = (empleado_id, inicio)
+        self._por_empleado[empleado_id][n] = inicio
+        self.carga[empleado_id] += duracion
+
+    def _quitar(self, n: int) -> Tuple[str, int]:
+        """Retira la petición n y devuelve dónde estaba (método privado)."""
+        empleado_id, inicio = self._colocadas.pop(n)
+        duracion = self._peticiones[n].duracion
+        self._liberar(empleado_id, inicio, inicio + duracion)
+        del self._por_empleado[empleado_id][n]
+        self.carga[empleado_id] -= duracion
+        return empleado_id, inicio
+
+    def _mejor_sitio(self, peticion: Peticion) -> Optional[Tuple[str, int]]:
+        """
+        Mejor candidato con hueco para la petición (método privado).
+
+        Se prefiere un empleado preferido por el cliente y, entre ellos, el
+        hueco más ajustado (el que deja menos minutos libres), para no partir
+        los huecos grandes que necesitarán peticiones más largas; a igualdad,
+        el empleado menos cargado.
+
+        Args:
+            peticion (Peticion): Petición a colocar
+
+        Returns:
+            Tuple[str, int]: (empleado_id, inicio) o None si no cabe en ningún candidato
+        """
+        mejor = None
+        for empleado_id in peticion.candidatos:
+            hueco = self._hueco(empleado_id, peticion)
+            if hueco is None:
+                continue
+            clave = (empleado_id not in peticion.preferidos, hueco[1], self.carga[empleado_id])
+            if mejor is None or clave < mejor[0]:
+                mejor = (clave, empleado_id, hueco[0])
+        return None if mejor is None else (mejor[1], mejor[2])
+
+    # BÚSQUEDA
+
+    def _voraz(self, pendientes: List[int]) -> List[int]:
+        """
+        Coloca las peticiones de la más a la menos restringida (método privado).
+
+        Args:
+            pendientes (List[int]): Peticiones a colocar
+
+        Returns:
+            List[int]: Peticiones que no han cabido
+        """
+        def holgura(n: int) -> Tuple[int, int, int]:
+            peticion = self._peticiones[n]
+            return (len(peticion.candidatos), peticion.hasta - peticion.desde - peticion.duracion,
+                    -peticion.duracion)
+
+        sin_sitio = []
+        for n in sorted(pendientes, key=holgura):
+            sitio = self._mejor_sitio(self._peticiones[n])
+            if sitio is None:
+                sin_sitio.append(n)
+            else:
+                self._poner(n, *sitio)
+        return sin_sitio
+
+    def _desalojar(self, n: int, limite: float) -> bool:
+        """
+        Intenta colocar la petición n recolocando otra ya asignada (método privado).
+
+        Args:
+            n (int): Petición sin asignar
+            limite (float): Instante (time.perf_counter) en el que hay que parar
+
+        Returns:
+            bool: True si la petición ha quedado colocada
+        """
+        peticion = self._peticiones[n]
+        for empleado_id in sorted(peticion.candidatos, key=self.carga.get):
+            for otra, inicio in list(self._por_empleado.get(empleado_id, {}).items()):
+                if time.perf_counter() > limite:
+                    return False
+                if (inicio >= peticion.hasta
+                        or inicio + self._peticiones[otra].duracion <= peticion.desde):
+                    continue
+                self._quitar(otra)
+                hueco = self._hueco(empleado_id, peticion)
+                if hueco is not None:
+                    self._poner(n, empleado_id, hueco[0])
+                    sitio = self._mejor_sitio(self._peticiones[otra])
+                    if sitio is not None:
+                        self._poner(otra, *sitio)
+                        return True
+                    self._quitar(n)
+                self._poner(otra, empleado_id, inicio)
+        return False
+
+    def _equilibrar(self, limite: float) -> int:
+        """
+        Pasa peticiones de los empleados más cargados a otros con menos carga (método privado).
+
+        Un cambio de un empleado con carga a a otro con carga b de una petición
+        de d minutos reduce la suma de cuadrados si b + d < a.
+
+        Args:
+            limite (float): Instante (time.perf_counter) en el que hay que parar
+
+        Returns:
+            int: Movimientos hechos
+        """
+        movimientos = 0
+        mejorado = True
+        while mejorado and time.perf_counter() <= limite:
+            mejorado = False
+            for origen in sorted(self._por_empleado, key=self.carga.get, reverse=True):
+                if time.perf_counter() > limite:
+                    break
+                for n, inicio in list(self._por_empleado[origen].items()):
+                    peticion = self._peticiones[n]
+                    preferida = origen in peticion.preferidos
+                    for destino in sorted(peticion.candidatos, key=self.carga.get):
+                        if self.carga[destino] + peticion.duracion >= self.carga[origen]:
+                            break
+                        if preferida and destino not in peticion.preferidos:
+                            continue
+                        hueco = self._hueco(destino, peticion)
+                        if hueco is not None:
+                            self._quitar(n)
+                            self._poner(n, destino, hueco[0])
+                            movimientos += 1
+                            mejorado = True
+                            break
+        return movimientos
+
+    def resolver(self, peticiones: Sequence[Peticion], presupuesto: float = 1.0
+                 ) -> ResultadoAsignacion:
+        """
+        Calcula el reparto de un conjunto de peticiones.
+
+        La fase voraz se completa siempre; la búsqueda local se detiene al agotar
+        el presupuesto, así que el resultado es válido aunque este sea 0. Los
+        huecos del planificador quedan ocupados con el reparto, de modo que cada
+        planificador resuelve un único conjunto de peticiones.
+
+        Args:
+            peticiones (Sequence[Peticion]): Peticiones a repartir
+            presupuesto (float): Segundos de cálculo, contando la fase voraz
+
+        Returns:
+            ResultadoAsignacion: Reparto calculado
+        """
+        comienzo = time.perf_counter()
+        limite = comienzo + presupuesto
+        self._peticiones = list(peticiones)
+        self._colocadas = {}
+        sin_sitio = self._voraz(list(range(len(self._peticiones))))
+
+        mejoras = 0
+        for n in list(sin_sitio):
+            if time.perf_counter() > limite:
+                break
+            if self._desalojar(n, limite):
+                sin_sitio.remove(n)
+                mejoras += 1
+        mejoras += self._equilibrar(limite)
+
+        preferidas = sum(1 for n, (empleado_id, _) in self._colocadas.items()
+                         if empleado_id in self._peticiones[n].preferidos)
+        return ResultadoAsignacion(dict(sorted(self._colocadas.items())), sorted(sin_sitio),
+                                   dict(self.carga), preferidas, mejoras,
+                                   time.perf_counter() - comienzo)
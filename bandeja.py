@@ -0,0 +1,141 @@
+"""
+Módulo: bandeja.py
+Descripción: Define la clase BandejaNotificaciones, la bandeja de entrada de un usuario.
+             Mantiene el contador de no leídas y descarta las notificaciones leídas más antiguas
+             para que la memoria por usuario esté acotada.
+"""
+
+from collections import OrderedDict, deque
+from heapq import merge
+from itertools import islice
+from typing import Iterator, List, Optional, Tuple
+
+
+class BandejaNotificaciones:
+    """
+    Bandeja de entrada de notificaciones de un usuario.
+
+    Las no leídas se guardan todas; de las leídas solo se conservan las
+    `max_leidas` más recientes.
+
+    Atributos:
+        max_leidas (int): Número máximo de notificaciones leídas que se conservan
+        descartadas (int): Notificaciones leídas eliminadas por la política de retención
+    """
+
+    def __init__(self, max_leidas: int = 100):
+        """
+        Inicializa una bandeja vacía.
+
+        Args:
+            max_leidas (int): Número máximo de notificaciones leídas que se conservan
+        """
+        self.max_leidas = max_leidas
+        self.descartadas = 0
+        self._secuencia = 0
+        # Entradas (secuencia, notificación) en orden de llegada
+        self._no_leidas: "OrderedDict[str, tuple]" = OrderedDict()
+        self._leidas: deque = deque()
+
+    @property
+    def no_leidas(self) -> int:
+        """Número de notificaciones sin leer."""
+        return len(self._no_leidas)
+
+    def agregar(self, notificacion):
+        """
+        Añade una notificación a la bandeja.
+
+        Args:
+            notificacion: Objeto Notificacion
+        """
+        self._secuencia += 1
+        entrada = (self._secuencia, notificacion)
+        if notificacion.leida:
+            self._guardar_leida(entrada)
+        else:
+            self._no_leidas[notificacion.id] = entrada
+
+    def marcar_leida(self, notificacion):
+        """
+        Pasa una notificación de no leídas a leídas.
+
+        Args:
+            notificacion: Objeto Notificacion que se acaba de leer
+        """
+        entrada = self._no_leidas.pop(notificacion.id, None)
+        if entrada is not None:
+            self._guardar_leida(entrada)
+
+    def _guardar_leida(self, entrada: tuple):
+        """
+        Guarda una entrada leída respetando la política de retención (método privado).
+
+        Args:
+            entrada (tuple): Par (secuencia, notificación)
+        """
+        # Las leídas se mantienen ordenadas por secuencia (llegada)
+        if self._leidas and self._leidas[-1][0] > entrada[0]:
+            posicion = len(self._leidas)
+            while posicion > 0 and self._leidas[posicion - 1][0] > entrada[0]:
+                posicion -= 1
+            self._leidas.insert(posicion, entrada)
+        else:
+            self._leidas.append(entrada)
+        while len(self._leidas) > self.max_leidas:
+            self._leidas.popleft()
+            self.descartadas += 1
+
+    def recorrer(self, antes_de: Optional[int] = None,
+                 solo_no_leidas: bool = False) -> Iterator[Tuple[int, object]]:
+        """
+        Recorre las notificaciones de la más reciente a la más antigua.
+
+        Args:
+            antes_de (int): Empezar por las de secuencia menor que esta (None = las más recientes)
+            solo_no_leidas (bool): Recorrer solo las no leídas
+
+        Yields:
+            Tuple[int, Notificacion]: Pares (secuencia, notificación)
+        """
+        recientes = reversed(self._no_leidas.values())
+        if not solo_no_leidas:
+            recientes = merge(recientes, reversed(self._leidas),
+                              key=lambda entrada: entrada[0], reverse=True)
+        for entrada in recientes:
+            if antes_de is None or entrada[0] < antes_de:
+                yield entrada
+
+    def pagina(self, desplazamiento: int = 0, limite: int = 20,
+               solo_no_leidas: bool = False) -> List:
+        """
+        Obtiene una página de notificaciones, de la más reciente a la más antigua.
+
+        El coste es proporcional a desplazamiento + limite, no al tamaño de la bandeja.
+
+        Args:
+            desplazamiento (int): Número de notificaciones a saltar
+            limite (int): Tamaño máximo de la página
+            solo_no_leidas (bool): Devolver solo las no leídas
+
+        Returns:
+            List: Notificaciones de la página
+        """
+        return [notificacion for _, notificacion
+                in islice(self.recorrer(solo_no_leidas=solo_no_leidas),
+                          desplazamiento, desplazamiento + limite)]
+
+    def todas(self) -> List:
+        """
+        Obtiene todas las notificaciones conservadas, en orden de llegada.
+
+        Returns:
+            List: Notificaciones de la bandeja
+        """
+        return [notificacion for _, notificacion
+                in merge(self._leidas, self._no_leidas.values(),
+                         key=lambda entrada: entrada[0])]
+
+    def __len__(self) -> int:
+        """Número de notificaciones conservadas."""
+        return len(self._no_leidas) + len(self._leidas)
@@ -0,0 +1,318 @@
+"""
+Módulo: bookme_async.py
+Descripción: Fachada asyncio de BookMeService para servidores web asíncronos. Expone corrutinas
+             para las operaciones de citas, listados y consultas de disponibilidad sin bloquear
+             el bucle de eventos.
+"""
+
+import asyncio
+import weakref
+from concurrent.futures import Executor
+from functools import partial
+from typing import Dict, List, Optional, Tuple
+
+from bookme_service import BookMeService
+from cita import Cita
+from notificacion import Notificacion
+from usuario import Empleado
+
+
+class AsyncBookMeService:
+    """
+    Versión asíncrona de BookMeService.
+
+    Las operaciones de un mismo empleado se encadenan con un asyncio.Lock por
+    empleado, que respeta el orden de llegada; las de empleados distintos se
+    atienden a la vez. Los cerrojos se guardan con referencias débiles: solo
+    existen mientras alguna operación los tiene o los espera, así que no se
+    acumulan con cada ID de empleado (válido o no) que llega. Lo que escribe en el repositorio o en la cola de envío se
+    ejecuta en el executor para no bloquear el bucle (sin repositorio ni
+    despachador todo ocurre en memoria y se ejecuta directamente). Los listados y
+    las consultas costosas (huecos, estadísticas) siempre van al executor.
+
+    El servicio envuelto debe estar en modo concurrente, porque el executor lo
+    usa desde varios hilos.
+
+    Atributos:
+        servicio (BookMeService): Servicio síncrono envuelto
+        executor (Executor): Executor de los trabajos en hilo (None = el del bucle)
+    """
+
+    def __init__(self, servicio: BookMeService, executor: Executor = None):
+        """
+        Inicializa la fachada.
+
+        Args:
+            servicio (BookMeService): Servicio creado con concurrente=True
+            executor (Executor): Executor para E/S y consultas costosas
+
+        Raises:
+            ValueError: Si el servicio no está en modo concurrente
+        """
+        if not servicio.concurrente:
+            raise ValueError("AsyncBookMeService necesita un BookMeService con concurrente=True")
+        self.servicio = servicio
+        self.executor = executor
+        self._locks_empleados: "weakref.WeakValueDictionary[str, asyncio.Lock]" = (
+            weakref.WeakValueDictionary())
+
+    async def __aenter__(self) -> "AsyncBookMeService":
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.cerrar()
+
+    # EJECUCIÓN
+
+    async def _en_hilo(self, funcion, *args, **kwargs):
+        """
+        Ejecuta una función síncrona en el executor (método privado).
+
+        Args:
+            funcion: Función a ejecutar
+            *args, **kwargs: Argumentos de la función
+
+        Returns:
+            Resultado de la función
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, partial(funcion, *args, **kwargs))
+
+    async def _con_es(self, funcion, *args, **kwargs):
+        """
+        Ejecuta una operación que puede hacer E/S (método privado).
+
+        Solo se lleva al executor si hay repositorio o despachador; en memoria
+        pura es más barato ejecutarla en el propio bucle.
+
+        Args:
+            funcion: Método del servicio
+            *args, **kwargs: Argumentos del método
+
+        Returns:
+            Resultado del método
+        """
+        if self.servicio.repositorio is None and self.servicio.despachador is None:
+            return funcion(*args, **kwargs)
+        return await self._en_hilo(funcion, *args, **kwargs)
+
+    def _bloqueo_empleado(self, empleado_id: str) -> asyncio.Lock:
+        """
+        Obtiene (o crea) el asyncio.Lock de un empleado (método privado).
+
+        Quien lo usa debe guardar la referencia mientras lo necesite: el
+        diccionario no lo mantiene vivo.
+
+        Args:
+            empleado_id (str): ID del empleado
+
+        Returns:
+            asyncio.Lock: Cerrojo del empleado
+        """
+        bloqueo = self._locks_empleados.get(empleado_id)
+        if bloqueo is None:
+            bloqueo = self._locks_empleados[empleado_id] = asyncio.Lock()
+        return bloqueo
+
+    async def _sobre_cita(self, cita_id: str, funcion, *args):
+        """
+        Ejecuta una operación sobre una cita en orden con las demás de su empleado (método privado).
+
+        Args:
+            cita_id (str): ID de la cita
+            funcion: Método del servicio que recibe cita_id como primer argumento
+            *args: Resto de argumentos
+
+        Returns:
+            Resultado del método
+        """
+        cita = self.servicio.obtener_cita(cita_id)
+        if cita is None:
+            return await self._con_es(funcion, cita_id, *args)
+        async with self._bloqueo_empleado(cita.empleado.id):
+            return await self._con_es(funcion, cita_id, *args)
+
+    # MÉTODOS DE CITAS
+
+    async def crear_cita(self, cliente_id: str, empleado_id: str,
+                         servicio_id: str, fecha_hora: str) -> Optional[Cita]:
+        """
+        Crea una nueva cita (ver BookMeService.crear_cita).
+
+        Args:
+            cliente_id (str): ID del cliente
+            empleado_id (str): ID del empleado
+            servicio_id (str): ID del servicio
+            fecha_hora (str): Fecha y hora en formato "YYYY-MM-DD HH:MM"
+
+        Returns:
+            Cita: Cita creada o None si hay error
+        """
+        async with self._bloqueo_empleado(empleado_id):
+            return await self._con_es(self.servicio.crear_cita, cliente_id, empleado_id,
+                                      servicio_id, fecha_hora)
+
+    async def modificar_cita(self, cita_id: str, nueva_fecha_hora: str) -> Optional[Cita]:
+        """
+        Modifica la fecha y hora de una cita (ver BookMeService.modificar_cita).
+
+        Args:
+            cita_id (str): ID de la cita
+            nueva_fecha_hora (str): Nueva fecha y hora
+
+        Returns:
+            Cita: Cita modificada o None si hay error
+        """
+        return await self._sobre_cita(cita_id, self.servicio.modificar_cita, nueva_fecha_hora)
+
+    async def cancelar_cita(self, cita_id: str, razon: str = "") -> str:
+        """
+        Cancela una cita (ver BookMeService.cancelar_cita).
+
+        Args:
+            cita_id (str): ID de la cita
+            razon (str): Razón de la cancelación
+
+        Returns:
+            str: Mensaje de confirmación o error
+        """
+        return await self._sobre_cita(cita_id, self.servicio.cancelar_cita, razon)
+
+    async def completar_cita(self, cita_id: str) -> str:
+        """
+        Marca una cita como completada (ver BookMeService.completar_cita).
+
+        Args:
+            cita_id (str): ID de la cita
+
+        Returns:
+            str: Mensaje de confirmación o error
+        """
+        return await self._sobre_cita(cita_id, self.servicio.completar_cita)
+
+    # LISTADOS
+
+    async def listar_usuarios(self) -> str:
+        """Lista todos los usuarios registrados."""
+        return await self._en_hilo(self.servicio.listar_usuarios)
+
+    async def listar_servicios(self) -> str:
+        """Lista todos los servicios disponibles."""
+        return await self._en_hilo(self.servicio.listar_servicios)
+
+    async def listar_citas_cliente(self, cliente_id: str) -> str:
+        """
+        Lista todas las citas de un cliente.
+
+        Args:
+            cliente_id (str): ID del cliente
+
+        Returns:
+            str: Lista formateada de citas
+        """
+        return await self._en_hilo(self.servicio.listar_citas_cliente, cliente_id)
+
+    async def listar_todas_citas(self) -> str:
+        """Lista todas las citas del sistema."""
+        return await self._en_hilo(self.servicio.listar_todas_citas)
+
+    async def listar_notificaciones(self, usuario_id: str) -> str:
+        """
+        Lista las notificaciones de un usuario.
+
+        Args:
+            usuario_id (str): ID del usuario
+
+        Returns:
+            str: Lista formateada de notificaciones
+        """
+        return await self._en_hilo(self.servicio.listar_notificaciones, usuario_id)
+
+    async def obtener_notificaciones(self, usuario_id: str, pagina: int = 1,
+                                     por_pagina: int = 20,
+                                     solo_no_leidas: bool = False) -> List[Notificacion]:
+        """
+        Obtiene una página de la bandeja de un usuario (en memoria, sin executor).
+
+        Args:
+            usuario_id (str): ID del usuario
+            pagina (int): Número de página, empezando en 1
+            por_pagina (int): Notificaciones por página
+            solo_no_leidas (bool): Devolver solo las no leídas
+
+        Returns:
+            List[Notificacion]: Notificaciones de la página
+        """
+        return self.servicio.obtener_notificaciones(usuario_id, pagina, por_pagina,
+                                                    solo_no_leidas)
+
+    # DISPONIBILIDAD Y ESTADÍSTICAS
+
+    async def buscar_huecos(self, servicio_id: str, cantidad: int = 5, desde: str = None,
+                            dias: int = 14, empleado_id: str = None,
+                            paso: int = 30) -> List[Tuple[str, Empleado]]:
+        """
+        Busca los primeros huecos libres para un servicio (ver BookMeService.buscar_huecos).
+
+        Returns:
+            List[Tuple[str, Empleado]]: Pares (fecha y hora de inicio, empleado), ordenados
+
+        Raises:
+            ValueError: Si paso es menor que 1
+        """
+        return await self._en_hilo(self.servicio.buscar_huecos, servicio_id, cantidad, desde,
+                                   dias, empleado_id, paso)
+
+    async def estadisticas(self, verificar: bool = False) -> Dict[str, float]:
+        """
+        Obtiene los contadores del negocio (ver BookMeService.estadisticas).
+
+        Args:
+            verificar (bool): Recalcular desde cero y comprobar que coinciden
+
+        Returns:
+            Dict: Totales de usuarios, citas, servicios e ingresos
+        """
+        if not verificar:
+            return self.servicio.estadisticas()
+        return await self._en_hilo(self.servicio.estadisticas, True)
+
+    async def obtener_estadisticas(self) -> str:
+        """Obtiene un resumen de estadísticas del negocio."""
+        return self.servicio.obtener_estadisticas()
+
+    async def informe_ingresos(self, desde: str = None, hasta: str = None,
+                               por: str = "servicio") -> Dict[str, float]:
+        """Calcula los ingresos de las citas completadas (ver BookMeService.informe_ingresos)."""
+        return await self._en_hilo(self.servicio.informe_ingresos, desde, hasta, por)
+
+    async def informe_ocupacion(self, desde: str, hasta: str) -> Dict[str, Dict[str, float]]:
+        """Calcula la ocupación de cada empleado (ver BookMeService.informe_ocupacion)."""
+        return await self._en_hilo(self.servicio.informe_ocupacion, desde, hasta)
+
+    async def archivar_citas(self, dias: int = 90) -> int:
+        """Pasa al archivo las citas terminadas antiguas (ver BookMeService.archivar_citas)."""
+        return await self._en_hilo(self.servicio.archivar_citas, dias)
+
+    # NOTIFICACIONES Y CIERRE
+
+    async def procesar_recordatorios(self, ahora: int = None) -> List[Notificacion]:
+        """
+        Emite los recordatorios que han vencido (ver BookMeService.procesar_recordatorios).
+
+        Args:
+            ahora (int): Instante actual en minutos (por defecto, el del reloj del servicio)
+
+        Returns:
+            List[Notificacion]: Recordatorios creados
+        """
+        return await self._con_es(self.servicio.procesar_recordatorios, ahora)
+
+    async def esperar_envios(self):
+        """Espera a que el despachador haya enviado todo lo encolado."""
+        if self.servicio.despachador is not None:
+            await self._en_hilo(self.servicio.despachador.esperar)
+
+    async def cerrar(self):
+        """Envía lo pendiente y cierra el servicio."""
+        await self._en_hilo(self.servicio.cerrar)
@@ -6,12 +6,53 @@ Descripción: Clase principal que coordina la lógica general del sistema BookMe
 Gestiona usuarios, servicios, citas y notificaciones.
 """
 
-from typing import List, Optional, Dict
+import heapq
+import logging
+import sys
+import threading
+from bisect import bisect_right
+from contextlib import ExitStack, contextmanager, nullcontext
+from itertools import chain, count
+from operator import attrgetter
+from typing import Callable, Iterable, Iterator, List, Optional, Dict, Tuple, Union
+import presentacion
 from usuario import Usuario, Cliente, Empleado, Administrador
 from servicio import Servicio
 from cita import Cita
 from notificacion import Notificacion
 from negocio import Negocio
+from horario import Horario
+from bandeja import BandejaNotificaciones
+from repositorio import Repositorio
+from identificadores import GeneradorIds
+from despacho import DespachadorNotificaciones
+from recordatorios import PlanificadorRecordatorios
+from series import Ocurrencia, ReglaRecurrencia, SerieCitas, texto_a_excepciones
+from agregados import MEDIDAS, AgregadosCitas
+from asignacion import Peticion, PlanificadorAsignaciones, ResultadoAsignacion, Solicitud
+from archivo import ArchivoCitas, CitaArchivada
+from indices import Calendario, IndiceCronologico, IndiceIntervalos, restar_intervalos
+from transferencia import (CAMPOS_CITA, CAMPOS_SERVICIO, CAMPOS_USUARIO, escribir_filas,
+                           exigir_campos, interpretar_registro, leer_registros, por_lotes)
+from tiempo import (MINUTOS_DIA, ahora_minutos, dia_a_fecha, dia_semana, fecha_a_minutos,
+                    instante_a_minutos, mes_de_dia, minutos_a_fecha, primer_dia_mes)
+from errores import HorarioOcupado, NoEncontrado, OperacionNoValida
+
+
+logger = logging.getLogger(__name__)
+
+
+def _avanzar_contador(clase, ultimo_numero: int):
+    """
+    Asegura que el contador de IDs de una clase no reutilice IDs ya guardados.
+    
+    Args:
+        clase: Clase con atributos contador_id y _lock_id
+        ultimo_numero (int): Número más alto ya usado
+    """
+    with clase._lock_id:
+        if ultimo_numero >= clase.contador_id:
+            clase.contador_id = ultimo_numero + 1
 
 
 class BookMeService:
@@ -21,12 +62,89 @@ class BookMeService:
     Atributos:
         lista_usuarios (List): Lista de todos los usuarios registrados
         lista_servicios (List): Lista de todos los servicios
-        lista_citas (List): Lista de todas las citas
-        lista_notificaciones (List): Lista de notificaciones
+        lista_citas (List): Lista de las citas en memoria (sin las archivadas)
+        archivo (ArchivoCitas): Citas terminadas antiguas, guardadas por columnas
+        lista_notificaciones (List): Notificaciones conservadas en las bandejas (solo lectura)
         negocio (Negocio): Objeto Negocio asociado
+        repositorio (Repositorio): Almacenamiento persistente opcional
+        despachador (DespachadorNotificaciones): Cola de envío asíncrono opcional
+        recordatorios (PlanificadorRecordatorios): Recordatorios pendientes de citas confirmadas
+        reloj (Callable): Devuelve el instante actual en minutos desde la época
+    
+    Además de las listas se mantienen índices id -> objeto (diccionarios) para
+    que las búsquedas por ID sean O(1). Las listas se conservan para
+    recorrerlas, pero son de solo lectura: las altas y bajas se hacen con los
+    métodos del servicio, que actualizan a la vez índices, agendas y
+    contadores. Una lista modificada directamente deja desfasado todo lo demás.
+    
+    Cada empleado tiene además un IndiceIntervalos con sus citas activas
+    (pendientes o confirmadas) para detectar reservas solapadas en O(log n),
+    un IndiceCronologico con todas sus citas por orden de inicio y la lista de
+    sus citas por orden de creación, que usan los listados paginados. Un
+    Calendario agrupa las citas no canceladas por día y empleado para las
+    vistas de agenda diaria.
+    
+    Si se indica un repositorio, cada cambio se escribe en él al momento, el
+    estado se recupera de él al arrancar y los listados de citas por cliente
+    y de notificaciones se resuelven con consultas al mismo. RepositorioSQLite
+    guarda las filas en SQLite; RepositorioEventos (eventos.py) las añade a un
+    registro de eventos con fsync agrupado e instantáneas periódicas.
+    
+    Cada operación que modifica el estado es todo o nada (ver _operacion): si
+    falla a medias, o falla la transacción del repositorio, se deshacen
+    también sus cambios en memoria y sus notificaciones no llegan a entregarse.
+    
+    Las citas completadas o canceladas que ya no se consultan a diario pueden
+    pasarse con archivar_citas() a un ArchivoCitas columnar: salen de las listas
+    e índices y quedan solo como registros compactos para informes y consultas
+    por ID (obtener_cita_archivada).
+    
+    Las estadísticas se mantienen con contadores que se actualizan en cada
+    alta y en cada cambio de estado de una cita, por lo que consultarlas es O(1).
+    Del mismo modo se mantienen agregados por día y por mes (AgregadosCitas)
+    con los que los informes por periodo suman cubos en vez de recorrer citas.
+    
+    Las notificaciones se guardan en una BandejaNotificaciones por usuario, con
+    contador de no leídas y retención limitada de las ya leídas. Si hay un
+    despachador, cada notificación creada se encola para enviarse en segundo
+    plano y la operación que la generó no espera al transporte.
+    
+    Los recordatorios de las citas confirmadas se programan solos al crearlas o
+    modificarlas; procesar_recordatorios() emite los que han vencido.
+    
+    Las citas periódicas se guardan como una SerieCitas (regla y excepciones)
+    en lugar de una Cita por repetición. Sus ocurrencias se calculan al
+    consultar la agenda, los huecos libres o los recordatorios, ocupan la
+    agenda del empleado igual que una cita y solo se convierten en Cita al
+    moverlas o materializarlas (p. ej. para completarlas). Las ocurrencias sin
+    materializar no cuentan en estadísticas ni informes. El repositorio guarda
+    cada serie como una fila (regla, repeticiones y excepciones), no sus ocurrencias.
+    
+    En modo concurrente el servicio puede usarse desde varios hilos. Cada
+    empleado tiene un cerrojo propio que protege su agenda, de modo que la
+    comprobación del hueco y la inserción de la cita son atómicas y las reservas
+    de empleados distintos avanzan en paralelo. Las listas, índices, contadores,
+    bandejas y recordatorios compartidos se protegen con un cerrojo global que
+    solo se retiene durante la actualización en memoria. Orden de adquisición:
+    cerrojo del empleado, después el global o el del repositorio; nunca al revés.
     """
     
-    def __init__(self, nombre_negocio: str, direccion: str, telefono: str):
+    # Estados en los que una cita ocupa la agenda del empleado
+    ESTADOS_ACTIVOS = ("pendiente", "confirmada")
+    ESTADOS_CITA = ("pendiente", "confirmada", "cancelada", "completada")
+    # Estados en los que una cita puede archivarse
+    ESTADOS_FINALES = ("cancelada", "completada")
+    TIPOS_USUARIO = ("cliente", "empleado", "administrador")
+    # Notificaciones leídas que se conservan en memoria por usuario
+    MAX_LEIDAS_POR_BANDEJA = 100
+    
+    def __init__(self, nombre_negocio: str, direccion: str, telefono: str,
+                 repositorio: Repositorio = None,
+                 despachador: DespachadorNotificaciones = None,
+                 antelacion_recordatorio: int = 1440,
+                 reloj: Callable[[], int] = ahora_minutos,
+                 concurrente: bool = False,
+                 ids: GeneradorIds = None):
         """
         Inicializa el servicio de BookMe.
         
@@ -34,12 +152,589 @@ class BookMeService:
             nombre_negocio (str): Nombre del negocio
             direccion (str): Dirección del negocio
             telefono (str): Teléfono del negocio
+            repositorio (Repositorio): Almacenamiento persistente (por defecto, solo memoria)
+            despachador (DespachadorNotificaciones): Envío asíncrono de notificaciones
+            antelacion_recordatorio (int): Minutos antes de la cita en que se envía el recordatorio
+            reloj (Callable): Función que devuelve la hora actual en minutos (inyectable en pruebas)
+            concurrente (bool): Proteger el estado con cerrojos para usarlo desde varios hilos
+            ids (GeneradorIds): Numeración propia del negocio (por defecto, los contadores de clase)
         """
         self.lista_usuarios = []
         self.lista_servicios = []
         self.lista_citas = []
-        self.lista_notificaciones = []
         self.negocio = Negocio(nombre_negocio, direccion, telefono)
+        
+        # Índices id -> objeto
+        self._indice_usuarios: Dict[str, Usuario] = {}
+        self._indice_servicios: Dict[str, Servicio] = {}
+        self._indice_citas: Dict[str, Cita] = {}
+        self._indice_empleados: Dict[str, Empleado] = {}
+        self._bandejas: Dict[str, BandejaNotificaciones] = {}
+        
+        # Agenda de citas activas por empleado: empleado_id -> IndiceIntervalos
+        self._agendas: Dict[str, IndiceIntervalos] = {}
+        # Todas las citas por empleado: por inicio y por orden de creación
+        self._cronologias: Dict[str, IndiceCronologico] = {}
+        self._citas_por_empleado: Dict[str, List[Cita]] = {}
+        # Citas no canceladas por día y empleado, y series de citas periódicas
+        self._calendario = Calendario()
+        self._indice_series: Dict[str, SerieCitas] = {}
+        # Citas terminadas que ya han salido de las estructuras anteriores
+        self.archivo = ArchivoCitas()
+        # Orden de alta de usuarios y citas: cursor estable de las páginas en orden "id"
+        self._altas = count()
+        
+        # Contadores para las estadísticas
+        self._usuarios_por_tipo: Dict[str, int] = dict.fromkeys(self.TIPOS_USUARIO, 0)
+        self._citas_por_estado: Dict[str, int] = dict.fromkeys(self.ESTADOS_CITA, 0)
+        self._ingresos_confirmados = 0
+        # Ingresos, minutos y citas por día y mes para los informes por periodo
+        self._agregados = AgregadosCitas()
+        
+        # Cerrojos del modo concurrente (sin él, contextos vacíos)
+        self.concurrente = concurrente
+        self._lock_global = threading.Lock() if concurrente else nullcontext()
+        self._locks_empleados: Dict[str, threading.RLock] = {}
+        
+        # Acciones de deshacer y de después de confirmar de la operación en curso, por hilo
+        self._local = threading.local()
+        
+        self.despachador = despachador
+        self.reloj = reloj
+        self.recordatorios = PlanificadorRecordatorios(antelacion_recordatorio)
+        self.ids = ids
+        self.repositorio = repositorio
+        if repositorio is not None:
+            self._cargar_desde_repositorio()
+    
+    # MÉTODOS DE PERSISTENCIA
+    
+    def _transaccion(self):
+        """
+        Agrupa las escrituras de una operación en una transacción (método privado).
+        
+        Returns:
+            Gestor de contexto de la transacción (vacío si no hay repositorio)
+        """
+        if self.repositorio is None:
+            return nullcontext()
+        return self.repositorio.transaccion()
+    
+    @contextmanager
+    def _operacion(self) -> Iterator[None]:
+        """
+        Ejecuta una operación que modifica el estado como una unidad (método privado).
+        
+        Abre una transacción del repositorio. Cada cambio en memoria hecho
+        dentro registra con _al_deshacer cómo revertirlo: si el bloque o la
+        transacción fallan, se revierten en orden inverso y la excepción se
+        propaga. Lo que solo debe ocurrir si todo sale bien (entregar las
+        notificaciones) se aplaza con _al_confirmar hasta que termina la
+        operación más externa. Una operación anidada que falla deshace solo lo
+        suyo, igual que la transacción anidada del repositorio.
+        """
+        profundidad = getattr(self._local, "profundidad", 0)
+        if profundidad == 0:
+            self._local.deshacer = []
+            self._local.al_confirmar = []
+        deshacer, al_confirmar = self._local.deshacer, self._local.al_confirmar
+        marca_deshacer, marca_confirmar = len(deshacer), len(al_confirmar)
+        self._local.profundidad = profundidad + 1
+        try:
+            with self._transaccion():
+                yield
+        except BaseException:
+            for accion in reversed(deshacer[marca_deshacer:]):
+                accion()
+            del deshacer[marca_deshacer:]
+            del al_confirmar[marca_confirmar:]
+            raise
+        finally:
+            self._local.profundidad = profundidad
+        if profundidad == 0:
+            self._local.deshacer = []
+            self._local.al_confirmar = []
+            for accion in al_confirmar:
+                accion()
+    
+    def _al_deshacer(self, accion: Callable[[], None]):
+        """
+        Registra cómo revertir un cambio en memoria de la operación en curso (método privado).
+        
+        La acción no debe escribir en el repositorio. Fuera de una operación no hace nada.
+        
+        Args:
+            accion (Callable): Función sin argumentos que revierte el cambio
+        """
+        if getattr(self._local, "profundidad", 0):
+            self._local.deshacer.append(accion)
+    
+    def _al_confirmar(self, accion: Callable[[], None]):
+        """
+        Aplaza una acción hasta que la operación en curso termine bien (método privado).
+        
+        Fuera de una operación se ejecuta en el momento.
+        
+        Args:
+            accion (Callable): Función sin argumentos
+        """
+        if getattr(self._local, "profundidad", 0):
+            self._local.al_confirmar.append(accion)
+        else:
+            accion()
+    
+    def _cargar_desde_repositorio(self):
+        """
+        Reconstruye usuarios, servicios, horarios, citas y series guardados (método privado).
+        
+        Las notificaciones vuelven a las bandejas con la misma política de
+        retención que al crearlas: todas las no leídas y las leídas más recientes.
+        """
+        datos = self.repositorio.cargar()
+        
+        for usuario_id, tipo, nombre, email, telefono, especialidad in datos["usuarios"]:
+            usuario = self._construir_usuario(tipo, nombre, email,
+                                              {"telefono": telefono or "",
+                                               "especialidad": especialidad or "General"},
+                                              usuario_id)
+            self._agregar_usuario(usuario, persistir=False)
+        
+        # Los servicios dados de baja se reconstruyen para las citas antiguas
+        todos_servicios = {}
+        for servicio_id, nombre, descripcion, duracion, precio, activo in datos["servicios"]:
+            servicio = Servicio(nombre, descripcion, duracion, precio, id=servicio_id)
+            todos_servicios[servicio_id] = servicio
+            if activo:
+                self._agregar_servicio(servicio, persistir=False)
+        
+        for empleado_id, dia, hora_inicio, hora_fin, pausas in datos["horarios"]:
+            empleado = self._indice_empleados.get(empleado_id)
+            if empleado:
+                empleado.horario = Horario(dia, hora_inicio, hora_fin,
+                                           pausas.split(",") if pausas else [])
+        
+        for cita_id, cliente_id, empleado_id, servicio_id, inicio, fin, estado in datos["citas"]:
+            cliente = self._indice_usuarios.get(cliente_id)
+            empleado = self._indice_usuarios.get(empleado_id)
+            servicio = todos_servicios.get(servicio_id)
+            if cliente is None or empleado is None or servicio is None:
+                # Fila huérfana: solo aparece si los datos se han dañado o editado a mano
+                logger.warning("⚠ Cita %s omitida al cargar: faltan cliente %s, "
+                               "empleado %s o servicio %s",
+                               cita_id, cliente_id, empleado_id, servicio_id)
+                continue
+            cita = Cita(cliente, empleado, servicio, inicio, id=cita_id)
+            cita.fin = fin
+            cita._estado = sys.intern(estado)
+            self._agregar_cita(cita, persistir=False)
+        
+        for (serie_id, cliente_id, empleado_id, servicio_id, inicio, duracion, frecuencia,
+             intervalo, repeticiones_regla, hasta, repeticiones, excepciones) in datos["series"]:
+            cliente = self._indice_usuarios.get(cliente_id)
+            empleado = self._indice_usuarios.get(empleado_id)
+            servicio = todos_servicios.get(servicio_id)
+            if cliente is None or empleado is None or servicio is None:
+                logger.warning("⚠ Serie %s omitida al cargar: faltan cliente %s, "
+                               "empleado %s o servicio %s",
+                               serie_id, cliente_id, empleado_id, servicio_id)
+                continue
+            regla = ReglaRecurrencia(frecuencia, intervalo, repeticiones_regla, hasta)
+            serie = SerieCitas(cliente, empleado, servicio, minutos_a_fecha(inicio), regla,
+                               id=serie_id)
+            # Repeticiones y excepciones pueden haber cambiado desde la reserva
+            serie.duracion = duracion
+            serie.repeticiones = repeticiones
+            serie.excepciones = texto_a_excepciones(excepciones)
+            self._calendario.agregar_serie(serie)
+            self._indice_series[serie.id] = serie
+            self.recordatorios.programar(serie.id, serie.inicio)
+        
+        for (notif_id, destinatario_id, mensaje, tipo, fecha_envio,
+             leida) in datos["notificaciones"]:
+            destinatario = self._indice_usuarios.get(destinatario_id)
+            if destinatario is None:
+                continue
+            notif = Notificacion(destinatario, mensaje, tipo, id=notif_id)
+            notif.fecha_envio = fecha_envio
+            notif.leida = bool(leida)
+            notif.observador = self
+            self._bandeja(destinatario_id).agregar(notif)
+        
+        self._avanzar_id(Usuario, "usuario", self.repositorio.ultimo_id("usuario"))
+        self._avanzar_id(Servicio, "servicio", self.repositorio.ultimo_id("servicio"))
+        self._avanzar_id(Cita, "cita", self.repositorio.ultimo_id("cita"))
+        self._avanzar_id(Notificacion, "notificacion", self.repositorio.ultimo_id("notificacion"))
+        self._avanzar_id(SerieCitas, "serie", self.repositorio.ultimo_id("serie"))
+    
+    def _nuevo_id(self, tabla: str) -> Optional[str]:
+        """
+        Genera un ID con la numeración propia del negocio (método privado).
+        
+        Args:
+            tabla (str): "usuario", "servicio", "cita" o "notificacion"
+        
+        Returns:
+            str: ID nuevo, o None para que lo asigne el contador de la clase
+        """
+        if self.ids is None:
+            return None
+        return self.ids.siguiente(tabla)
+    
+    def _avanzar_id(self, clase, tabla: str, ultimo_numero: int):
+        """
+        Evita reutilizar IDs ya guardados, en la numeración que use el servicio (método privado).
+        
+        Args:
+            clase: Clase con contador_id, si el servicio no tiene numeración propia
+            tabla (str): Tabla de la numeración propia
+            ultimo_numero (int): Número más alto ya usado
+        """
+        if self.ids is None:
+            _avanzar_contador(clase, ultimo_numero)
+        else:
+            self.ids.avanzar(tabla, ultimo_numero)
+    
+    def _notificacion_leida(self, notificacion: Notificacion):
+        """
+        Registra en el repositorio que una notificación se ha leído (método privado).
+        
+        Args:
+            notificacion (Notificacion): Notificación marcada como leída
+        """
+        with self._lock_global:
+            bandeja = self._bandejas.get(notificacion.destinatario.id)
+            if bandeja is not None:
+                bandeja.marcar_leida(notificacion)
+        if self.repositorio is not None:
+            self.repositorio.marcar_notificacion_leida(notificacion.id)
+    
+    def cerrar(self):
+        """Envía las notificaciones pendientes y cierra el despachador y el repositorio."""
+        if self.despachador is not None:
+            self.despachador.detener()
+        if self.repositorio is not None:
+            self.repositorio.cerrar()
+    
+    # MÉTODOS DE ÍNDICES
+    
+    def _agenda_empleado(self, empleado_id: str) -> IndiceIntervalos:
+        """
+        Obtiene (o crea) el índice de citas activas de un empleado (método privado).
+        
+        Args:
+            empleado_id (str): ID del empleado
+        
+        Returns:
+            IndiceIntervalos: Agenda del empleado
+        """
+        agenda = self._agendas.get(empleado_id)
+        if agenda is None:
+            agenda = self._agendas[empleado_id] = IndiceIntervalos()
+        return agenda
+    
+    def _bloqueo_empleado(self, empleado_id: str):
+        """
+        Obtiene (o crea) el cerrojo de la agenda de un empleado (método privado).
+        
+        Es reentrante para que las operaciones que ya lo tienen puedan provocar
+        cambios de estado de la cita sin bloquearse.
+        
+        Args:
+            empleado_id (str): ID del empleado
+        
+        Returns:
+            Gestor de contexto del cerrojo (vacío fuera del modo concurrente)
+        """
+        if not self.concurrente:
+            return self._lock_global
+        bloqueo = self._locks_empleados.get(empleado_id)
+        if bloqueo is None:
+            with self._lock_global:
+                bloqueo = self._locks_empleados.setdefault(empleado_id, threading.RLock())
+        return bloqueo
+    
+    def _conflicto_series(self, empleado_id: str, inicio: int, fin: int) -> Optional[str]:
+        """
+        Busca una ocurrencia de las series del empleado que solape el intervalo (método privado).
+        
+        Args:
+            empleado_id (str): ID del empleado
+            inicio (int): Minuto de inicio
+            fin (int): Minuto de fin
+        
+        Returns:
+            str: ID de la ocurrencia que se solapa o None si no hay ninguna
+        """
+        series = self._calendario.series_de(empleado_id)
+        if series is None:
+            return None
+        ocurrencia = series.solapa(inicio, fin)
+        return ocurrencia.id if ocurrencia is not None else None
+    
+    def _conflicto(self, empleado_id: str, inicio: int, fin: int) -> Optional[str]:
+        """
+        Busca una cita activa u ocurrencia de serie que solape el intervalo (método privado).
+        
+        Args:
+            empleado_id (str): ID del empleado
+            inicio (int): Minuto de inicio
+            fin (int): Minuto de fin
+        
+        Returns:
+            str: ID de la cita u ocurrencia que se solapa o None si el hueco está libre
+        """
+        return (self._agenda_empleado(empleado_id).solapa(inicio, fin)
+                or self._conflicto_series(empleado_id, inicio, fin))
+    
+    @staticmethod
+    def _tipo_usuario(usuario: Usuario) -> Optional[str]:
+        """
+        Obtiene el tipo de un usuario tal como se usa en las estadísticas (método privado).
+        
+        Args:
+            usuario (Usuario): Usuario
+        
+        Returns:
+            str: "cliente", "empleado", "administrador" o None
+        """
+        if isinstance(usuario, Cliente):
+            return "cliente"
+        if isinstance(usuario, Empleado):
+            return "empleado"
+        if isinstance(usuario, Administrador):
+            return "administrador"
+        return None
+    
+    def _contar_cita(self, estado: str, cita: Cita, delta: int):
+        """
+        Suma o resta una cita en los contadores de estado e ingresos (método privado).
+        
+        Args:
+            estado (str): Estado en el que se cuenta la cita
+            cita (Cita): Cita contada
+            delta (int): 1 para sumar, -1 para restar
+        """
+        if estado in self._citas_por_estado:
+            self._citas_por_estado[estado] += delta
+        if estado == "confirmada":
+            self._ingresos_confirmados += delta * cita.servicio.precio
+    
+    def _agregar_usuario(self, usuario: Usuario, persistir: bool = True):
+        """
+        Añade un usuario ya construido a las listas e índices (método privado).
+        
+        Args:
+            usuario (Usuario): Usuario a añadir
+            persistir (bool): Si debe escribirse en el repositorio
+        """
+        tipo = self._tipo_usuario(usuario)
+        with self._lock_global:
+            usuario.alta = next(self._altas)
+            self.lista_usuarios.append(usuario)
+            self._indice_usuarios[usuario.id] = usuario
+            if isinstance(usuario, Empleado):
+                self._indice_empleados[usuario.id] = usuario
+                usuario.calendario = self._calendario
+            if tipo:
+                self._usuarios_por_tipo[tipo] += 1
+        self._al_deshacer(lambda: self._quitar_usuario(usuario))
+        if persistir and self.repositorio is not None:
+            self.repositorio.guardar_usuario(usuario)
+    
+    def _quitar_usuario(self, usuario: Usuario):
+        """
+        Deshace en memoria lo que hizo _agregar_usuario con un usuario (método privado).
+        
+        Args:
+            usuario (Usuario): Usuario añadido con _agregar_usuario
+        """
+        tipo = self._tipo_usuario(usuario)
+        with self._lock_global:
+            self.lista_usuarios.remove(usuario)
+            del self._indice_usuarios[usuario.id]
+            self._indice_empleados.pop(usuario.id, None)
+            if tipo:
+                self._usuarios_por_tipo[tipo] -= 1
+    
+    def _agregar_servicio(self, servicio: Servicio, persistir: bool = True):
+        """
+        Añade un servicio ya construido a las listas, índices y al negocio (método privado).
+        
+        Args:
+            servicio (Servicio): Servicio a añadir
+            persistir (bool): Si debe escribirse en el repositorio
+        """
+        with self._lock_global:
+            self.lista_servicios.append(servicio)
+            self._indice_servicios[servicio.id] = servicio
+            self.negocio.agregar_servicio(servicio)
+        self._al_deshacer(lambda: self._quitar_servicio(servicio))
+        if persistir and self.repositorio is not None:
+            self.repositorio.guardar_servicio(servicio)
+    
+    def _quitar_servicio(self, servicio: Servicio):
+        """
+        Deshace en memoria lo que hizo _agregar_servicio con un servicio (método privado).
+        
+        Args:
+            servicio (Servicio): Servicio añadido con _agregar_servicio
+        """
+        with self._lock_global:
+            self.lista_servicios.remove(servicio)
+            del self._indice_servicios[servicio.id]
+            self.negocio.eliminar_servicio(servicio.id)
+    
+    def _agregar_cita(self, cita: Cita, persistir: bool = True):
+        """
+        Añade una cita ya construida a la agenda, listas, índices e historial (método privado).
+        
+        Args:
+            cita (Cita): Cita a añadir
+            persistir (bool): Si debe escribirse en el repositorio
+        
+        Raises:
+            ValueError: Si la cita está activa y se solapa con otra del empleado
+        """
+        with self._bloqueo_empleado(cita.empleado.id):
+            if cita.estado in self.ESTADOS_ACTIVOS:
+                conflicto = (self._conflicto_series(cita.empleado.id, cita.inicio, cita.fin)
+                             or self._agenda_empleado(cita.empleado.id).insertar(
+                                 cita.inicio, cita.fin, cita.id))
+                if conflicto:
+                    raise HorarioOcupado(cita.empleado, conflicto)
+            empleado_id = cita.empleado.id
+            cronologia = self._cronologias.get(empleado_id)
+            if cronologia is None:
+                cronologia = self._cronologias[empleado_id] = IndiceCronologico()
+            cronologia.insertar(cita.inicio, cita.id)
+            self._citas_por_empleado.setdefault(empleado_id, []).append(cita)
+            if cita.estado != "cancelada":
+                self._calendario.agregar(cita)
+            cita.observador = self
+            with self._lock_global:
+                # Se numera en la misma sección que las altas en las listas, que quedan
+                # así ordenadas por alta (la del empleado, por su cerrojo)
+                cita.alta = next(self._altas)
+                self.lista_citas.append(cita)
+                self._indice_citas[cita.id] = cita
+                self._contar_cita(cita.estado, cita, 1)
+                self._agregados.registrar(cita)
+                if cita.estado == "confirmada":
+                    self.recordatorios.programar(cita.id, cita.inicio)
+                if isinstance(cita.cliente, Cliente):
+                    cita.cliente.reservar(cita)
+        self._al_deshacer(lambda: self._quitar_cita(cita))
+        if persistir and self.repositorio is not None:
+            self.repositorio.guardar_cita(cita)
+    
+    def _quitar_cita(self, cita: Cita):
+        """
+        Deshace en memoria lo que hizo _agregar_cita con una cita (método privado).
+        
+        Sirve para revertir un alta cuya operación ha fallado; no escribe nada
+        en el repositorio.
+        
+        Args:
+            cita (Cita): Cita añadida con _agregar_cita y sin cambios desde entonces
+        """
+        with self._bloqueo_empleado(cita.empleado.id):
+            empleado_id = cita.empleado.id
+            if cita.estado in self.ESTADOS_ACTIVOS:
+                self._agenda_empleado(empleado_id).eliminar(cita.inicio, cita.id)
+            self._cronologias[empleado_id].eliminar(cita.inicio, cita.id)
+            self._citas_por_empleado[empleado_id].remove(cita)
+            if cita.estado != "cancelada":
+                self._calendario.quitar(cita)
+            cita.observador = None
+            with self._lock_global:
+                self.lista_citas.remove(cita)
+                del self._indice_citas[cita.id]
+                self._contar_cita(cita.estado, cita, -1)
+                self._agregados.registrar(cita, -1)
+                if cita.estado == "confirmada":
+                    self.recordatorios.anular(cita.id)
+                if isinstance(cita.cliente, Cliente):
+                    cita.cliente.historial.remove(cita)
+    
+    def _cita_cambio_estado(self, cita: Cita, estado_anterior: str):
+        """
+        Mantiene la agenda del empleado al cambiar el estado de una cita (método privado).
+        
+        Se invoca desde Cita cuando el servicio es su observador, de modo que los
+        cambios hechos con Cita.marcar_completada o Empleado.actualizar_estado_cita
+        también se reflejan.
+        
+        Args:
+            cita (Cita): Cita que ha cambiado
+            estado_anterior (str): Estado que tenía antes del cambio
+        
+        Raises:
+            HorarioOcupado: Si la cita vuelve a un estado activo y su hueco ya está ocupado
+                por otra cita o por una ocurrencia de serie (Cita restaura entonces el estado)
+        """
+        estado = cita.estado
+        with self._bloqueo_empleado(cita.empleado.id):
+            # Al reactivarla se comprueba el hueco antes de tocar nada
+            if estado in self.ESTADOS_ACTIVOS and estado_anterior not in self.ESTADOS_ACTIVOS:
+                conflicto = self._conflicto(cita.empleado.id, cita.inicio, cita.fin)
+                if conflicto:
+                    raise HorarioOcupado(cita.empleado, conflicto)
+            if self.repositorio is not None:
+                self.repositorio.guardar_cita(cita)
+            self._actualizar_estado(cita, estado_anterior, estado)
+            self._al_deshacer(lambda: self._revertir_estado(cita, estado_anterior))
+    
+    def _actualizar_estado(self, cita: Cita, estado_anterior: str, estado: str):
+        """
+        Actualiza contadores, recordatorios, calendario y agenda tras un cambio de estado
+        (método privado).
+        
+        Solo toca la memoria. Se llama con el cerrojo del empleado tomado.
+        
+        Args:
+            cita (Cita): Cita que ha cambiado
+            estado_anterior (str): Estado que tenía antes del cambio
+            estado (str): Estado que tiene ahora
+        """
+        with self._lock_global:
+            self._contar_cita(estado_anterior, cita, -1)
+            self._contar_cita(estado, cita, 1)
+            self._agregados.registrar(cita, -1, estado=estado_anterior)
+            self._agregados.registrar(cita, estado=estado)
+            
+            if estado == "confirmada":
+                self.recordatorios.programar(cita.id, cita.inicio)
+            elif estado_anterior == "confirmada":
+                self.recordatorios.anular(cita.id)
+        
+        if estado == "cancelada":
+            self._calendario.quitar(cita)
+        elif estado_anterior == "cancelada":
+            self._calendario.agregar(cita)
+        
+        estaba_activa = estado_anterior in self.ESTADOS_ACTIVOS
+        esta_activa = estado in self.ESTADOS_ACTIVOS
+        if estaba_activa == esta_activa:
+            return
+        agenda = self._agenda_empleado(cita.empleado.id)
+        if esta_activa:
+            agenda.insertar(cita.inicio, cita.fin, cita.id)
+        else:
+            agenda.eliminar(cita.inicio, cita.id)
+    
+    def _revertir_estado(self, cita: Cita, estado_anterior: str):
+        """
+        Devuelve una cita a su estado anterior sin escribir en el repositorio (método privado).
+        
+        Args:
+            cita (Cita): Cita que cambió de estado en la operación que se deshace
+            estado_anterior (str): Estado que tenía antes del cambio
+        """
+        with self._bloqueo_empleado(cita.empleado.id):
+            estado = cita.estado
+            # Sin pasar por el observador: no es un cambio nuevo
+            cita._estado = estado_anterior
+            self._actualizar_estado(cita, estado, estado_anterior)
     
     #  MÉTODOS DE USUARIOS
     def registrar_usuario(self, tipo_usuario: str, nombre: str, email: str, 
@@ -56,28 +751,70 @@ class BookMeService:
         Returns:
             Usuario: Usuario registrado o None si hay error
         """
-        datos_adicionales = datos_adicionales or {}
-        
         try:
-            if tipo_usuario.lower() == "cliente":
-                telefono = datos_adicionales.get("telefono", "")
-                usuario = Cliente(nombre, email, telefono)
-            elif tipo_usuario.lower() == "empleado":
-                especialidad = datos_adicionales.get("especialidad", "General")
-                usuario = Empleado(nombre, email, especialidad)
-            elif tipo_usuario.lower() == "administrador":
-                usuario = Administrador(nombre, email)
-            else:
-                print(f"Tipo de usuario '{tipo_usuario}' no reconocido")
+            usuario = self._construir_usuario(tipo_usuario, nombre, email, datos_adicionales,
+                                              self._nuevo_id("usuario"))
+            if usuario is None:
+                logger.warning("Tipo de usuario '%s' no reconocido", tipo_usuario)
                 return None
             
-            self.lista_usuarios.append(usuario)
-            print(f"✓ Usuario '{nombre}' registrado como {tipo_usuario.lower()}")
+            with self._operacion():
+                self._agregar_usuario(usuario)
+            logger.info("✓ Usuario '%s' registrado como %s", nombre, tipo_usuario.lower())
             return usuario
         except Exception as e:
-            print(f"✗ Error al registrar usuario: {e}")
+            logger.warning("✗ Error al registrar usuario: %s", e)
             return None
     
+    @staticmethod
+    def _construir_usuario(tipo_usuario: str, nombre: str, email: str,
+                           datos_adicionales: Dict = None, usuario_id: str = None
+                           ) -> Optional[Usuario]:
+        """
+        Construye un usuario del tipo indicado (método privado).
+        
+        Args:
+            tipo_usuario (str): Tipo de usuario ("cliente", "empleado", "administrador")
+            nombre (str): Nombre del usuario
+            email (str): Email del usuario
+            datos_adicionales (Dict): Datos adicionales según el tipo de usuario
+            usuario_id (str): ID ya existente; por defecto se genera
+        
+        Returns:
+            Usuario: Usuario construido o None si el tipo no se reconoce
+        """
+        datos_adicionales = datos_adicionales or {}
+        tipo = tipo_usuario.lower()
+        if tipo == "cliente":
+            telefono = datos_adicionales.get("telefono", "")
+            return Cliente(nombre, email, telefono, id=usuario_id)
+        if tipo == "empleado":
+            especialidad = datos_adicionales.get("especialidad", "General")
+            return Empleado(nombre, email, especialidad, id=usuario_id)
+        if tipo == "administrador":
+            return Administrador(nombre, email, id=usuario_id)
+        return None
+    
+    def asignar_horario(self, empleado_id: str, horario: Horario) -> str:
+        """
+        Asigna un horario a un empleado y lo guarda en el repositorio.
+        
+        Args:
+            empleado_id (str): ID del empleado
+            horario (Horario): Horario a asignar
+        
+        Returns:
+            str: Mensaje de confirmación o error
+        """
+        empleado = self._indice_empleados.get(empleado_id)
+        if not empleado:
+            return f"✗ Empleado {empleado_id} no encontrado"
+        if self.repositorio is not None:
+            self.repositorio.guardar_horario(empleado_id, horario)
+        with self._bloqueo_empleado(empleado_id):
+            empleado.horario = horario
+        return f"✓ Horario asignado a {empleado.nombre}: {horario}"
+    
     def obtener_usuario(self, usuario_id: str) -> Optional[Usuario]:
         """
         Obtiene un usuario por su ID.
@@ -88,10 +825,17 @@ class BookMeService:
         Returns:
             Usuario: Usuario encontrado o None
         """
-        for usuario in self.lista_usuarios:
-            if usuario.id == usuario_id:
-                return usuario
-        return None
+        with self._lock_global:
+            return self._indice_usuarios.get(usuario_id)
+    
+    def iterar_usuarios(self) -> Iterator[Usuario]:
+        """
+        Recorre los usuarios registrados en orden de alta.
+        
+        Returns:
+            Iterator[Usuario]: Usuarios
+        """
+        return iter(self.lista_usuarios)
     
     def listar_usuarios(self) -> str:
         """
@@ -100,14 +844,7 @@ class BookMeService:
         Returns:
             str: Lista formateada de usuarios
         """
-        if not self.lista_usuarios:
-            return "No hay usuarios registrados"
-        
-        lista = "\n========== USUARIOS REGISTRADOS ==========\n"
-        for i, usuario in enumerate(self.lista_usuarios, 1):
-            lista += f"{i}. {usuario}\n"
-        lista += "========================================="
-        return lista
+        return presentacion.lista_usuarios(self.iterar_usuarios())
     
     # MÉTODOS DE SERVICIOS
     
@@ -126,13 +863,14 @@ class BookMeService:
             Servicio: Servicio creado o None si hay error
         """
         try:
-            servicio = Servicio(nombre, descripcion, duracion, precio)
-            self.lista_servicios.append(servicio)
-            self.negocio.agregar_servicio(servicio)
-            print(f"✓ Servicio '{nombre}' creado exitosamente")
+            servicio = Servicio(nombre, descripcion, duracion, precio,
+                                id=self._nuevo_id("servicio"))
+            with self._operacion():
+                self._agregar_servicio(servicio)
+            logger.info("✓ Servicio '%s' creado exitosamente", nombre)
             return servicio
         except Exception as e:
-            print(f"✗ Error al crear servicio: {e}")
+            logger.warning("✗ Error al crear servicio: %s", e)
             return None
     
     def obtener_servicio(self, servicio_id: str) -> Optional[Servicio]:
@@ -145,10 +883,8 @@ class BookMeService:
         Returns:
             Servicio: Servicio encontrado o None
         """
-        for servicio in self.lista_servicios:
-            if servicio.id == servicio_id:
-                return servicio
-        return None
+        with self._lock_global:
+            return self._indice_servicios.get(servicio_id)
     
     def listar_servicios(self) -> str:
         """
@@ -169,20 +905,72 @@ class BookMeService:
         Returns:
             str: Mensaje de confirmación o error
         """
-        for servicio in self.lista_servicios:
-            if servicio.id == servicio_id:
+        servicio = self.obtener_servicio(servicio_id)
+        if servicio:
+            if self.repositorio is not None:
+                self.repositorio.eliminar_servicio(servicio_id)
+            with self._lock_global:
+                del self._indice_servicios[servicio_id]
                 self.lista_servicios.remove(servicio)
                 self.negocio.eliminar_servicio(servicio_id)
-                return f"✓ Servicio {servicio_id} eliminado"
+            return f"✓ Servicio {servicio_id} eliminado"
         return f"✗ Servicio {servicio_id} no encontrado"
     
     # MÉTODOS DE CITAS
     
+    def reservar_cita(self, cliente_id: str, empleado_id: str,
+                      servicio_id: str, fecha_hora: str) -> Cita:
+        """
+        Crea y confirma una cita, lanzando una excepción si no es posible.
+        
+        Args:
+            cliente_id (str): ID del cliente
+            empleado_id (str): ID del empleado
+            servicio_id (str): ID del servicio
+            fecha_hora (str): Fecha y hora en formato "YYYY-MM-DD HH:MM"
+        
+        Returns:
+            Cita: Cita creada
+        
+        Raises:
+            NoEncontrado: Si el cliente, el empleado o el servicio no existen
+            HorarioOcupado: Si el empleado ya tiene una cita en ese horario
+            ValueError: Si la fecha no tiene el formato esperado
+        """
+        cliente = self.obtener_usuario(cliente_id)
+        empleado = self.obtener_usuario(empleado_id)
+        servicio = self.obtener_servicio(servicio_id)
+        if not cliente:
+            raise NoEncontrado("Cliente", cliente_id)
+        if not empleado:
+            raise NoEncontrado("Empleado", empleado_id)
+        if not servicio:
+            raise NoEncontrado("Servicio", servicio_id)
+        
+        inicio = fecha_a_minutos(fecha_hora)
+        # Comprobar el hueco y reservarlo sin que otro hilo se cuele en medio
+        with self._bloqueo_empleado(empleado.id):
+            conflicto = self._conflicto(empleado.id, inicio, inicio + servicio.duracion)
+            if conflicto:
+                raise HorarioOcupado(empleado, conflicto)
+            
+            cita = Cita(cliente, empleado, servicio, inicio, id=self._nuevo_id("cita"))
+            cita.confirmar()
+            
+            # Guardar la cita y su notificación en una misma operación
+            with self._operacion():
+                self._agregar_cita(cita)
+                self._crear_notificacion(cliente, (empleado.nombre, servicio.nombre, inicio),
+                                         "confirmacion")
+        return cita
+    
     def crear_cita(self, cliente_id: str, empleado_id: str, 
                    servicio_id: str, fecha_hora: str) -> Optional[Cita]:
         """
         Crea una nueva cita en el sistema.
         
+        Igual que reservar_cita, pero registra el error en el log y devuelve None.
+        
         Args:
             cliente_id (str): ID del cliente
             empleado_id (str): ID del empleado
@@ -193,58 +981,229 @@ class BookMeService:
             Cita: Cita creada o None si hay error
         """
         try:
-            cliente = self.obtener_usuario(cliente_id)
-            empleado = self.obtener_usuario(empleado_id)
-            servicio = self.obtener_servicio(servicio_id)
-            
-            if not cliente:
-                print(f"✗ Cliente {cliente_id} no encontrado")
-                return None
-            if not empleado:
-                print(f"✗ Empleado {empleado_id} no encontrado")
-                return None
-            if not servicio:
-                print(f"✗ Servicio {servicio_id} no encontrado")
-                return None
-            
-            cita = Cita(cliente, empleado, servicio, fecha_hora)
-            cita.confirmar()
-            self.lista_citas.append(cita)
-            
-            # Agregar a historial del cliente
-            if isinstance(cliente, Cliente):
-                cliente.reservar(cita)
-            
-            # Crear notificación
-            mensaje = f"Tu cita con {empleado.nombre} para {servicio.nombre} " \
-                     f"ha sido confirmada el {fecha_hora}"
-            self._crear_notificacion(cliente, mensaje, "confirmacion")
-            
-            print(f"✓ Cita {cita.id} creada y confirmada")
-            return cita
+            cita = self.reservar_cita(cliente_id, empleado_id, servicio_id, fecha_hora)
+        except (NoEncontrado, HorarioOcupado) as e:
+            logger.warning("✗ %s", e)
+            return None
         except Exception as e:
-            print(f"✗ Error al crear cita: {e}")
+            logger.warning("✗ Error al crear cita: %s", e)
             return None
+        logger.info("✓ Cita %s creada y confirmada", cita.id)
+        return cita
     
-    def obtener_cita(self, cita_id: str) -> Optional[Cita]:
+    def reservar_citas_lote(self, reservas: Iterable[Tuple[str, str, str, str]]) -> List[Cita]:
         """
-        Obtiene una cita por su ID.
+        Crea y confirma varias citas a la vez: o se crean todas o ninguna.
+        
+        Todas las reservas se validan antes de tocar nada: los usuarios y
+        servicios se resuelven con una sola consulta a los índices, los
+        solapamientos dentro del propio lote se detectan ordenándolo por
+        empleado e inicio, y los de cada reserva con la agenda existente se
+        comprueban con los cerrojos de todos los empleados afectados tomados
+        (por orden de ID). Después las citas se guardan en una única
+        transacción del repositorio y cada cliente recibe una sola notificación
+        con todas sus citas del lote.
         
         Args:
-            cita_id (str): ID de la cita
+            reservas (Iterable): Tuplas (cliente_id, empleado_id, servicio_id, fecha_hora)
         
         Returns:
-            Cita: Cita encontrada o None
+            List[Cita]: Citas creadas, en el orden de las reservas
+        
+        Raises:
+            NoEncontrado: Si algún cliente, empleado o servicio no existe
+            HorarioOcupado: Si alguna reserva se solapa con una cita existente o del lote
+            ValueError: Si alguna fecha no tiene el formato esperado
         """
-        for cita in self.lista_citas:
-            if cita.id == cita_id:
-                return cita
-        return None
-    
+        reservas = list(reservas)
+        with self._lock_global:
+            usuarios = self._indice_usuarios
+            servicios = self._indice_servicios
+            resueltas = []
+            for cliente_id, empleado_id, servicio_id, fecha_hora in reservas:
+                cliente = usuarios.get(cliente_id)
+                empleado = usuarios.get(empleado_id)
+                servicio = servicios.get(servicio_id)
+                if not cliente:
+                    raise NoEncontrado("Cliente", cliente_id)
+                if not empleado:
+                    raise NoEncontrado("Empleado", empleado_id)
+                if not servicio:
+                    raise NoEncontrado("Servicio", servicio_id)
+                resueltas.append((cliente, empleado, servicio))
+        inicios = [fecha_a_minutos(reserva[3]) for reserva in reservas]
+        
+        # Solapamientos dentro del lote: tras ordenar, basta comparar con la anterior
+        orden = sorted(range(len(reservas)),
+                       key=lambda i: (resueltas[i][1].id, inicios[i]))
+        for anterior, i in zip(orden, orden[1:]):
+            empleado = resueltas[i][1]
+            if (empleado is resueltas[anterior][1]
+                    and inicios[i] < inicios[anterior] + resueltas[anterior][2].duracion):
+                raise HorarioOcupado(empleado, f"nº {anterior + 1} del lote")
+        
+        empleados = sorted({empleado.id for _, empleado, _ in resueltas})
+        with ExitStack() as cerrojos:
+            for empleado_id in empleados:
+                cerrojos.enter_context(self._bloqueo_empleado(empleado_id))
+            for (_, empleado, servicio), inicio in zip(resueltas, inicios):
+                conflicto = self._conflicto(empleado.id, inicio, inicio + servicio.duracion)
+                if conflicto:
+                    raise HorarioOcupado(empleado, conflicto)
+            
+            citas = []
+            for (cliente, empleado, servicio), inicio in zip(resueltas, inicios):
+                cita = Cita(cliente, empleado, servicio, inicio, id=self._nuevo_id("cita"))
+                cita.confirmar()
+                citas.append(cita)
+            por_cliente: Dict[str, List[Cita]] = {}
+            # Todo o nada también en memoria si falla el guardado a mitad del lote
+            with self._operacion():
+                for cita in citas:
+                    self._agregar_cita(cita)
+                    por_cliente.setdefault(cita.cliente.id, []).append(cita)
+                for citas_cliente in por_cliente.values():
+                    datos = tuple((cita.empleado.nombre, cita.servicio.nombre, cita.inicio)
+                                  for cita in citas_cliente)
+                    if len(datos) == 1:
+                        self._crear_notificacion(citas_cliente[0].cliente, datos[0],
+                                                 "confirmacion")
+                    else:
+                        self._crear_notificacion(citas_cliente[0].cliente, datos,
+                                                 "confirmacion_lote")
+        return citas
+    
+    def crear_citas_lote(self, reservas: Iterable[Tuple[str, str, str, str]]
+                         ) -> Optional[List[Cita]]:
+        """
+        Crea varias citas a la vez, todas o ninguna.
+        
+        Igual que reservar_citas_lote, pero registra el error en el log y devuelve None.
+        
+        Args:
+            reservas (Iterable): Tuplas (cliente_id, empleado_id, servicio_id, fecha_hora)
+        
+        Returns:
+            List[Cita]: Citas creadas o None si alguna reserva no es posible
+        """
+        try:
+            citas = self.reservar_citas_lote(reservas)
+        except (NoEncontrado, HorarioOcupado) as e:
+            logger.warning("✗ Lote rechazado: %s", e)
+            return None
+        except Exception as e:
+            logger.warning("✗ Error al crear el lote de citas: %s", e)
+            return None
+        logger.info("✓ Lote de %d citas creado y confirmado", len(citas))
+        return citas
+    
+    def obtener_cita(self, cita_id: str) -> Optional[Cita]:
+        """
+        Obtiene una cita por su ID.
+        
+        Args:
+            cita_id (str): ID de la cita
+        
+        Returns:
+            Cita: Cita encontrada o None
+        """
+        with self._lock_global:
+            return self._indice_citas.get(cita_id)
+    
+    def reprogramar_cita(self, cita_id: str, nueva_fecha_hora: str) -> Cita:
+        """
+        Cambia la fecha y hora de una cita confirmada, lanzando una excepción si no es posible.
+        
+        Args:
+            cita_id (str): ID de la cita
+            nueva_fecha_hora (str): Nueva fecha y hora
+        
+        Returns:
+            Cita: Cita modificada
+        
+        Raises:
+            NoEncontrado: Si la cita no existe
+            OperacionNoValida: Si la cita no está confirmada
+            HorarioOcupado: Si el empleado ya tiene otra cita en el nuevo horario
+            ValueError: Si la fecha no tiene el formato esperado
+        """
+        cita = self.obtener_cita(cita_id)
+        if not cita:
+            raise NoEncontrado("Cita", cita_id)
+        
+        with self._bloqueo_empleado(cita.empleado.id):
+            if cita.estado != "confirmada":
+                raise OperacionNoValida(f"La cita {cita_id} no está confirmada")
+            nuevo_inicio = fecha_a_minutos(nueva_fecha_hora)
+            
+            # La propia cita no cuenta como conflicto: se aparta mientras se comprueba
+            agenda = self._agenda_empleado(cita.empleado.id)
+            agenda.eliminar(cita.inicio, cita.id)
+            # Se conserva la duración propia de la cita, que puede no ser la actual del servicio
+            nuevo_fin = nuevo_inicio + (cita.fin - cita.inicio)
+            conflicto = self._conflicto(cita.empleado.id, nuevo_inicio, nuevo_fin)
+            agenda.insertar(cita.inicio, cita.fin, cita.id)
+            if conflicto:
+                raise HorarioOcupado(cita.empleado, conflicto)
+            
+            with self._operacion():
+                self._mover_cita(cita, nuevo_inicio, nuevo_fin)
+                if self.repositorio is not None:
+                    self.repositorio.guardar_cita(cita)
+                self._crear_notificacion(cita.cliente, (cita.inicio,), "modificacion")
+        return cita
+    
+    def _mover_cita(self, cita: Cita, inicio: int, fin: int):
+        """
+        Cambia el horario de una cita en memoria (método privado).
+        
+        Actualiza agenda, cronología, calendario, agregados y recordatorio, y
+        registra cómo deshacerlo. Debe llamarse con el cerrojo del empleado tomado.
+        
+        Args:
+            cita (Cita): Cita a mover
+            inicio (int): Nuevo inicio en minutos
+            fin (int): Nuevo fin en minutos
+        """
+        empleado_id = cita.empleado.id
+        inicio_anterior, fin_anterior = cita.inicio, cita.fin
+        activa = cita.estado in self.ESTADOS_ACTIVOS
+        en_calendario = cita.estado != "cancelada"
+        agenda = self._agenda_empleado(empleado_id)
+        cronologia = self._cronologias[empleado_id]
+        if activa:
+            agenda.eliminar(inicio_anterior, cita.id)
+        cronologia.eliminar(inicio_anterior, cita.id)
+        if en_calendario:
+            self._calendario.quitar(cita)
+        with self._lock_global:
+            # Los agregados se restan con el horario anterior antes de cambiarlo
+            self._agregados.registrar(cita, -1)
+            cita._reprogramar(inicio, fin)
+            self._agregados.registrar(cita)
+            recordatorio_pendiente = cita.id in self.recordatorios
+            if cita.estado == "confirmada":
+                self.recordatorios.programar(cita.id, inicio)
+        if activa:
+            agenda.insertar(inicio, fin, cita.id)
+        cronologia.insertar(inicio, cita.id)
+        if en_calendario:
+            self._calendario.agregar(cita)
+        
+        def deshacer():
+            self._mover_cita(cita, inicio_anterior, fin_anterior)
+            if not recordatorio_pendiente:
+                # El recordatorio ya se había enviado: no se vuelve a programar
+                with self._lock_global:
+                    self.recordatorios.anular(cita.id)
+        self._al_deshacer(deshacer)
+    
     def modificar_cita(self, cita_id: str, nueva_fecha_hora: str) -> Optional[Cita]:
         """
         Modifica la fecha y hora de una cita.
         
+        Igual que reprogramar_cita, pero registra el error en el log y devuelve None.
+        
         Args:
             cita_id (str): ID de la cita
             nueva_fecha_hora (str): Nueva fecha y hora
@@ -252,19 +1211,65 @@ class BookMeService:
         Returns:
             Cita: Cita modificada o None si hay error
         """
+        try:
+            cita = self.reprogramar_cita(cita_id, nueva_fecha_hora)
+        except HorarioOcupado as e:
+            logger.warning("✗ %s", e)
+            return None
+        except (NoEncontrado, OperacionNoValida):
+            logger.warning("✗ No se puede modificar la cita %s", cita_id)
+            return None
+        except ValueError as e:
+            logger.warning("✗ No se puede modificar la cita %s: %s", cita_id, e)
+            return None
+        logger.info("✓ Cita %s modificada a %s", cita_id, nueva_fecha_hora)
+        return cita
+    
+    def _anular(self, cita_id: str, razon: str) -> Tuple[Cita, str]:
+        """
+        Cancela una cita y notifica al cliente (método privado).
+        
+        Args:
+            cita_id (str): ID de la cita
+            razon (str): Razón de la cancelación
+        
+        Returns:
+            Tuple[Cita, str]: Cita cancelada y mensaje de confirmación
+        
+        Raises:
+            NoEncontrado: Si la cita no existe
+            OperacionNoValida: Si la cita ya estaba cancelada o completada
+        """
         cita = self.obtener_cita(cita_id)
-        if cita and cita.estado == "confirmada":
-            cita.fecha_hora_inicio = nueva_fecha_hora
-            cita.fecha_hora_fin = cita._calcular_hora_fin()
-            
-            mensaje = f"Tu cita ha sido modificada a {nueva_fecha_hora}"
-            self._crear_notificacion(cita.cliente, mensaje, "modificacion")
-            
-            print(f"✓ Cita {cita_id} modificada a {nueva_fecha_hora}")
-            return cita
+        if not cita:
+            raise NoEncontrado("Cita", cita_id)
         
-        print(f"✗ No se puede modificar la cita {cita_id}")
-        return None
+        with self._bloqueo_empleado(cita.empleado.id):
+            # Validar antes de abrir la transacción: un fallo no debe deshacer nada
+            if cita.estado in ("cancelada", "completada"):
+                raise OperacionNoValida(
+                    f"No se puede cancelar una cita con estado {cita.estado}")
+            with self._operacion():
+                resultado = cita.cancelar(razon)
+                self._crear_notificacion(cita.cliente, (razon,), "cancelacion")
+        return cita, resultado
+    
+    def anular_cita(self, cita_id: str, razon: str = "") -> Cita:
+        """
+        Cancela una cita, lanzando una excepción si no es posible.
+        
+        Args:
+            cita_id (str): ID de la cita
+            razon (str): Razón de la cancelación
+        
+        Returns:
+            Cita: Cita cancelada
+        
+        Raises:
+            NoEncontrado: Si la cita no existe
+            OperacionNoValida: Si la cita ya estaba cancelada o completada
+        """
+        return self._anular(cita_id, razon)[0]
     
     def cancelar_cita(self, cita_id: str, razon: str = "") -> str:
         """
@@ -274,21 +1279,55 @@ class BookMeService:
             cita_id (str): ID de la cita a cancelar
             razon (str): Razón de la cancelación
         
+        Returns:
+            str: Mensaje de confirmación o error
+        """
+        try:
+            _, resultado = self._anular(cita_id, razon)
+        except (NoEncontrado, OperacionNoValida) as e:
+            logger.warning("✗ %s", e)
+            return str(e)
+        logger.info("✓ %s", resultado)
+        return resultado
+    
+    def completar_cita(self, cita_id: str) -> str:
+        """
+        Marca una cita como completada, liberando su hueco en la agenda.
+        
+        Args:
+            cita_id (str): ID de la cita
+        
         Returns:
             str: Mensaje de confirmación o error
         """
         cita = self.obtener_cita(cita_id)
-        if cita:
-            resultado = cita.cancelar(razon)
-            
-            mensaje = f"Tu cita ha sido cancelada. Razón: {razon}"
-            self._crear_notificacion(cita.cliente, mensaje, "cancelacion")
-            
-            print(f"✓ {resultado}")
-            return resultado
+        if not cita:
+            return f"Cita {cita_id} no encontrada"
+        with self._bloqueo_empleado(cita.empleado.id):
+            return cita.marcar_completada()
+    
+    def iterar_citas_cliente(self, cliente_id: str) -> Iterator[Cita]:
+        """
+        Recorre las citas de un cliente en orden de creación.
+        
+        Args:
+            cliente_id (str): ID del cliente
+        
+        Returns:
+            Iterator[Cita]: Citas del cliente
+        
+        Raises:
+            NoEncontrado: Si el cliente no existe
+        """
+        cliente = self.obtener_usuario(cliente_id)
+        if not cliente or not isinstance(cliente, Cliente):
+            raise NoEncontrado("Cliente", cliente_id)
         
-        print(f"✗ Cita {cita_id} no encontrada")
-        return f"Cita {cita_id} no encontrada"
+        if self.repositorio is not None:
+            return (self._indice_citas[cita_id]
+                    for cita_id in self.repositorio.ids_citas_cliente(cliente_id)
+                    if cita_id in self._indice_citas)
+        return iter(cliente.consultar_historial())
     
     def listar_citas_cliente(self, cliente_id: str) -> str:
         """
@@ -300,19 +1339,35 @@ class BookMeService:
         Returns:
             str: Lista formateada de citas
         """
-        cliente = self.obtener_usuario(cliente_id)
-        if not cliente or not isinstance(cliente, Cliente):
-            return f"Cliente {cliente_id} no encontrado"
+        try:
+            citas = self.iterar_citas_cliente(cliente_id)
+        except NoEncontrado as e:
+            return str(e)
+        return presentacion.lista_citas_cliente(self._indice_usuarios[cliente_id], citas)
+    
+    def iterar_citas(self, orden: str = "id", estado: str = None, empleado_id: str = None,
+                     cliente_id: str = None, desde: Union[str, int] = None,
+                     hasta: Union[str, int] = None, cursor: str = None) -> Iterator[Cita]:
+        """
+        Recorre las citas, opcionalmente filtradas, sin construir listas intermedias.
         
-        citas = cliente.consultar_historial()
-        if not citas:
-            return f"El cliente no tiene citas reservadas"
+        Sin argumentos recorre todas las citas en orden de creación. Los filtros
+        se combinan entre sí (ver _recorrer_citas).
         
-        lista = f"\n========== CITAS DE {cliente.nombre.upper()} ==========\n"
-        for i, cita in enumerate(citas, 1):
-            lista += f"{i}. {cita}\n"
-        lista += "=========================================="
-        return lista
+        Args:
+            orden (str): "id" (orden de creación) o "inicio" (fecha de la cita)
+            estado (str): Solo citas en este estado
+            empleado_id (str): Solo citas de este empleado
+            cliente_id (str): Solo citas de este cliente
+            desde: Solo citas que empiezan en o después de este instante ("YYYY-MM-DD[ HH:MM]")
+            hasta: Solo citas que empiezan antes de este instante
+            cursor (str): Continuar tras el cursor devuelto por pagina_citas
+        
+        Returns:
+            Iterator[Cita]: Citas
+        """
+        return (cita for _, cita in self._recorrer_citas(orden, estado, empleado_id,
+                                                         cliente_id, desde, hasta, cursor))
     
     def listar_todas_citas(self) -> str:
         """
@@ -321,118 +1376,1658 @@ class BookMeService:
         Returns:
             str: Lista formateada de citas
         """
-        if not self.lista_citas:
-            return "No hay citas registradas"
+        return presentacion.lista_citas(self.iterar_citas())
+    
+    # MÉTODOS DE SERIES
+    
+    def reservar_serie(self, cliente_id: str, empleado_id: str, servicio_id: str,
+                       fecha_hora: str, regla: Union[str, ReglaRecurrencia]) -> SerieCitas:
+        """
+        Crea una serie de citas periódicas confirmadas, lanzando una excepción si no es posible.
+        
+        Se comprueba que ninguna ocurrencia se solape con las citas activas ni
+        con otras series del empleado, pero no se crea ninguna Cita: las
+        ocurrencias se calculan a partir de la regla cuando se consultan.
+        
+        Args:
+            cliente_id (str): ID del cliente
+            empleado_id (str): ID del empleado
+            servicio_id (str): ID del servicio
+            fecha_hora (str): Primera ocurrencia "YYYY-MM-DD HH:MM"
+            regla: ReglaRecurrencia o texto RRULE, p. ej. "FREQ=WEEKLY;INTERVAL=4;COUNT=13"
+        
+        Returns:
+            SerieCitas: Serie creada
+        
+        Raises:
+            NoEncontrado: Si el cliente, el empleado o el servicio no existen
+            HorarioOcupado: Si alguna ocurrencia se solapa con otra cita u ocurrencia
+            ValueError: Si la fecha o la regla no son válidas
+        """
+        cliente = self.obtener_usuario(cliente_id)
+        empleado = self.obtener_usuario(empleado_id)
+        servicio = self.obtener_servicio(servicio_id)
+        if not cliente:
+            raise NoEncontrado("Cliente", cliente_id)
+        if not empleado:
+            raise NoEncontrado("Empleado", empleado_id)
+        if not servicio:
+            raise NoEncontrado("Servicio", servicio_id)
+        if isinstance(regla, str):
+            regla = ReglaRecurrencia.desde_rrule(regla)
         
-        lista = "\n========== TODAS LAS CITAS ==========\n"
-        for i, cita in enumerate(self.lista_citas, 1):
-            lista += f"{i}. {cita}\n"
-        lista += "===================================="
-        return lista
+        with self._bloqueo_empleado(empleado.id):
+            serie = SerieCitas(cliente, empleado, servicio, fecha_hora, regla,
+                               id=self._nuevo_id("serie"))
+            for ocurrencia in serie.ocurrencias():
+                conflicto = self._conflicto(empleado.id, ocurrencia.inicio, ocurrencia.fin)
+                if conflicto:
+                    raise HorarioOcupado(empleado, conflicto)
+            
+            with self._operacion():
+                self._agregar_serie(serie)
+                self._guardar_serie(serie)
+                self._crear_notificacion(cliente, (empleado.nombre, servicio.nombre,
+                                                   serie.inicio, str(regla)),
+                                         "confirmacion_serie")
+        return serie
     
-    # MÉTODOS DE NOTIFICACIONES
+    def crear_serie(self, cliente_id: str, empleado_id: str, servicio_id: str,
+                    fecha_hora: str, regla: Union[str, ReglaRecurrencia]) -> Optional[SerieCitas]:
+        """
+        Crea una serie de citas periódicas.
+        
+        Igual que reservar_serie, pero registra el error en el log y devuelve None.
+        
+        Args:
+            cliente_id (str): ID del cliente
+            empleado_id (str): ID del empleado
+            servicio_id (str): ID del servicio
+            fecha_hora (str): Primera ocurrencia "YYYY-MM-DD HH:MM"
+            regla: ReglaRecurrencia o texto RRULE
+        
+        Returns:
+            SerieCitas: Serie creada o None si hay error
+        """
+        try:
+            serie = self.reservar_serie(cliente_id, empleado_id, servicio_id, fecha_hora, regla)
+        except (NoEncontrado, HorarioOcupado) as e:
+            logger.warning("✗ %s", e)
+            return None
+        except Exception as e:
+            logger.warning("✗ Error al crear la serie: %s", e)
+            return None
+        logger.info("✓ Serie %s creada y confirmada (%s)", serie.id, serie.regla)
+        return serie
     
-    def _crear_notificacion(self, destinatario: Usuario, mensaje: str, tipo: str) -> Notificacion:
+    def obtener_serie(self, serie_id: str) -> Optional[SerieCitas]:
         """
-        Crea una notificación en el sistema (método privado).
+        Obtiene una serie de citas periódicas por su ID.
         
         Args:
-            destinatario: Usuario destinatario
-            mensaje (str): Contenido del mensaje
-            tipo (str): Tipo de notificación
+            serie_id (str): ID de la serie
         
         Returns:
-            Notificacion: Notificación creada
+            SerieCitas: Serie encontrada o None
         """
-        notificacion = Notificacion(destinatario, mensaje, tipo)
-        self.lista_notificaciones.append(notificacion)
-        return notificacion
+        with self._lock_global:
+            return self._indice_series.get(serie_id)
     
-    def enviar_recordatorio(self, cita_id: str) -> str:
+    def _agregar_serie(self, serie: SerieCitas):
         """
-        Envía un recordatorio automático para una cita.
+        Añade una serie al calendario, al índice y a los recordatorios (método privado).
+        
+        Debe llamarse con el cerrojo del empleado de la serie tomado.
         
         Args:
-            cita_id (str): ID de la cita
+            serie (SerieCitas): Serie a añadir
+        """
+        self._calendario.agregar_serie(serie)
+        with self._lock_global:
+            self._indice_series[serie.id] = serie
+            self.recordatorios.programar(serie.id, serie.inicio)
+        self._al_deshacer(lambda: self._quitar_serie(serie))
+    
+    def _quitar_serie(self, serie: SerieCitas):
+        """
+        Deshace en memoria lo que hizo _agregar_serie con una serie (método privado).
+        
+        Args:
+            serie (SerieCitas): Serie añadida con _agregar_serie
+        """
+        with self._bloqueo_empleado(serie.empleado.id):
+            self._calendario.quitar_serie(serie)
+            with self._lock_global:
+                del self._indice_series[serie.id]
+                self.recordatorios.anular(serie.id)
+    
+    def _excluir_ocurrencia(self, serie: SerieCitas, inicio: int, cita_id: str = None):
+        """
+        Marca una ocurrencia vigente como excepción y registra cómo deshacerlo (método privado).
+        
+        Debe llamarse con el cerrojo del empleado de la serie tomado.
+        
+        Args:
+            serie (SerieCitas): Serie de la ocurrencia
+            inicio (int): Inicio original de la ocurrencia
+            cita_id (str): Cita que la sustituye (None si se cancela sin más)
+        """
+        serie.excluir(inicio, cita_id)
+        self._al_deshacer(lambda: serie.excepciones.pop(inicio, None))
+    
+    def _terminar_serie(self, serie: SerieCitas, desde: int) -> int:
+        """
+        Elimina las ocurrencias desde `desde` y registra cómo deshacerlo (método privado).
+        
+        Debe llamarse con el cerrojo del empleado de la serie tomado.
+        
+        Args:
+            serie (SerieCitas): Serie a recortar
+            desde (int): Primer minuto que ya no forma parte de la serie
         
         Returns:
-            str: Mensaje de confirmación o error
+            int: Número de ocurrencias vigentes eliminadas
         """
-        cita = self.obtener_cita(cita_id)
-        if not cita:
-            return f"Cita {cita_id} no encontrada"
+        # terminar() sustituye el diccionario de excepciones, así que basta guardar el actual
+        repeticiones, excepciones = serie.repeticiones, serie.excepciones
+        canceladas = serie.terminar(desde)
         
-        mensaje = (f"Recordatorio: Tienes una cita mañana con {cita.empleado.nombre} "
-                  f"para {cita.servicio.nombre} a las {cita.fecha_hora_inicio}")
-        notificacion = self._crear_notificacion(cita.cliente, mensaje, "recordatorio")
+        def deshacer():
+            serie.repeticiones, serie.excepciones = repeticiones, excepciones
+        self._al_deshacer(deshacer)
+        return canceladas
+    
+    def _guardar_serie(self, serie: SerieCitas):
+        """
+        Escribe una serie en el repositorio, si lo hay (método privado).
         
-        return notificacion.enviar()
+        Debe llamarse con el cerrojo del empleado de la serie tomado.
+        
+        Args:
+            serie (SerieCitas): Serie a guardar
+        """
+        if self.repositorio is not None:
+            self.repositorio.guardar_serie(serie)
     
-    def listar_notificaciones(self, usuario_id: str) -> str:
+    @staticmethod
+    def _inicio_ocurrencia(serie: SerieCitas, fecha_hora: str) -> int:
         """
-        Lista las notificaciones de un usuario.
+        Comprueba que una ocurrencia no se ha cancelado ni materializado (método privado).
+        
+        Debe llamarse con el cerrojo del empleado de la serie tomado.
         
         Args:
-            usuario_id (str): ID del usuario
+            serie (SerieCitas): Serie de la ocurrencia
+            fecha_hora (str): Inicio original de la ocurrencia "YYYY-MM-DD HH:MM"
         
         Returns:
-            str: Lista formateada de notificaciones
+            int: Inicio de la ocurrencia en minutos
+        
+        Raises:
+            OperacionNoValida: Si la serie no tiene una ocurrencia vigente en esa fecha
         """
-        usuario = self.obtener_usuario(usuario_id)
-        if not usuario:
-            return f"Usuario {usuario_id} no encontrado"
+        inicio = fecha_a_minutos(fecha_hora)
+        if not serie.es_ocurrencia(inicio):
+            raise OperacionNoValida(f"La serie {serie.id} no tiene ninguna ocurrencia "
+                                    f"vigente el {fecha_hora}")
+        return inicio
+    
+    def _sustituir_ocurrencia(self, serie: SerieCitas, inicio: int, nuevo_inicio: int,
+                              notificar: bool = False) -> Cita:
+        """
+        Convierte una ocurrencia en una Cita confirmada en `nuevo_inicio` (método privado).
+        
+        Debe llamarse con el cerrojo del empleado de la serie tomado. La
+        ocurrencia se marca como excepción antes de comprobar el hueco, así que
+        la cita puede solaparse con el horario que deja libre. El hueco se
+        comprueba antes de abrir la operación; solo el alta de la cita va en ella.
+        
+        Args:
+            serie (SerieCitas): Serie de la ocurrencia
+            inicio (int): Inicio original de la ocurrencia
+            nuevo_inicio (int): Inicio de la cita
+            notificar (bool): Si se notifica al cliente el cambio de horario
+        
+        Returns:
+            Cita: Cita creada y guardada
+        
+        Raises:
+            HorarioOcupado: Si el nuevo horario se solapa con otra cita u ocurrencia
+        """
+        serie.excluir(inicio)
+        conflicto = self._conflicto(serie.empleado.id, nuevo_inicio,
+                                    nuevo_inicio + serie.duracion)
+        del serie.excepciones[inicio]
+        if conflicto:
+            raise HorarioOcupado(serie.empleado, conflicto)
+        cita = Cita(serie.cliente, serie.empleado, serie.servicio, nuevo_inicio,
+                    id=self._nuevo_id("cita"))
+        cita.confirmar()
+        with self._operacion():
+            self._excluir_ocurrencia(serie, inicio, cita.id)
+            self._agregar_cita(cita)
+            self._guardar_serie(serie)
+            if notificar:
+                self._crear_notificacion(cita.cliente, (cita.inicio,), "modificacion")
+        return cita
+    
+    def materializar_ocurrencia(self, serie_id: str, fecha_hora: str) -> Cita:
+        """
+        Convierte una ocurrencia de una serie en una Cita confirmada en el mismo horario.
+        
+        Hace falta para operar sobre la ocurrencia como cita (completarla,
+        cancelarla con anular_cita...). No se notifica al cliente.
         
-        notificaciones_usuario = [n for n in self.lista_notificaciones 
-                                  if n.destinatario.id == usuario_id]
+        Args:
+            serie_id (str): ID de la serie
+            fecha_hora (str): Inicio de la ocurrencia "YYYY-MM-DD HH:MM"
         
-        if not notificaciones_usuario:
-            return f"{usuario.nombre} no tiene notificaciones"
+        Returns:
+            Cita: Cita que sustituye a la ocurrencia
         
-        lista = f"\n========== NOTIFICACIONES DE {usuario.nombre.upper()} ==========\n"
-        for i, notif in enumerate(notificaciones_usuario, 1):
-            lista += f"{i}. {notif}\n"
-        lista += "=================================================="
-        return lista
+        Raises:
+            NoEncontrado: Si la serie no existe
+            OperacionNoValida: Si la serie no tiene una ocurrencia vigente en esa fecha
+        """
+        serie = self.obtener_serie(serie_id)
+        if serie is None:
+            raise NoEncontrado("Serie", serie_id)
+        with self._bloqueo_empleado(serie.empleado.id):
+            inicio = self._inicio_ocurrencia(serie, fecha_hora)
+            return self._sustituir_ocurrencia(serie, inicio, inicio)
     
-    # MÉTODOS DE ESTADÍSTICAS
-    def obtener_estadisticas(self) -> str:
+    def mover_ocurrencia(self, serie_id: str, fecha_hora: str, nueva_fecha_hora: str) -> Cita:
         """
-        Obtiene un resumen de estadísticas del negocio.
+        Cambia el horario de una sola ocurrencia de una serie.
+        
+        La ocurrencia pasa a ser una Cita confirmada en el nuevo horario; el
+        resto de la serie no cambia.
+        
+        Args:
+            serie_id (str): ID de la serie
+            fecha_hora (str): Inicio original de la ocurrencia "YYYY-MM-DD HH:MM"
+            nueva_fecha_hora (str): Nuevo inicio "YYYY-MM-DD HH:MM"
         
         Returns:
-            str: Estadísticas formateadas
+            Cita: Cita que sustituye a la ocurrencia
+        
+        Raises:
+            NoEncontrado: Si la serie no existe
+            OperacionNoValida: Si la serie no tiene una ocurrencia vigente en esa fecha
+            HorarioOcupado: Si el nuevo horario se solapa con otra cita u ocurrencia
+            ValueError: Si alguna fecha no tiene el formato esperado
+        """
+        serie = self.obtener_serie(serie_id)
+        if serie is None:
+            raise NoEncontrado("Serie", serie_id)
+        nuevo_inicio = fecha_a_minutos(nueva_fecha_hora)
+        with self._bloqueo_empleado(serie.empleado.id):
+            inicio = self._inicio_ocurrencia(serie, fecha_hora)
+            return self._sustituir_ocurrencia(serie, inicio, nuevo_inicio, notificar=True)
+    
+    def cancelar_ocurrencia(self, serie_id: str, fecha_hora: str, razon: str = ""):
+        """
+        Cancela una sola ocurrencia de una serie y notifica al cliente.
+        
+        Args:
+            serie_id (str): ID de la serie
+            fecha_hora (str): Inicio de la ocurrencia "YYYY-MM-DD HH:MM"
+            razon (str): Razón de la cancelación
+        
+        Raises:
+            NoEncontrado: Si la serie no existe
+            OperacionNoValida: Si la serie no tiene una ocurrencia vigente en esa fecha
         """
-        total_clientes = len([u for u in self.lista_usuarios if isinstance(u, Cliente)])
-        total_empleados = len([u for u in self.lista_usuarios if isinstance(u, Empleado)])
-        total_citas = len(self.lista_citas)
-        citas_confirmadas = len([c for c in self.lista_citas if c.estado == "confirmada"])
-        ingresos_totales = sum([c.servicio.precio for c in self.lista_citas 
-                               if c.estado == "confirmada"])
+        serie = self.obtener_serie(serie_id)
+        if serie is None:
+            raise NoEncontrado("Serie", serie_id)
+        with self._bloqueo_empleado(serie.empleado.id):
+            inicio = self._inicio_ocurrencia(serie, fecha_hora)
+            with self._operacion():
+                self._excluir_ocurrencia(serie, inicio)
+                self._guardar_serie(serie)
+                self._crear_notificacion(serie.cliente, (razon,), "cancelacion")
+    
+    def cancelar_serie(self, serie_id: str, desde: str = None, razon: str = "") -> int:
+        """
+        Cancela las ocurrencias de una serie a partir de una fecha y notifica al cliente.
         
-        stats = f"""
-        ========== ESTADÍSTICAS DEL NEGOCIO ==========
-        Negocio: {self.negocio.nombre}
-        Total de usuarios: {len(self.lista_usuarios)}
-        - Clientes: {total_clientes}
-        - Empleados: {total_empleados}
-        - Administradores: {len([u for u in self.lista_usuarios if isinstance(u, Administrador)])}
+        Las ocurrencias ya convertidas en Cita no se tocan: se cancelan como
+        cualquier otra cita.
+        
+        Args:
+            serie_id (str): ID de la serie
+            desde (str): Fecha y hora desde la que se cancela (por defecto, la serie entera)
+            razon (str): Razón de la cancelación
         
-        Total de servicios: {len(self.lista_servicios)}
-        Total de citas: {total_citas}
-        - Confirmadas: {citas_confirmadas}
-        - Canceladas: {len([c for c in self.lista_citas if c.estado == 'cancelada'])}
-        - Completadas: {len([c for c in self.lista_citas if c.estado == 'completada'])}
+        Returns:
+            int: Número de ocurrencias canceladas
         
-        Ingresos totales: {ingresos_totales}€
-        =============================================
+        Raises:
+            NoEncontrado: Si la serie no existe
+            ValueError: Si la fecha no tiene el formato esperado
         """
-        return stats
+        serie = self.obtener_serie(serie_id)
+        if serie is None:
+            raise NoEncontrado("Serie", serie_id)
+        corte = serie.inicio if desde is None else instante_a_minutos(desde)
+        with self._bloqueo_empleado(serie.empleado.id), self._operacion():
+            canceladas = self._terminar_serie(serie, corte)
+            if canceladas:
+                self._guardar_serie(serie)
+                self._crear_notificacion(serie.cliente, (razon,), "cancelacion")
+        return canceladas
     
-    def obtener_informacion_negocio(self) -> str:
+    # MÉTODOS DE LISTADO POR PÁGINAS
+    
+    @staticmethod
+    def _paginar(recorrido: Iterator[Tuple[str, object]], limite: int
+                 ) -> Tuple[List, Optional[str]]:
         """
-        Obtiene la información del negocio.
+        Toma una página de un recorrido de pares (cursor, elemento) (método privado).
+        
+        Args:
+            recorrido (Iterator): Pares (cursor tras el elemento, elemento)
+            limite (int): Tamaño máximo de la página
         
         Returns:
-            str: Información formateada
+            Tuple[List, str]: Elementos y cursor de la página siguiente (None si no hay más)
         """
-        return self.negocio.obtener_informacion()
+        elementos = []
+        cursor = None
+        for siguiente, elemento in recorrido:
+            if len(elementos) == limite:
+                return elementos, cursor
+            elementos.append(elemento)
+            cursor = siguiente
+        return elementos, None
+    
+    @staticmethod
+    def _desde_alta(fuente: List, cursor: Optional[str]) -> Iterator:
+        """
+        Recorre una lista ordenada por alta a partir de un cursor (método privado).
+        
+        Args:
+            fuente (List): Usuarios o citas en orden de alta
+            cursor (str): Número de alta del último elemento ya devuelto, o None
+        
+        Yields:
+            Usuarios o citas con alta posterior al cursor
+        """
+        posicion = bisect_right(fuente, int(cursor), key=attrgetter("alta")) if cursor else 0
+        while posicion < len(fuente):
+            yield fuente[posicion]
+            posicion += 1
+    
+    def _recorrer_citas(self, orden: str, estado: Optional[str], empleado_id: Optional[str],
+                        cliente_id: Optional[str], desde, hasta,
+                        cursor: Optional[str]) -> Iterator[Tuple[str, Cita]]:
+        """
+        Recorre las citas filtradas junto con el cursor de cada una (método privado).
+        
+        En orden "id" se recorre el historial del cliente, la lista de citas del
+        empleado o la lista global, según el filtro más selectivo, y el cursor es
+        el número de alta de la última cita: como las listas están ordenadas por
+        alta, se continúa por búsqueda binaria y el cursor sigue valiendo aunque
+        entretanto se quiten citas (al deshacer una operación o al archivar).
+        En orden "inicio" se recorren los índices
+        cronológicos (mezclando los de todos los empleados si no se filtra por
+        uno), empezando por búsqueda binaria en `desde` o en el cursor
+        "inicio:id". El rango de fechas acota el recorrido en orden "inicio";
+        estado y cliente (y las fechas en orden "id") se comprueban cita a cita.
+        
+        Args:
+            orden (str): "id" o "inicio"
+            estado (str): Estado exigido o None
+            empleado_id (str): Empleado exigido o None
+            cliente_id (str): Cliente exigido o None
+            desde: Límite inferior de inicio (incluido) o None
+            hasta: Límite superior de inicio (excluido) o None
+            cursor (str): Cursor de continuación o None
+        
+        Yields:
+            Tuple[str, Cita]: Cursor tras la cita y la cita
+        
+        Raises:
+            ValueError: Si el orden o el estado no son válidos
+        """
+        if orden not in ("id", "inicio"):
+            raise ValueError(f"Orden '{orden}' no válido (use 'id' o 'inicio')")
+        if estado is not None and estado not in self.ESTADOS_CITA:
+            raise ValueError(f"Estado '{estado}' no válido")
+        desde = None if desde is None else instante_a_minutos(desde)
+        hasta = None if hasta is None else instante_a_minutos(hasta)
+        
+        def cumple(cita: Cita) -> bool:
+            return ((estado is None or cita.estado == estado)
+                    and (empleado_id is None or cita.empleado.id == empleado_id)
+                    and (cliente_id is None or cita.cliente.id == cliente_id)
+                    and (desde is None or cita.inicio >= desde)
+                    and (hasta is None or cita.inicio < hasta))
+        
+        if orden == "id":
+            if cliente_id is not None:
+                cliente = self._indice_usuarios.get(cliente_id)
+                fuente = cliente.consultar_historial() if isinstance(cliente, Cliente) else []
+            elif empleado_id is not None:
+                fuente = self._citas_por_empleado.get(empleado_id, [])
+            else:
+                fuente = self.lista_citas
+            for cita in self._desde_alta(fuente, cursor):
+                if cumple(cita):
+                    yield str(cita.alta), cita
+            return
+        
+        if cursor:
+            inicio, _, cita_id = cursor.partition(":")
+            inicio = int(inicio)
+        else:
+            inicio, cita_id = desde, ""
+        if empleado_id is not None:
+            cronologias = [self._cronologias.get(empleado_id, IndiceCronologico())]
+        else:
+            with self._lock_global:
+                cronologias = list(self._cronologias.values())
+        for inicio, cita_id in heapq.merge(*(c.desde(inicio, cita_id) for c in cronologias)):
+            if hasta is not None and inicio >= hasta:
+                return
+            cita = self._indice_citas.get(cita_id)
+            if cita is not None and cumple(cita):
+                yield f"{inicio}:{cita_id}", cita
+    
+    def pagina_citas(self, limite: int = 50, cursor: str = None, orden: str = "id",
+                     estado: str = None, empleado_id: str = None, cliente_id: str = None,
+                     desde: Union[str, int] = None,
+                     hasta: Union[str, int] = None) -> Tuple[List[Cita], Optional[str]]:
+        """
+        Obtiene una página de citas con paginación por cursor.
+        
+        El orden es estable: por creación ("id") o por (inicio, id) ("inicio").
+        Para la página siguiente se repite la llamada con los mismos filtros y el
+        cursor devuelto. El coste depende del tamaño de la página y de cuántas
+        citas descarten los filtros no indexados, no del total de citas.
+        
+        Args:
+            limite (int): Tamaño máximo de la página
+            cursor (str): Cursor devuelto por la página anterior (None = primera página)
+            orden (str): "id" o "inicio"
+            estado (str): Solo citas en este estado
+            empleado_id (str): Solo citas de este empleado
+            cliente_id (str): Solo citas de este cliente
+            desde: Solo citas que empiezan en o después de este instante
+            hasta: Solo citas que empiezan antes de este instante
+        
+        Returns:
+            Tuple[List[Cita], str]: Citas y cursor de la página siguiente (None si no hay más)
+        """
+        return self._paginar(self._recorrer_citas(orden, estado, empleado_id, cliente_id,
+                                                  desde, hasta, cursor), limite)
+    
+    def pagina_usuarios(self, limite: int = 50, cursor: str = None,
+                        tipo: str = None) -> Tuple[List[Usuario], Optional[str]]:
+        """
+        Obtiene una página de usuarios en orden de alta, con paginación por cursor.
+        
+        Args:
+            limite (int): Tamaño máximo de la página
+            cursor (str): Cursor devuelto por la página anterior (None = primera página)
+            tipo (str): Solo usuarios de este tipo ("cliente", "empleado", "administrador")
+        
+        Returns:
+            Tuple[List[Usuario], str]: Usuarios y cursor de la página siguiente (None si no hay más)
+        """
+        recorrido = ((str(usuario.alta), usuario)
+                     for usuario in self._desde_alta(self.lista_usuarios, cursor)
+                     if tipo is None or self._tipo_usuario(usuario) == tipo)
+        return self._paginar(recorrido, limite)
+    
+    # MÉTODOS DE AGENDA
+    
+    def citas_del_dia(self, fecha: str, empleado_id: str = None) -> List[Cita]:
+        """
+        Obtiene las citas no canceladas de un día, por orden de inicio.
+        
+        Se leen del calendario, así que el coste depende de las citas de ese
+        día y no del total.
+        
+        Args:
+            fecha (str): Día "YYYY-MM-DD"
+            empleado_id (str): Limitar a un empleado (por defecto, todo el negocio)
+        
+        Returns:
+            List[Cita]: Citas del día
+        """
+        dia = instante_a_minutos(fecha) // MINUTOS_DIA
+        if empleado_id is not None:
+            return self._calendario.del_empleado(empleado_id, dia)
+        return list(heapq.merge(*self._calendario.del_dia(dia).values(),
+                                key=lambda cita: (cita.inicio, cita.id)))
+    
+    def ver_agenda_dia(self, fecha: str) -> str:
+        """
+        Muestra la agenda de todo el negocio para un día.
+        
+        Args:
+            fecha (str): Día "YYYY-MM-DD"
+        
+        Returns:
+            str: Agenda formateada
+        """
+        return presentacion.agenda_negocio(fecha, self.citas_del_dia(fecha))
+    
+    # MÉTODOS DE ARCHIVO
+    
+    def archivar_citas(self, dias: int = 90, ahora: int = None) -> int:
+        """
+        Pasa al archivo las citas completadas o canceladas que terminaron hace más de `dias` días.
+        
+        Las citas archivadas salen de lista_citas, de los índices, del calendario
+        y del historial del cliente; siguen contando en las estadísticas y en los
+        informes y se consultan con obtener_cita_archivada. En el repositorio no
+        cambia nada (al arrancar desde él vuelven a cargarse como citas normales).
+        Las citas con un ID que el archivo no admite (p. ej. importadas con otro
+        formato) se quedan entre las citas normales.
+        Los cursores de orden "id" obtenidos antes de archivar siguen siendo válidos.
+        
+        Args:
+            dias (int): Antigüedad mínima, en días, del fin de la cita
+            ahora (int): Instante actual en minutos (por defecto, el del reloj del servicio)
+        
+        Returns:
+            int: Número de citas archivadas
+        """
+        limite = (self.reloj() if ahora is None else ahora) - dias * MINUTOS_DIA
+        with self._lock_global:
+            empleados = list(self._citas_por_empleado)
+        
+        salen = []
+        for empleado_id in empleados:
+            with self._bloqueo_empleado(empleado_id):
+                citas = self._citas_por_empleado[empleado_id]
+                quedan = []
+                salen_empleado = []
+                for cita in citas:
+                    if (cita.estado in self.ESTADOS_FINALES and cita.fin <= limite
+                            and self.archivo.admite(cita.id)):
+                        salen_empleado.append(cita)
+                    else:
+                        quedan.append(cita)
+                if not salen_empleado:
+                    continue
+                citas[:] = quedan
+                self._cronologias[empleado_id].descartar({c.id for c in salen_empleado})
+                for cita in salen_empleado:
+                    self._calendario.quitar(cita)
+                    cita.observador = None
+                salen.extend(salen_empleado)
+        if not salen:
+            return 0
+        
+        archivadas = {cita.id for cita in salen}
+        with self._lock_global:
+            self.lista_citas[:] = [c for c in self.lista_citas if c.id not in archivadas]
+            # Un diccionario no reduce su tabla al borrar claves: se reconstruye
+            self._indice_citas = {cita.id: cita for cita in self.lista_citas}
+            for cita in salen:
+                self._contar_cita(cita.estado, cita, -1)
+            for cliente in {cita.cliente for cita in salen if isinstance(cita.cliente, Cliente)}:
+                cliente.historial[:] = [c for c in cliente.historial if c.id not in archivadas]
+            self.archivo.agregar(salen)
+        logger.info("✓ %d citas archivadas", len(salen))
+        return len(salen)
+    
+    def obtener_cita_archivada(self, cita_id: str) -> Optional[CitaArchivada]:
+        """
+        Obtiene una cita archivada por su ID.
+        
+        Args:
+            cita_id (str): ID de la cita
+        
+        Returns:
+            CitaArchivada: Registro de la cita o None si no está archivada
+        """
+        with self._lock_global:
+            return self.archivo.obtener(cita_id)
+    
+    # MÉTODOS DE DISPONIBILIDAD
+    
+    def _huecos_empleado_dia(self, empleado: Empleado, dia: int) -> List[Tuple[int, int]]:
+        """
+        Calcula los huecos libres de un empleado en un día (método privado).
+        
+        Parte de los tramos del Horario (sin pausas) y les resta las citas
+        activas de la agenda del empleado y las ocurrencias de sus series para
+        ese día.
+        
+        Args:
+            empleado (Empleado): Empleado consultado
+            dia (int): Día contado desde 1970-01-01
+        
+        Returns:
+            List[Tuple[int, int]]: Huecos (inicio, fin) en minutos absolutos, ordenados
+        """
+        horario = empleado.horario
+        if horario is None or not horario.trabaja_el(dia_semana(dia)):
+            return []
+        
+        base = dia * MINUTOS_DIA
+        libres = [(base + inicio, base + fin) for inicio, fin in horario.tramos_disponibles()]
+        agenda = self._agendas.get(empleado.id)
+        series = self._calendario.series_de(empleado.id)
+        if (agenda is None and series is None) or not libres:
+            return libres
+        desde, hasta = libres[0][0], libres[-1][1]
+        ocupados = agenda.entre(desde, hasta) if agenda is not None else ()
+        if series is not None:
+            ocupados = heapq.merge(ocupados, series.entre(desde, hasta))
+        return restar_intervalos(libres, ocupados)
+    
+    def buscar_huecos(self, servicio_id: str, cantidad: int = 5, desde: str = None,
+                      dias: int = 14, empleado_id: str = None,
+                      paso: int = 30) -> List[Tuple[str, Empleado]]:
+        """
+        Busca los primeros huecos libres para un servicio con cualquier empleado.
+        
+        Para cada día se calculan las listas de huecos de cada empleado (horario
+        menos pausas menos citas activas) y se generan inicios cada `paso` minutos
+        dentro de cada hueco en el que quepa la duración del servicio.
+        
+        Args:
+            servicio_id (str): ID del servicio a reservar
+            cantidad (int): Número máximo de huecos a devolver
+            desde (str): Fecha y hora "YYYY-MM-DD HH:MM" desde la que buscar (por defecto, ahora)
+            dias (int): Número de días a explorar
+            empleado_id (str): Limitar la búsqueda a un empleado concreto
+            paso (int): Separación en minutos entre inicios propuestos dentro de un hueco
+        
+        Returns:
+            List[Tuple[str, Empleado]]: Pares (fecha y hora de inicio, empleado), ordenados
+        
+        Raises:
+            ValueError: Si paso es menor que 1
+        """
+        if paso < 1:
+            raise ValueError("paso debe ser al menos 1")
+        servicio = self.obtener_servicio(servicio_id)
+        if not servicio:
+            return []
+        
+        if empleado_id is not None:
+            empleado = self._indice_empleados.get(empleado_id)
+            empleados = [empleado] if empleado else []
+        else:
+            with self._lock_global:
+                empleados = list(self._indice_empleados.values())
+        
+        inicio_busqueda = self.reloj() if desde is None else fecha_a_minutos(desde)
+        primer_dia = inicio_busqueda // MINUTOS_DIA
+        duracion = servicio.duracion
+        
+        resultado = []
+        for dia in range(primer_dia, primer_dia + dias):
+            candidatos = []
+            for orden, empleado in enumerate(empleados):
+                with self._bloqueo_empleado(empleado.id):
+                    huecos = self._huecos_empleado_dia(empleado, dia)
+                for inicio, fin in huecos:
+                    if inicio < inicio_busqueda:
+                        # Ajustar al primer inicio del hueco posterior a 'desde'
+                        inicio += -(-(inicio_busqueda - inicio) // paso) * paso
+                    while inicio + duracion <= fin:
+                        candidatos.append((inicio, orden))
+                        inicio += paso
+            candidatos.sort()
+            for inicio, orden in candidatos[:cantidad - len(resultado)]:
+                resultado.append((minutos_a_fecha(inicio), empleados[orden]))
+            if len(resultado) >= cantidad:
+                break
+        return resultado
+    
+    # MÉTODOS DE ASIGNACIÓN AUTOMÁTICA
+    
+    def planificar_solicitudes(self, solicitudes: Iterable[Solicitud],
+                               especialidades: Dict[str, Iterable[str]] = None,
+                               paso: int = 30, presupuesto: float = 1.0) -> ResultadoAsignacion:
+        """
+        Elige empleado y hora para un conjunto de solicitudes sin reservar nada.
+        
+        Los candidatos de cada solicitud son los empleados con horario cuya
+        especialidad cubre el servicio; los huecos libres salen del horario
+        menos las citas activas y las ocurrencias de series, como en
+        buscar_huecos. El reparto lo calcula PlanificadorAsignaciones
+        (asignacion.py) con la carga ya ocupada de cada empleado como punto de
+        partida para equilibrarla.
+        
+        Args:
+            solicitudes (Iterable): Solicitud o tuplas (cliente_id, servicio_id, desde,
+                hasta[, preferidos])
+            especialidades (Dict): Especialidad -> IDs de los servicios que cubre; los
+                empleados con una especialidad que no aparece (o si no se indica) pueden
+                atender cualquier servicio
+            paso (int): Separación en minutos entre inicios posibles dentro de un hueco
+            presupuesto (float): Segundos de cálculo (la fase voraz termina aunque los supere)
+        
+        Returns:
+            ResultadoAsignacion: Reparto; los números de solicitud siguen el orden recibido
+        
+        Raises:
+            NoEncontrado: Si algún cliente o servicio no existe
+            ValueError: Si alguna fecha no tiene el formato esperado
+        """
+        solicitudes = [Solicitud(*solicitud) for solicitud in solicitudes]
+        with self._lock_global:
+            usuarios = self._indice_usuarios
+            servicios = self._indice_servicios
+            empleados = [empleado for empleado in self._indice_empleados.values()
+                         if empleado.horario is not None]
+        if especialidades is not None:
+            especialidades = {especialidad: set(ids)
+                              for especialidad, ids in especialidades.items()}
+        
+        franjas = []
+        for solicitud in solicitudes:
+            if solicitud.cliente_id not in usuarios:
+                raise NoEncontrado("Cliente", solicitud.cliente_id)
+            if solicitud.servicio_id not in servicios:
+                raise NoEncontrado("Servicio", solicitud.servicio_id)
+            franjas.append((instante_a_minutos(solicitud.desde),
+                            instante_a_minutos(solicitud.hasta)))
+        if not solicitudes:
+            return PlanificadorAsignaciones({}, paso=paso).resolver([], presupuesto)
+        
+        # Huecos y carga de cada empleado en los días que abarcan las solicitudes
+        primer_dia = min(desde for desde, _ in franjas) // MINUTOS_DIA
+        ultimo_dia = max(hasta - 1 for _, hasta in franjas) // MINUTOS_DIA + 1
+        huecos: Dict[str, List[Tuple[int, int]]] = {}
+        carga: Dict[str, int] = {}
+        for empleado in empleados:
+            with self._bloqueo_empleado(empleado.id):
+                libres = [hueco for dia in range(primer_dia, ultimo_dia)
+                          for hueco in self._huecos_empleado_dia(empleado, dia)]
+            huecos[empleado.id] = libres
+            carga[empleado.id] = (empleado.horario.capacidad(primer_dia, ultimo_dia)
+                                  - sum(fin - inicio for inicio, fin in libres))
+        
+        capaces: Dict[str, Tuple[str, ...]] = {}
+        peticiones = []
+        for solicitud, (desde, hasta) in zip(solicitudes, franjas):
+            servicio = servicios[solicitud.servicio_id]
+            candidatos = capaces.get(servicio.id)
+            if candidatos is None:
+                candidatos = capaces[servicio.id] = tuple(
+                    empleado.id for empleado in empleados
+                    if especialidades is None
+                    or empleado.especialidad not in especialidades
+                    or servicio.id in especialidades[empleado.especialidad])
+            preferidos = frozenset(solicitud.preferidos).intersection(candidatos)
+            peticiones.append(Peticion(servicio.duracion, desde, hasta, candidatos, preferidos))
+        return PlanificadorAsignaciones(huecos, carga, paso).resolver(peticiones, presupuesto)
+    
+    def reservar_solicitudes(self, solicitudes: Iterable[Solicitud],
+                             especialidades: Dict[str, Iterable[str]] = None,
+                             paso: int = 30, presupuesto: float = 1.0
+                             ) -> Tuple[ResultadoAsignacion, List[Cita]]:
+        """
+        Asigna empleado y hora a un conjunto de solicitudes y reserva las que caben.
+        
+        El reparto se calcula con planificar_solicitudes y se reserva con
+        reservar_citas_lote, que vuelve a comprobar cada hueco con los cerrojos
+        tomados: si otra reserva ha ocupado alguno entretanto no se crea
+        ninguna cita y basta con volver a llamar.
+        
+        Args:
+            solicitudes (Iterable): Solicitud o tuplas (cliente_id, servicio_id, desde,
+                hasta[, preferidos])
+            especialidades (Dict): Especialidad -> IDs de los servicios que cubre
+            paso (int): Separación en minutos entre inicios posibles dentro de un hueco
+            presupuesto (float): Segundos de cálculo (la fase voraz termina aunque los supere)
+        
+        Returns:
+            Tuple[ResultadoAsignacion, List[Cita]]: Reparto y citas creadas (en el
+            orden de las solicitudes asignadas)
+        
+        Raises:
+            NoEncontrado: Si algún cliente o servicio no existe
+            HorarioOcupado: Si algún hueco elegido se ha ocupado mientras se planificaba
+            ValueError: Si alguna fecha no tiene el formato esperado
+        """
+        solicitudes = [Solicitud(*solicitud) for solicitud in solicitudes]
+        resultado = self.planificar_solicitudes(solicitudes, especialidades, paso, presupuesto)
+        reservas = [(solicitudes[n].cliente_id, empleado_id, solicitudes[n].servicio_id,
+                     minutos_a_fecha(inicio))
+                    for n, (empleado_id, inicio) in resultado.asignaciones.items()]
+        citas = self.reservar_citas_lote(reservas) if reservas else []
+        return resultado, citas
+    
+    # MÉTODOS DE NOTIFICACIONES
+    
+    @property
+    def lista_notificaciones(self) -> List[Notificacion]:
+        """
+        Notificaciones conservadas en todas las bandejas, en orden de creación.
+        
+        Se mantiene por compatibilidad: recorre todas las bandejas, así que para
+        consultar las de un usuario es mejor obtener_notificaciones().
+        """
+        with self._lock_global:
+            notificaciones = [n for bandeja in self._bandejas.values() for n in bandeja.todas()]
+        notificaciones.sort(key=lambda n: (len(n.id), n.id))
+        return notificaciones
+    
+    def _bandeja(self, usuario_id: str) -> BandejaNotificaciones:
+        """
+        Obtiene (o crea) la bandeja de un usuario (método privado).
+        
+        Args:
+            usuario_id (str): ID del usuario
+        
+        Returns:
+            BandejaNotificaciones: Bandeja del usuario
+        """
+        bandeja = self._bandejas.get(usuario_id)
+        if bandeja is None:
+            bandeja = self._bandejas[usuario_id] = BandejaNotificaciones(
+                self.MAX_LEIDAS_POR_BANDEJA)
+        return bandeja
+    
+    def _crear_notificacion(self, destinatario: Usuario, mensaje: Union[str, Tuple],
+                            tipo: str) -> Notificacion:
+        """
+        Crea una notificación en el sistema (método privado).
+        
+        Se guarda en el repositorio al momento, pero solo llega a la bandeja y
+        al despachador cuando termina bien la operación en curso.
+        
+        Args:
+            destinatario: Usuario destinatario
+            mensaje: Contenido del mensaje, o argumentos de la plantilla del tipo
+            tipo (str): Tipo de notificación
+        
+        Returns:
+            Notificacion: Notificación creada
+        """
+        notificacion = Notificacion(destinatario, mensaje, tipo,
+                                    id=self._nuevo_id("notificacion"))
+        notificacion.observador = self
+        # Primero el repositorio: si falla, la notificación no llega a la bandeja
+        if self.repositorio is not None:
+            self.repositorio.guardar_notificacion(notificacion)
+        self._al_confirmar(lambda: self._entregar_notificacion(notificacion))
+        return notificacion
+    
+    def _entregar_notificacion(self, notificacion: Notificacion):
+        """
+        Deja una notificación ya guardada en su bandeja y en la cola de envío (método privado).
+        
+        Args:
+            notificacion (Notificacion): Notificación a entregar
+        """
+        with self._lock_global:
+            self._bandeja(notificacion.destinatario.id).agregar(notificacion)
+        if self.despachador is not None:
+            self.despachador.encolar(notificacion)
+    
+    def _crear_recordatorio(self, cita: Cita) -> Notificacion:
+        """
+        Crea la notificación de recordatorio de una cita (método privado).
+        
+        Args:
+            cita (Cita): Cita a recordar
+        
+        Returns:
+            Notificacion: Notificación creada
+        """
+        return self._crear_notificacion(cita.cliente, (cita.empleado.nombre, cita.servicio.nombre,
+                                                       cita.inicio), "recordatorio")
+    
+    def procesar_recordatorios(self, ahora: int = None) -> List[Notificacion]:
+        """
+        Emite los recordatorios que han vencido. Pensado para llamarse periódicamente.
+        
+        Solo se procesan las entradas vencidas, O(k log n); las citas que ya han
+        empezado no reciben recordatorio. Cada serie tiene programado solo el
+        recordatorio de su próxima ocurrencia, y al emitirlo se programa el de
+        la siguiente.
+        
+        Args:
+            ahora (int): Instante actual en minutos (por defecto, el del reloj del servicio)
+        
+        Returns:
+            List[Notificacion]: Recordatorios creados
+        """
+        if ahora is None:
+            ahora = self.reloj()
+        enviados = []
+        with self._operacion():
+            with self._lock_global:
+                vencidos = self.recordatorios.vencidos(ahora)
+            # Si la operación falla, los vencidos vuelven al planificador
+            self._al_deshacer(lambda: self._reponer_recordatorios(vencidos, ahora))
+            for cita_id in vencidos:
+                cita = self._indice_citas.get(cita_id)
+                if cita is None and cita_id in self._indice_series:
+                    cita = self._ocurrencia_a_recordar(self._indice_series[cita_id], ahora)
+                if cita and cita.estado == "confirmada" and cita.inicio > ahora:
+                    enviados.append(self._crear_recordatorio(cita))
+        return enviados
+    
+    def _reponer_recordatorios(self, vencidos: List[str], ahora: int):
+        """
+        Vuelve a programar recordatorios extraídos cuyo envío se ha deshecho (método privado).
+        
+        Args:
+            vencidos (List[str]): IDs de citas o series extraídos del planificador
+            ahora (int): Instante con el que se extrajeron
+        """
+        with self._lock_global:
+            for cita_id in vencidos:
+                cita = self._indice_citas.get(cita_id)
+                if cita is not None:
+                    if cita.estado == "confirmada" and cita.inicio > ahora:
+                        self.recordatorios.programar(cita_id, cita.inicio)
+                    continue
+                serie = self._indice_series.get(cita_id)
+                inicio = serie.siguiente(ahora) if serie is not None else None
+                if inicio is not None:
+                    self.recordatorios.programar(cita_id, inicio)
+    
+    def _ocurrencia_a_recordar(self, serie: SerieCitas, ahora: int) -> Optional[Ocurrencia]:
+        """
+        Próxima ocurrencia de una serie cuyo recordatorio ya ha vencido (método privado).
+        
+        Deja programado el recordatorio de la ocurrencia que toque después.
+        
+        Args:
+            serie (SerieCitas): Serie cuyo recordatorio ha vencido
+            ahora (int): Instante actual en minutos
+        
+        Returns:
+            Ocurrencia: Ocurrencia a recordar o None si aún no toca ninguna
+        """
+        inicio = serie.siguiente(ahora)
+        if inicio is None:
+            return None
+        with self._lock_global:
+            if inicio - self.recordatorios.antelacion > ahora:
+                self.recordatorios.programar(serie.id, inicio)
+                return None
+            siguiente = serie.siguiente(inicio)
+            if siguiente is not None:
+                self.recordatorios.programar(serie.id, siguiente)
+        return serie.ocurrencia(inicio)
+    
+    def enviar_recordatorio(self, cita_id: str) -> str:
+        """
+        Envía un recordatorio automático para una cita.
+        
+        Args:
+            cita_id (str): ID de la cita
+        
+        Returns:
+            str: Mensaje de confirmación o error
+        """
+        cita = self.obtener_cita(cita_id)
+        if not cita:
+            return f"Cita {cita_id} no encontrada"
+        
+        notificacion = self._crear_recordatorio(cita)
+        
+        # Con despachador la entrega ya está en la cola; aquí solo se genera el resumen
+        return notificacion.enviar()
+    
+    def iterar_notificaciones(self, usuario_id: str) -> Iterator[Notificacion]:
+        """
+        Recorre las notificaciones de un usuario en orden de creación.
+        
+        Con repositorio se leen todas las guardadas; si no, las conservadas en su bandeja.
+        
+        Args:
+            usuario_id (str): ID del usuario
+        
+        Returns:
+            Iterator[Notificacion]: Notificaciones del usuario
+        
+        Raises:
+            NoEncontrado: Si el usuario no existe
+        """
+        usuario = self.obtener_usuario(usuario_id)
+        if not usuario:
+            raise NoEncontrado("Usuario", usuario_id)
+        
+        if self.repositorio is not None:
+            return self._notificaciones_guardadas(usuario)
+        with self._lock_global:
+            bandeja = self._bandejas.get(usuario_id)
+            return iter(bandeja.todas() if bandeja else [])
+    
+    def _notificaciones_guardadas(self, usuario: Usuario) -> Iterator[Notificacion]:
+        """
+        Reconstruye las notificaciones de un usuario desde el repositorio (método privado).
+        
+        Args:
+            usuario (Usuario): Destinatario
+        
+        Yields:
+            Notificacion: Notificaciones guardadas, en orden de creación
+        """
+        for notif_id, mensaje, tipo, fecha_envio, leida in \
+                self.repositorio.notificaciones_de(usuario.id):
+            notif = Notificacion(usuario, mensaje, tipo, id=notif_id)
+            notif.fecha_envio = fecha_envio
+            notif.leida = bool(leida)
+            notif.observador = self
+            yield notif
+    
+    def listar_notificaciones(self, usuario_id: str) -> str:
+        """
+        Lista las notificaciones de un usuario.
+        
+        Args:
+            usuario_id (str): ID del usuario
+        
+        Returns:
+            str: Lista formateada de notificaciones
+        """
+        try:
+            notificaciones = self.iterar_notificaciones(usuario_id)
+        except NoEncontrado as e:
+            return str(e)
+        return presentacion.lista_notificaciones(self._indice_usuarios[usuario_id],
+                                                 notificaciones)
+    
+    # MÉTODOS DE IMPORTACIÓN Y EXPORTACIÓN
+    
+    @staticmethod
+    def _id_importado(fila: Dict, tabla: str) -> Tuple[Optional[str], Optional[int]]:
+        """
+        Lee y valida el ID opcional de una fila importada (método privado).
+        
+        Args:
+            fila (Dict): Fila del fichero
+            tabla (str): Tabla del ID ("usuario", "servicio" o "cita")
+        
+        Returns:
+            Tuple: ID y su número, o (None, None) si la fila no trae ID
+        
+        Raises:
+            ValueError: Si el ID no tiene el prefijo de la tabla seguido de dígitos
+        """
+        objeto_id = fila.get("id") or None
+        if objeto_id is None:
+            return None, None
+        numero = GeneradorIds.numero(tabla, str(objeto_id))
+        if numero is None:
+            raise ValueError(f"ID '{objeto_id}' no válido")
+        return objeto_id, numero
+    
+    def _importar(self, origen, formato: str, tam_lote: int, aplicar_fila,
+                  max_errores: int) -> Dict:
+        """
+        Recorre un fichero por lotes aplicando cada fila (método privado).
+        
+        Cada lote se valida y guarda en una única operación, y cada fila en una
+        operación anidada. Las filas erróneas, incluidas las mal formadas, se
+        deshacen, se saltan y se anotan en el resumen. Cualquier otro error (por
+        ejemplo, del repositorio) deshace el lote en curso, también en memoria,
+        y se propaga; los lotes anteriores quedan importados.
+        
+        Args:
+            origen: Ruta o fichero abierto
+            formato (str): "csv" o "jsonl"
+            tam_lote (int): Filas por lote
+            aplicar_fila: Función que valida y aplica una fila (lanza ValueError si no es válida)
+            max_errores (int): Máximo de errores que se guardan en el resumen
+        
+        Returns:
+            Dict: Resumen con "importados", "total_errores" y "errores" [(fila, motivo)]
+        """
+        resumen = {"importados": 0, "total_errores": 0, "errores": []}
+        for lote in por_lotes(enumerate(leer_registros(origen, formato), 1), tam_lote):
+            with self._operacion():
+                for numero, registro in lote:
+                    try:
+                        with self._operacion():
+                            aplicar_fila(interpretar_registro(registro, formato))
+                        resumen["importados"] += 1
+                    except (ValueError, KeyError, TypeError) as e:
+                        resumen["total_errores"] += 1
+                        if len(resumen["errores"]) < max_errores:
+                            resumen["errores"].append((numero, str(e)))
+        return resumen
+    
+    def importar_usuarios(self, origen, formato: str = "csv", tam_lote: int = 10000,
+                          max_errores: int = 1000) -> Dict:
+        """
+        Importa usuarios desde un fichero CSV o JSONL.
+        
+        Columnas: id (opcional), tipo, nombre, email, telefono, especialidad.
+        
+        Args:
+            origen: Ruta o fichero abierto
+            formato (str): "csv" o "jsonl"
+            tam_lote (int): Filas por lote
+            max_errores (int): Máximo de errores detallados en el resumen
+        
+        Returns:
+            Dict: Resumen de la importación
+        """
+        def aplicar_fila(fila: Dict):
+            exigir_campos(fila, ("tipo", "nombre", "email"))
+            usuario_id, numero = self._id_importado(fila, "usuario")
+            if usuario_id and usuario_id in self._indice_usuarios:
+                raise ValueError(f"Usuario {usuario_id} duplicado")
+            usuario = self._construir_usuario(fila["tipo"], fila["nombre"], fila["email"],
+                                              {"telefono": fila.get("telefono") or "",
+                                               "especialidad": fila.get("especialidad")
+                                               or "General"},
+                                              usuario_id or self._nuevo_id("usuario"))
+            if usuario is None:
+                raise ValueError(f"Tipo de usuario '{fila['tipo']}' no reconocido")
+            self._agregar_usuario(usuario)
+            if usuario_id:
+                self._avanzar_id(Usuario, "usuario", numero)
+        
+        resumen = self._importar(origen, formato, tam_lote, aplicar_fila, max_errores)
+        logger.info("✓ %d usuarios importados, %d filas con errores",
+                    resumen["importados"], resumen["total_errores"])
+        return resumen
+    
+    def importar_servicios(self, origen, formato: str = "csv", tam_lote: int = 10000,
+                           max_errores: int = 1000) -> Dict:
+        """
+        Importa servicios desde un fichero CSV o JSONL.
+        
+        Columnas: id (opcional), nombre, descripcion, duracion, precio.
+        
+        Args:
+            origen: Ruta o fichero abierto
+            formato (str): "csv" o "jsonl"
+            tam_lote (int): Filas por lote
+            max_errores (int): Máximo de errores detallados en el resumen
+        
+        Returns:
+            Dict: Resumen de la importación
+        """
+        def aplicar_fila(fila: Dict):
+            exigir_campos(fila, ("nombre", "duracion", "precio"))
+            servicio_id, numero = self._id_importado(fila, "servicio")
+            if servicio_id and servicio_id in self._indice_servicios:
+                raise ValueError(f"Servicio {servicio_id} duplicado")
+            servicio = Servicio(fila["nombre"], fila.get("descripcion") or "",
+                                int(fila["duracion"]), float(fila["precio"]),
+                                id=servicio_id or self._nuevo_id("servicio"))
+            self._agregar_servicio(servicio)
+            if servicio_id:
+                self._avanzar_id(Servicio, "servicio", numero)
+        
+        resumen = self._importar(origen, formato, tam_lote, aplicar_fila, max_errores)
+        logger.info("✓ %d servicios importados, %d filas con errores",
+                    resumen["importados"], resumen["total_errores"])
+        return resumen
+    
+    def importar_citas(self, origen, formato: str = "csv", tam_lote: int = 10000,
+                       notificar: bool = False, max_errores: int = 1000) -> Dict:
+        """
+        Importa citas desde un fichero CSV o JSONL.
+        
+        Columnas: id (opcional), cliente_id, empleado_id, servicio_id,
+        inicio ("YYYY-MM-DD HH:MM") y estado (por defecto "confirmada").
+        Las citas activas se comprueban contra la agenda del empleado.
+        
+        Args:
+            origen: Ruta o fichero abierto
+            formato (str): "csv" o "jsonl"
+            tam_lote (int): Filas por lote
+            notificar (bool): Crear la notificación de confirmación de cada cita activa
+            max_errores (int): Máximo de errores detallados en el resumen
+        
+        Returns:
+            Dict: Resumen de la importación
+        """
+        estados_validos = ("pendiente", "confirmada", "cancelada", "completada")
+        
+        def aplicar_fila(fila: Dict):
+            exigir_campos(fila, ("cliente_id", "empleado_id", "servicio_id", "inicio"))
+            cita_id, numero = self._id_importado(fila, "cita")
+            if cita_id and cita_id in self._indice_citas:
+                raise ValueError(f"Cita {cita_id} duplicada")
+            cliente = self._indice_usuarios.get(fila["cliente_id"])
+            empleado = self._indice_empleados.get(fila["empleado_id"])
+            servicio = self._indice_servicios.get(fila["servicio_id"])
+            if not cliente:
+                raise ValueError(f"Cliente {fila['cliente_id']} no encontrado")
+            if not empleado:
+                raise ValueError(f"Empleado {fila['empleado_id']} no encontrado")
+            if not servicio:
+                raise ValueError(f"Servicio {fila['servicio_id']} no encontrado")
+            estado = fila.get("estado") or "confirmada"
+            if estado not in estados_validos:
+                raise ValueError(f"Estado '{estado}' no válido")
+            
+            cita = Cita(cliente, empleado, servicio, fila["inicio"],
+                        id=cita_id or self._nuevo_id("cita"))
+            cita._estado = sys.intern(estado)
+            self._agregar_cita(cita)
+            if cita_id:
+                self._avanzar_id(Cita, "cita", numero)
+            if notificar and estado in self.ESTADOS_ACTIVOS:
+                self._crear_notificacion(cliente, (empleado.nombre, servicio.nombre,
+                                                   cita.inicio), "confirmacion")
+        
+        resumen = self._importar(origen, formato, tam_lote, aplicar_fila, max_errores)
+        logger.info("✓ %d citas importadas, %d filas con errores",
+                    resumen["importados"], resumen["total_errores"])
+        return resumen
+    
+    def exportar_usuarios(self, destino, formato: str = "csv") -> int:
+        """
+        Exporta los usuarios a un fichero CSV o JSONL.
+        
+        Args:
+            destino: Ruta o fichero abierto
+            formato (str): "csv" o "jsonl"
+        
+        Returns:
+            int: Número de usuarios exportados
+        """
+        filas = ((u.id, type(u).__name__.lower(), u.nombre, u.email,
+                  getattr(u, "teléfono", ""), getattr(u, "especialidad", ""))
+                 for u in self.lista_usuarios)
+        return escribir_filas(destino, filas, CAMPOS_USUARIO, formato)
+    
+    def exportar_servicios(self, destino, formato: str = "csv") -> int:
+        """
+        Exporta los servicios a un fichero CSV o JSONL.
+        
+        Args:
+            destino: Ruta o fichero abierto
+            formato (str): "csv" o "jsonl"
+        
+        Returns:
+            int: Número de servicios exportados
+        """
+        filas = ((s.id, s.nombre, s.descripcion, s.duracion, s.precio)
+                 for s in self.lista_servicios)
+        return escribir_filas(destino, filas, CAMPOS_SERVICIO, formato)
+    
+    def exportar_citas(self, destino, formato: str = "csv") -> int:
+        """
+        Exporta las citas, incluidas las archivadas, a un fichero CSV o JSONL.
+        
+        Args:
+            destino: Ruta o fichero abierto
+            formato (str): "csv" o "jsonl"
+        
+        Returns:
+            int: Número de citas exportadas
+        """
+        filas = chain(((c.id, c.cliente.id, c.empleado.id, c.servicio.id,
+                        c.fecha_hora_inicio, c.estado)
+                       for c in self.lista_citas),
+                      ((c.id, c.cliente_id, c.empleado_id, c.servicio_id,
+                        c.fecha_hora_inicio, c.estado)
+                       for c in self.archivo))
+        return escribir_filas(destino, filas, CAMPOS_CITA, formato)
+    
+    def obtener_notificaciones(self, usuario_id: str, pagina: int = 1, por_pagina: int = 20,
+                               solo_no_leidas: bool = False) -> List[Notificacion]:
+        """
+        Obtiene una página de la bandeja de un usuario, de la más reciente a la más antigua.
+        
+        Args:
+            usuario_id (str): ID del usuario
+            pagina (int): Número de página, empezando en 1
+            por_pagina (int): Notificaciones por página
+            solo_no_leidas (bool): Devolver solo las no leídas
+        
+        Returns:
+            List[Notificacion]: Notificaciones de la página
+        """
+        bandeja = self._bandejas.get(usuario_id)
+        if bandeja is None or pagina < 1:
+            return []
+        with self._lock_global:
+            return bandeja.pagina((pagina - 1) * por_pagina, por_pagina, solo_no_leidas)
+    
+    def pagina_notificaciones(self, usuario_id: str, limite: int = 20, cursor: str = None,
+                              solo_no_leidas: bool = False
+                              ) -> Tuple[List[Notificacion], Optional[str]]:
+        """
+        Obtiene una página de la bandeja de un usuario con paginación por cursor.
+        
+        A diferencia de obtener_notificaciones, las notificaciones que lleguen
+        entre dos llamadas no desplazan las páginas siguientes.
+        
+        Args:
+            usuario_id (str): ID del usuario
+            limite (int): Tamaño máximo de la página
+            cursor (str): Cursor devuelto por la página anterior (None = las más recientes)
+            solo_no_leidas (bool): Devolver solo las no leídas
+        
+        Returns:
+            Tuple[List[Notificacion], str]: Notificaciones y cursor de la página siguiente
+        """
+        bandeja = self._bandejas.get(usuario_id)
+        if bandeja is None:
+            return [], None
+        with self._lock_global:
+            recorrido = ((str(secuencia), notificacion) for secuencia, notificacion
+                         in bandeja.recorrer(int(cursor) if cursor else None, solo_no_leidas))
+            return self._paginar(recorrido, limite)
+    
+    def contar_no_leidas(self, usuario_id: str) -> int:
+        """
+        Obtiene el número de notificaciones sin leer de un usuario.
+        
+        Args:
+            usuario_id (str): ID del usuario
+        
+        Returns:
+            int: Notificaciones sin leer
+        """
+        bandeja = self._bandejas.get(usuario_id)
+        return bandeja.no_leidas if bandeja else 0
+    
+    # MÉTODOS DE ESTADÍSTICAS
+    def estadisticas(self, verificar: bool = False) -> Dict[str, float]:
+        """
+        Obtiene los contadores del negocio en O(1), incluidas las citas archivadas.
+        
+        Args:
+            verificar (bool): Recalcular desde cero y comprobar que coinciden
+        
+        Returns:
+            Dict: Totales de usuarios por tipo, citas por estado, servicios e ingresos
+        
+        Raises:
+            RuntimeError: Si verificar es True y los contadores no coinciden
+        """
+        with self._lock_global:
+            datos = {
+                "usuarios": len(self.lista_usuarios),
+                "servicios": len(self.lista_servicios),
+                "citas": len(self.lista_citas) + len(self.archivo),
+                "archivadas": len(self.archivo),
+                "ingresos": self._ingresos_confirmados,
+            }
+            datos.update(self._usuarios_por_tipo)
+            for estado, archivadas in self.archivo.contar_por_estado().items():
+                datos[estado] = self._citas_por_estado[estado] + archivadas
+        
+        if verificar:
+            diferencias = self.verificar_estadisticas(datos)
+            if diferencias:
+                raise RuntimeError(f"Estadísticas inconsistentes: {diferencias}")
+        return datos
+    
+    def verificar_estadisticas(self, datos: Dict[str, float] = None) -> Dict[str, Tuple]:
+        """
+        Compara los contadores con un recálculo completo.
+        
+        Args:
+            datos (Dict): Contadores a comprobar (por defecto, los actuales)
+        
+        Returns:
+            Dict: Claves que no coinciden -> (valor del contador, valor recalculado)
+        """
+        if datos is None:
+            datos = self.estadisticas()
+        recalculadas = self._recalcular_estadisticas()
+        diferencias = {}
+        for clave, valor in recalculadas.items():
+            actual = datos.get(clave, 0)
+            if abs(actual - valor) > 1e-6:
+                diferencias[clave] = (actual, valor)
+        return diferencias
+    
+    def _recalcular_estadisticas(self) -> Dict[str, float]:
+        """
+        Recalcula las estadísticas desde cero (método privado).
+        
+        Con repositorio se consulta al almacenamiento (que conserva también las
+        citas archivadas); si no, se recorren las listas y se suma el archivo.
+        
+        Returns:
+            Dict: Mismas claves que estadisticas()
+        """
+        if self.repositorio is not None:
+            return self.repositorio.estadisticas()
+        
+        datos = {
+            "usuarios": len(self.lista_usuarios),
+            "cliente": len([u for u in self.lista_usuarios if isinstance(u, Cliente)]),
+            "empleado": len([u for u in self.lista_usuarios if isinstance(u, Empleado)]),
+            "administrador": len([u for u in self.lista_usuarios
+                                  if isinstance(u, Administrador)]),
+            "servicios": len(self.lista_servicios),
+            "citas": len(self.lista_citas) + len(self.archivo),
+            "ingresos": sum([c.servicio.precio for c in self.lista_citas
+                             if c.estado == "confirmada"]),
+        }
+        archivadas = self.archivo.contar_por_estado()
+        for estado in ("pendiente", "confirmada", "cancelada", "completada"):
+            datos[estado] = (len([c for c in self.lista_citas if c.estado == estado])
+                             + archivadas[estado])
+        return datos
+    
+    def _citas_en_rango(self, desde: Optional[int], hasta: Optional[int]) -> List[Cita]:
+        """
+        Obtiene las citas en memoria que empiezan en [desde, hasta), sin orden (método privado).
+        
+        Sin límites es una copia de lista_citas; con ellos se recorta por
+        búsqueda binaria el índice cronológico de cada empleado, así que solo se
+        visitan las citas del rango.
+        
+        Args:
+            desde (int): Minuto inicial (None = sin límite)
+            hasta (int): Minuto final, excluido (None = sin límite)
+        
+        Returns:
+            List[Cita]: Citas del rango
+        """
+        with self._lock_global:
+            if desde is None and hasta is None:
+                return list(self.lista_citas)
+            citas = (self._indice_citas.get(cita_id)
+                     for cronologia in self._cronologias.values()
+                     for cita_id in cronologia.entre(desde, hasta))
+            return [cita for cita in citas if cita is not None]
+    
+    def informe_ingresos(self, desde: Union[str, int] = None, hasta: Union[str, int] = None,
+                         por: str = "servicio") -> Dict[str, float]:
+        """
+        Calcula los ingresos de las citas completadas, incluidas las archivadas.
+        
+        Args:
+            desde: Solo citas que empiezan en o después de este instante ("YYYY-MM-DD[ HH:MM]")
+            hasta: Solo citas que empiezan antes de este instante
+            por (str): Agrupar por "servicio", "empleado" o "cliente"
+        
+        Returns:
+            Dict[str, float]: ID del grupo -> ingresos (solo grupos con ingresos)
+        
+        Raises:
+            ValueError: Si la agrupación no es válida
+        """
+        desde = None if desde is None else instante_a_minutos(desde)
+        hasta = None if hasta is None else instante_a_minutos(hasta)
+        with self._lock_global:
+            totales = self.archivo.ingresos(desde, hasta, por)
+        for cita in self._citas_en_rango(desde, hasta):
+            if cita.estado == "completada":
+                clave = getattr(cita, por).id
+                totales[clave] = totales.get(clave, 0) + cita.servicio.precio
+        return totales
+    
+    def informe_ocupacion(self, desde: Union[str, int],
+                          hasta: Union[str, int]) -> Dict[str, Dict[str, float]]:
+        """
+        Calcula la ocupación de cada empleado en un rango de días.
+        
+        Cuentan como ocupados los minutos de las citas no canceladas (las
+        archivadas incluidas); la capacidad sale del Horario del empleado, sin
+        pausas, para los días del rango. Se calcula con los agregados diarios y
+        mensuales (ver resumen_periodo).
+        
+        Args:
+            desde: Primer día "YYYY-MM-DD" (o instante en minutos)
+            hasta: Día siguiente al último, excluido
+        
+        Returns:
+            Dict: empleado_id -> {"ocupados": minutos, "capacidad": minutos,
+                  "ocupacion": fracción ocupada (0 si no tiene horario)}
+        """
+        return {empleado_id: {"ocupados": medidas["minutos"],
+                              "capacidad": medidas["capacidad"],
+                              "ocupacion": medidas["ocupacion"]}
+                for empleado_id, medidas in self.resumen_periodo(desde, hasta,
+                                                                 "empleado").items()}
+    
+    def obtener_estadisticas(self) -> str:
+        """
+        Obtiene un resumen de estadísticas del negocio.
+        
+        Returns:
+            str: Estadísticas formateadas
+        """
+        return presentacion.estadisticas(self.negocio.nombre, self.estadisticas())
+    
+    def obtener_informacion_negocio(self) -> str:
+        """
+        Obtiene la información del negocio.
+        
+        Returns:
+            str: Información formateada
+        """
+        return self.negocio.obtener_informacion()
+    
+    # MÉTODOS DE INFORMES POR PERIODO
+    
+    @staticmethod
+    def _rango_dias(desde: Union[str, int], hasta: Union[str, int]) -> Tuple[int, int]:
+        """
+        Convierte un rango de instantes en un rango de días [primero, último + 1) (método privado).
+        
+        Args:
+            desde: Instante inicial ("YYYY-MM-DD[ HH:MM]" o minutos)
+            hasta: Instante final, excluido
+        
+        Returns:
+            Tuple[int, int]: Días desde 1970-01-01 (el segundo, excluido)
+        """
+        return (instante_a_minutos(desde) // MINUTOS_DIA,
+                -(-instante_a_minutos(hasta) // MINUTOS_DIA))
+    
+    def _resumen_dias(self, primer_dia: int, ultimo_dia: int, por: str,
+                      empleados: List[Empleado]) -> Dict[str, Dict[str, float]]:
+        """
+        Resume un rango de días y añade la ocupación si procede (método privado).
+        
+        Args:
+            primer_dia (int): Primer día
+            ultimo_dia (int): Día siguiente al último
+            por (str): "servicio", "empleado" o "total"
+            empleados (List[Empleado]): Empleados cuya capacidad se tiene en cuenta
+        
+        Returns:
+            Dict: Clave -> medidas (ver resumen_periodo)
+        """
+        with self._lock_global:
+            resumen = self._agregados.resumir(primer_dia, ultimo_dia, por)
+        if por == "servicio":
+            return resumen
+        
+        capacidades = {empleado.id: (empleado.horario.capacidad(primer_dia, ultimo_dia)
+                                     if empleado.horario is not None else 0)
+                       for empleado in empleados}
+        if por == "total":
+            claves = {"total": sum(capacidades.values())}
+            resumen = {"total": resumen.get("", dict.fromkeys(MEDIDAS, 0))}
+        else:
+            claves = capacidades
+            for empleado_id in capacidades:
+                resumen.setdefault(empleado_id, dict.fromkeys(MEDIDAS, 0))
+        for clave, capacidad in claves.items():
+            medidas = resumen[clave]
+            medidas["capacidad"] = capacidad
+            medidas["ocupacion"] = medidas["minutos"] / capacidad if capacidad else 0
+        return resumen
+    
+    def resumen_periodo(self, desde: Union[str, int], hasta: Union[str, int],
+                        por: str = "total") -> Dict[str, Dict[str, float]]:
+        """
+        Resume ingresos, ocupación y citas de un rango de días.
+        
+        Suma los agregados mensuales de los meses completos y los diarios de los
+        extremos, así que no depende del número de citas. Se cuentan las citas
+        que empiezan en el rango, incluidas las archivadas.
+        
+        Medidas de cada clave:
+            citas: Citas no canceladas
+            canceladas: Citas canceladas
+            minutos: Minutos reservados en citas no canceladas
+            ingresos: Ingresos de las citas completadas
+            previstos: Ingresos de las citas pendientes o confirmadas
+            capacidad, ocupacion: Minutos de horario y fracción reservada
+                                  (solo por empleado y en el total)
+        
+        Args:
+            desde: Primer día "YYYY-MM-DD" (o instante en minutos)
+            hasta: Día siguiente al último, excluido
+            por (str): "servicio", "empleado" o "total"
+        
+        Returns:
+            Dict: ID del servicio o empleado (o "total") -> medida -> valor
+        
+        Raises:
+            ValueError: Si la agrupación no es válida
+        """
+        primer_dia, ultimo_dia = self._rango_dias(desde, hasta)
+        with self._lock_global:
+            empleados = list(self._indice_empleados.values())
+        return self._resumen_dias(primer_dia, ultimo_dia, por, empleados)
+    
+    def informe_por_periodos(self, desde: Union[str, int], hasta: Union[str, int],
+                             periodo: str = "mes", por: str = "total"
+                             ) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """
+        Resume un rango de días dividido en días, semanas o meses.
+        
+        Las semanas empiezan en lunes y los periodos de los extremos se recortan
+        al rango pedido.
+        
+        Args:
+            desde: Primer día "YYYY-MM-DD" (o instante en minutos)
+            hasta: Día siguiente al último, excluido
+            periodo (str): "dia", "semana" o "mes"
+            por (str): "servicio", "empleado" o "total"
+        
+        Returns:
+            Dict: Periodo ("YYYY-MM-DD", "YYYY-Www" o "YYYY-MM") -> resumen como en resumen_periodo
+        
+        Raises:
+            ValueError: Si el periodo o la agrupación no son válidos
+        """
+        if periodo not in ("dia", "semana", "mes"):
+            raise ValueError(f"Periodo '{periodo}' no válido (use 'dia', 'semana' o 'mes')")
+        primer_dia, ultimo_dia = self._rango_dias(desde, hasta)
+        with self._lock_global:
+            empleados = list(self._indice_empleados.values())
+        
+        informe = {}
+        dia = primer_dia
+        while dia < ultimo_dia:
+            fecha = dia_a_fecha(dia)
+            if periodo == "dia":
+                siguiente, etiqueta = dia + 1, fecha.isoformat()
+            elif periodo == "semana":
+                siguiente = dia + 7 - dia_semana(dia)
+                año, semana, _ = fecha.isocalendar()
+                etiqueta = f"{año}-W{semana:02d}"
+            else:
+                siguiente = primer_dia_mes(mes_de_dia(dia) + 1)
+                etiqueta = f"{fecha.year}-{fecha.month:02d}"
+            siguiente = min(siguiente, ultimo_dia)
+            informe[etiqueta] = self._resumen_dias(dia, siguiente, por, empleados)
+            dia = siguiente
+        return informe
@@ -3,8 +3,10 @@ Módulo: cita.py
 Descripción: Define la clase Cita que representa una reserva de un cliente en el sistema.
 """
 
-from datetime import datetime, timedelta
-from typing import Optional
+import sys
+import threading
+from typing import Optional, Union
+from tiempo import fecha_a_minutos, minutos_a_fecha
 
 
 class Cita:
@@ -16,46 +18,129 @@ class Cita:
         cliente: Objeto Cliente que realizó la reserva
         empleado: Objeto Empleado asignado a la cita
         servicio: Objeto Servicio contratado
-        fecha_hora_inicio (str): Fecha y hora de inicio "YYYY-MM-DD HH:MM"
-        fecha_hora_fin (str): Fecha y hora de fin "YYYY-MM-DD HH:MM"
+        inicio (int): Inicio en minutos desde 1970-01-01 00:00
+        fin (int): Fin en minutos desde 1970-01-01 00:00
+        fecha_hora_inicio (str): Fecha y hora de inicio "YYYY-MM-DD HH:MM" (calculada)
+        fecha_hora_fin (str): Fecha y hora de fin "YYYY-MM-DD HH:MM" (calculada)
         estado (str): Estado de la cita (pendiente, confirmada, cancelada, completada)
+        observador: Objeto avisado de cada cambio de estado (normalmente BookMeService)
+        alta (int): Orden de alta en el servicio, creciente (None hasta que se añade a uno)
+    
+    Se crean cientos de miles de citas, así que la clase usa __slots__ (sin
+    __dict__ por instancia) y el estado se guarda como cadena internada: todas
+    las citas con el mismo estado comparten el mismo objeto str.
     """
     
+    __slots__ = ("id", "cliente", "empleado", "servicio", "inicio", "fin",
+                 "observador", "alta", "_estado")
+    
     contador_id = 4000
+    _lock_id = threading.Lock()
     
-    def __init__(self, cliente, empleado, servicio, fecha_hora_inicio: str):
+    def __init__(self, cliente, empleado, servicio, fecha_hora_inicio: Union[str, int],
+                 id: str = None):
         """
         Inicializa una cita.
         
+        La fecha se interpreta una única vez; internamente se guardan minutos
+        enteros y el texto solo se genera al mostrarlo.
+        
         Args:
             cliente: Objeto Cliente
             empleado: Objeto Empleado
             servicio: Objeto Servicio
-            fecha_hora_inicio (str): Fecha y hora de inicio "YYYY-MM-DD HH:MM"
+            fecha_hora_inicio: Fecha y hora de inicio "YYYY-MM-DD HH:MM" o minutos desde la época
+            id (str): ID ya existente; por defecto se genera
+        
+        Raises:
+            ValueError: Si la fecha no tiene el formato esperado
         """
-        self.id = f"CIT{Cita.contador_id}"
-        Cita.contador_id += 1
+        if id is None:
+            with Cita._lock_id:
+                id = f"CIT{Cita.contador_id}"
+                Cita.contador_id += 1
+        self.id = id
         self.cliente = cliente
         self.empleado = empleado
         self.servicio = servicio
-        self.fecha_hora_inicio = fecha_hora_inicio
-        self.fecha_hora_fin = self._calcular_hora_fin()
-        self.estado = "pendiente"
+        # bool es subclase de int, pero True/False no son instantes válidos
+        if isinstance(fecha_hora_inicio, int) and not isinstance(fecha_hora_inicio, bool):
+            self.inicio = fecha_hora_inicio
+        else:
+            self.inicio = fecha_a_minutos(fecha_hora_inicio)
+        self.fin = self._calcular_hora_fin()
+        self.observador = None
+        self.alta = None
+        self._estado = "pendiente"
+    
+    @property
+    def estado(self) -> str:
+        """Estado actual de la cita."""
+        return self._estado
+    
+    @estado.setter
+    def estado(self, nuevo_estado: str):
+        """
+        Cambia el estado de la cita y avisa al observador, si lo hay.
+        
+        Si el observador rechaza el cambio lanzando una excepción, la cita
+        recupera su estado anterior y la excepción se propaga.
+        
+        Args:
+            nuevo_estado (str): Nuevo estado de la cita
+        """
+        estado_anterior = self._estado
+        self._estado = sys.intern(nuevo_estado)
+        if self.observador is not None and estado_anterior != nuevo_estado:
+            try:
+                self.observador._cita_cambio_estado(self, estado_anterior)
+            except Exception:
+                self._estado = estado_anterior
+                raise
     
-    def _calcular_hora_fin(self) -> str:
+    @property
+    def fecha_hora_inicio(self) -> str:
+        """Fecha y hora de inicio "YYYY-MM-DD HH:MM"."""
+        return minutos_a_fecha(self.inicio)
+    
+    @fecha_hora_inicio.setter
+    def fecha_hora_inicio(self, valor: str):
+        # Cambiar el inicio por aquí dejaría desfasadas las agendas e índices del servicio
+        raise AttributeError("fecha_hora_inicio es de solo lectura; "
+                             "use BookMeService.reprogramar_cita para mover la cita")
+    
+    @property
+    def fecha_hora_fin(self) -> str:
+        """Fecha y hora de fin "YYYY-MM-DD HH:MM"."""
+        return minutos_a_fecha(self.fin)
+    
+    @fecha_hora_fin.setter
+    def fecha_hora_fin(self, valor: str):
+        # Igual que el inicio: el fin forma parte del intervalo indexado por el servicio
+        raise AttributeError("fecha_hora_fin es de solo lectura; "
+                             "use BookMeService.reprogramar_cita para mover la cita")
+    
+    def _calcular_hora_fin(self) -> int:
         """
         Calcula la hora de fin basándose en la duración del servicio.
         
         Returns:
-            str: Fecha y hora de fin
-        """
-        try:
-            fecha_inicio = datetime.strptime(self.fecha_hora_inicio, "%Y-%m-%d %H:%M")
-            duracion = timedelta(minutes=self.servicio.duracion)
-            fecha_fin = fecha_inicio + duracion
-            return fecha_fin.strftime("%Y-%m-%d %H:%M")
-        except ValueError:
-            return "Fecha inválida"
+            int: Fin en minutos desde la época
+        """
+        return self.inicio + self.servicio.duracion
+    
+    def _reprogramar(self, inicio: int, fin: int):
+        """
+        Cambia el intervalo de la cita (método privado).
+        
+        Solo debe llamarlo BookMeService, que actualiza a la vez sus agendas e índices.
+        
+        Args:
+            inicio (int): Nuevo inicio en minutos desde la época
+            fin (int): Nuevo fin en minutos desde la época
+        """
+        self.inicio = inicio
+        self.fin = fin
     
     def confirmar(self) -> str:
         """
@@ -0,0 +1,200 @@
+"""
+Módulo: despacho.py
+Descripción: Envío asíncrono de notificaciones. El servicio deja cada notificación en una cola
+             acotada y uno o varios hilos la envían por lotes a través de un Transporte, con
+             reintentos y métricas de entrega, fuera del camino de las reservas.
+"""
+
+import queue
+import threading
+import time
+from typing import Dict, List
+
+
+class Transporte:
+    """
+    Interfaz de los canales de envío (SMTP, SMS...).
+
+    enviar_lote debe lanzar una excepción si el envío falla, para que el
+    despachador lo reintente.
+    """
+
+    def enviar_lote(self, notificaciones: List):
+        """
+        Envía un lote de notificaciones.
+
+        Args:
+            notificaciones (List): Objetos Notificacion a enviar
+        """
+        raise NotImplementedError
+
+
+class TransporteLocal(Transporte):
+    """
+    Transporte en memoria para pruebas: guarda lo enviado y puede simular fallos.
+
+    Atributos:
+        enviadas (List): Notificaciones entregadas, en orden
+        lotes (int): Número de lotes entregados
+        fallos_pendientes (int): Número de envíos que fallarán antes de funcionar
+    """
+
+    def __init__(self, fallos_pendientes: int = 0):
+        """
+        Inicializa el transporte.
+
+        Args:
+            fallos_pendientes (int): Número de envíos que fallarán antes de funcionar
+        """
+        self.enviadas = []
+        self.lotes = 0
+        self.fallos_pendientes = fallos_pendientes
+        self._lock = threading.Lock()
+
+    def enviar_lote(self, notificaciones: List):
+        with self._lock:
+            if self.fallos_pendientes > 0:
+                self.fallos_pendientes -= 1
+                raise ConnectionError("Fallo simulado del transporte")
+            self.enviadas.extend(notificaciones)
+            self.lotes += 1
+
+
+class DespachadorNotificaciones:
+    """
+    Cola de envío de notificaciones atendida por hilos de trabajo.
+
+    encolar() bloquea cuando la cola está llena (contrapresión). Cada hilo toma
+    hasta `tam_lote` notificaciones y las envía juntas; si el transporte falla se
+    reintenta con espera exponencial hasta `reintentos` veces.
+
+    Atributos:
+        transporte (Transporte): Canal de envío
+        tam_lote (int): Máximo de notificaciones por envío
+        reintentos (int): Reintentos por lote antes de darlo por fallido
+        espera_inicial (float): Segundos de espera antes del primer reintento
+        fallidas (List): Notificaciones que no se pudieron entregar
+    """
+
+    _FIN = object()
+
+    def __init__(self, transporte: Transporte, tam_lote: int = 50, capacidad: int = 10000,
+                 reintentos: int = 3, espera_inicial: float = 0.1, hilos: int = 1):
+        """
+        Inicializa el despachador y arranca sus hilos.
+
+        Args:
+            transporte (Transporte): Canal de envío
+            tam_lote (int): Máximo de notificaciones por envío
+            capacidad (int): Tamaño máximo de la cola
+            reintentos (int): Reintentos por lote
+            espera_inicial (float): Segundos antes del primer reintento (se duplica en cada uno)
+            hilos (int): Número de hilos de envío
+        """
+        self.transporte = transporte
+        self.tam_lote = tam_lote
+        self.reintentos = reintentos
+        self.espera_inicial = espera_inicial
+        self.fallidas = []
+        self._cola: queue.Queue = queue.Queue(maxsize=capacidad)
+        self._lock = threading.Lock()
+        self._metricas = {"encoladas": 0, "enviadas": 0, "lotes": 0,
+                          "reintentos": 0, "fallidas": 0, "segundos_envio": 0.0}
+        self._hilos = [threading.Thread(target=self._trabajar, daemon=True,
+                                        name=f"despacho-{i}")
+                       for i in range(hilos)]
+        for hilo in self._hilos:
+            hilo.start()
+
+    def encolar(self, notificacion, timeout: float = None):
+        """
+        Deja una notificación en la cola de envío.
+
+        Args:
+            notificacion: Objeto Notificacion
+            timeout (float): Segundos máximos de espera si la cola está llena (None = sin límite)
+
+        Raises:
+            queue.Full: Si la cola sigue llena tras el timeout
+        """
+        self._cola.put(notificacion, timeout=timeout)
+        with self._lock:
+            self._metricas["encoladas"] += 1
+
+    def _trabajar(self):
+        """Bucle de un hilo de envío (método privado)."""
+        while True:
+            primera = self._cola.get()
+            if primera is self._FIN:
+                self._cola.task_done()
+                return
+            lote = [primera]
+            fin_recibido = False
+            while len(lote) < self.tam_lote:
+                try:
+                    siguiente = self._cola.get_nowait()
+                except queue.Empty:
+                    break
+                if siguiente is self._FIN:
+                    fin_recibido = True
+                    break
+                lote.append(siguiente)
+
+            self._enviar(lote)
+            for _ in range(len(lote) + fin_recibido):
+                self._cola.task_done()
+            if fin_recibido:
+                return
+
+    def _enviar(self, lote: List):
+        """
+        Envía un lote con reintentos y espera exponencial (método privado).
+
+        Args:
+            lote (List): Notificaciones a enviar
+        """
+        espera = self.espera_inicial
+        for intento in range(self.reintentos + 1):
+            inicio = time.perf_counter()
+            try:
+                self.transporte.enviar_lote(lote)
+            except Exception:
+                if intento == self.reintentos:
+                    with self._lock:
+                        self._metricas["fallidas"] += len(lote)
+                        self.fallidas.extend(lote)
+                    return
+                with self._lock:
+                    self._metricas["reintentos"] += 1
+                time.sleep(espera)
+                espera *= 2
+                continue
+            with self._lock:
+                self._metricas["enviadas"] += len(lote)
+                self._metricas["lotes"] += 1
+                self._metricas["segundos_envio"] += time.perf_counter() - inicio
+            return
+
+    def esperar(self):
+        """Bloquea hasta que todo lo encolado se haya enviado o dado por fallido."""
+        self._cola.join()
+
+    def metricas(self) -> Dict[str, float]:
+        """
+        Obtiene las métricas de entrega.
+
+        Returns:
+            Dict: Contadores de encoladas, enviadas, lotes, reintentos, fallidas,
+                  pendientes y tiempo total de envío
+        """
+        with self._lock:
+            datos = dict(self._metricas)
+        datos["pendientes"] = self._cola.qsize()
+        return datos
+
+    def detener(self):
+        """Envía lo pendiente y detiene los hilos."""
+        for _ in self._hilos:
+            self._cola.put(self._FIN)
+        for hilo in self._hilos:
+            hilo.join()
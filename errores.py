@@ -0,0 +1,45 @@
+"""
+Módulo: errores.py
+Descripción: Excepciones de BookMeService. Las operaciones estrictas (reservar_cita,
+             reprogramar_cita, anular_cita) las lanzan en lugar de imprimir el error y
+             devolver None.
+"""
+
+
+class ErrorBookMe(Exception):
+    """Error base de las operaciones de BookMe."""
+
+
+class NoEncontrado(ErrorBookMe, LookupError):
+    """
+    Un usuario, servicio o cita no existe.
+
+    Atributos:
+        tipo (str): Tipo de objeto buscado ("Cliente", "Empleado", "Servicio", "Cita", "Serie")
+        id (str): ID buscado
+    """
+
+    def __init__(self, tipo: str, id: str):
+        super().__init__(f"{tipo} {id} no encontrado" if tipo not in ("Cita", "Serie")
+                         else f"{tipo} {id} no encontrada")
+        self.tipo = tipo
+        self.id = id
+
+
+class HorarioOcupado(ErrorBookMe, ValueError):
+    """
+    La cita se solapa con otra activa del mismo empleado.
+
+    Atributos:
+        empleado: Empleado de la cita
+        conflicto (str): ID de la cita con la que se solapa
+    """
+
+    def __init__(self, empleado, conflicto: str):
+        super().__init__(f"{empleado.nombre} ya tiene la cita {conflicto} en ese horario")
+        self.empleado = empleado
+        self.conflicto = conflicto
+
+
+class OperacionNoValida(ErrorBookMe, ValueError):
+    """La operación no se puede aplicar en el estado actual (p. ej. cancelar una cita completada)."""
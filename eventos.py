@@ -0,0 +1,426 @@
+"""
+Módulo: eventos.py
+Descripción: Repositorio de BookMeService basado en un registro de eventos de solo escritura
+             al final (write-ahead log) con confirmación agrupada e instantáneas periódicas.
+             Al arrancar se carga la última instantánea y se reaplica el final del registro.
+"""
+
+import os
+import pickle
+import struct
+import threading
+import zlib
+from typing import Dict, List, Optional, Tuple
+
+from repositorio import Repositorio
+from series import excepciones_a_texto
+
+
+class RepositorioEventos(Repositorio):
+    """
+    Repositorio que guarda cada escritura como un evento en un registro de solo añadir.
+
+    Cada operación que modifica el servicio añade un evento compacto, por
+    ejemplo ("c", id, cliente, empleado, servicio, inicio, fin, estado) para
+    una cita; el estado se mantiene además en memoria en forma de filas, igual
+    que las que devuelve RepositorioSQLite, para responder a las lecturas.
+
+    Confirmación agrupada: los eventos se acumulan en un búfer y se escriben y
+    sincronizan con disco (fsync) cuando hay `tam_lote` pendientes, al cerrar
+    la transacción más externa o al llamar a confirmar(). Con tam_lote = 1
+    cada evento se sincroniza por separado. Si varios hilos confirman a la vez,
+    un único fsync cubre los eventos de todos: quien llega mientras otro
+    sincroniza y ve que sus eventos ya están en disco no repite el fsync.
+
+    Cada sincronización escribe un bloque: longitud y CRC-32 (struct CABECERA)
+    seguidos de la lista de eventos serializada con pickle. Al arrancar se
+    leen bloques enteros en lugar de interpretar un evento por línea.
+
+    Cada `eventos_por_instantanea` eventos se guarda una instantánea de todas
+    las filas (pickle, escrita en un fichero temporal y renombrada, con fsync
+    de la carpeta para que el renombrado sobreviva a un corte) y se vacía el
+    registro. Los eventos son idempotentes (cada uno fija el valor de una
+    fila), así que si el proceso cae entre la instantánea y el vaciado basta con
+    reaplicarlos. Un último bloque incompleto o con CRC erróneo (escritura
+    interrumpida) se descarta. La instantánea se serializa a partir de una
+    copia de las filas tomada con el cerrojo, así que las escrituras de otros
+    hilos no esperan al pickle ni al fsync.
+
+    Como la bandeja del servicio, de cada usuario se conservan todas las
+    notificaciones no leídas y solo las `max_leidas` leídas más recientes; las
+    demás salen de las filas en memoria (y de la siguiente instantánea).
+
+    Los eventos de una transacción se apartan por hilo y solo se aplican a las
+    filas y pasan al búfer, todos juntos, al cerrar la más externa sin error;
+    si el bloque falla se descartan sin llegar al registro (ver el contrato
+    de Repositorio).
+
+    Atributos:
+        directorio (str): Carpeta con el registro y la instantánea
+        tam_lote (int): Eventos pendientes que provocan una sincronización
+        eventos_por_instantanea (int): Eventos entre instantáneas (None = solo manuales)
+        eventos_recuperados (int): Eventos reaplicados del registro al arrancar
+        max_leidas (int): Notificaciones leídas que se conservan por usuario (None = todas)
+    """
+
+    REGISTRO = "eventos.log"
+    INSTANTANEA = "instantanea.pickle"
+    # Cabecera de cada bloque del registro: longitud y CRC-32 de los datos
+    CABECERA = struct.Struct("<II")
+
+    def __init__(self, directorio: str, tam_lote: int = 1,
+                 eventos_por_instantanea: Optional[int] = 100000,
+                 max_leidas: Optional[int] = 100):
+        """
+        Abre (o crea) el registro y recupera el estado guardado.
+
+        Args:
+            directorio (str): Carpeta del registro (se crea si no existe)
+            tam_lote (int): Eventos pendientes que provocan una sincronización
+            eventos_por_instantanea (int): Eventos entre instantáneas automáticas
+            max_leidas (int): Notificaciones leídas que se conservan por usuario (None = todas)
+
+        Raises:
+            ValueError: Si max_leidas es menor que 1
+        """
+        # Con al menos una leída por usuario nunca se descarta la notificación
+        # más reciente, de la que depende ultimo_id("notificacion")
+        if max_leidas is not None and max_leidas < 1:
+            raise ValueError("max_leidas debe ser al menos 1")
+        super().__init__()
+        self.directorio = directorio
+        self.tam_lote = tam_lote
+        self.eventos_por_instantanea = eventos_por_instantanea
+        self.max_leidas = max_leidas
+        os.makedirs(directorio, exist_ok=True)
+        self._ruta_registro = os.path.join(directorio, self.REGISTRO)
+        self._ruta_instantanea = os.path.join(directorio, self.INSTANTANEA)
+
+        # Filas en memoria, en el formato de RepositorioSQLite.cargar()
+        self._usuarios: Dict[str, tuple] = {}
+        self._servicios: Dict[str, tuple] = {}
+        self._horarios: Dict[str, tuple] = {}
+        self._citas: Dict[str, tuple] = {}
+        self._notificaciones: Dict[str, tuple] = {}
+        self._series: Dict[str, tuple] = {}
+        self._citas_cliente: Dict[str, List[str]] = {}
+        self._notificaciones_usuario: Dict[str, List[str]] = {}
+        # Notificaciones leídas que se conservan de cada usuario
+        self._leidas_usuario: Dict[str, int] = {}
+
+        self._lock = threading.RLock()
+        # Serializa las escrituras en disco; se toma antes que _lock, nunca después
+        self._lock_disco = threading.Lock()
+        self._bufer: List[tuple] = []
+        self._lsn = 0
+        self._lsn_en_disco = 0
+        self._eventos_en_registro = 0
+
+        self._recuperar()
+        self._fichero = open(self._ruta_registro, "ab")
+
+    # RECUPERACIÓN
+
+    def _recuperar(self):
+        """
+        Carga la instantánea y reaplica el registro (método privado).
+
+        Si el último bloque está incompleto o dañado se recorta el fichero hasta
+        el último bloque válido.
+        """
+        if os.path.exists(self._ruta_instantanea):
+            with open(self._ruta_instantanea, "rb") as fichero:
+                filas = pickle.load(fichero)
+            (self._usuarios, self._servicios, self._horarios, self._citas,
+             self._notificaciones, self._citas_cliente, self._notificaciones_usuario) = filas[:7]
+            # Las instantáneas anteriores a las series no las incluyen
+            if len(filas) > 7:
+                self._series = filas[7]
+            for fila in self._notificaciones.values():
+                if fila[5]:
+                    self._leidas_usuario[fila[1]] = self._leidas_usuario.get(fila[1], 0) + 1
+
+        self.eventos_recuperados = 0
+        if not os.path.exists(self._ruta_registro):
+            return
+        with open(self._ruta_registro, "rb") as fichero:
+            datos = fichero.read()
+        cabecera = self.CABECERA.size
+        valido = 0
+        while valido + cabecera <= len(datos):
+            longitud, crc = self.CABECERA.unpack_from(datos, valido)
+            bloque = datos[valido + cabecera:valido + cabecera + longitud]
+            if len(bloque) < longitud or zlib.crc32(bloque) != crc:
+                break
+            eventos = pickle.loads(bloque)
+            for evento in eventos:
+                self._aplicar(evento)
+            valido += cabecera + longitud
+            self.eventos_recuperados += len(eventos)
+        if valido < len(datos):
+            os.truncate(self._ruta_registro, valido)
+        self._eventos_en_registro = self.eventos_recuperados
+
+    def _aplicar(self, evento: tuple):
+        """
+        Aplica un evento a las filas en memoria (método privado).
+
+        Se usa igual al escribir que al recuperar, y aplicar dos veces el mismo
+        evento deja el mismo resultado.
+
+        Args:
+            evento (tuple): Código del evento seguido de sus datos
+        """
+        tipo = evento[0]
+        if tipo == "c":
+            cita_id = evento[1]
+            if cita_id not in self._citas:
+                self._citas_cliente.setdefault(evento[2], []).append(cita_id)
+            self._citas[cita_id] = evento[1:]
+        elif tipo == "n":
+            notificacion_id = evento[1]
+            anterior = self._notificaciones.get(notificacion_id)
+            if anterior is None:
+                self._notificaciones_usuario.setdefault(evento[2], []).append(notificacion_id)
+            self._notificaciones[notificacion_id] = evento[1:]
+            if evento[6] and not (anterior and anterior[5]):
+                self._contar_leida(evento[2])
+        elif tipo == "l":
+            fila = self._notificaciones.get(evento[1])
+            if fila is not None and not fila[5]:
+                self._notificaciones[evento[1]] = fila[:5] + (1,)
+                self._contar_leida(fila[1])
+        elif tipo == "u":
+            self._usuarios[evento[1]] = evento[1:]
+        elif tipo == "s":
+            self._servicios[evento[1]] = evento[1:] + (1,)
+        elif tipo == "b":
+            fila = self._servicios.get(evento[1])
+            if fila is not None:
+                self._servicios[evento[1]] = fila[:5] + (0,)
+        elif tipo == "h":
+            self._horarios[evento[1]] = evento[1:]
+        elif tipo == "r":
+            self._series[evento[1]] = evento[1:]
+        else:
+            raise ValueError(f"Evento desconocido: {tipo!r}")
+
+    def _contar_leida(self, usuario_id: str):
+        """
+        Anota una notificación leída más y descarta las sobrantes (método privado).
+
+        Se descartan las leídas más antiguas del usuario, en orden de llegada,
+        igual que BandejaNotificaciones.
+
+        Args:
+            usuario_id (str): Destinatario de la notificación leída
+        """
+        leidas = self._leidas_usuario.get(usuario_id, 0) + 1
+        if self.max_leidas is not None and leidas > self.max_leidas:
+            ids = self._notificaciones_usuario[usuario_id]
+            quedan = []
+            for notificacion_id in ids:
+                if leidas > self.max_leidas and self._notificaciones[notificacion_id][5]:
+                    del self._notificaciones[notificacion_id]
+                    leidas -= 1
+                else:
+                    quedan.append(notificacion_id)
+            ids[:] = quedan
+        self._leidas_usuario[usuario_id] = leidas
+
+    # ESCRITURA
+
+    def _escribir(self, evento: tuple):
+        """
+        Aplica un evento (o lo aparta si hay transacción) y sincroniza si toca
+        (método privado).
+
+        Args:
+            evento (tuple): Código del evento seguido de sus datos
+        """
+        if not self._diferir(evento):
+            self._aplicar_escrituras([evento])
+
+    def _aplicar_escrituras(self, eventos: List[tuple]):
+        with self._lock:
+            for evento in eventos:
+                self._aplicar(evento)
+            self._bufer.extend(eventos)
+            self._lsn += len(eventos)
+            lsn = self._lsn
+            sincronizar = lsn - self._lsn_en_disco >= self.tam_lote
+        if sincronizar:
+            self._sincronizar(lsn)
+
+    def _sincronizar(self, lsn: int):
+        """
+        Escribe el búfer y hace fsync hasta cubrir el evento `lsn` (método privado).
+
+        Args:
+            lsn (int): Número del último evento que debe quedar en disco
+        """
+        with self._lock_disco:
+            if self._lsn_en_disco >= lsn:
+                # Otro hilo ya sincronizó estos eventos mientras esperábamos
+                return
+            with self._lock:
+                eventos, self._bufer = self._bufer, []
+                hasta = self._lsn
+            bloque = pickle.dumps(eventos, protocol=pickle.HIGHEST_PROTOCOL)
+            self._fichero.write(self.CABECERA.pack(len(bloque), zlib.crc32(bloque)) + bloque)
+            self._fichero.flush()
+            os.fsync(self._fichero.fileno())
+            self._lsn_en_disco = hasta
+            self._eventos_en_registro += len(eventos)
+            if (self.eventos_por_instantanea is not None
+                    and self._eventos_en_registro >= self.eventos_por_instantanea):
+                self._guardar_instantanea()
+
+    def _guardar_instantanea(self):
+        """
+        Guarda todas las filas y vacía el registro (método privado).
+
+        Se llama con _lock_disco tomado, así que nadie más escribe el registro ni
+        vacía el búfer mientras tanto. Con _lock solo se copian las filas; el
+        pickle y los fsync se hacen sin él.
+        """
+        with self._lock:
+            filas = (dict(self._usuarios), dict(self._servicios), dict(self._horarios),
+                     dict(self._citas), dict(self._notificaciones),
+                     {cliente: list(ids) for cliente, ids in self._citas_cliente.items()},
+                     {usuario: list(ids)
+                      for usuario, ids in self._notificaciones_usuario.items()},
+                     dict(self._series))
+            # Los eventos ya en el búfer están aplicados y entran en la instantánea
+            en_bufer = len(self._bufer)
+            lsn = self._lsn
+        temporal = self._ruta_instantanea + ".tmp"
+        with open(temporal, "wb") as fichero:
+            pickle.dump(filas, fichero, protocol=pickle.HIGHEST_PROTOCOL)
+            fichero.flush()
+            os.fsync(fichero.fileno())
+        os.replace(temporal, self._ruta_instantanea)
+        self._sincronizar_directorio()
+        self._fichero.truncate(0)
+        os.fsync(self._fichero.fileno())
+        with self._lock:
+            # Los llegados durante la copia no están en la instantánea: se quedan en el búfer
+            del self._bufer[:en_bufer]
+            self._eventos_en_registro = 0
+            self._lsn_en_disco = lsn
+
+    def _sincronizar_directorio(self):
+        """
+        Hace fsync de la carpeta para que un renombrado quede en disco (método privado).
+
+        Sin él, tras un corte de luz la carpeta podría seguir apuntando a la
+        instantánea anterior aunque el registro ya se hubiera vaciado. En
+        sistemas que no permiten abrir carpetas (Windows) no se hace nada.
+        """
+        try:
+            descriptor = os.open(self.directorio, os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.fsync(descriptor)
+        finally:
+            os.close(descriptor)
+
+    def instantanea(self):
+        """Guarda una instantánea ahora y vacía el registro."""
+        with self._lock_disco:
+            self._guardar_instantanea()
+
+    def guardar_usuario(self, usuario):
+        self._escribir(("u", usuario.id, type(usuario).__name__.lower(), usuario.nombre,
+                        usuario.email, getattr(usuario, "teléfono", None),
+                        getattr(usuario, "especialidad", None)))
+
+    def guardar_servicio(self, servicio):
+        self._escribir(("s", servicio.id, servicio.nombre, servicio.descripcion,
+                        servicio.duracion, servicio.precio))
+
+    def eliminar_servicio(self, servicio_id: str):
+        self._escribir(("b", servicio_id))
+
+    def guardar_horario(self, empleado_id: str, horario):
+        self._escribir(("h", empleado_id, horario.dia, horario.hora_inicio, horario.hora_fin,
+                        ",".join(horario.pausas)))
+
+    def guardar_cita(self, cita):
+        self._escribir(("c", cita.id, cita.cliente.id, cita.empleado.id, cita.servicio.id,
+                        cita.inicio, cita.fin, cita.estado))
+
+    def guardar_notificacion(self, notificacion):
+        self._escribir(("n", notificacion.id, notificacion.destinatario.id,
+                        notificacion.mensaje, notificacion.tipo, notificacion.fecha_envio,
+                        int(notificacion.leida)))
+
+    def marcar_notificacion_leida(self, notificacion_id: str):
+        self._escribir(("l", notificacion_id))
+
+    def guardar_serie(self, serie):
+        regla = serie.regla
+        self._escribir(("r", serie.id, serie.cliente.id, serie.empleado.id, serie.servicio.id,
+                        serie.inicio, serie.duracion, regla.frecuencia, regla.intervalo,
+                        regla.repeticiones, regla.hasta, serie.repeticiones,
+                        excepciones_a_texto(serie.excepciones)))
+
+    def confirmar(self):
+        with self._lock:
+            lsn = self._lsn
+        self._sincronizar(lsn)
+
+    def cerrar(self):
+        self.confirmar()
+        with self._lock_disco:
+            self._fichero.close()
+
+    # LECTURA
+
+    def cargar(self) -> Dict[str, List[tuple]]:
+        with self._lock:
+            return {
+                "usuarios": list(self._usuarios.values()),
+                "servicios": list(self._servicios.values()),
+                "horarios": list(self._horarios.values()),
+                "citas": list(self._citas.values()),
+                "series": list(self._series.values()),
+                "notificaciones": list(self._notificaciones.values()),
+            }
+
+    def ultimo_id(self, tabla: str) -> int:
+        filas = {"usuario": self._usuarios, "servicio": self._servicios,
+                 "cita": self._citas, "notificacion": self._notificaciones,
+                 "serie": self._series}.get(tabla)
+        if filas is None:
+            raise ValueError(f"Tabla desconocida: {tabla}")
+        with self._lock:
+            return max((int(id[3:]) for id in filas if id[3:].isdigit()), default=0)
+
+    def ids_citas_cliente(self, cliente_id: str) -> List[str]:
+        with self._lock:
+            return list(self._citas_cliente.get(cliente_id, ()))
+
+    def notificaciones_de(self, usuario_id: str) -> List[Tuple]:
+        with self._lock:
+            return [(fila[0],) + fila[2:]
+                    for fila in map(self._notificaciones.__getitem__,
+                                    self._notificaciones_usuario.get(usuario_id, ()))]
+
+    def estadisticas(self) -> Dict[str, float]:
+        with self._lock:
+            datos = {"cliente": 0, "empleado": 0, "administrador": 0,
+                     "confirmada": 0, "cancelada": 0, "completada": 0, "pendiente": 0}
+            for fila in self._usuarios.values():
+                datos[fila[1]] = datos.get(fila[1], 0) + 1
+            ingresos = 0
+            for fila in self._citas.values():
+                datos[fila[6]] = datos.get(fila[6], 0) + 1
+                if fila[6] == "confirmada":
+                    ingresos += self._servicios[fila[3]][4]
+            datos["usuarios"] = datos["cliente"] + datos["empleado"] + datos["administrador"]
+            datos["servicios"] = sum(1 for fila in self._servicios.values() if fila[5])
+            datos["citas"] = len(self._citas)
+            datos["ingresos"] = ingresos
+            return datos
@@ -3,7 +3,10 @@ Módulo: horario.py
 Descripción: Define la clase Horario que gestiona la disponibilidad del negocio y empleados.
 """
 
-from typing import List, Dict
+import threading
+from bisect import bisect_right
+from typing import Iterable, List, Dict, Tuple
+from tiempo import dia_semana, hora_a_minutos, indice_dia_semana, minutos_a_hora
 
 
 class Horario:
@@ -14,10 +17,17 @@ class Horario:
         dia (str): Día de la semana
         hora_inicio (str): Hora de inicio en formato "HH:MM"
         hora_fin (str): Hora de fin en formato "HH:MM"
-        pausas (List): Lista de pausas/descansos
+        pausas (Tuple): Pausas/descansos "HH:MM-HH:MM" (solo lectura; se reasignan enteras)
+    
+    Las horas y pausas se interpretan una sola vez y se guardan como tramos
+    (inicio, fin) en minutos enteros; las consultas trabajan solo con enteros.
     """
     
+    __slots__ = ("id", "_pausas", "_dia", "_dia_semana", "_hora_inicio", "_hora_fin",
+                 "_tramos", "_inicio_jornada", "_inicios_tramos")
+    
     contador_id = 3000
+    _lock_id = threading.Lock()
     
     def __init__(self, dia: str, hora_inicio: str, hora_fin: str, pausas: List[str] = None):
         """
@@ -29,13 +39,90 @@ class Horario:
             hora_fin (str): Hora de fin "HH:MM"
             pausas (List): Lista de pausas, ejemplo: ["12:00-13:00"]
         """
-        self.id = f"HOR{Horario.contador_id}"
-        Horario.contador_id += 1
+        with Horario._lock_id:
+            self.id = f"HOR{Horario.contador_id}"
+            Horario.contador_id += 1
+        self._tramos = None
         self.dia = dia
         self.hora_inicio = hora_inicio
         self.hora_fin = hora_fin
         self.pausas = pausas if pausas else []
     
+    # Las cadenas se interpretan una sola vez: cualquier cambio en ellas
+    # invalida la representación compilada en minutos enteros.
+    
+    @property
+    def dia(self) -> str:
+        """Día de la semana del horario."""
+        return self._dia
+    
+    @dia.setter
+    def dia(self, valor: str):
+        self._dia = valor
+        self._dia_semana = indice_dia_semana(valor)
+    
+    @property
+    def hora_inicio(self) -> str:
+        """Hora de inicio "HH:MM"."""
+        return self._hora_inicio
+    
+    @hora_inicio.setter
+    def hora_inicio(self, valor: str):
+        self._hora_inicio = valor
+        self._tramos = None
+    
+    @property
+    def hora_fin(self) -> str:
+        """Hora de fin "HH:MM"."""
+        return self._hora_fin
+    
+    @hora_fin.setter
+    def hora_fin(self, valor: str):
+        self._hora_fin = valor
+        self._tramos = None
+    
+    @property
+    def pausas(self) -> Tuple[str, ...]:
+        """Pausas "HH:MM-HH:MM" (tupla: para cambiarlas se reasigna el atributo)."""
+        return self._pausas
+    
+    @pausas.setter
+    def pausas(self, valor: Iterable[str]):
+        self._pausas = tuple(valor)
+        self._tramos = None
+    
+    def _compilar(self) -> Tuple[Tuple[int, int], ...]:
+        """
+        Interpreta horas y pausas y guarda los tramos de trabajo en minutos (método privado).
+        
+        Todo se calcula en variables locales y se publica al final, con _tramos
+        en último lugar: quien vea _tramos distinto de None ve también sus inicios.
+        
+        Returns:
+            Tuple: Tramos (inicio, fin) en minutos desde medianoche, ordenados y sin pausas
+        """
+        inicio_jornada = hora_a_minutos(self.hora_inicio)
+        tramos = [(inicio_jornada, hora_a_minutos(self.hora_fin))]
+        for pausa in sorted(self.pausas):
+            pausa_inicio, pausa_fin = pausa.split('-')
+            pausa_inicio_min = hora_a_minutos(pausa_inicio)
+            pausa_fin_min = hora_a_minutos(pausa_fin)
+            nuevos = []
+            for inicio, fin in tramos:
+                if pausa_fin_min <= inicio or pausa_inicio_min >= fin:
+                    nuevos.append((inicio, fin))
+                    continue
+                if inicio < pausa_inicio_min:
+                    nuevos.append((inicio, pausa_inicio_min))
+                if pausa_fin_min < fin:
+                    nuevos.append((pausa_fin_min, fin))
+            tramos = nuevos
+        
+        tramos = tuple(tramos)
+        inicios = [inicio for inicio, _ in tramos]
+        self._inicio_jornada, self._inicios_tramos, self._tramos = inicio_jornada, inicios, tramos
+        return tramos
+    
     def disponible(self, hora_consultada: str) -> bool:
         """
         Verifica si el horario está disponible a una hora determinada.
@@ -46,28 +133,63 @@ class Horario:
         Returns:
             bool: True si está disponible, False en caso contrario
         """
-        # Convertir horas a minutos para facilitar la comparación
-        def hora_a_minutos(hora: str) -> int:
-            h, m = map(int, hora.split(':'))
-            return h * 60 + m
+        return self.disponible_minuto(hora_a_minutos(hora_consultada))
+    
+    def disponible_minuto(self, minuto: int) -> bool:
+        """
+        Verifica la disponibilidad a partir de los minutos desde medianoche.
         
-        hora_consulta_min = hora_a_minutos(hora_consultada)
-        inicio_min = hora_a_minutos(self.hora_inicio)
-        fin_min = hora_a_minutos(self.hora_fin)
+        Args:
+            minuto (int): Minuto del día a consultar
         
-        # Verificar si está dentro del horario general
-        if not (inicio_min <= hora_consulta_min < fin_min):
-            return False
+        Returns:
+            bool: True si está disponible, False en caso contrario
+        """
+        tramos = self._tramos if self._tramos is not None else self._compilar()
+        i = bisect_right(self._inicios_tramos, minuto) - 1
+        return i >= 0 and minuto < tramos[i][1]
+    
+    def trabaja_el(self, dia_semana: int) -> bool:
+        """
+        Indica si el horario se aplica a un día de la semana.
         
-        # Verificar si coincide con alguna pausa
-        for pausa in self.pausas:
-            pausa_inicio, pausa_fin = pausa.split('-')
-            pausa_inicio_min = hora_a_minutos(pausa_inicio)
-            pausa_fin_min = hora_a_minutos(pausa_fin)
-            if pausa_inicio_min <= hora_consulta_min < pausa_fin_min:
-                return False
+        Si el campo dia no es un día reconocible se considera que el horario
+        se aplica todos los días.
+        
+        Args:
+            dia_semana (int): Día de la semana (0 = lunes)
+        
+        Returns:
+            bool: True si el horario se aplica ese día
+        """
+        return self._dia_semana is None or self._dia_semana == dia_semana
+    
+    def tramos_disponibles(self) -> Tuple[Tuple[int, int], ...]:
+        """
+        Obtiene los tramos de trabajo del día descontando las pausas.
+        
+        Returns:
+            Tuple: Tramos (inicio, fin) en minutos desde medianoche, ordenados
+        """
+        return self._tramos if self._tramos is not None else self._compilar()
+    
+    def capacidad(self, desde_dia: int, hasta_dia: int) -> int:
+        """
+        Calcula los minutos de trabajo (sin pausas) en un rango de días.
         
-        return True
+        Args:
+            desde_dia (int): Primer día, contado desde 1970-01-01
+            hasta_dia (int): Día siguiente al último (excluido)
+        
+        Returns:
+            int: Minutos de trabajo en el rango
+        """
+        dias = max(0, hasta_dia - desde_dia)
+        if self._dia_semana is not None:
+            # Solo cuentan los días de [desde_dia, hasta_dia) con ese día de la semana
+            primero = desde_dia + (self._dia_semana - dia_semana(desde_dia)) % 7
+            dias = len(range(primero, hasta_dia, 7))
+        return dias * sum(fin - inicio for inicio, fin in self.tramos_disponibles())
     
     def agregar_pausa(self, pausa: str) -> str:
         """
@@ -79,7 +201,7 @@ class Horario:
         Returns:
             str: Mensaje de confirmación
         """
-        self.pausas.append(pausa)
+        self.pausas = self.pausas + (pausa,)
         return f"Pausa {pausa} agregada al horario"
     
     def obtener_horas_disponibles(self) -> List[str]:
@@ -89,25 +211,17 @@ class Horario:
         Returns:
             List[str]: Lista de horas disponibles
         """
-        horas_disponibles = []
-        
-        def hora_a_minutos(hora: str) -> int:
-            h, m = map(int, hora.split(':'))
-            return h * 60 + m
+        tramos = self.tramos_disponibles()
+        if not tramos:
+            return []
         
-        def minutos_a_hora(minutos: int) -> str:
-            h = minutos // 60
-            m = minutos % 60
-            return f"{h:02d}:{m:02d}"
-        
-        inicio_min = hora_a_minutos(self.hora_inicio)
-        fin_min = hora_a_minutos(self.hora_fin)
-        
-        # Generar horas cada 30 minutos
-        for minuto in range(inicio_min, fin_min, 30):
-            hora = minutos_a_hora(minuto)
-            if self.disponible(hora):
-                horas_disponibles.append(hora)
+        # Marcas cada 30 minutos desde la hora de inicio que caen dentro de un tramo
+        inicio_min = self._inicio_jornada
+        horas_disponibles = []
+        for inicio, fin in tramos:
+            primera = inicio_min + -(-(inicio - inicio_min) // 30) * 30
+            for minuto in range(primera, fin, 30):
+                horas_disponibles.append(minutos_a_hora(minuto))
         
         return horas_disponibles
     
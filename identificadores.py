@@ -0,0 +1,104 @@
+"""
+Módulo: identificadores.py
+Descripción: Generador de IDs propio de un negocio. Sustituye a los contadores de clase
+             (Usuario.contador_id, Cita.contador_id...), que son comunes a todo el proceso,
+             cuando varios negocios conviven en el mismo proceso.
+"""
+
+import threading
+from typing import Dict, Optional
+
+
+class GeneradorIds:
+    """
+    Contadores de IDs de usuarios, servicios, citas, notificaciones y series de un negocio.
+
+    Genera los mismos formatos que los contadores de clase ("USR1000",
+    "CIT4000"...), pero cada negocio lleva su propia numeración, así que dos
+    negocios pueden tener una cita "CIT4000" sin mezclarse. Las tablas se
+    nombran como en Repositorio.ultimo_id.
+
+    Con `paso` > 1 solo se generan los números inicial + desfase + k * paso:
+    varios generadores con el mismo paso y desfases distintos nunca coinciden,
+    y el desfase de un ID se recupera con (número - inicial) % paso.
+
+    Atributos:
+        paso (int): Separación entre números consecutivos
+        desfase (int): Desplazamiento sobre el primer número de cada tabla
+        _siguientes (Dict[str, int]): Tabla -> siguiente número a asignar
+    """
+
+    # Tabla -> (prefijo, primer número), igual que los contadores de clase
+    TABLAS = {
+        "usuario": ("USR", 1000),
+        "servicio": ("SRV", 2000),
+        "cita": ("CIT", 4000),
+        "notificacion": ("NOT", 5000),
+        "serie": ("SER", 7000),
+    }
+
+    def __init__(self, paso: int = 1, desfase: int = 0):
+        """
+        Inicializa los contadores en su primer número.
+
+        Args:
+            paso (int): Separación entre números consecutivos
+            desfase (int): Desplazamiento sobre el primer número, entre 0 y paso - 1
+
+        Raises:
+            ValueError: Si el desfase no está entre 0 y paso - 1
+        """
+        if not 0 <= desfase < paso:
+            raise ValueError(f"Desfase {desfase} no válido para paso {paso}")
+        self.paso = paso
+        self.desfase = desfase
+        self._siguientes: Dict[str, int] = {tabla: inicial + desfase
+                                            for tabla, (_, inicial) in self.TABLAS.items()}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def numero(cls, tabla: str, objeto_id: str) -> Optional[int]:
+        """
+        Número de un ID con el formato de una tabla.
+
+        Args:
+            tabla (str): Tabla del ID
+            objeto_id (str): ID a interpretar
+
+        Returns:
+            int: Número del ID, o None si no tiene el prefijo de la tabla seguido de dígitos
+        """
+        prefijo = cls.TABLAS[tabla][0]
+        if not objeto_id.startswith(prefijo) or not objeto_id[len(prefijo):].isdigit():
+            return None
+        return int(objeto_id[len(prefijo):])
+
+    def siguiente(self, tabla: str) -> str:
+        """
+        Genera un ID nuevo.
+
+        Args:
+            tabla (str): "usuario", "servicio", "cita", "notificacion" o "serie"
+
+        Returns:
+            str: ID con el prefijo de la tabla
+        """
+        prefijo = self.TABLAS[tabla][0]
+        with self._lock:
+            numero = self._siguientes[tabla]
+            self._siguientes[tabla] = numero + self.paso
+        return f"{prefijo}{numero}"
+
+    def avanzar(self, tabla: str, ultimo_numero: int):
+        """
+        Asegura que no se reutilicen IDs ya guardados.
+
+        Args:
+            tabla (str): Tabla del contador
+            ultimo_numero (int): Número más alto ya usado
+        """
+        primero = self.TABLAS[tabla][1] + self.desfase
+        with self._lock:
+            if ultimo_numero >= self._siguientes[tabla]:
+                numero = ultimo_numero + 1
+                self._siguientes[tabla] = numero + (primero - numero) % self.paso
@@ -0,0 +1,522 @@
+"""
+Módulo: indices.py
+Descripción: Estructuras de índice en memoria usadas por BookMeService para responder
+             consultas sin recorrer todas las citas del sistema.
+"""
+
+from bisect import bisect_left, bisect_right, insort
+from heapq import merge
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from tiempo import MINUTOS_DIA
+
+
+class IndiceIntervalos:
+    """
+    Conjunto ordenado de intervalos [inicio, fin) que no se solapan entre sí.
+
+    Se usa como agenda de un empleado: cada intervalo es una cita activa expresada
+    en minutos enteros. Las consultas de solapamiento usan búsqueda binaria, O(log n).
+
+    Atributos:
+        _inicios (List[int]): Inicios de los intervalos, ordenados
+        _fines (List[int]): Fines de los intervalos, en el mismo orden
+        _ids (List[str]): ID de la cita asociada a cada intervalo
+    """
+
+    def __init__(self):
+        """Inicializa un índice vacío."""
+        self._inicios: List[int] = []
+        self._fines: List[int] = []
+        self._ids: List[str] = []
+
+    def solapa(self, inicio: int, fin: int) -> Optional[str]:
+        """
+        Busca un intervalo que se solape con [inicio, fin).
+
+        Args:
+            inicio (int): Minuto de inicio
+            fin (int): Minuto de fin
+
+        Returns:
+            str: ID de la cita que se solapa o None si el hueco está libre
+        """
+        # Al no haber solapamientos, los fines también están ordenados:
+        # basta con mirar el intervalo anterior y el siguiente.
+        i = bisect_right(self._inicios, inicio)
+        if i > 0 and self._fines[i - 1] > inicio:
+            return self._ids[i - 1]
+        if i < len(self._inicios) and self._inicios[i] < fin:
+            return self._ids[i]
+        return None
+
+    def insertar(self, inicio: int, fin: int, cita_id: str) -> Optional[str]:
+        """
+        Inserta un intervalo si no se solapa con ninguno existente.
+
+        Args:
+            inicio (int): Minuto de inicio
+            fin (int): Minuto de fin
+            cita_id (str): ID de la cita
+
+        Returns:
+            str: ID de la cita en conflicto, o None si se insertó correctamente
+        """
+        conflicto = self.solapa(inicio, fin)
+        if conflicto is not None:
+            return conflicto
+        i = bisect_right(self._inicios, inicio)
+        self._inicios.insert(i, inicio)
+        self._fines.insert(i, fin)
+        self._ids.insert(i, cita_id)
+        return None
+
+    def eliminar(self, inicio: int, cita_id: str) -> bool:
+        """
+        Elimina el intervalo de una cita.
+
+        Args:
+            inicio (int): Minuto de inicio con el que se insertó
+            cita_id (str): ID de la cita
+
+        Returns:
+            bool: True si se eliminó, False si no estaba en el índice
+        """
+        i = bisect_left(self._inicios, inicio)
+        while i < len(self._inicios) and self._inicios[i] == inicio:
+            if self._ids[i] == cita_id:
+                del self._inicios[i]
+                del self._fines[i]
+                del self._ids[i]
+                return True
+            i += 1
+        return False
+
+    def entre(self, desde: int, hasta: int) -> Iterator[Tuple[int, int]]:
+        """
+        Recorre los intervalos que se solapan con [desde, hasta), en orden.
+
+        Args:
+            desde (int): Minuto inicial del rango
+            hasta (int): Minuto final del rango
+
+        Yields:
+            Tuple[int, int]: Intervalos (inicio, fin)
+        """
+        i = max(bisect_right(self._inicios, desde) - 1, 0)
+        while i < len(self._inicios) and self._inicios[i] < hasta:
+            if self._fines[i] > desde:
+                yield self._inicios[i], self._fines[i]
+            i += 1
+
+    def __len__(self) -> int:
+        """Número de intervalos almacenados."""
+        return len(self._inicios)
+
+
+def restar_intervalos(libres: Iterable[Tuple[int, int]],
+                      ocupados: Iterable[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """
+    Resta a unos intervalos libres otros ocupados. Ambas entradas deben estar ordenadas.
+
+    Args:
+        libres (Iterable): Intervalos (inicio, fin) disponibles, sin solapamientos
+        ocupados (Iterable): Intervalos (inicio, fin) ocupados, sin solapamientos
+
+    Returns:
+        List[Tuple[int, int]]: Huecos libres resultantes, ordenados
+    """
+    ocupados = list(ocupados)
+    huecos = []
+    j = 0
+    for inicio, fin in libres:
+        while j < len(ocupados) and ocupados[j][1] <= inicio:
+            j += 1
+        k = j
+        while k < len(ocupados) and ocupados[k][0] < fin:
+            if ocupados[k][0] > inicio:
+                huecos.append((inicio, ocupados[k][0]))
+            inicio = max(inicio, ocupados[k][1])
+            k += 1
+        if inicio < fin:
+            huecos.append((inicio, fin))
+    return huecos
+
+
+class IndiceCronologico:
+    """
+    Citas de un empleado ordenadas por (inicio, id), en cualquier estado.
+
+    A diferencia de IndiceIntervalos admite solapamientos (las citas canceladas
+    siguen aquí) y sirve para recorrer las citas por orden de inicio a partir de
+    una posición dada sin ordenar toda la colección.
+
+    Atributos:
+        _inicios (List[int]): Inicios de las citas, ordenados
+        _ids (List[str]): ID de cada cita; a igual inicio, en orden de ID
+    """
+
+    def __init__(self):
+        """Inicializa un índice vacío."""
+        self._inicios: List[int] = []
+        self._ids: List[str] = []
+
+    def _siguiente(self, inicio: int, cita_id: str) -> int:
+        """
+        Posición de la primera entrada posterior a (inicio, cita_id) (método privado).
+
+        Args:
+            inicio (int): Minuto de inicio
+            cita_id (str): ID de la cita ("" para incluir todas las de ese inicio)
+
+        Returns:
+            int: Posición en las listas
+        """
+        i = bisect_left(self._inicios, inicio)
+        while i < len(self._inicios) and self._inicios[i] == inicio and self._ids[i] <= cita_id:
+            i += 1
+        return i
+
+    def insertar(self, inicio: int, cita_id: str):
+        """
+        Inserta una cita.
+
+        Args:
+            inicio (int): Minuto de inicio
+            cita_id (str): ID de la cita
+        """
+        i = self._siguiente(inicio, cita_id)
+        self._inicios.insert(i, inicio)
+        self._ids.insert(i, cita_id)
+
+    def eliminar(self, inicio: int, cita_id: str) -> bool:
+        """
+        Elimina una cita.
+
+        Args:
+            inicio (int): Minuto de inicio con el que se insertó
+            cita_id (str): ID de la cita
+
+        Returns:
+            bool: True si se eliminó, False si no estaba en el índice
+        """
+        i = bisect_left(self._inicios, inicio)
+        while i < len(self._inicios) and self._inicios[i] == inicio:
+            if self._ids[i] == cita_id:
+                del self._inicios[i]
+                del self._ids[i]
+                return True
+            i += 1
+        return False
+
+    def entre(self, desde: Optional[int], hasta: Optional[int]) -> List[str]:
+        """
+        IDs de las citas que empiezan en [desde, hasta), por orden de inicio.
+
+        Args:
+            desde (int): Minuto inicial (None = desde el principio)
+            hasta (int): Minuto final, excluido (None = hasta el final)
+
+        Returns:
+            List[str]: IDs de las citas (copia)
+        """
+        i = 0 if desde is None else bisect_left(self._inicios, desde)
+        j = len(self._inicios) if hasta is None else bisect_left(self._inicios, hasta)
+        return self._ids[i:j]
+
+    def descartar(self, ids: Set[str]) -> int:
+        """
+        Elimina de una vez varias citas, en O(n) en lugar de O(n) por cita.
+
+        Args:
+            ids (Set[str]): IDs de las citas a eliminar
+
+        Returns:
+            int: Número de citas eliminadas
+        """
+        quedan = [(inicio, cita_id) for inicio, cita_id in zip(self._inicios, self._ids)
+                  if cita_id not in ids]
+        eliminadas = len(self._ids) - len(quedan)
+        self._inicios = [inicio for inicio, _ in quedan]
+        self._ids = [cita_id for _, cita_id in quedan]
+        return eliminadas
+
+    def desde(self, inicio: Optional[int] = None, cita_id: str = "") -> Iterator[Tuple[int, str]]:
+        """
+        Recorre las entradas posteriores a (inicio, cita_id), en orden.
+
+        Cada paso vuelve a buscar su posición a partir de la última clave
+        devuelta, así que el recorrido sigue siendo correcto aunque se inserten o
+        eliminen citas mientras tanto. Coste O(log n) por elemento.
+
+        Args:
+            inicio (int): Minuto desde el que empezar (None = desde el principio)
+            cita_id (str): Última cita ya vista con ese inicio ("" = incluirlas todas)
+
+        Yields:
+            Tuple[int, str]: Pares (inicio, id)
+        """
+        i = 0 if inicio is None else self._siguiente(inicio, cita_id)
+        while i < len(self._inicios):
+            inicio, cita_id = self._inicios[i], self._ids[i]
+            yield inicio, cita_id
+            i = self._siguiente(inicio, cita_id)
+
+    def __len__(self) -> int:
+        """Número de citas almacenadas."""
+        return len(self._inicios)
+
+
+class IndiceSeries:
+    """
+    Series de citas periódicas de un empleado (ver series.SerieCitas).
+
+    Las series se agrupan por paso y, dentro de cada paso, se ordenan por su
+    fase (inicio % paso). Una ocurrencia que empiece en [desde, hasta) tiene
+    que pertenecer a una serie cuya fase caiga en esa misma ventana módulo el
+    paso, así que para rangos más cortos que el paso basta una búsqueda
+    binaria en lugar de revisar todas las series.
+
+    Atributos:
+        _grupos (Dict[int, Tuple[List[int], list]]): Paso -> (fases ordenadas, series)
+        _duracion_max (int): Duración más larga de las ocurrencias de cualquier serie
+    """
+
+    def __init__(self):
+        """Inicializa un índice vacío."""
+        self._grupos: Dict[int, Tuple[List[int], list]] = {}
+        self._duracion_max = 0
+
+    def agregar(self, serie):
+        """
+        Añade una serie.
+
+        Args:
+            serie: Objeto SerieCitas
+        """
+        fases, series = self._grupos.setdefault(serie.paso, ([], []))
+        i = bisect_right(fases, serie.inicio % serie.paso)
+        fases.insert(i, serie.inicio % serie.paso)
+        series.insert(i, serie)
+        self._duracion_max = max(self._duracion_max, serie.duracion)
+
+    def quitar(self, serie) -> bool:
+        """
+        Quita una serie. _duracion_max no se reduce: sigue siendo una cota válida.
+
+        Args:
+            serie: Objeto SerieCitas
+
+        Returns:
+            bool: True si la serie estaba en el índice
+        """
+        grupo = self._grupos.get(serie.paso)
+        if grupo is None:
+            return False
+        fases, series = grupo
+        fase = serie.inicio % serie.paso
+        for i in range(bisect_left(fases, fase), bisect_right(fases, fase)):
+            if series[i] is serie:
+                del fases[i]
+                del series[i]
+                return True
+        return False
+
+    def _candidatas(self, desde: int, hasta: int) -> Iterator:
+        """
+        Series que pueden tener ocurrencias que empiecen en [desde, hasta) (método privado).
+
+        Args:
+            desde (int): Minuto inicial del rango
+            hasta (int): Minuto final, excluido
+
+        Yields:
+            Series candidatas
+        """
+        for paso, (fases, series) in self._grupos.items():
+            if hasta - desde >= paso:
+                yield from series
+                continue
+            a, b = desde % paso, hasta % paso
+            if a < b:
+                yield from series[bisect_left(fases, a):bisect_left(fases, b)]
+            else:
+                yield from series[bisect_left(fases, a):]
+                yield from series[:bisect_left(fases, b)]
+
+    def solapa(self, inicio: int, fin: int):
+        """
+        Busca una ocurrencia vigente que se solape con [inicio, fin).
+
+        Args:
+            inicio (int): Minuto de inicio
+            fin (int): Minuto de fin
+
+        Returns:
+            Ocurrencia que se solapa o None si no hay ninguna
+        """
+        for serie in self._candidatas(inicio - self._duracion_max + 1, fin):
+            conflicto = serie.solapa(inicio, fin)
+            if conflicto is not None:
+                return serie.ocurrencia(conflicto)
+        return None
+
+    def entre(self, desde: int, hasta: int) -> Iterator[Tuple[int, int]]:
+        """
+        Recorre las ocurrencias vigentes que se solapan con [desde, hasta), en orden.
+
+        Args:
+            desde (int): Minuto inicial del rango
+            hasta (int): Minuto final del rango
+
+        Yields:
+            Tuple[int, int]: Intervalos (inicio, fin)
+        """
+        for ocurrencia in self.ocurrencias(desde - self._duracion_max + 1, hasta):
+            if ocurrencia.fin > desde:
+                yield ocurrencia.inicio, ocurrencia.fin
+
+    def ocurrencias(self, desde: int, hasta: int) -> list:
+        """
+        Ocurrencias vigentes que empiezan en [desde, hasta), por orden de (inicio, id).
+
+        Args:
+            desde (int): Minuto inicial del rango
+            hasta (int): Minuto final, excluido
+
+        Returns:
+            list: Ocurrencias del rango
+        """
+        ocurrencias = [ocurrencia for serie in self._candidatas(desde, hasta)
+                       for ocurrencia in serie.ocurrencias(desde, hasta)]
+        ocurrencias.sort(key=_clave_cita)
+        return ocurrencias
+
+    def __len__(self) -> int:
+        """Número de series almacenadas."""
+        return sum(len(series) for _, series in self._grupos.values())
+
+
+def _clave_cita(cita) -> Tuple[int, str]:
+    """Clave de orden de una cita dentro de un día: (inicio, id)."""
+    return cita.inicio, cita.id
+
+
+class Calendario:
+    """
+    Citas agrupadas por día y empleado: día -> empleado_id -> citas ordenadas por inicio.
+
+    Permite obtener la agenda de un empleado o de todo el negocio para un día
+    en tiempo proporcional a las citas de ese día. Las series de citas
+    periódicas no se desglosan por días: sus ocurrencias se calculan al
+    consultar cada día y se mezclan con las citas.
+    """
+
+    def __init__(self):
+        """Inicializa un calendario vacío."""
+        self._dias: Dict[int, Dict[str, list]] = {}
+        self._series: Dict[str, IndiceSeries] = {}
+
+    def agregar_serie(self, serie):
+        """
+        Añade una serie de citas periódicas.
+
+        Args:
+            serie: Objeto SerieCitas
+        """
+        self._series.setdefault(serie.empleado.id, IndiceSeries()).agregar(serie)
+
+    def quitar_serie(self, serie) -> bool:
+        """
+        Quita una serie de citas periódicas.
+
+        Args:
+            serie: Objeto SerieCitas
+
+        Returns:
+            bool: True si la serie estaba en el calendario
+        """
+        series = self._series.get(serie.empleado.id)
+        return series is not None and series.quitar(serie)
+
+    def series_de(self, empleado_id: str) -> Optional[IndiceSeries]:
+        """
+        Índice de series de un empleado.
+
+        Args:
+            empleado_id (str): ID del empleado
+
+        Returns:
+            IndiceSeries: Series del empleado o None si no tiene ninguna
+        """
+        return self._series.get(empleado_id)
+
+    def _ocurrencias(self, empleado_id: str, dia: int) -> list:
+        """Ocurrencias de las series de un empleado en un día (método privado)."""
+        series = self._series.get(empleado_id)
+        if series is None:
+            return []
+        return series.ocurrencias(dia * MINUTOS_DIA, (dia + 1) * MINUTOS_DIA)
+
+    def agregar(self, cita):
+        """
+        Añade una cita al día en que empieza.
+
+        Args:
+            cita: Objeto Cita
+        """
+        empleados = self._dias.setdefault(cita.inicio // MINUTOS_DIA, {})
+        insort(empleados.setdefault(cita.empleado.id, []), cita, key=_clave_cita)
+
+    def quitar(self, cita, inicio: Optional[int] = None) -> bool:
+        """
+        Quita una cita del calendario.
+
+        Args:
+            cita: Objeto Cita
+            inicio (int): Inicio con el que se añadió, si ha cambiado desde entonces
+
+        Returns:
+            bool: True si estaba en el calendario
+        """
+        dia = (cita.inicio if inicio is None else inicio) // MINUTOS_DIA
+        empleados = self._dias.get(dia)
+        citas = empleados.get(cita.empleado.id) if empleados else None
+        if not citas or cita not in citas:
+            return False
+        citas.remove(cita)
+        if not citas:
+            del empleados[cita.empleado.id]
+            if not empleados:
+                del self._dias[dia]
+        return True
+
+    def del_empleado(self, empleado_id: str, dia: int) -> list:
+        """
+        Citas de un empleado en un día por orden de inicio, con las ocurrencias de sus series.
+
+        Args:
+            empleado_id (str): ID del empleado
+            dia (int): Día contado desde 1970-01-01
+
+        Returns:
+            list: Citas del día (copia)
+        """
+        citas = self._dias.get(dia, {}).get(empleado_id, ())
+        ocurrencias = self._ocurrencias(empleado_id, dia)
+        if not ocurrencias:
+            return list(citas)
+        return list(merge(citas, ocurrencias, key=_clave_cita))
+
+    def del_dia(self, dia: int) -> Dict[str, list]:
+        """
+        Citas de todos los empleados en un día.
+
+        Args:
+            dia (int): Día contado desde 1970-01-01
+
+        Returns:
+            Dict[str, list]: empleado_id -> citas del día por orden de inicio (copias)
+        """
+        empleados = set(self._dias.get(dia, {})) | set(self._series)
+        agenda = {empleado_id: self.del_empleado(empleado_id, dia) for empleado_id in empleados}
+        return {empleado_id: citas for empleado_id, citas in agenda.items() if citas}
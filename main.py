@@ -4,6 +4,8 @@ Descripción: Archivo principal que prueba todas las funcionalidades del sistema
              Demuestra la creación de usuarios, servicios, citas y notificaciones.
 """
 
+import logging
+import sys
 from bookme_service import BookMeService
 from horario import Horario
 
@@ -16,6 +18,9 @@ def linea_separadora():
 def main():
     """Función principal que ejecuta las pruebas del sistema."""
     
+    # Los mensajes del servicio van al log; en la demo se muestran por pantalla
+    logging.basicConfig(level=logging.INFO, format="%(message)s", stream=sys.stdout)
+    
     print("╔══════════════════════════════════════════════════╗")
     print("║          BIENVENIDO AL SISTEMA BOOKME            ║")
     print("║     Sistema de Gestión de Reservas y Citas       ║")
@@ -281,6 +286,16 @@ def main():
     horas_disponibles = horario_empleado1.obtener_horas_disponibles()
     print(", ".join(horas_disponibles))
     
+    # Buscar los primeros huecos libres para un servicio
+    print(f"\nPrimeros huecos libres para {servicio1.nombre}:")
+    for fecha_hora, empleado in service.buscar_huecos(servicio1.id, cantidad=3,
+                                                      desde="2025-11-10 09:00"):
+        print(f"  {fecha_hora} con {empleado.nombre}")
+    
+    # Agenda diaria
+    print(empleado1.ver_agenda("2025-11-10"))
+    print(service.ver_agenda_dia("2025-11-10"))
+    
     # Información de servicios
     print(f"\nInformación detallada del servicio:")
     print(servicio1.mostrar_info())
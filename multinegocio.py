@@ -0,0 +1,283 @@
+"""
+Módulo: multinegocio.py
+Descripción: Alojamiento de muchos negocios en un mismo proceso. Cada negocio tiene su propio
+             BookMeService (índices, contadores y numeración de IDs); los que no se usan se
+             descargan de memoria y se vuelven a cargar desde su repositorio cuando hacen falta.
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Tuple
+
+from bookme_service import BookMeService
+from errores import NoEncontrado
+from identificadores import GeneradorIds
+from repositorio import Repositorio
+
+
+logger = logging.getLogger(__name__)
+
+
+class ServicioMultinegocio:
+    """
+    Conjunto de negocios independientes servidos desde un único proceso.
+
+    Cada negocio se identifica por una clave elegida por quien lo registra y
+    tiene su propio BookMeService con un GeneradorIds, de modo que sus IDs no
+    dependen de los demás negocios. Los servicios se crean al usarlos por
+    primera vez, cargando el estado desde el repositorio que devuelve
+    `fabrica_repositorio(clave)`.
+
+    Como mucho se mantienen `max_residentes` negocios en memoria: al cargar
+    uno más se descarga el usado hace más tiempo (LRU), cerrando su
+    repositorio para que confirme lo pendiente. El cierre se hace sin el
+    cerrojo del conjunto; mientras dura, el negocio figura como en carga y
+    quien lo pida espera a que termine antes de volver a abrirlo. Un negocio en uso dentro de
+    un bloque `with negocio(clave)` no se descarga hasta que el bloque termina.
+    Sin fábrica de repositorios no hay dónde guardar el estado, así que nunca
+    se descarga ningún negocio.
+
+    La carga de un negocio (abrir su repositorio y reconstruir el servicio) se
+    hace sin el cerrojo del conjunto, así que no frena a los demás negocios;
+    si otro hilo pide el mismo negocio mientras se carga, espera a esa carga
+    en lugar de repetirla.
+
+    Atributos:
+        fabrica_repositorio (Callable): Clave -> Repositorio del negocio (None = solo memoria)
+        max_residentes (int): Negocios que pueden estar cargados a la vez
+        opciones (Dict): Argumentos adicionales para cada BookMeService
+        cargas (int): Veces que se ha cargado un negocio
+        descargas (int): Veces que se ha descargado un negocio
+    """
+
+    def __init__(self, fabrica_repositorio: Callable[[str], Repositorio] = None,
+                 max_residentes: int = 100, **opciones):
+        """
+        Inicializa el conjunto sin ningún negocio.
+
+        Args:
+            fabrica_repositorio (Callable): Crea (o abre) el repositorio de un negocio
+            max_residentes (int): Negocios que pueden estar cargados a la vez
+            **opciones: Argumentos para BookMeService (reloj, concurrente...); un
+                despachador indicado aquí lo comparten todos los negocios
+        """
+        if max_residentes < 1:
+            raise ValueError("max_residentes debe ser al menos 1")
+        self.fabrica_repositorio = fabrica_repositorio
+        self.max_residentes = max_residentes
+        self.opciones = opciones
+        self.cargas = 0
+        self.descargas = 0
+        # Clave -> (nombre, dirección, teléfono) de todos los negocios registrados
+        self._negocios: Dict[str, Tuple[str, str, str]] = {}
+        # Negocios cargados, del usado hace más tiempo al más reciente
+        self._residentes: "OrderedDict[str, BookMeService]" = OrderedDict()
+        # Clave -> bloques `with negocio(...)` abiertos
+        self._en_uso: Dict[str, int] = {}
+        # Clave -> evento que se activa al terminar (bien o mal) su carga o su cierre en curso
+        self._cargando: Dict[str, threading.Event] = {}
+        self._lock = threading.Lock()
+
+    def registrar_negocio(self, clave: str, nombre: str, direccion: str, telefono: str):
+        """
+        Registra un negocio; no se carga hasta que se use.
+
+        Registrar de nuevo una clave existente actualiza sus datos de contacto
+        para la próxima vez que se cargue.
+
+        Args:
+            clave (str): Identificador del negocio
+            nombre (str): Nombre del negocio
+            direccion (str): Dirección del negocio
+            telefono (str): Teléfono del negocio
+        """
+        with self._lock:
+            self._negocios[clave] = (nombre, direccion, telefono)
+
+    def claves(self) -> List[str]:
+        """Claves de todos los negocios registrados, cargados o no."""
+        with self._lock:
+            return list(self._negocios)
+
+    def residentes(self) -> List[str]:
+        """Claves de los negocios cargados, del usado hace más tiempo al más reciente."""
+        with self._lock:
+            return list(self._residentes)
+
+    def _cargar(self, clave: str, datos: Tuple[str, str, str]) -> BookMeService:
+        """
+        Crea el servicio de un negocio desde su repositorio (método privado).
+
+        Se llama sin el cerrojo del conjunto tomado.
+
+        Args:
+            clave (str): Identificador del negocio
+            datos (Tuple): Nombre, dirección y teléfono del negocio
+
+        Returns:
+            BookMeService: Servicio cargado
+        """
+        repositorio = None
+        if self.fabrica_repositorio is not None:
+            repositorio = self.fabrica_repositorio(clave)
+        servicio = BookMeService(*datos, repositorio=repositorio, ids=GeneradorIds(),
+                                 **self.opciones)
+        logger.debug("Negocio '%s' cargado", clave)
+        return servicio
+
+    def _reservar(self, clave: str) -> BookMeService:
+        """
+        Obtiene un negocio cargado y lo marca en uso, cargándolo si hace falta (método privado).
+
+        Args:
+            clave (str): Identificador del negocio
+
+        Returns:
+            BookMeService: Servicio del negocio
+
+        Raises:
+            NoEncontrado: Si el negocio no está registrado
+        """
+        while True:
+            with self._lock:
+                servicio = self._residentes.get(clave)
+                if servicio is not None:
+                    self._residentes.move_to_end(clave)
+                    self._en_uso[clave] = self._en_uso.get(clave, 0) + 1
+                    descargados = self._descargar_sobrantes()
+                    break
+                datos = self._negocios.get(clave)
+                if datos is None:
+                    raise NoEncontrado("Negocio", clave)
+                carga = self._cargando.get(clave)
+                if carga is None:
+                    carga = self._cargando[clave] = threading.Event()
+                    break
+            # Otro hilo lo está cargando o cerrando: se espera y se vuelve a mirar
+            carga.wait()
+        if servicio is not None:
+            self._cerrar_descargados(descargados)
+            return servicio
+
+        try:
+            servicio = self._cargar(clave, datos)
+        except BaseException:
+            with self._lock:
+                del self._cargando[clave]
+            carga.set()
+            raise
+        with self._lock:
+            del self._cargando[clave]
+            self._residentes[clave] = servicio
+            self._en_uso[clave] = self._en_uso.get(clave, 0) + 1
+            self.cargas += 1
+            descargados = self._descargar_sobrantes()
+        carga.set()
+        self._cerrar_descargados(descargados)
+        return servicio
+
+    def _descargar_sobrantes(self) -> List[Tuple[str, BookMeService, threading.Event]]:
+        """
+        Saca de memoria los negocios que sobran, empezando por el menos reciente (método privado).
+
+        Se llama con el cerrojo tomado. Cada negocio descargado queda marcado
+        en _cargando para que nadie lo vuelva a cargar antes de que su
+        repositorio se cierre con _cerrar_descargados, ya sin el cerrojo.
+
+        Returns:
+            List[Tuple]: (clave, servicio, evento del cierre) de cada negocio descargado
+        """
+        if self.fabrica_repositorio is None:
+            return []
+        descargados = []
+        sobran = len(self._residentes) - self.max_residentes
+        for clave in list(self._residentes):
+            if sobran <= 0:
+                break
+            if self._en_uso.get(clave):
+                continue
+            cierre = self._cargando[clave] = threading.Event()
+            descargados.append((clave, self._residentes.pop(clave), cierre))
+            self.descargas += 1
+            sobran -= 1
+        return descargados
+
+    def _cerrar_descargados(self, descargados: List[Tuple[str, BookMeService, threading.Event]]):
+        """
+        Cierra los repositorios de los negocios descargados (método privado).
+
+        Se llama sin el cerrojo del conjunto. Un error al cerrar se registra y
+        no se propaga: quien provocó la descarga no tiene relación con ese negocio.
+
+        Args:
+            descargados (List[Tuple]): Resultado de _descargar_sobrantes
+        """
+        for clave, servicio, cierre in descargados:
+            try:
+                servicio.repositorio.cerrar()
+                logger.debug("Negocio '%s' descargado", clave)
+            except Exception:
+                logger.exception("✗ Error al cerrar el repositorio del negocio '%s'", clave)
+            finally:
+                with self._lock:
+                    del self._cargando[clave]
+                cierre.set()
+
+    def servicio(self, clave: str) -> BookMeService:
+        """
+        Obtiene el servicio de un negocio, cargándolo si no está en memoria.
+
+        El servicio devuelto puede descargarse (y cerrarse) en cuanto se carguen
+        otros negocios; para operaciones que deban completarse sobre él, úsese
+        `with negocio(clave)`.
+
+        Args:
+            clave (str): Identificador del negocio
+
+        Returns:
+            BookMeService: Servicio del negocio
+
+        Raises:
+            NoEncontrado: Si el negocio no está registrado
+        """
+        with self.negocio(clave) as servicio:
+            return servicio
+
+    @contextmanager
+    def negocio(self, clave: str) -> Iterator[BookMeService]:
+        """
+        Usa el servicio de un negocio sin que pueda descargarse mientras tanto.
+
+        Args:
+            clave (str): Identificador del negocio
+
+        Yields:
+            BookMeService: Servicio del negocio
+
+        Raises:
+            NoEncontrado: Si el negocio no está registrado
+        """
+        servicio = self._reservar(clave)
+        try:
+            yield servicio
+        finally:
+            with self._lock:
+                self._en_uso[clave] -= 1
+                if not self._en_uso[clave]:
+                    del self._en_uso[clave]
+                descargados = self._descargar_sobrantes()
+            self._cerrar_descargados(descargados)
+
+    def cerrar(self):
+        """Cierra los repositorios de los negocios cargados y el despachador compartido."""
+        with self._lock:
+            servicios = list(self._residentes.values())
+            self._residentes.clear()
+        for servicio in servicios:
+            if servicio.repositorio is not None:
+                servicio.repositorio.cerrar()
+        despachador = self.opciones.get("despachador")
+        if despachador is not None:
+            despachador.detener()
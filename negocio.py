@@ -3,7 +3,9 @@ Módulo: negocio.py
 Descripción: Define la clase Negocio que representa el establecimiento que utiliza la aplicación.
 """
 
+import threading
 from typing import List, Optional
+import presentacion
 
 
 class Negocio:
@@ -21,6 +23,7 @@ class Negocio:
     """
     
     contador_id = 6000
+    _lock_id = threading.Lock()
     
     def __init__(self, nombre: str, direccion: str, telefono: str):
         """
@@ -31,8 +34,9 @@ class Negocio:
             direccion (str): Dirección del negocio
             telefono (str): Teléfono de contacto
         """
-        self.id = f"NEG{Negocio.contador_id}"
-        Negocio.contador_id += 1
+        with Negocio._lock_id:
+            self.id = f"NEG{Negocio.contador_id}"
+            Negocio.contador_id += 1
         self.nombre = nombre
         self.direccion = direccion
         self.telefono = telefono
@@ -142,14 +146,7 @@ class Negocio:
         Returns:
             str: Lista formateada de servicios
         """
-        if not self.servicios:
-            return "No hay servicios disponibles"
-        
-        lista = "\n========== SERVICIOS DISPONIBLES ==========\n"
-        for i, servicio in enumerate(self.servicios, 1):
-            lista += f"{i}. {servicio.nombre} - {servicio.precio}€ ({servicio.duracion}min)\n"
-        lista += "==========================================="
-        return lista
+        return presentacion.lista_servicios(self.servicios)
     
     def listar_empleados(self) -> str:
         """
@@ -158,14 +155,7 @@ class Negocio:
         Returns:
             str: Lista formateada de empleados
         """
-        if not self.empleados:
-            return "No hay empleados registrados"
-        
-        lista = "\n========== EMPLEADOS ==========\n"
-        for i, empleado in enumerate(self.empleados, 1):
-            lista += f"{i}. {empleado.nombre} ({empleado.especialidad}) - {empleado.email}\n"
-        lista += "=============================="
-        return lista
+        return presentacion.lista_empleados(self.empleados)
     
     def __str__(self) -> str:
         """Representación en texto del negocio."""
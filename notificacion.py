@@ -3,8 +3,34 @@ Módulo: notificacion.py
 Descripción: Define la clase Notificación para gestionar recordatorios y avisos del sistema.
 """
 
+import sys
+import threading
+import time
 from datetime import datetime
-from typing import Optional
+from typing import Optional, Tuple, Union
+from tiempo import minutos_a_fecha
+
+
+FORMATO_ENVIO = "%Y-%m-%d %H:%M:%S"
+
+# Plantillas de los avisos que genera BookMeService. La notificación guarda solo
+# los argumentos (nombres compartidos con los objetos y minutos enteros) y el
+# texto se compone al leer el mensaje.
+PLANTILLAS = {
+    "confirmacion": lambda empleado, servicio, inicio: (
+        f"Tu cita con {empleado} para {servicio} ha sido confirmada el {minutos_a_fecha(inicio)}"),
+    "confirmacion_lote": lambda *citas: "Tus citas han sido confirmadas: " + "; ".join(
+        f"{servicio} con {empleado} el {minutos_a_fecha(inicio)}"
+        for empleado, servicio, inicio in citas),
+    "confirmacion_serie": lambda empleado, servicio, inicio, regla: (
+        f"Tus citas periódicas con {empleado} para {servicio} han sido confirmadas: "
+        f"{regla}, a partir del {minutos_a_fecha(inicio)}"),
+    "modificacion": lambda inicio: f"Tu cita ha sido modificada a {minutos_a_fecha(inicio)}",
+    "cancelacion": lambda razon: f"Tu cita ha sido cancelada. Razón: {razon}",
+    "recordatorio": lambda empleado, servicio, inicio: (
+        f"Recordatorio: Tienes una cita mañana con {empleado} "
+        f"para {servicio} a las {minutos_a_fecha(inicio)}"),
+}
 
 
 class Notificacion:
@@ -15,29 +41,63 @@ class Notificacion:
         id (str): Identificador único de la notificación
         destinatario: Usuario que recibe la notificación
         mensaje (str): Contenido del mensaje
-        fecha_envio (str): Fecha y hora de envío
+        fecha_envio (str): Fecha y hora de envío "YYYY-MM-DD HH:MM:SS"
         tipo (str): Tipo de notificación (confirmacion, recordatorio, cancelacion)
         leida (bool): Si la notificación ha sido leída
+        observador: Objeto avisado cuando la notificación se marca como leída
+    
+    Para ocupar poco en memoria la clase usa __slots__, el tipo se interna, la
+    fecha de envío se guarda como segundos desde la época y, si el mensaje se
+    crea a partir de una plantilla, solo se guardan sus argumentos.
     """
     
+    __slots__ = ("id", "destinatario", "_mensaje", "_enviada", "tipo", "leida", "observador")
+    
     contador_id = 5000
+    _lock_id = threading.Lock()
     
-    def __init__(self, destinatario, mensaje: str, tipo: str = "general"):
+    def __init__(self, destinatario, mensaje: Union[str, Tuple], tipo: str = "general",
+                 id: str = None):
         """
         Inicializa una notificación.
         
         Args:
             destinatario: Usuario destinatario
-            mensaje (str): Contenido del mensaje
+            mensaje: Contenido del mensaje, o tupla de argumentos de PLANTILLAS[tipo]
             tipo (str): Tipo de notificación
+            id (str): ID ya existente; por defecto se genera
         """
-        self.id = f"NOT{Notificacion.contador_id}"
-        Notificacion.contador_id += 1
+        if id is None:
+            with Notificacion._lock_id:
+                id = f"NOT{Notificacion.contador_id}"
+                Notificacion.contador_id += 1
+        self.id = id
         self.destinatario = destinatario
-        self.mensaje = mensaje
-        self.fecha_envio = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        self.tipo = tipo
+        self._mensaje = mensaje
+        self._enviada = time.time()
+        self.tipo = sys.intern(tipo)
         self.leida = False
+        self.observador = None
+    
+    @property
+    def mensaje(self) -> str:
+        """Contenido del mensaje (se compone al leerlo si viene de una plantilla)."""
+        if isinstance(self._mensaje, tuple):
+            return PLANTILLAS[self.tipo](*self._mensaje)
+        return self._mensaje
+    
+    @mensaje.setter
+    def mensaje(self, valor: str):
+        self._mensaje = valor
+    
+    @property
+    def fecha_envio(self) -> str:
+        """Fecha y hora de envío "YYYY-MM-DD HH:MM:SS"."""
+        return datetime.fromtimestamp(self._enviada).strftime(FORMATO_ENVIO)
+    
+    @fecha_envio.setter
+    def fecha_envio(self, valor: str):
+        self._enviada = datetime.strptime(valor, FORMATO_ENVIO).timestamp()
     
     def enviar(self) -> str:
         """
@@ -64,7 +124,10 @@ class Notificacion:
         Returns:
             str: Mensaje de confirmación
         """
-        self.leida = True
+        if not self.leida:
+            self.leida = True
+            if self.observador is not None:
+                self.observador._notificacion_leida(self)
         return f"Notificación {self.id} marcada como leída"
     
     def obtener_estado(self) -> str:
@@ -0,0 +1,587 @@
+"""
+Módulo: particiones.py
+Descripción: Despliegue de BookMeService repartido entre varios procesos. Cada proceso
+             trabajador atiende a un grupo de empleados con sus citas; un enrutador envía cada
+             operación al trabajador que corresponde y reparte y combina las consultas que
+             abarcan a todos los empleados.
+"""
+
+import logging
+import multiprocessing
+import os
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+import presentacion
+from bookme_service import BookMeService
+from horario import Horario
+from identificadores import GeneradorIds
+from repositorio import Repositorio
+from servicio import Servicio
+
+
+logger = logging.getLogger(__name__)
+
+
+def _id_o_none(objeto) -> Optional[str]:
+    """ID de un objeto, o None si no lo hay (función privada)."""
+    return None if objeto is None else objeto.id
+
+
+def _alta_usuario(servicio: BookMeService, usuario_id: str, tipo: str, nombre: str,
+                  email: str, datos_adicionales: Dict):
+    """Da de alta un usuario con el ID asignado por el enrutador, todo o nada (función privada)."""
+    usuario = servicio._construir_usuario(tipo, nombre, email, datos_adicionales, usuario_id)
+    with servicio._operacion():
+        servicio._agregar_usuario(usuario)
+
+
+def _alta_servicio(servicio: BookMeService, servicio_id: str, nombre: str, descripcion: str,
+                   duracion: int, precio: float):
+    """Da de alta un servicio con el ID asignado por el enrutador, todo o nada (función privada)."""
+    with servicio._operacion():
+        servicio._agregar_servicio(Servicio(nombre, descripcion, duracion, precio,
+                                            id=servicio_id))
+
+
+def _estado_ruta(servicio: BookMeService) -> Tuple[List[str], int, int]:
+    """
+    Datos que necesita el enrutador al arrancar sobre particiones ya pobladas (función privada).
+
+    Returns:
+        Tuple: IDs de los empleados de la partición y números más altos de
+            usuario y servicio usados (-1 si no hay ninguno)
+    """
+    def ultimo(ids, tabla: str) -> int:
+        numeros = (GeneradorIds.numero(tabla, objeto_id) for objeto_id in ids)
+        return max((numero for numero in numeros if numero is not None), default=-1)
+
+    return (list(servicio._indice_empleados),
+            ultimo(servicio._indice_usuarios, "usuario"),
+            ultimo(servicio._indice_servicios, "servicio"))
+
+
+# Operaciones que atiende cada trabajador. Los resultados se devuelven como
+# IDs y valores simples: los objetos del dominio apuntan al servicio y no
+# pueden enviarse a otro proceso.
+_OPERACIONES: Dict[str, Callable] = {
+    "alta_usuario": _alta_usuario,
+    "alta_servicio": _alta_servicio,
+    "asignar_horario": BookMeService.asignar_horario,
+    "crear_cita": lambda s, *args: _id_o_none(s.crear_cita(*args)),
+    "modificar_cita": lambda s, *args: _id_o_none(s.modificar_cita(*args)),
+    "cancelar_cita": BookMeService.cancelar_cita,
+    "completar_cita": BookMeService.completar_cita,
+    "buscar_huecos": lambda s, *args: [(fecha, empleado.id)
+                                       for fecha, empleado in s.buscar_huecos(*args)],
+    "estadisticas": BookMeService.estadisticas,
+    "estado_ruta": _estado_ruta,
+}
+
+
+def _trabajador(conexion, indice: int, num_particiones: int, datos_negocio: Tuple[str, str, str],
+                fabrica_repositorio: Optional[Callable[[int], Repositorio]], opciones: Dict):
+    """
+    Bucle de un proceso trabajador (función privada).
+
+    Recibe tuplas (operación, argumentos) y responde ("ok", resultado) o
+    ("error", descripción); None indica que hay que cerrar.
+
+    Args:
+        conexion: Extremo del Pipe del trabajador
+        indice (int): Número de partición, que es también el desfase de sus IDs
+        num_particiones (int): Número total de particiones, que es el paso de sus IDs
+        datos_negocio (Tuple): Nombre, dirección y teléfono del negocio
+        fabrica_repositorio (Callable): Índice -> Repositorio de la partición (o None)
+        opciones (Dict): Argumentos adicionales para BookMeService
+    """
+    repositorio = fabrica_repositorio(indice) if fabrica_repositorio is not None else None
+    servicio = BookMeService(*datos_negocio, repositorio=repositorio,
+                             ids=GeneradorIds(paso=num_particiones, desfase=indice), **opciones)
+    try:
+        while True:
+            mensaje = conexion.recv()
+            if mensaje is None:
+                break
+            operacion, args = mensaje
+            try:
+                respuesta = ("ok", _OPERACIONES[operacion](servicio, *args))
+            except Exception as e:
+                respuesta = ("error", f"{type(e).__name__}: {e}")
+            conexion.send(respuesta)
+    finally:
+        servicio.cerrar()
+        conexion.close()
+
+
+class ServicioParticionado:
+    """
+    Enrutador de un negocio repartido entre varios procesos trabajadores.
+
+    Cada empleado pertenece a una partición (se asignan por turnos al
+    registrarlos) y sus citas viven solo en el BookMeService de ese proceso,
+    así que las reservas de empleados de particiones distintas se atienden en
+    paralelo sin compartir el GIL. Los clientes, administradores y servicios
+    se replican en todas las particiones con el ID que asigna el enrutador.
+
+    Las citas y notificaciones se numeran con un GeneradorIds de paso igual al
+    número de particiones y desfase igual al índice de la partición: los IDs
+    no se repiten entre procesos y la partición de una cita se deduce de su ID
+    sin tabla de rutas. Las consultas sobre todos los empleados (buscar_huecos,
+    estadisticas) se envían a todas las particiones a la vez y se combinan.
+
+    Cada partición se atiende por un Pipe protegido por un cerrojo: el
+    enrutador puede usarse desde varios hilos y las peticiones a particiones
+    distintas avanzan en paralelo. Las opciones y la fábrica de repositorios se
+    envían a los procesos, por lo que deben poder serializarse con pickle
+    cuando el método de arranque no es "fork".
+
+    Con repositorios persistentes, al arrancar se reconstruyen la tabla de
+    empleados y la numeración de usuarios y servicios a partir de lo que ha
+    cargado cada partición. El número de particiones debe ser el mismo con el
+    que se guardaron los datos.
+
+    Las altas replicadas (clientes, administradores y servicios) se validan
+    en el enrutador antes de enviarlas, y cada partición las aplica todo o
+    nada. No son atómicas entre particiones: si alguna falla (por ejemplo, su
+    repositorio), las demás conservan el alta y se lanza RuntimeError con las
+    particiones que fallaron. Los repositorios no permiten borrar usuarios, así
+    que no se deshace en las que sí la aplicaron.
+
+    Atributos:
+        num_particiones (int): Número de procesos trabajadores
+        nombre_negocio (str): Nombre del negocio
+        ids (GeneradorIds): Numeración de usuarios y servicios
+    """
+
+    def __init__(self, nombre_negocio: str, direccion: str, telefono: str,
+                 num_particiones: int = None,
+                 fabrica_repositorio: Callable[[int], Repositorio] = None, **opciones):
+        """
+        Arranca los procesos trabajadores.
+
+        Args:
+            nombre_negocio (str): Nombre del negocio
+            direccion (str): Dirección del negocio
+            telefono (str): Teléfono del negocio
+            num_particiones (int): Procesos trabajadores (por defecto, uno por CPU)
+            fabrica_repositorio (Callable): Índice de partición -> Repositorio (por defecto, solo memoria)
+            **opciones: Argumentos para el BookMeService de cada partición
+        """
+        self.num_particiones = num_particiones or os.cpu_count() or 1
+        self.nombre_negocio = nombre_negocio
+        self.ids = GeneradorIds()
+        self._conexiones = []
+        self._procesos = []
+        self._locks = [threading.Lock() for _ in range(self.num_particiones)]
+        for indice in range(self.num_particiones):
+            extremo, extremo_trabajador = multiprocessing.Pipe()
+            proceso = multiprocessing.Process(
+                target=_trabajador, daemon=True, name=f"bookme-particion-{indice}",
+                args=(extremo_trabajador, indice, self.num_particiones,
+                      (nombre_negocio, direccion, telefono), fabrica_repositorio, opciones))
+            proceso.start()
+            extremo_trabajador.close()
+            self._conexiones.append(extremo)
+            self._procesos.append(proceso)
+
+        # Empleado -> partición, y orden de alta de los empleados
+        self._particion_empleado: Dict[str, int] = {}
+        self._orden_empleados: Dict[str, int] = {}
+        # Altas de empleados reservadas: fija su partición (por turnos) y su orden
+        self._altas_empleados = 0
+        self._lock = threading.Lock()
+        self._reconstruir_rutas()
+
+    def _reconstruir_rutas(self):
+        """
+        Recupera los empleados y los últimos IDs que ya tienen las particiones (método privado).
+
+        Los IDs de usuario los asigna el enrutador en orden creciente, así que
+        ordenarlos por número reproduce el orden de alta de los empleados.
+        """
+        empleados = []
+        for indice, (ids_empleados, ultimo_usuario, ultimo_servicio) in enumerate(
+                self._difundir("estado_ruta")):
+            empleados.extend((empleado_id, indice) for empleado_id in ids_empleados)
+            self.ids.avanzar("usuario", ultimo_usuario)
+            self.ids.avanzar("servicio", ultimo_servicio)
+        empleados.sort(key=lambda par: GeneradorIds.numero("usuario", par[0]) or 0)
+        for empleado_id, indice in empleados:
+            self._particion_empleado[empleado_id] = indice
+            self._orden_empleados[empleado_id] = len(self._orden_empleados)
+        self._altas_empleados = len(empleados)
+
+    def __enter__(self) -> "ServicioParticionado":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.cerrar()
+
+    # COMUNICACIÓN CON LOS TRABAJADORES
+
+    @staticmethod
+    def _resultado(respuesta: Tuple[str, object]):
+        """
+        Extrae el resultado de una respuesta de un trabajador (método privado).
+
+        Raises:
+            RuntimeError: Si la operación lanzó una excepción en el trabajador
+        """
+        estado, valor = respuesta
+        if estado == "error":
+            raise RuntimeError(valor)
+        return valor
+
+    def _llamar(self, indice: int, operacion: str, *args):
+        """
+        Ejecuta una operación en una partición y espera su resultado (método privado).
+
+        Args:
+            indice (int): Partición
+            operacion (str): Nombre de la operación
+            *args: Argumentos de la operación
+
+        Returns:
+            Resultado de la operación
+        """
+        with self._locks[indice]:
+            self._conexiones[indice].send((operacion, args))
+            respuesta = self._conexiones[indice].recv()
+        return self._resultado(respuesta)
+
+    def _difundir(self, operacion: str, *args, particiones: List[int] = None) -> List:
+        """
+        Ejecuta una operación en varias particiones a la vez (método privado).
+
+        Primero se envía la petición a todas y después se recogen las
+        respuestas, de modo que los trabajadores la atienden en paralelo. Los
+        cerrojos se toman por orden de índice para no bloquearse con otros hilos.
+
+        Args:
+            operacion (str): Nombre de la operación
+            *args: Argumentos de la operación
+            particiones (List[int]): Particiones destino (por defecto, todas)
+
+        Returns:
+            List: Resultado de cada partición, en el orden de `particiones`
+
+        Raises:
+            RuntimeError: Si la operación falla en alguna partición
+        """
+        return [self._resultado(respuesta)
+                for respuesta in self._difundir_respuestas(operacion, *args,
+                                                           particiones=particiones)]
+
+    def _difundir_respuestas(self, operacion: str, *args,
+                             particiones: List[int] = None) -> List[Tuple[str, object]]:
+        """
+        Envía una operación a varias particiones y recoge sus respuestas sin interpretarlas
+        (método privado).
+
+        Args:
+            operacion (str): Nombre de la operación
+            *args: Argumentos de la operación
+            particiones (List[int]): Particiones destino (por defecto, todas)
+
+        Returns:
+            List[Tuple[str, object]]: Respuesta ("ok" o "error", valor) de cada partición
+        """
+        if particiones is None:
+            particiones = range(self.num_particiones)
+        particiones = sorted(particiones)
+        for indice in particiones:
+            self._locks[indice].acquire()
+        try:
+            for indice in particiones:
+                self._conexiones[indice].send((operacion, args))
+            respuestas = [self._conexiones[indice].recv() for indice in particiones]
+        finally:
+            for indice in particiones:
+                self._locks[indice].release()
+        return respuestas
+
+    def _replicar(self, operacion: str, objeto_id: str, *args):
+        """
+        Aplica un alta en todas las particiones (método privado).
+
+        Args:
+            operacion (str): "alta_usuario" o "alta_servicio"
+            objeto_id (str): ID asignado por el enrutador
+            *args: Resto de argumentos del alta
+
+        Raises:
+            RuntimeError: Si el alta falla en alguna partición (las demás la conservan)
+        """
+        respuestas = self._difundir_respuestas(operacion, objeto_id, *args)
+        fallidas = [indice for indice, (estado, _) in enumerate(respuestas) if estado == "error"]
+        if fallidas:
+            errores = "; ".join(str(respuestas[indice][1]) for indice in fallidas)
+            logger.error("✗ Alta de %s aplicada solo en parte: fallaron las particiones %s",
+                         objeto_id, fallidas)
+            raise RuntimeError(f"Alta de {objeto_id} fallida en las particiones "
+                               f"{fallidas}: {errores}")
+
+    def particion_de_cita(self, cita_id: str) -> Optional[int]:
+        """
+        Partición a la que pertenece una cita, deducida de su ID.
+
+        Args:
+            cita_id (str): ID de la cita
+
+        Returns:
+            int: Índice de la partición, o None si el ID no tiene el formato esperado
+        """
+        numero = GeneradorIds.numero("cita", cita_id)
+        if numero is None:
+            return None
+        return (numero - GeneradorIds.TABLAS["cita"][1]) % self.num_particiones
+
+    def particion_de_empleado(self, empleado_id: str) -> Optional[int]:
+        """
+        Partición a la que pertenece un empleado.
+
+        Args:
+            empleado_id (str): ID del empleado
+
+        Returns:
+            int: Índice de la partición, o None si el empleado no existe
+        """
+        return self._particion_empleado.get(empleado_id)
+
+    # MÉTODOS DE USUARIOS Y SERVICIOS
+
+    def registrar_usuario(self, tipo_usuario: str, nombre: str, email: str,
+                          datos_adicionales: Dict = None) -> Optional[str]:
+        """
+        Registra un usuario: los empleados en una partición y el resto en todas.
+
+        Args:
+            tipo_usuario (str): Tipo de usuario ("cliente", "empleado", "administrador")
+            nombre (str): Nombre del usuario
+            email (str): Email del usuario
+            datos_adicionales (Dict): Datos adicionales según el tipo de usuario
+
+        Returns:
+            str: ID del usuario registrado o None si los datos no son válidos
+
+        Raises:
+            RuntimeError: Si el alta de un usuario replicado falla en alguna partición
+        """
+        tipo = tipo_usuario.lower()
+        if tipo not in BookMeService.TIPOS_USUARIO:
+            logger.warning("Tipo de usuario '%s' no reconocido", tipo_usuario)
+            return None
+        datos_adicionales = datos_adicionales or {}
+        usuario_id = self.ids.siguiente("usuario")
+        # Se construye aquí para que un dato no válido no llegue a ninguna partición
+        try:
+            BookMeService._construir_usuario(tipo, nombre, email, datos_adicionales, usuario_id)
+        except Exception as e:
+            logger.warning("✗ Error al registrar usuario: %s", e)
+            return None
+        args = (usuario_id, tipo, nombre, email, datos_adicionales)
+        if tipo == "empleado":
+            # Partición y orden se reservan juntos: dos altas a la vez no caen en el mismo turno
+            with self._lock:
+                orden = self._altas_empleados
+                self._altas_empleados += 1
+            indice = orden % self.num_particiones
+            self._llamar(indice, "alta_usuario", *args)
+            # La ruta se anota solo si la partición ha dado de alta al empleado
+            with self._lock:
+                self._particion_empleado[usuario_id] = indice
+                self._orden_empleados[usuario_id] = orden
+        else:
+            self._replicar("alta_usuario", *args)
+        logger.info("✓ Usuario '%s' registrado como %s", nombre, tipo)
+        return usuario_id
+
+    def crear_servicio(self, nombre: str, descripcion: str, duracion: int,
+                       precio: float) -> Optional[str]:
+        """
+        Crea un servicio en todas las particiones.
+
+        Args:
+            nombre (str): Nombre del servicio
+            descripcion (str): Descripción del servicio
+            duracion (int): Duración en minutos
+            precio (float): Precio del servicio
+
+        Returns:
+            str: ID del servicio creado o None si los datos no son válidos
+
+        Raises:
+            RuntimeError: Si el alta falla en alguna partición
+        """
+        servicio_id = self.ids.siguiente("servicio")
+        try:
+            Servicio(nombre, descripcion, duracion, precio, id=servicio_id)
+        except Exception as e:
+            logger.warning("✗ Error al crear servicio: %s", e)
+            return None
+        self._replicar("alta_servicio", servicio_id, nombre, descripcion, duracion, precio)
+        logger.info("✓ Servicio '%s' creado exitosamente", nombre)
+        return servicio_id
+
+    def asignar_horario(self, empleado_id: str, horario: Horario) -> str:
+        """
+        Asigna un horario a un empleado (ver BookMeService.asignar_horario).
+
+        Args:
+            empleado_id (str): ID del empleado
+            horario (Horario): Horario a asignar
+
+        Returns:
+            str: Mensaje de confirmación o error
+        """
+        indice = self._particion_empleado.get(empleado_id)
+        if indice is None:
+            return f"Empleado {empleado_id} no encontrado"
+        return self._llamar(indice, "asignar_horario", empleado_id, horario)
+
+    # MÉTODOS DE CITAS
+
+    def crear_cita(self, cliente_id: str, empleado_id: str, servicio_id: str,
+                   fecha_hora: str) -> Optional[str]:
+        """
+        Crea una cita en la partición del empleado (ver BookMeService.crear_cita).
+
+        Args:
+            cliente_id (str): ID del cliente
+            empleado_id (str): ID del empleado
+            servicio_id (str): ID del servicio
+            fecha_hora (str): Fecha y hora en formato "YYYY-MM-DD HH:MM"
+
+        Returns:
+            str: ID de la cita creada o None si hay error
+        """
+        indice = self._particion_empleado.get(empleado_id)
+        if indice is None:
+            logger.warning("✗ Error al crear cita: Empleado %s no encontrado", empleado_id)
+            return None
+        return self._llamar(indice, "crear_cita", cliente_id, empleado_id, servicio_id,
+                            fecha_hora)
+
+    def _sobre_cita(self, cita_id: str, operacion: str, *args):
+        """
+        Envía una operación sobre una cita a su partición (método privado).
+
+        Un ID mal formado se envía a la partición 0, que responde como el
+        servicio ante una cita inexistente.
+        """
+        indice = self.particion_de_cita(cita_id)
+        return self._llamar(indice or 0, operacion, cita_id, *args)
+
+    def modificar_cita(self, cita_id: str, nueva_fecha_hora: str) -> Optional[str]:
+        """
+        Modifica la fecha y hora de una cita (ver BookMeService.modificar_cita).
+
+        Args:
+            cita_id (str): ID de la cita
+            nueva_fecha_hora (str): Nueva fecha y hora
+
+        Returns:
+            str: ID de la cita modificada o None si hay error
+        """
+        return self._sobre_cita(cita_id, "modificar_cita", nueva_fecha_hora)
+
+    def cancelar_cita(self, cita_id: str, razon: str = "") -> str:
+        """
+        Cancela una cita (ver BookMeService.cancelar_cita).
+
+        Args:
+            cita_id (str): ID de la cita
+            razon (str): Razón de la cancelación
+
+        Returns:
+            str: Mensaje de confirmación o error
+        """
+        return self._sobre_cita(cita_id, "cancelar_cita", razon)
+
+    def completar_cita(self, cita_id: str) -> str:
+        """
+        Marca una cita como completada (ver BookMeService.completar_cita).
+
+        Args:
+            cita_id (str): ID de la cita
+
+        Returns:
+            str: Mensaje de confirmación o error
+        """
+        return self._sobre_cita(cita_id, "completar_cita")
+
+    # CONSULTAS SOBRE TODAS LAS PARTICIONES
+
+    def buscar_huecos(self, servicio_id: str, cantidad: int = 5, desde: str = None,
+                      dias: int = 14, empleado_id: str = None,
+                      paso: int = 30) -> List[Tuple[str, str]]:
+        """
+        Busca los primeros huecos libres con cualquier empleado (ver BookMeService.buscar_huecos).
+
+        Cada partición devuelve sus `cantidad` primeros huecos y aquí se quedan
+        los `cantidad` primeros del conjunto, desempatando por orden de alta del
+        empleado como hace el servicio.
+
+        Args:
+            servicio_id (str): ID del servicio a reservar
+            cantidad (int): Número máximo de huecos a devolver
+            desde (str): Fecha y hora "YYYY-MM-DD HH:MM" desde la que buscar
+            dias (int): Número de días a explorar
+            empleado_id (str): Limitar la búsqueda a un empleado concreto
+            paso (int): Separación en minutos entre inicios propuestos
+
+        Returns:
+            List[Tuple[str, str]]: Pares (fecha y hora de inicio, ID del empleado), ordenados
+
+        Raises:
+            ValueError: Si paso es menor que 1
+        """
+        if paso < 1:
+            raise ValueError("paso debe ser al menos 1")
+        args = (servicio_id, cantidad, desde, dias, empleado_id, paso)
+        if empleado_id is not None:
+            indice = self._particion_empleado.get(empleado_id)
+            return [] if indice is None else self._llamar(indice, "buscar_huecos", *args)
+        huecos = [hueco for parcial in self._difundir("buscar_huecos", *args)
+                  for hueco in parcial]
+        huecos.sort(key=lambda hueco: (hueco[0], self._orden_empleados[hueco[1]]))
+        return huecos[:cantidad]
+
+    def estadisticas(self) -> Dict[str, float]:
+        """
+        Combina los contadores de todas las particiones (ver BookMeService.estadisticas).
+
+        Los clientes, administradores y servicios están replicados y se toman
+        de una sola partición; empleados, citas e ingresos se suman.
+
+        Returns:
+            Dict: Totales de usuarios, citas, servicios e ingresos
+        """
+        parciales = self._difundir("estadisticas")
+        datos = dict(parciales[0])
+        for parcial in parciales[1:]:
+            for clave, valor in parcial.items():
+                if clave not in ("cliente", "administrador", "servicios", "usuarios"):
+                    datos[clave] += valor
+        datos["usuarios"] = datos["cliente"] + datos["empleado"] + datos["administrador"]
+        return datos
+
+    def obtener_estadisticas(self) -> str:
+        """
+        Obtiene un resumen de estadísticas del negocio.
+
+        Returns:
+            str: Estadísticas formateadas
+        """
+        return presentacion.estadisticas(self.nombre_negocio, self.estadisticas())
+
+    def cerrar(self):
+        """Cierra los trabajadores y espera a que terminen."""
+        for indice, conexion in enumerate(self._conexiones):
+            with self._locks[indice]:
+                if not conexion.closed:
+                    conexion.send(None)
+                    conexion.close()
+        for proceso in self._procesos:
+            proceso.join()
@@ -0,0 +1,110 @@
+"""
+Módulo: presentacion.py
+Descripción: Formateo en texto de los listados de BookMe. El servicio devuelve objetos del
+             dominio y este módulo los convierte en el texto que muestra la interfaz,
+             construyéndolo con str.join en lugar de concatenaciones sucesivas.
+"""
+
+from typing import Callable, Dict, Iterable
+from tiempo import MINUTOS_DIA, minutos_a_hora
+
+
+def lista_numerada(titulo: str, objetos: Iterable, vacio: str, ancho_pie: int,
+                   formato: Callable = str) -> str:
+    """
+    Formatea una lista numerada con cabecera y pie.
+
+    Args:
+        titulo (str): Texto de la cabecera
+        objetos (Iterable): Objetos a listar (se recorren una sola vez)
+        vacio (str): Texto si no hay objetos
+        ancho_pie (int): Número de "=" del pie
+        formato (Callable): Convierte cada objeto en su línea (por defecto, str)
+
+    Returns:
+        str: Lista formateada
+    """
+    lineas = [f"{i}. {formato(objeto)}" for i, objeto in enumerate(objetos, 1)]
+    if not lineas:
+        return vacio
+    return "\n".join([f"\n========== {titulo} ==========", *lineas, "=" * ancho_pie])
+
+
+def lista_usuarios(usuarios: Iterable) -> str:
+    """Formatea la lista de usuarios registrados."""
+    return lista_numerada("USUARIOS REGISTRADOS", usuarios,
+                          "No hay usuarios registrados", 41)
+
+
+def lista_servicios(servicios: Iterable) -> str:
+    """Formatea la lista de servicios disponibles."""
+    return lista_numerada("SERVICIOS DISPONIBLES", servicios,
+                          "No hay servicios disponibles", 43,
+                          lambda s: f"{s.nombre} - {s.precio}€ ({s.duracion}min)")
+
+
+def lista_empleados(empleados: Iterable) -> str:
+    """Formatea la lista de empleados del negocio."""
+    return lista_numerada("EMPLEADOS", empleados, "No hay empleados registrados", 30,
+                          lambda e: f"{e.nombre} ({e.especialidad}) - {e.email}")
+
+
+def lista_citas(citas: Iterable) -> str:
+    """Formatea la lista de todas las citas."""
+    return lista_numerada("TODAS LAS CITAS", citas, "No hay citas registradas", 36)
+
+
+def lista_citas_cliente(cliente, citas: Iterable) -> str:
+    """Formatea las citas de un cliente."""
+    return lista_numerada(f"CITAS DE {cliente.nombre.upper()}", citas,
+                          "El cliente no tiene citas reservadas", 42)
+
+
+def lista_notificaciones(usuario, notificaciones: Iterable) -> str:
+    """Formatea las notificaciones de un usuario."""
+    return lista_numerada(f"NOTIFICACIONES DE {usuario.nombre.upper()}", notificaciones,
+                          f"{usuario.nombre} no tiene notificaciones", 50)
+
+
+def _franja(cita) -> str:
+    """Hora de inicio y fin de una cita, "HH:MM-HH:MM"."""
+    return (f"{minutos_a_hora(cita.inicio % MINUTOS_DIA)}-"
+            f"{minutos_a_hora(cita.fin % MINUTOS_DIA)}")
+
+
+def agenda_empleado(empleado, fecha: str, citas: Iterable) -> str:
+    """Formatea la agenda de un empleado para un día."""
+    return lista_numerada(f"AGENDA DE {empleado.nombre.upper()} ({fecha})", citas,
+                          f"{empleado.nombre} no tiene citas el {fecha}", 40,
+                          lambda c: f"{_franja(c)} {c.servicio.nombre} - "
+                                    f"{c.cliente.nombre} ({c.estado})")
+
+
+def agenda_negocio(fecha: str, citas: Iterable) -> str:
+    """Formatea la agenda de todo el negocio para un día."""
+    return lista_numerada(f"AGENDA DEL {fecha}", citas, f"No hay citas el {fecha}", 40,
+                          lambda c: f"{_franja(c)} {c.empleado.nombre}: {c.servicio.nombre} - "
+                                    f"{c.cliente.nombre} ({c.estado})")
+
+
+def estadisticas(nombre_negocio: str, datos: Dict) -> str:
+    """Formatea el resumen de estadísticas del negocio (ver BookMeService.estadisticas)."""
+    lineas = [
+        "========== ESTADÍSTICAS DEL NEGOCIO ==========",
+        f"Negocio: {nombre_negocio}",
+        f"Total de usuarios: {datos['usuarios']}",
+        f"- Clientes: {datos['cliente']}",
+        f"- Empleados: {datos['empleado']}",
+        f"- Administradores: {datos['administrador']}",
+        "",
+        f"Total de servicios: {datos['servicios']}",
+        f"Total de citas: {datos['citas']}",
+        f"- Confirmadas: {datos['confirmada']}",
+        f"- Canceladas: {datos['cancelada']}",
+        f"- Completadas: {datos['completada']}",
+        "",
+        f"Ingresos totales: {datos['ingresos']}€",
+        "=============================================",
+    ]
+    sangria = " " * 8
+    return "\n" + "".join(f"{sangria}{linea}\n" for linea in lineas) + sangria
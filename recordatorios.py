@@ -0,0 +1,90 @@
+"""
+Módulo: recordatorios.py
+Descripción: Define la clase PlanificadorRecordatorios, que ordena en un montículo (heap) los
+             recordatorios pendientes de las citas confirmadas para emitir en cada revisión solo
+             los que ya han vencido.
+"""
+
+import heapq
+from typing import Dict, List, Tuple
+
+
+class PlanificadorRecordatorios:
+    """
+    Cola de recordatorios ordenada por instante de envío.
+
+    Cada cita programada tiene una entrada (vencimiento, versión, cita_id) en un
+    min-heap. Reprogramar o anular no busca la entrada antigua: se cambia la versión
+    vigente y las entradas obsoletas se descartan al salir del heap.
+
+    Atributos:
+        antelacion (int): Minutos antes del inicio de la cita en que vence el recordatorio
+    """
+
+    def __init__(self, antelacion: int = 1440):
+        """
+        Inicializa el planificador.
+
+        Args:
+            antelacion (int): Minutos de antelación del recordatorio (por defecto, un día)
+        """
+        self.antelacion = antelacion
+        self._heap: List[Tuple[int, int, str]] = []
+        self._versiones: Dict[str, int] = {}
+        self._siguiente_version = 0
+
+    def programar(self, cita_id: str, inicio: int):
+        """
+        Programa (o reprograma) el recordatorio de una cita.
+
+        Args:
+            cita_id (str): ID de la cita
+            inicio (int): Inicio de la cita en minutos desde la época
+        """
+        self._siguiente_version += 1
+        self._versiones[cita_id] = self._siguiente_version
+        heapq.heappush(self._heap, (inicio - self.antelacion, self._siguiente_version, cita_id))
+        # Si las entradas obsoletas dominan el heap, se reconstruye
+        if len(self._heap) > 2 * len(self._versiones) + 64:
+            self._compactar()
+
+    def anular(self, cita_id: str):
+        """
+        Anula el recordatorio de una cita, si estaba programado.
+
+        Args:
+            cita_id (str): ID de la cita
+        """
+        self._versiones.pop(cita_id, None)
+
+    def vencidos(self, ahora: int) -> List[str]:
+        """
+        Extrae los recordatorios cuyo vencimiento ya ha llegado. Coste O(k log n).
+
+        Args:
+            ahora (int): Instante actual en minutos desde la época
+
+        Returns:
+            List[str]: IDs de las citas a recordar, por orden de vencimiento
+        """
+        vencidos = []
+        while self._heap and self._heap[0][0] <= ahora:
+            _, version, cita_id = heapq.heappop(self._heap)
+            if self._versiones.get(cita_id) == version:
+                del self._versiones[cita_id]
+                vencidos.append(cita_id)
+        return vencidos
+
+    def _compactar(self):
+        """Elimina del heap las entradas obsoletas (método privado)."""
+        self._heap = [entrada for entrada in self._heap
+                      if self._versiones.get(entrada[2]) == entrada[1]]
+        heapq.heapify(self._heap)
+
+    def __contains__(self, cita_id: str) -> bool:
+        """Indica si la cita tiene un recordatorio programado."""
+        return cita_id in self._versiones
+
+    def __len__(self) -> int:
+        """Número de recordatorios programados."""
+        return len(self._versiones)
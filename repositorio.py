@@ -0,0 +1,418 @@
+"""
+Módulo: repositorio.py
+Descripción: Capa de persistencia de BookMeService. Define la interfaz Repositorio y una
+             implementación sobre SQLite (módulo estándar sqlite3) con escritura inmediata,
+             transacciones agrupadas e índices para las consultas más frecuentes.
+"""
+
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Tuple
+
+from series import excepciones_a_texto
+
+
+class Repositorio:
+    """
+    Interfaz de almacenamiento persistente para BookMeService.
+
+    El servicio mantiene sus objetos en memoria y escribe cada cambio en el
+    repositorio (write-through). Las consultas de listado y estadísticas se
+    delegan al repositorio para que se resuelvan en el propio almacenamiento.
+
+    Contrato de transacción, igual para todas las implementaciones: las
+    escrituras hechas dentro de transaccion() se aplican todas o ninguna. Si el
+    bloque lanza una excepción se descartan las suyas (en un bloque anidado,
+    solo las de ese bloque); si falla su aplicación al cerrar la transacción
+    más externa, no queda nada aplicado y la excepción se propaga. El servicio
+    deshace entonces sus cambios en memoria, de modo que memoria y
+    almacenamiento nunca divergen.
+
+    Las implementaciones lo cumplen aplazando las escrituras: dentro de una
+    transacción, _diferir() las acumula por hilo y al cerrar la más externa se
+    entregan juntas a _aplicar_escrituras(). Las escrituras de una transacción
+    no se ven en las lecturas hasta entonces.
+    """
+
+    def __init__(self):
+        """Inicializa el estado por hilo de las transacciones."""
+        self._local = threading.local()
+
+    @property
+    def _profundidad(self) -> int:
+        """Profundidad de transacciones anidadas del hilo actual."""
+        return getattr(self._local, "profundidad", 0)
+
+    def _diferir(self, escritura) -> bool:
+        """
+        Aparta una escritura si el hilo está dentro de una transacción (método privado).
+
+        Args:
+            escritura: Escritura en el formato de la implementación
+
+        Returns:
+            bool: True si se ha apartado; False si debe aplicarse ya
+        """
+        if self._profundidad == 0:
+            return False
+        self._local.escrituras.append(escritura)
+        return True
+
+    def _aplicar_escrituras(self, escrituras: List):
+        """
+        Aplica de forma atómica las escrituras de una transacción (método privado).
+
+        Args:
+            escrituras (List): Escrituras apartadas con _diferir, en orden
+
+        Raises:
+            Exception: Si alguna falla; en ese caso no debe quedar ninguna aplicada
+        """
+        raise NotImplementedError
+
+    # ESCRITURA
+
+    def guardar_usuario(self, usuario):
+        """Guarda un usuario nuevo."""
+        raise NotImplementedError
+
+    def guardar_servicio(self, servicio):
+        """Guarda o actualiza un servicio."""
+        raise NotImplementedError
+
+    def eliminar_servicio(self, servicio_id: str):
+        """Da de baja un servicio (las citas antiguas lo siguen referenciando)."""
+        raise NotImplementedError
+
+    def guardar_horario(self, empleado_id: str, horario):
+        """Guarda o reemplaza el horario de un empleado."""
+        raise NotImplementedError
+
+    def guardar_cita(self, cita):
+        """Guarda o actualiza una cita (fechas y estado)."""
+        raise NotImplementedError
+
+    def guardar_notificacion(self, notificacion):
+        """Guarda una notificación nueva."""
+        raise NotImplementedError
+
+    def marcar_notificacion_leida(self, notificacion_id: str):
+        """Marca una notificación como leída."""
+        raise NotImplementedError
+
+    def guardar_serie(self, serie):
+        """Guarda o actualiza una serie de citas periódicas (repeticiones y excepciones)."""
+        raise NotImplementedError
+
+    @contextmanager
+    def transaccion(self) -> Iterator[None]:
+        """
+        Agrupa varias escrituras en una única transacción: todas o ninguna.
+
+        Las transacciones se pueden anidar; un bloque anidado que falla
+        descarta solo sus escrituras, como un punto de guardado.
+        """
+        profundidad = self._profundidad
+        if profundidad == 0:
+            self._local.escrituras = []
+        marca = len(self._local.escrituras)
+        self._local.profundidad = profundidad + 1
+        try:
+            yield
+        except BaseException:
+            del self._local.escrituras[marca:]
+            raise
+        finally:
+            self._local.profundidad = profundidad
+        if profundidad == 0:
+            escrituras, self._local.escrituras = self._local.escrituras, []
+            if escrituras:
+                self._aplicar_escrituras(escrituras)
+
+    def confirmar(self):
+        """Confirma las escrituras pendientes."""
+
+    def cerrar(self):
+        """Confirma lo pendiente y libera los recursos."""
+
+    # LECTURA
+
+    def cargar(self) -> Dict[str, List[tuple]]:
+        """
+        Lee el estado necesario para reconstruir el servicio al arrancar.
+
+        Returns:
+            Dict: Filas de "usuarios", "servicios", "horarios", "citas", "series" y
+                "notificaciones" (id, destinatario_id, mensaje, tipo, fecha_envio,
+                leida), cada una en orden de creación
+        """
+        raise NotImplementedError
+
+    def ultimo_id(self, tabla: str) -> int:
+        """Número más alto usado en los IDs de una tabla (0 si está vacía)."""
+        raise NotImplementedError
+
+    def ids_citas_cliente(self, cliente_id: str) -> List[str]:
+        """IDs de las citas de un cliente en orden de creación."""
+        raise NotImplementedError
+
+    def notificaciones_de(self, usuario_id: str) -> List[tuple]:
+        """Filas (id, mensaje, tipo, fecha_envio, leida) de las notificaciones de un usuario."""
+        raise NotImplementedError
+
+    def estadisticas(self) -> Dict[str, float]:
+        """Contadores agregados de usuarios, servicios, citas e ingresos."""
+        raise NotImplementedError
+
+
+class RepositorioSQLite(Repositorio):
+    """
+    Repositorio sobre una base de datos SQLite.
+
+    Las escrituras se acumulan en la transacción de SQLite abierta y se
+    confirman (commit) cuando se alcanzan `tam_lote` escrituras.
+
+    Las escrituras de una transacción(), apartadas por hilo hasta que se
+    cierra la más externa, se ejecutan de una vez con el cerrojo de la
+    conexión tomado y dentro de un punto de guardado (SAVEPOINT): si una falla
+    se deshacen las de ese bloque y solo esas, no las de operaciones
+    anteriores del lote que aún no se habían confirmado. Como ningún otro hilo
+    puede escribir mientras tanto, deshacer nunca arrastra escrituras ajenas.
+
+    Puede usarse desde varios hilos: la conexión se protege con un cerrojo y
+    las transacciones se llevan por hilo.
+
+    Atributos:
+        ruta (str): Ruta del fichero de base de datos (":memory:" para pruebas)
+        tam_lote (int): Escrituras acumuladas antes de confirmar la transacción
+    """
+
+    ESQUEMA = """
+        CREATE TABLE IF NOT EXISTS usuario (
+            id TEXT PRIMARY KEY,
+            tipo TEXT NOT NULL,
+            nombre TEXT NOT NULL,
+            email TEXT NOT NULL,
+            telefono TEXT,
+            especialidad TEXT
+        );
+        CREATE TABLE IF NOT EXISTS servicio (
+            id TEXT PRIMARY KEY,
+            nombre TEXT NOT NULL,
+            descripcion TEXT,
+            duracion INTEGER NOT NULL,
+            precio REAL NOT NULL,
+            activo INTEGER NOT NULL DEFAULT 1
+        );
+        CREATE TABLE IF NOT EXISTS horario (
+            empleado_id TEXT PRIMARY KEY,
+            dia TEXT NOT NULL,
+            hora_inicio TEXT NOT NULL,
+            hora_fin TEXT NOT NULL,
+            pausas TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS cita (
+            id TEXT PRIMARY KEY,
+            cliente_id TEXT NOT NULL,
+            empleado_id TEXT NOT NULL,
+            servicio_id TEXT NOT NULL,
+            inicio INTEGER NOT NULL,
+            fin INTEGER NOT NULL,
+            estado TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_cita_empleado_inicio ON cita (empleado_id, inicio);
+        CREATE INDEX IF NOT EXISTS idx_cita_cliente ON cita (cliente_id);
+        CREATE TABLE IF NOT EXISTS notificacion (
+            id TEXT PRIMARY KEY,
+            destinatario_id TEXT NOT NULL,
+            mensaje TEXT NOT NULL,
+            tipo TEXT NOT NULL,
+            fecha_envio TEXT NOT NULL,
+            leida INTEGER NOT NULL DEFAULT 0
+        );
+        CREATE INDEX IF NOT EXISTS idx_notificacion_destinatario
+            ON notificacion (destinatario_id);
+        CREATE TABLE IF NOT EXISTS serie (
+            id TEXT PRIMARY KEY,
+            cliente_id TEXT NOT NULL,
+            empleado_id TEXT NOT NULL,
+            servicio_id TEXT NOT NULL,
+            inicio INTEGER NOT NULL,
+            duracion INTEGER NOT NULL,
+            frecuencia TEXT NOT NULL,
+            intervalo INTEGER NOT NULL,
+            repeticiones_regla INTEGER,
+            hasta TEXT,
+            repeticiones INTEGER NOT NULL,
+            excepciones TEXT NOT NULL
+        );
+    """
+
+    def __init__(self, ruta: str, tam_lote: int = 1):
+        """
+        Abre (o crea) la base de datos.
+
+        Args:
+            ruta (str): Ruta del fichero SQLite
+            tam_lote (int): Escrituras acumuladas antes de confirmar
+        """
+        super().__init__()
+        self.ruta = ruta
+        self.tam_lote = tam_lote
+        self._conexion = sqlite3.connect(ruta, check_same_thread=False)
+        self._conexion.executescript(self.ESQUEMA)
+        self._lock = threading.RLock()
+        self._pendientes = 0
+
+    # ESCRITURA
+
+    def _escribir(self, sql: str, parametros: tuple):
+        """
+        Ejecuta una escritura (o la aparta si hay transacción) y confirma si toca
+        (método privado).
+
+        Args:
+            sql (str): Sentencia SQL
+            parametros (tuple): Parámetros de la sentencia
+        """
+        if self._diferir((sql, parametros)):
+            return
+        with self._lock:
+            self._conexion.execute(sql, parametros)
+            self._pendientes += 1
+            if self._pendientes >= self.tam_lote:
+                self.confirmar()
+
+    def _aplicar_escrituras(self, escrituras: List[Tuple[str, tuple]]):
+        with self._lock:
+            if not self._conexion.in_transaction:
+                # Sin BEGIN explícito, liberar el punto de guardado confirmaría el lote
+                self._conexion.execute("BEGIN")
+            self._conexion.execute("SAVEPOINT bloque")
+            try:
+                for sql, parametros in escrituras:
+                    self._conexion.execute(sql, parametros)
+            except BaseException:
+                self._conexion.execute("ROLLBACK TO bloque")
+                self._conexion.execute("RELEASE bloque")
+                raise
+            self._conexion.execute("RELEASE bloque")
+            self._pendientes += len(escrituras)
+            if self._pendientes >= self.tam_lote:
+                self.confirmar()
+
+    def guardar_usuario(self, usuario):
+        self._escribir(
+            "INSERT OR REPLACE INTO usuario VALUES (?, ?, ?, ?, ?, ?)",
+            (usuario.id, type(usuario).__name__.lower(), usuario.nombre, usuario.email,
+             getattr(usuario, "teléfono", None), getattr(usuario, "especialidad", None)))
+
+    def guardar_servicio(self, servicio):
+        self._escribir(
+            "INSERT OR REPLACE INTO servicio VALUES (?, ?, ?, ?, ?, 1)",
+            (servicio.id, servicio.nombre, servicio.descripcion, servicio.duracion,
+             servicio.precio))
+
+    def eliminar_servicio(self, servicio_id: str):
+        self._escribir("UPDATE servicio SET activo = 0 WHERE id = ?", (servicio_id,))
+
+    def guardar_horario(self, empleado_id: str, horario):
+        self._escribir(
+            "INSERT OR REPLACE INTO horario VALUES (?, ?, ?, ?, ?)",
+            (empleado_id, horario.dia, horario.hora_inicio, horario.hora_fin,
+             ",".join(horario.pausas)))
+
+    def guardar_cita(self, cita):
+        self._escribir(
+            "INSERT OR REPLACE INTO cita VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (cita.id, cita.cliente.id, cita.empleado.id, cita.servicio.id,
+             cita.inicio, cita.fin, cita.estado))
+
+    def guardar_notificacion(self, notificacion):
+        self._escribir(
+            "INSERT INTO notificacion VALUES (?, ?, ?, ?, ?, ?)",
+            (notificacion.id, notificacion.destinatario.id, notificacion.mensaje,
+             notificacion.tipo, notificacion.fecha_envio, int(notificacion.leida)))
+
+    def marcar_notificacion_leida(self, notificacion_id: str):
+        self._escribir("UPDATE notificacion SET leida = 1 WHERE id = ?", (notificacion_id,))
+
+    def guardar_serie(self, serie):
+        regla = serie.regla
+        self._escribir(
+            "INSERT OR REPLACE INTO serie VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (serie.id, serie.cliente.id, serie.empleado.id, serie.servicio.id, serie.inicio,
+             serie.duracion, regla.frecuencia, regla.intervalo, regla.repeticiones,
+             regla.hasta, serie.repeticiones, excepciones_a_texto(serie.excepciones)))
+
+    def confirmar(self):
+        with self._lock:
+            self._conexion.commit()
+            self._pendientes = 0
+
+    def cerrar(self):
+        with self._lock:
+            self.confirmar()
+            self._conexion.close()
+
+    # LECTURA
+
+    def cargar(self) -> Dict[str, List[tuple]]:
+        consultas = {
+            "usuarios": "SELECT id, tipo, nombre, email, telefono, especialidad "
+                        "FROM usuario ORDER BY rowid",
+            "servicios": "SELECT id, nombre, descripcion, duracion, precio, activo "
+                         "FROM servicio ORDER BY rowid",
+            "horarios": "SELECT empleado_id, dia, hora_inicio, hora_fin, pausas FROM horario",
+            "citas": "SELECT id, cliente_id, empleado_id, servicio_id, inicio, fin, estado "
+                     "FROM cita ORDER BY rowid",
+            "series": "SELECT id, cliente_id, empleado_id, servicio_id, inicio, duracion, "
+                      "frecuencia, intervalo, repeticiones_regla, hasta, repeticiones, "
+                      "excepciones FROM serie ORDER BY rowid",
+            "notificaciones": "SELECT id, destinatario_id, mensaje, tipo, fecha_envio, leida "
+                              "FROM notificacion ORDER BY rowid",
+        }
+        with self._lock:
+            return {clave: self._conexion.execute(sql).fetchall()
+                    for clave, sql in consultas.items()}
+
+    def ultimo_id(self, tabla: str) -> int:
+        if tabla not in ("usuario", "servicio", "cita", "notificacion", "serie"):
+            raise ValueError(f"Tabla desconocida: {tabla}")
+        with self._lock:
+            fila = self._conexion.execute(
+                f"SELECT MAX(CAST(SUBSTR(id, 4) AS INTEGER)) FROM {tabla}").fetchone()
+        return fila[0] or 0
+
+    def ids_citas_cliente(self, cliente_id: str) -> List[str]:
+        with self._lock:
+            filas = self._conexion.execute(
+                "SELECT id FROM cita WHERE cliente_id = ? ORDER BY rowid", (cliente_id,))
+            return [fila[0] for fila in filas]
+
+    def notificaciones_de(self, usuario_id: str) -> List[Tuple]:
+        with self._lock:
+            return self._conexion.execute(
+                "SELECT id, mensaje, tipo, fecha_envio, leida FROM notificacion "
+                "WHERE destinatario_id = ? ORDER BY rowid", (usuario_id,)).fetchall()
+
+    def estadisticas(self) -> Dict[str, float]:
+        with self._lock:
+            datos = {"cliente": 0, "empleado": 0, "administrador": 0,
+                     "confirmada": 0, "cancelada": 0, "completada": 0, "pendiente": 0}
+            for tipo, total in self._conexion.execute(
+                    "SELECT tipo, COUNT(*) FROM usuario GROUP BY tipo"):
+                datos[tipo] = total
+            for estado, total in self._conexion.execute(
+                    "SELECT estado, COUNT(*) FROM cita GROUP BY estado"):
+                datos[estado] = total
+            datos["usuarios"] = datos["cliente"] + datos["empleado"] + datos["administrador"]
+            datos["servicios"] = self._conexion.execute(
+                "SELECT COUNT(*) FROM servicio WHERE activo = 1").fetchone()[0]
+            datos["citas"] = self._conexion.execute("SELECT COUNT(*) FROM cita").fetchone()[0]
+            datos["ingresos"] = self._conexion.execute(
+                "SELECT COALESCE(SUM(s.precio), 0) FROM cita c "
+                "JOIN servicio s ON s.id = c.servicio_id "
+                "WHERE c.estado = 'confirmada'").fetchone()[0]
+            return datos
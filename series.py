@@ -0,0 +1,374 @@
+"""
+Módulo: series.py
+Descripción: Citas periódicas ("cada 4 semanas, martes a las 10:00"). Una SerieCitas guarda
+             la regla de repetición y sus excepciones en lugar de una Cita por repetición;
+             las ocurrencias se calculan al consultarlas y solo se convierten en Cita cuando
+             hace falta (moverlas, completarlas...).
+"""
+
+import threading
+from datetime import datetime
+from typing import Dict, Iterator, NamedTuple, Optional
+from tiempo import MINUTOS_DIA, fecha_a_minutos, minutos_a_fecha
+
+
+# Frecuencias admitidas y su duración en minutos
+FRECUENCIAS = {"diaria": MINUTOS_DIA, "semanal": 7 * MINUTOS_DIA}
+# Equivalencias con FREQ de RRULE (RFC 5545)
+_FRECUENCIAS_RRULE = {"DAILY": "diaria", "WEEKLY": "semanal"}
+
+
+def excepciones_a_texto(excepciones: Dict[int, Optional[str]]) -> str:
+    """
+    Codifica las excepciones de una serie para guardarlas en un repositorio.
+
+    Args:
+        excepciones (Dict): Inicio original -> ID de la cita que la sustituye (o None)
+
+    Returns:
+        str: Pares "inicio:cita_id" separados por comas (cita_id vacío si se canceló)
+    """
+    return ",".join(f"{inicio}:{cita_id or ''}"
+                    for inicio, cita_id in sorted(excepciones.items()))
+
+
+def texto_a_excepciones(texto: str) -> Dict[int, Optional[str]]:
+    """
+    Decodifica las excepciones guardadas con excepciones_a_texto.
+
+    Args:
+        texto (str): Pares "inicio:cita_id" separados por comas
+
+    Returns:
+        Dict: Inicio original -> ID de la cita que la sustituye (o None)
+    """
+    excepciones = {}
+    for par in filter(None, texto.split(",")):
+        inicio, _, cita_id = par.partition(":")
+        excepciones[int(inicio)] = cita_id or None
+    return excepciones
+
+
+class ReglaRecurrencia(NamedTuple):
+    """
+    Regla de repetición de una serie, al estilo de RRULE.
+
+    Hay que indicar `repeticiones` o `hasta` (o ambos, y manda el que
+    termine antes): las series abiertas no se admiten.
+
+    Atributos:
+        frecuencia (str): "diaria" o "semanal"
+        intervalo (int): Cada cuántos días o semanas se repite
+        repeticiones (int): Número total de ocurrencias (COUNT)
+        hasta (str): Última fecha "YYYY-MM-DD" en la que puede empezar una ocurrencia (UNTIL)
+    """
+
+    frecuencia: str = "semanal"
+    intervalo: int = 1
+    repeticiones: Optional[int] = None
+    hasta: Optional[str] = None
+
+    @classmethod
+    def desde_rrule(cls, texto: str) -> "ReglaRecurrencia":
+        """
+        Interpreta una regla en formato RRULE, p. ej. "FREQ=WEEKLY;INTERVAL=4;COUNT=13".
+
+        Se admiten FREQ (DAILY o WEEKLY), INTERVAL, COUNT y UNTIL (YYYYMMDD).
+
+        Args:
+            texto (str): Regla RRULE, con o sin el prefijo "RRULE:"
+
+        Returns:
+            ReglaRecurrencia: Regla equivalente
+
+        Raises:
+            ValueError: Si la regla usa partes o valores no admitidos
+        """
+        if texto.upper().startswith("RRULE:"):
+            texto = texto[len("RRULE:"):]
+        partes = {}
+        for parte in filter(None, texto.split(";")):
+            clave, _, valor = parte.partition("=")
+            partes[clave.strip().upper()] = valor.strip()
+        desconocidas = set(partes) - {"FREQ", "INTERVAL", "COUNT", "UNTIL"}
+        if desconocidas:
+            raise ValueError(f"Partes de RRULE no admitidas: {', '.join(sorted(desconocidas))}")
+        frecuencia = _FRECUENCIAS_RRULE.get(partes.get("FREQ", "").upper())
+        if frecuencia is None:
+            raise ValueError(f"FREQ no admitida: {partes.get('FREQ')!r}")
+        hasta = None
+        if "UNTIL" in partes:
+            hasta = datetime.strptime(partes["UNTIL"][:8], "%Y%m%d").strftime("%Y-%m-%d")
+        return cls(frecuencia, int(partes.get("INTERVAL", 1)),
+                   int(partes["COUNT"]) if "COUNT" in partes else None, hasta)
+
+    @property
+    def paso(self) -> int:
+        """Minutos entre dos ocurrencias seguidas."""
+        return FRECUENCIAS[self.frecuencia] * self.intervalo
+
+    def __str__(self) -> str:
+        """Descripción de la regla en texto."""
+        unidad = "día" if self.frecuencia == "diaria" else "semana"
+        texto = f"cada {unidad}" if self.intervalo == 1 else f"cada {self.intervalo} {unidad}s"
+        if self.repeticiones is not None:
+            texto += f", {self.repeticiones} veces"
+        if self.hasta is not None:
+            texto += f", hasta el {self.hasta}"
+        return texto
+
+
+class Ocurrencia(NamedTuple):
+    """
+    Una repetición de una serie que no se ha convertido en Cita.
+
+    Tiene los atributos de una Cita que usan la agenda y los recordatorios
+    (inicio, fin, cliente, empleado, servicio, estado), así que puede
+    mostrarse junto a las citas normales.
+
+    Atributos:
+        serie (SerieCitas): Serie a la que pertenece
+        inicio (int): Inicio en minutos desde 1970-01-01 00:00
+    """
+
+    serie: "SerieCitas"
+    inicio: int
+
+    @property
+    def id(self) -> str:
+        """Identificador "SERIE@YYYY-MM-DD HH:MM"."""
+        return f"{self.serie.id}@{minutos_a_fecha(self.inicio)}"
+
+    @property
+    def fin(self) -> int:
+        """Fin en minutos desde la época."""
+        return self.inicio + self.serie.duracion
+
+    @property
+    def cliente(self):
+        return self.serie.cliente
+
+    @property
+    def empleado(self):
+        return self.serie.empleado
+
+    @property
+    def servicio(self):
+        return self.serie.servicio
+
+    @property
+    def estado(self) -> str:
+        """Las ocurrencias siempre están confirmadas; si se cancelan dejan de existir."""
+        return "confirmada"
+
+    @property
+    def fecha_hora_inicio(self) -> str:
+        """Fecha y hora de inicio "YYYY-MM-DD HH:MM"."""
+        return minutos_a_fecha(self.inicio)
+
+    def __str__(self) -> str:
+        """Representación en texto de la ocurrencia."""
+        return (f"Ocurrencia(Serie: {self.serie.id}, Cliente: {self.cliente.nombre}, "
+                f"Empleado: {self.empleado.nombre}, Servicio: {self.servicio.nombre}, "
+                f"Inicio: {self.fecha_hora_inicio})")
+
+
+class SerieCitas:
+    """
+    Cita periódica de un cliente con un empleado y un servicio.
+
+    La ocurrencia k empieza en inicio + k * paso, para k entre 0 y
+    repeticiones - 1. Las ocurrencias canceladas o convertidas en Cita se
+    guardan como excepciones (inicio original -> ID de la cita, o None si se
+    canceló) y se saltan al recorrer la serie. Cualquier consulta por rango
+    calcula directamente qué k caen dentro, sin recorrer la serie entera.
+
+    Atributos:
+        id (str): Identificador único de la serie
+        cliente: Objeto Cliente
+        empleado: Objeto Empleado
+        servicio: Objeto Servicio
+        regla (ReglaRecurrencia): Regla de repetición
+        inicio (int): Inicio de la primera ocurrencia, en minutos desde la época
+        duracion (int): Duración de cada ocurrencia en minutos
+        paso (int): Minutos entre ocurrencias
+        repeticiones (int): Número de ocurrencias, contando las excepciones
+        excepciones (Dict[int, Optional[str]]): Inicio original -> ID de la cita que la sustituye
+    """
+
+    __slots__ = ("id", "cliente", "empleado", "servicio", "regla", "inicio", "duracion",
+                 "paso", "repeticiones", "excepciones")
+
+    contador_id = 7000
+    _lock_id = threading.Lock()
+
+    def __init__(self, cliente, empleado, servicio, fecha_hora_inicio: str,
+                 regla: ReglaRecurrencia, id: str = None):
+        """
+        Inicializa una serie.
+
+        Args:
+            cliente: Objeto Cliente
+            empleado: Objeto Empleado
+            servicio: Objeto Servicio
+            fecha_hora_inicio (str): Primera ocurrencia "YYYY-MM-DD HH:MM"
+            regla (ReglaRecurrencia): Regla de repetición
+            id (str): ID ya existente; por defecto se genera
+
+        Raises:
+            ValueError: Si la regla no es válida o no produce ninguna ocurrencia
+        """
+        if regla.frecuencia not in FRECUENCIAS or regla.intervalo < 1:
+            raise ValueError(f"Regla de repetición no válida: {regla}")
+        if regla.repeticiones is None and regla.hasta is None:
+            raise ValueError("La serie necesita un número de repeticiones o una fecha final")
+        inicio = fecha_a_minutos(fecha_hora_inicio)
+        repeticiones = regla.repeticiones
+        if regla.hasta is not None:
+            ultimo = fecha_a_minutos(f"{regla.hasta} 23:59")
+            hasta_fecha = max(0, (ultimo - inicio) // regla.paso + 1)
+            repeticiones = hasta_fecha if repeticiones is None else min(repeticiones,
+                                                                         hasta_fecha)
+        if repeticiones < 1:
+            raise ValueError("La serie no tiene ninguna ocurrencia")
+        if id is None:
+            with SerieCitas._lock_id:
+                id = f"SER{SerieCitas.contador_id}"
+                SerieCitas.contador_id += 1
+        self.id = id
+        self.cliente = cliente
+        self.empleado = empleado
+        self.servicio = servicio
+        self.regla = regla
+        self.inicio = inicio
+        self.duracion = servicio.duracion
+        self.paso = regla.paso
+        self.repeticiones = repeticiones
+        self.excepciones: Dict[int, Optional[str]] = {}
+
+    @property
+    def ultimo_inicio(self) -> int:
+        """Inicio de la última ocurrencia (aunque sea una excepción)."""
+        return self.inicio + (self.repeticiones - 1) * self.paso
+
+    def es_ocurrencia(self, inicio: int) -> bool:
+        """
+        Indica si en `inicio` empieza una ocurrencia vigente de la serie.
+
+        Args:
+            inicio (int): Minuto a comprobar
+
+        Returns:
+            bool: True si es una ocurrencia y no es una excepción
+        """
+        k, resto = divmod(inicio - self.inicio, self.paso)
+        return resto == 0 and 0 <= k < self.repeticiones and inicio not in self.excepciones
+
+    def ocurrencia(self, inicio: int) -> Ocurrencia:
+        """
+        Obtiene la ocurrencia vigente que empieza en `inicio`.
+
+        Args:
+            inicio (int): Minuto de inicio de la ocurrencia
+
+        Returns:
+            Ocurrencia: Ocurrencia de la serie
+
+        Raises:
+            ValueError: Si en ese minuto no empieza ninguna ocurrencia vigente
+        """
+        if not self.es_ocurrencia(inicio):
+            raise ValueError(f"La serie {self.id} no tiene ninguna ocurrencia el "
+                             f"{minutos_a_fecha(inicio)}")
+        return Ocurrencia(self, inicio)
+
+    def _indices(self, desde: int, hasta: int) -> range:
+        """Valores de k cuyas ocurrencias empiezan en [desde, hasta) (método privado)."""
+        primero = max(0, -(-(desde - self.inicio) // self.paso))
+        ultimo = min(self.repeticiones, -(-(hasta - self.inicio) // self.paso))
+        return range(primero, max(primero, ultimo))
+
+    def ocurrencias(self, desde: int = None, hasta: int = None) -> Iterator[Ocurrencia]:
+        """
+        Recorre las ocurrencias vigentes que empiezan en [desde, hasta), en orden.
+
+        Args:
+            desde (int): Minuto inicial (None = desde la primera)
+            hasta (int): Minuto final, excluido (None = hasta la última)
+
+        Yields:
+            Ocurrencia: Ocurrencias del rango
+        """
+        desde = self.inicio if desde is None else desde
+        hasta = self.ultimo_inicio + 1 if hasta is None else hasta
+        for k in self._indices(desde, hasta):
+            inicio = self.inicio + k * self.paso
+            if inicio not in self.excepciones:
+                yield Ocurrencia(self, inicio)
+
+    def solapa(self, inicio: int, fin: int) -> Optional[int]:
+        """
+        Busca una ocurrencia vigente que se solape con [inicio, fin).
+
+        Args:
+            inicio (int): Minuto de inicio
+            fin (int): Minuto de fin
+
+        Returns:
+            int: Inicio de la ocurrencia que se solapa o None si no hay ninguna
+        """
+        for ocurrencia in self.ocurrencias(inicio - self.duracion + 1, fin):
+            return ocurrencia.inicio
+        return None
+
+    def siguiente(self, despues: int) -> Optional[int]:
+        """
+        Inicio de la primera ocurrencia vigente posterior a `despues`.
+
+        Args:
+            despues (int): Minuto de referencia (excluido)
+
+        Returns:
+            int: Inicio de la ocurrencia o None si la serie ya ha terminado
+        """
+        for ocurrencia in self.ocurrencias(despues + 1, None):
+            return ocurrencia.inicio
+        return None
+
+    def excluir(self, inicio: int, cita_id: str = None):
+        """
+        Marca una ocurrencia como excepción.
+
+        Args:
+            inicio (int): Inicio original de la ocurrencia
+            cita_id (str): Cita que la sustituye (None si se cancela sin más)
+        """
+        self.excepciones[inicio] = cita_id
+
+    def terminar(self, desde: int) -> int:
+        """
+        Elimina las ocurrencias que empiezan en `desde` o después.
+
+        Args:
+            desde (int): Primer minuto que ya no forma parte de la serie
+
+        Returns:
+            int: Número de ocurrencias vigentes eliminadas
+        """
+        quedan = self._indices(self.inicio, desde).stop
+        eliminadas = sum(1 for _ in self.ocurrencias(self.inicio + quedan * self.paso, None))
+        self.repeticiones = quedan
+        self.excepciones = {inicio: cita_id for inicio, cita_id in self.excepciones.items()
+                            if inicio < desde}
+        return eliminadas
+
+    def __len__(self) -> int:
+        """Número de ocurrencias vigentes."""
+        return self.repeticiones - len(self.excepciones)
+
+    def __str__(self) -> str:
+        """Representación en texto de la serie."""
+        return (f"SerieCitas(ID: {self.id}, Cliente: {self.cliente.nombre}, "
+                f"Empleado: {self.empleado.nombre}, Servicio: {self.servicio.nombre}, "
+                f"Desde: {minutos_a_fecha(self.inicio)}, Regla: {self.regla}, "
+                f"Ocurrencias: {len(self)})")
@@ -4,6 +4,7 @@ Descripción: Define la clase Servicio que representa los servicios ofrecidos po
              Cada servicio tiene características como duración, precio y descripción.
 """
 
+import threading
 from typing import List
 
 
@@ -19,9 +20,13 @@ class Servicio:
         precio (float): Precio del servicio en euros
     """
     
+    __slots__ = ("id", "nombre", "descripcion", "duracion", "precio")
+    
     contador_id = 2000
+    _lock_id = threading.Lock()
     
-    def __init__(self, nombre: str, descripcion: str, duracion: int, precio: float):
+    def __init__(self, nombre: str, descripcion: str, duracion: int, precio: float,
+                 id: str = None):
         """
         Inicializa un servicio.
         
@@ -30,9 +35,13 @@ class Servicio:
             descripcion (str): Descripción del servicio
             duracion (int): Duración en minutos
             precio (float): Precio del servicio
+            id (str): ID ya existente; por defecto se genera
         """
-        self.id = f"SRV{Servicio.contador_id}"
-        Servicio.contador_id += 1
+        if id is None:
+            with Servicio._lock_id:
+                id = f"SRV{Servicio.contador_id}"
+                Servicio.contador_id += 1
+        self.id = id
         self.nombre = nombre
         self.descripcion = descripcion
         self.duracion = duracion
@@ -0,0 +1,51 @@
+"""
+Módulo: tests/test_archivo.py
+Descripción: Pruebas del archivado de citas terminadas con IDs que el archivo no admite.
+"""
+
+import io
+import logging
+import unittest
+
+from archivo import ArchivoCitas
+from bookme_service import BookMeService
+from identificadores import GeneradorIds
+from tiempo import fecha_a_minutos
+
+
+class TestArchivarCitas(unittest.TestCase):
+    """Las citas con IDs no archivables se quedan entre las citas normales."""
+
+    def setUp(self):
+        logging.disable(logging.CRITICAL)
+        self.service = BookMeService("Negocio", "Calle 1", "900", ids=GeneradorIds())
+
+    def tearDown(self):
+        logging.disable(logging.NOTSET)
+
+    def test_id_no_archivable_queda_vivo(self):
+        cliente = self.service.registrar_usuario("cliente", "Ana", "ana@mail.com")
+        empleado = self.service.registrar_usuario("empleado", "Luis", "luis@mail.com")
+        servicio = self.service.crear_servicio("Corte", "Corte clásico", 30, 10.0)
+        origen = io.StringIO(
+            "id,cliente_id,empleado_id,servicio_id,inicio,estado\n"
+            f"CIT0042,{cliente.id},{empleado.id},{servicio.id},2026-01-10 10:00,completada\n"
+            f"CIT4100,{cliente.id},{empleado.id},{servicio.id},2026-01-10 11:00,completada\n")
+        self.assertEqual(self.service.importar_citas(origen)["importados"], 2)
+
+        archivadas = self.service.archivar_citas(dias=30,
+                                                 ahora=fecha_a_minutos("2026-06-01 00:00"))
+        self.assertEqual(archivadas, 1)
+        self.assertIsNotNone(self.service.obtener_cita("CIT0042"))
+        self.assertIsNone(self.service.obtener_cita("CIT4100"))
+        self.assertIsNotNone(self.service.obtener_cita_archivada("CIT4100"))
+        self.assertEqual(self.service.estadisticas()["completada"], 2)
+
+    def test_admite(self):
+        self.assertTrue(ArchivoCitas.admite("CIT4000"))
+        for cita_id in ("ABC", "CIT", "CIT0042", "CIT-1", "SER7000"):
+            self.assertFalse(ArchivoCitas.admite(cita_id), cita_id)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+"""
+Módulo: tests/test_async.py
+Descripción: Pruebas de AsyncBookMeService: las operaciones de un mismo empleado se encadenan,
+             las de empleados distintos avanzan a la vez y los cerrojos por empleado no se
+             acumulan.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from bookme_async import AsyncBookMeService
+from bookme_service import BookMeService
+from identificadores import GeneradorIds
+from repositorio import RepositorioSQLite
+
+
+class TestCerrojosPorEmpleado(unittest.TestCase):
+    """Orden por empleado y paralelismo entre empleados en el executor."""
+
+    def setUp(self):
+        logging.disable(logging.CRITICAL)
+        # Con repositorio las reservas se ejecutan en el executor
+        self.service = BookMeService("Negocio", "Calle 1", "900", ids=GeneradorIds(),
+                                     repositorio=RepositorioSQLite(":memory:"),
+                                     concurrente=True)
+        self.cliente = self.service.registrar_usuario("cliente", "Ana", "ana@mail.com")
+        self.empleados = [self.service.registrar_usuario("empleado", f"Empleado {i}",
+                                                         f"e{i}@mail.com")
+                          for i in range(2)]
+        self.servicio = self.service.crear_servicio("Corte", "Corte clásico", 30, 10.0)
+        self.executor = ThreadPoolExecutor(4)
+        self.tramos = []
+        self._lock = threading.Lock()
+
+    def tearDown(self):
+        self.executor.shutdown()
+        self.service.cerrar()
+        logging.disable(logging.NOTSET)
+
+    def _reserva_lenta(self):
+        """Sustituye crear_cita por una versión que anota cuándo empieza y termina."""
+        crear_cita = self.service.crear_cita
+
+        def lenta(cliente_id, empleado_id, servicio_id, fecha_hora):
+            inicio = time.perf_counter()
+            time.sleep(0.05)
+            cita = crear_cita(cliente_id, empleado_id, servicio_id, fecha_hora)
+            with self._lock:
+                self.tramos.append((empleado_id, inicio, time.perf_counter()))
+            return cita
+
+        self.service.crear_cita = lenta
+
+    def test_mismo_empleado_en_serie_y_distintos_a_la_vez(self):
+        self._reserva_lenta()
+        uno, otro = (empleado.id for empleado in self.empleados)
+
+        async def escenario():
+            fachada = AsyncBookMeService(self.service, self.executor)
+            citas = await asyncio.gather(*(
+                fachada.crear_cita(self.cliente.id, empleado_id, self.servicio.id, fecha)
+                for empleado_id, fecha in ((uno, "2026-10-20 10:00"), (uno, "2026-10-20 11:00"),
+                                           (otro, "2026-10-20 10:00"))))
+            return fachada, citas
+
+        fachada, citas = asyncio.run(escenario())
+        self.assertTrue(all(cita is not None for cita in citas))
+        primero, segundo = [(a, b) for empleado_id, a, b in self.tramos if empleado_id == uno]
+        [del_otro] = [(a, b) for empleado_id, a, b in self.tramos if empleado_id == otro]
+        self.assertLessEqual(primero[1], segundo[0])
+        # El otro empleado no esperó a que terminase el primero
+        self.assertLess(del_otro[0], primero[1])
+        self.assertEqual(len(fachada._locks_empleados), 0)
+
+    def test_ids_desconocidos_no_dejan_cerrojos(self):
+        async def escenario():
+            fachada = AsyncBookMeService(self.service, self.executor)
+            for i in range(100):
+                await fachada.crear_cita(self.cliente.id, f"USR{9000 + i}", self.servicio.id,
+                                         "2026-10-20 10:00")
+                await fachada.cancelar_cita(f"CIT{9000 + i}")
+            return fachada
+
+        fachada = asyncio.run(escenario())
+        self.assertEqual(len(fachada._locks_empleados), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
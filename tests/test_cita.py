@@ -0,0 +1,129 @@
+"""
+Módulo: tests/test_cita.py
+Descripción: Pruebas de Cita: inicio y fin solo se cambian a través del servicio, que
+             conserva la duración propia de la cita, y una cita cancelada no puede
+             reactivarse sobre un hueco ya ocupado.
+"""
+
+import logging
+import unittest
+
+from bookme_service import BookMeService
+from cita import Cita
+from errores import HorarioOcupado
+from identificadores import GeneradorIds
+from servicio import Servicio
+from tiempo import fecha_a_minutos
+from usuario import Cliente, Empleado
+
+
+class TestInicioCita(unittest.TestCase):
+    """El inicio se fija al crear la cita y no se cambia por fuera del servicio."""
+
+    def setUp(self):
+        self.cliente = Cliente("Ana", "ana@mail.com", "600")
+        self.empleado = Empleado("Luis", "luis@mail.com", "Corte")
+        self.servicio = Servicio("Corte", "Corte clásico", 30, 10.0)
+
+    def test_inicio_en_minutos(self):
+        inicio = fecha_a_minutos("2026-10-20 10:00")
+        cita = Cita(self.cliente, self.empleado, self.servicio, inicio)
+        self.assertEqual(cita.fecha_hora_inicio, "2026-10-20 10:00")
+        self.assertEqual(cita.fin, inicio + 30)
+
+    def test_bool_no_es_un_inicio(self):
+        for valor in (True, False):
+            with self.assertRaises(ValueError):
+                Cita(self.cliente, self.empleado, self.servicio, valor)
+
+    def test_fecha_hora_inicio_es_de_solo_lectura(self):
+        cita = Cita(self.cliente, self.empleado, self.servicio, "2026-10-20 10:00")
+        with self.assertRaises(AttributeError):
+            cita.fecha_hora_inicio = "2026-10-20 12:00"
+        self.assertEqual(cita.fecha_hora_inicio, "2026-10-20 10:00")
+
+    def test_fecha_hora_fin_es_de_solo_lectura(self):
+        cita = Cita(self.cliente, self.empleado, self.servicio, "2026-10-20 10:00")
+        with self.assertRaises(AttributeError):
+            cita.fecha_hora_fin = "2026-10-20 12:00"
+        self.assertEqual(cita.fecha_hora_fin, "2026-10-20 10:30")
+        self.assertFalse(hasattr(cita, "reprogramar"))
+
+
+class TestReprogramarCita(unittest.TestCase):
+    """Reprogramar mueve la cita con su propia duración y actualiza los agregados."""
+
+    def setUp(self):
+        logging.disable(logging.CRITICAL)
+        self.service = BookMeService("Negocio", "Calle 1", "900", ids=GeneradorIds())
+        self.cliente = self.service.registrar_usuario("cliente", "Ana", "ana@mail.com")
+        self.empleado = self.service.registrar_usuario("empleado", "Luis", "luis@mail.com")
+        self.servicio = self.service.crear_servicio("Corte", "Corte clásico", 30, 10.0)
+
+    def tearDown(self):
+        logging.disable(logging.NOTSET)
+
+    def test_conserva_la_duracion_de_la_cita(self):
+        cita = self.service.reservar_cita(self.cliente.id, self.empleado.id,
+                                          self.servicio.id, "2026-10-20 10:00")
+        # La cita se reservó con 30 minutos aunque el servicio dure ahora 45
+        self.servicio.duracion = 45
+        self.service.reprogramar_cita(cita.id, "2026-10-21 10:00")
+        self.assertEqual(cita.fecha_hora_fin, "2026-10-21 10:30")
+        self.assertIsNotNone(self.service.reservar_cita(self.cliente.id, self.empleado.id,
+                                                        self.servicio.id, "2026-10-21 10:30"))
+
+        anterior = self.service.resumen_periodo("2026-10-20", "2026-10-21")["total"]
+        nuevo = self.service.resumen_periodo("2026-10-21", "2026-10-22")["total"]
+        self.assertEqual((anterior["citas"], anterior["minutos"]), (0, 0))
+        self.assertEqual((nuevo["citas"], nuevo["minutos"]), (2, 30 + 45))
+
+
+class TestReactivarCita(unittest.TestCase):
+    """Volver a activar una cita cancelada exige que su hueco siga libre."""
+
+    def setUp(self):
+        logging.disable(logging.CRITICAL)
+        self.service = BookMeService("Negocio", "Calle 1", "900", ids=GeneradorIds())
+        self.cliente = self.service.registrar_usuario("cliente", "Ana", "ana@mail.com")
+        self.empleado = self.service.registrar_usuario("empleado", "Luis", "luis@mail.com")
+        self.servicio = self.service.crear_servicio("Corte", "Corte clásico", 30, 10.0)
+
+    def tearDown(self):
+        logging.disable(logging.NOTSET)
+
+    def _reservar(self, fecha_hora: str) -> Cita:
+        return self.service.reservar_cita(self.cliente.id, self.empleado.id,
+                                          self.servicio.id, fecha_hora)
+
+    def test_reactivar_sobre_otra_cita(self):
+        cita = self._reservar("2026-10-20 10:00")
+        self.service.cancelar_cita(cita.id, "prueba")
+        otra = self._reservar("2026-10-20 10:15")
+        antes = self.service.estadisticas()
+
+        with self.assertRaises(HorarioOcupado) as contexto:
+            self.empleado.actualizar_estado_cita(cita, "confirmada")
+        self.assertEqual(contexto.exception.conflicto, otra.id)
+        self.assertEqual(cita.estado, "cancelada")
+        self.assertEqual(self.service.estadisticas(verificar=True), antes)
+
+        self.service.cancelar_cita(otra.id, "prueba")
+        self.empleado.actualizar_estado_cita(cita, "confirmada")
+        self.assertEqual(cita.estado, "confirmada")
+        with self.assertRaises(HorarioOcupado):
+            self._reservar("2026-10-20 10:15")
+
+    def test_reactivar_sobre_una_serie(self):
+        cita = self._reservar("2026-10-27 10:00")
+        self.service.cancelar_cita(cita.id, "prueba")
+        self.service.reservar_serie(self.cliente.id, self.empleado.id, self.servicio.id,
+                                    "2026-10-20 10:00", "FREQ=WEEKLY;COUNT=3")
+
+        with self.assertRaises(HorarioOcupado):
+            cita.estado = "pendiente"
+        self.assertEqual(cita.estado, "cancelada")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+"""
+Módulo: tests/test_concurrencia.py
+Descripción: Prueba de estrés del modo concurrente: muchos hilos reservando, cancelando y
+             moviendo citas sobre los mismos huecos sin dobles reservas ni IDs repetidos.
+"""
+
+import logging
+import random
+import sys
+import threading
+import unittest
+
+from bookme_service import BookMeService
+from identificadores import GeneradorIds
+from repositorio import RepositorioSQLite
+
+
+class TestEstresConcurrente(unittest.TestCase):
+    """Las reservas simultáneas nunca ocupan dos veces el mismo hueco."""
+
+    HILOS = 16
+    OPERACIONES = 300
+
+    def setUp(self):
+        logging.disable(logging.CRITICAL)
+        # Cambios de hilo muy frecuentes para provocar intercalados
+        self.intervalo = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+
+    def tearDown(self):
+        sys.setswitchinterval(self.intervalo)
+        logging.disable(logging.NOTSET)
+
+    def _estres(self, service: BookMeService):
+        empleados = [service.registrar_usuario("empleado", f"Empleado {i}", f"e{i}@mail.com")
+                     for i in range(4)]
+        clientes = [service.registrar_usuario("cliente", f"Cliente {i}", f"c{i}@mail.com")
+                    for i in range(20)]
+        servicio = service.crear_servicio("Corte", "Corte clásico", 45, 10.0)
+        # Pocos huecos de 15 minutos para servicios de 45: casi todas las reservas chocan
+        huecos = [f"2026-10-{dia} {hora:02d}:{minuto:02d}" for dia in (20, 21)
+                  for hora in range(9, 13) for minuto in (0, 15, 30, 45)]
+        errores = []
+        salida = threading.Barrier(self.HILOS)
+
+        def trabajar(semilla: int):
+            azar = random.Random(semilla)
+            salida.wait()
+            try:
+                for _ in range(self.OPERACIONES):
+                    accion = azar.random()
+                    if accion < 0.1:
+                        reservas = [(azar.choice(clientes).id, azar.choice(empleados).id,
+                                     servicio.id, azar.choice(huecos)) for _ in range(2)]
+                        service.crear_citas_lote(reservas)
+                        continue
+                    cita = service.crear_cita(azar.choice(clientes).id,
+                                              azar.choice(empleados).id, servicio.id,
+                                              azar.choice(huecos))
+                    if cita is None:
+                        continue
+                    if accion < 0.25:
+                        service.cancelar_cita(cita.id, "prueba")
+                    elif accion < 0.4:
+                        service.modificar_cita(cita.id, azar.choice(huecos))
+            except Exception as e:
+                errores.append(e)
+
+        hilos = [threading.Thread(target=trabajar, args=(i,)) for i in range(self.HILOS)]
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join()
+        self.assertEqual(errores, [])
+
+        ids_citas = [cita.id for cita in service.lista_citas]
+        self.assertGreater(len(ids_citas), 0)
+        self.assertEqual(len(ids_citas), len(set(ids_citas)))
+        ids_notificaciones = [n.id for n in service.lista_notificaciones]
+        self.assertEqual(len(ids_notificaciones), len(set(ids_notificaciones)))
+        for empleado in empleados:
+            activas = sorted((cita.inicio, cita.fin) for cita in service.lista_citas
+                             if cita.empleado is empleado
+                             and cita.estado in service.ESTADOS_ACTIVOS)
+            for anterior, siguiente in zip(activas, activas[1:]):
+                self.assertGreaterEqual(siguiente[0], anterior[1],
+                                        f"Doble reserva de {empleado.id}")
+        self.assertEqual(service.verificar_estadisticas(), {})
+
+    def test_sin_repositorio(self):
+        self._estres(BookMeService("Negocio", "Calle 1", "900", concurrente=True,
+                                   ids=GeneradorIds()))
+
+    def test_con_repositorio(self):
+        service = BookMeService("Negocio", "Calle 1", "900", concurrente=True,
+                                repositorio=RepositorioSQLite(":memory:", tam_lote=50))
+        self._estres(service)
+        guardadas = service.repositorio.estadisticas()["citas"]
+        self.assertEqual(guardadas, len(service.lista_citas))
+        service.cerrar()
+
+
+if __name__ == "__main__":
+    unittest.main()
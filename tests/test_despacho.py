@@ -0,0 +1,114 @@
+"""
+Módulo: tests/test_despacho.py
+Descripción: Pruebas de DespachadorNotificaciones con TransporteLocal: envío por lotes,
+             contrapresión de la cola, reintentos con espera exponencial, notificaciones
+             fallidas, métricas y vaciado de la cola al detener.
+"""
+
+import queue
+import threading
+import unittest
+from unittest import mock
+
+from despacho import DespachadorNotificaciones, TransporteLocal
+
+
+class _TransporteRetenido(TransporteLocal):
+    """Transporte cuyo primer envío espera a que la prueba lo libere."""
+
+    def __init__(self, fallos_pendientes: int = 0):
+        super().__init__(fallos_pendientes)
+        self.enviando = threading.Event()
+        self.liberar = threading.Event()
+
+    def enviar_lote(self, notificaciones):
+        self.enviando.set()
+        self.liberar.wait(5)
+        super().enviar_lote(notificaciones)
+
+
+class TestDespachador(unittest.TestCase):
+    """Entrega de notificaciones a través del hilo de envío."""
+
+    def _despachador(self, transporte, **opciones) -> DespachadorNotificaciones:
+        despachador = DespachadorNotificaciones(transporte, **opciones)
+        self.addCleanup(despachador.detener)
+        return despachador
+
+    def _retener(self, despachador: DespachadorNotificaciones,
+                 transporte: _TransporteRetenido):
+        """Ocupa el hilo de envío con un primer lote retenido en el transporte."""
+        despachador.encolar("n0")
+        self.assertTrue(transporte.enviando.wait(5))
+
+    def test_envio_por_lotes(self):
+        transporte = _TransporteRetenido()
+        despachador = self._despachador(transporte, tam_lote=3)
+        self._retener(despachador, transporte)
+        for i in range(1, 8):
+            despachador.encolar(f"n{i}")
+        transporte.liberar.set()
+        despachador.esperar()
+        # El primer lote iba solo; los 7 siguientes salen en lotes de como mucho 3
+        self.assertEqual(transporte.enviadas, [f"n{i}" for i in range(8)])
+        self.assertEqual(transporte.lotes, 4)
+
+    def test_contrapresion_con_cola_llena(self):
+        transporte = _TransporteRetenido()
+        despachador = self._despachador(transporte, capacidad=1)
+        self._retener(despachador, transporte)
+        despachador.encolar("n1")
+        with self.assertRaises(queue.Full):
+            despachador.encolar("n2", timeout=0.05)
+        self.assertEqual(despachador.metricas()["pendientes"], 1)
+        transporte.liberar.set()
+        despachador.encolar("n2", timeout=5)
+        despachador.esperar()
+        self.assertEqual(transporte.enviadas, ["n0", "n1", "n2"])
+
+    def test_reintento_con_espera_exponencial(self):
+        transporte = TransporteLocal(fallos_pendientes=2)
+        despachador = self._despachador(transporte, reintentos=3, espera_inicial=0.1)
+        with mock.patch("despacho.time.sleep") as dormir:
+            despachador.encolar("n0")
+            despachador.esperar()
+        self.assertEqual([llamada.args[0] for llamada in dormir.call_args_list], [0.1, 0.2])
+        self.assertEqual(transporte.enviadas, ["n0"])
+        self.assertEqual(despachador.fallidas, [])
+
+    def test_agotar_reintentos_pasa_a_fallidas(self):
+        transporte = TransporteLocal(fallos_pendientes=10)
+        despachador = self._despachador(transporte, reintentos=2, espera_inicial=0)
+        despachador.encolar("n0")
+        despachador.esperar()
+        self.assertEqual(despachador.fallidas, ["n0"])
+        self.assertEqual(transporte.enviadas, [])
+        self.assertEqual(transporte.fallos_pendientes, 7)
+
+    def test_metricas(self):
+        transporte = TransporteLocal(fallos_pendientes=1)
+        despachador = self._despachador(transporte, reintentos=1, espera_inicial=0)
+        despachador.encolar("n0")
+        despachador.esperar()
+        metricas = despachador.metricas()
+        self.assertEqual({clave: metricas[clave] for clave in
+                          ("encoladas", "enviadas", "lotes", "reintentos", "fallidas",
+                           "pendientes")},
+                         {"encoladas": 1, "enviadas": 1, "lotes": 1, "reintentos": 1,
+                          "fallidas": 0, "pendientes": 0})
+        self.assertGreaterEqual(metricas["segundos_envio"], 0)
+
+    def test_detener_vacia_la_cola(self):
+        transporte = _TransporteRetenido()
+        despachador = DespachadorNotificaciones(transporte, tam_lote=2, hilos=2)
+        self._retener(despachador, transporte)
+        for i in range(1, 6):
+            despachador.encolar(f"n{i}")
+        transporte.liberar.set()
+        despachador.detener()
+        self.assertEqual(sorted(transporte.enviadas), [f"n{i}" for i in range(6)])
+        self.assertFalse(any(hilo.is_alive() for hilo in despachador._hilos))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,178 @@
+"""
+Módulo: tests/test_eventos.py
+Descripción: Pruebas de RepositorioEventos: rendimiento de escritura con confirmación
+             agrupada, tiempo de arranque reaplicando el registro o desde la instantánea,
+             sincronización de la carpeta al guardar la instantánea, transacciones
+             que se descartan enteras si fallan, retención de notificaciones leídas e
+             instantáneas que no bloquean las escrituras.
+"""
+
+import os
+import pickle
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+from cita import Cita
+from eventos import RepositorioEventos
+from notificacion import Notificacion
+from servicio import Servicio
+from tiempo import fecha_a_minutos, minutos_a_fecha
+from usuario import Cliente, Empleado
+
+
+class TestRepositorioEventos(unittest.TestCase):
+    """Escritura por lotes y arranque del registro de eventos."""
+
+    # Cotas holgadas: en una máquina normal se van por encima (o por debajo) un orden de magnitud
+    EVENTOS = 20000
+    MIN_EVENTOS_POR_SEGUNDO = 5000
+    MAX_SEGUNDOS_ARRANQUE = 2.0
+
+    def setUp(self):
+        self.directorio = tempfile.TemporaryDirectory()
+        self.clientes = [Cliente(f"Cliente {i}", f"c{i}@mail.com", "600") for i in range(100)]
+        self.empleados = [Empleado(f"Empleado {i}", f"e{i}@mail.com", "Corte")
+                          for i in range(10)]
+        self.servicio = Servicio("Corte", "Corte clásico", 30, 10.0)
+
+    def tearDown(self):
+        self.directorio.cleanup()
+
+    def _escribir_citas(self, repositorio: RepositorioEventos, total: int) -> float:
+        """Guarda usuarios, servicio y `total` citas; devuelve los segundos que tarda."""
+        for usuario in self.clientes + self.empleados:
+            repositorio.guardar_usuario(usuario)
+        repositorio.guardar_servicio(self.servicio)
+        base = fecha_a_minutos("2026-01-01 09:00")
+        inicio = time.perf_counter()
+        for i in range(total):
+            repositorio.guardar_cita(Cita(self.clientes[i % 100], self.empleados[i % 10],
+                                          self.servicio, minutos_a_fecha(base + i * 30)))
+        repositorio.confirmar()
+        return time.perf_counter() - inicio
+
+    def test_escritura_agrupada(self):
+        repositorio = RepositorioEventos(self.directorio.name, tam_lote=512,
+                                         eventos_por_instantanea=None)
+        with mock.patch("eventos.os.fsync", wraps=os.fsync) as fsync:
+            segundos = self._escribir_citas(repositorio, self.EVENTOS)
+        repositorio.cerrar()
+        # Un fsync por lote, no por evento
+        total = self.EVENTOS + len(self.clientes) + len(self.empleados) + 1
+        self.assertLessEqual(fsync.call_count, total // 512 + 2)
+        self.assertGreater(self.EVENTOS / segundos, self.MIN_EVENTOS_POR_SEGUNDO)
+
+    def test_arranque_reaplicando_registro_y_desde_instantanea(self):
+        repositorio = RepositorioEventos(self.directorio.name, tam_lote=1000,
+                                         eventos_por_instantanea=None)
+        self._escribir_citas(repositorio, self.EVENTOS)
+        repositorio.cerrar()
+        total = self.EVENTOS + len(self.clientes) + len(self.empleados) + 1
+
+        inicio = time.perf_counter()
+        repositorio = RepositorioEventos(self.directorio.name, eventos_por_instantanea=None)
+        self.assertLess(time.perf_counter() - inicio, self.MAX_SEGUNDOS_ARRANQUE)
+        self.assertEqual(repositorio.eventos_recuperados, total)
+        self.assertEqual(len(repositorio.cargar()["citas"]), self.EVENTOS)
+        repositorio.instantanea()
+        repositorio.cerrar()
+
+        inicio = time.perf_counter()
+        repositorio = RepositorioEventos(self.directorio.name)
+        self.assertLess(time.perf_counter() - inicio, self.MAX_SEGUNDOS_ARRANQUE)
+        self.assertEqual(repositorio.eventos_recuperados, 0)
+        self.assertEqual(len(repositorio.cargar()["citas"]), self.EVENTOS)
+        repositorio.cerrar()
+
+    def test_instantanea_sincroniza_la_carpeta(self):
+        repositorio = RepositorioEventos(self.directorio.name)
+        self._escribir_citas(repositorio, 10)
+        with mock.patch.object(RepositorioEventos, "_sincronizar_directorio",
+                               autospec=True) as sincronizar:
+            repositorio.instantanea()
+        sincronizar.assert_called_once_with(repositorio)
+        repositorio.cerrar()
+
+    def test_transaccion_fallida_no_deja_eventos(self):
+        repositorio = RepositorioEventos(self.directorio.name)
+        cliente, otro = self.clientes[:2]
+        with repositorio.transaccion():
+            repositorio.guardar_usuario(cliente)
+            with self.assertRaises(RuntimeError):
+                with repositorio.transaccion():
+                    repositorio.guardar_usuario(otro)
+                    raise RuntimeError("fallo a mitad de bloque")
+        with self.assertRaises(RuntimeError):
+            with repositorio.transaccion():
+                repositorio.guardar_servicio(self.servicio)
+                raise RuntimeError("fallo a mitad de bloque")
+        self.assertEqual([fila[0] for fila in repositorio.cargar()["usuarios"]], [cliente.id])
+        self.assertEqual(repositorio.cargar()["servicios"], [])
+        repositorio.cerrar()
+
+        repositorio = RepositorioEventos(self.directorio.name)
+        self.assertEqual([fila[0] for fila in repositorio.cargar()["usuarios"]], [cliente.id])
+        self.assertEqual(repositorio.cargar()["servicios"], [])
+        repositorio.cerrar()
+
+    def _ids_notificaciones(self, repositorio: RepositorioEventos) -> list:
+        return [fila[0] for fila in repositorio.cargar()["notificaciones"]]
+
+    def test_descarta_leidas_sobrantes(self):
+        repositorio = RepositorioEventos(self.directorio.name, max_leidas=2)
+        cliente = self.clientes[0]
+        notificaciones = [Notificacion(cliente, f"Aviso {i}", id=f"NOT{5000 + i}")
+                          for i in range(5)]
+        for notificacion in notificaciones:
+            repositorio.guardar_notificacion(notificacion)
+        for notificacion in notificaciones[:4]:
+            repositorio.marcar_notificacion_leida(notificacion.id)
+        # Quedan la no leída y las dos leídas más recientes
+        esperadas = ["NOT5002", "NOT5003", "NOT5004"]
+        self.assertEqual(self._ids_notificaciones(repositorio), esperadas)
+        self.assertEqual([fila[0] for fila in repositorio.notificaciones_de(cliente.id)],
+                         esperadas)
+        self.assertEqual(repositorio.ultimo_id("notificacion"), 5004)
+        repositorio.cerrar()
+
+        repositorio = RepositorioEventos(self.directorio.name, max_leidas=2)
+        self.assertEqual(self._ids_notificaciones(repositorio), esperadas)
+        repositorio.instantanea()
+        repositorio.cerrar()
+        repositorio = RepositorioEventos(self.directorio.name, max_leidas=2)
+        repositorio.marcar_notificacion_leida("NOT5004")
+        self.assertEqual(self._ids_notificaciones(repositorio), ["NOT5003", "NOT5004"])
+        repositorio.cerrar()
+
+    def test_instantanea_no_bloquea_las_escrituras(self):
+        # Con lotes grandes la escritura no tiene que esperar su propio fsync
+        repositorio = RepositorioEventos(self.directorio.name, tam_lote=1000,
+                                         eventos_por_instantanea=None)
+        self._escribir_citas(repositorio, 10)
+        otro = Cliente("Eva", "eva@mail.com", "600")
+        volcar = pickle.dump
+        escrito = threading.Event()
+
+        def volcar_con_escritura(*args, **kwargs):
+            # Otro hilo escribe mientras se serializa la instantánea
+            hilo = threading.Thread(target=lambda: (repositorio.guardar_usuario(otro),
+                                                    escrito.set()))
+            hilo.start()
+            self.assertTrue(escrito.wait(5))
+            volcar(*args, **kwargs)
+
+        with mock.patch("eventos.pickle.dump", side_effect=volcar_con_escritura):
+            repositorio.instantanea()
+        repositorio.cerrar()
+
+        repositorio = RepositorioEventos(self.directorio.name)
+        self.assertEqual(repositorio.eventos_recuperados, 1)
+        self.assertIn(otro.id, [fila[0] for fila in repositorio.cargar()["usuarios"]])
+        repositorio.cerrar()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,42 @@
+"""
+Módulo: tests/test_horario.py
+Descripción: Pruebas de Horario: los cambios de pausas invalidan los tramos compilados.
+"""
+
+import unittest
+
+from horario import Horario
+from tiempo import hora_a_minutos
+
+
+class TestPausas(unittest.TestCase):
+    """Las pausas son de solo lectura y reasignarlas recalcula los tramos."""
+
+    def setUp(self):
+        self.horario = Horario("Lunes", "09:00", "18:00", ["13:00-14:00"])
+
+    def test_pausas_es_tupla_de_solo_lectura(self):
+        self.assertEqual(self.horario.pausas, ("13:00-14:00",))
+        with self.assertRaises(AttributeError):
+            self.horario.pausas.append("16:00-16:30")
+
+    def test_reasignar_pausas_invalida_los_tramos(self):
+        self.assertFalse(self.horario.disponible("13:30"))
+        self.assertTrue(self.horario.disponible("16:15"))
+        self.horario.pausas = ["16:00-16:30"]
+        self.assertTrue(self.horario.disponible("13:30"))
+        self.assertFalse(self.horario.disponible("16:15"))
+        self.assertEqual(self.horario.tramos_disponibles(),
+                         ((hora_a_minutos("09:00"), hora_a_minutos("16:00")),
+                          (hora_a_minutos("16:30"), hora_a_minutos("18:00"))))
+
+    def test_agregar_pausa_invalida_los_tramos(self):
+        self.assertTrue(self.horario.disponible("10:15"))
+        self.horario.agregar_pausa("10:00-10:30")
+        self.assertEqual(self.horario.pausas, ("13:00-14:00", "10:00-10:30"))
+        self.assertFalse(self.horario.disponible("10:15"))
+        self.assertEqual(len(self.horario.tramos_disponibles()), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
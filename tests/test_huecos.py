@@ -0,0 +1,59 @@
+"""
+Módulo: tests/test_huecos.py
+Descripción: Pruebas de buscar_huecos: inicios alineados al paso dentro de cada hueco y
+             rechazo de pasos no positivos en el servicio y en el enrutador particionado.
+"""
+
+import logging
+import unittest
+
+from bookme_service import BookMeService
+from horario import Horario
+from identificadores import GeneradorIds
+from particiones import ServicioParticionado
+
+
+class TestBuscarHuecos(unittest.TestCase):
+    """Huecos propuestos cada `paso` minutos a partir de la fecha pedida."""
+
+    def setUp(self):
+        logging.disable(logging.CRITICAL)
+        self.service = BookMeService("Negocio", "Calle 1", "900", ids=GeneradorIds())
+        self.empleado = self.service.registrar_usuario("empleado", "Luis", "luis@mail.com")
+        self.servicio = self.service.crear_servicio("Corte", "Corte clásico", 30, 10.0)
+        self.service.asignar_horario(self.empleado.id, Horario("Lunes", "09:00", "18:00"))
+
+    def tearDown(self):
+        logging.disable(logging.NOTSET)
+
+    def test_inicios_alineados_al_paso(self):
+        huecos = self.service.buscar_huecos(self.servicio.id, cantidad=3,
+                                            desde="2026-10-19 09:10", paso=20)
+        self.assertEqual([inicio for inicio, _ in huecos],
+                         ["2026-10-19 09:20", "2026-10-19 09:40", "2026-10-19 10:00"])
+
+    def test_paso_no_positivo(self):
+        for paso in (0, -15):
+            with self.assertRaises(ValueError):
+                self.service.buscar_huecos(self.servicio.id, desde="2026-10-19 09:10",
+                                           paso=paso)
+
+
+class TestBuscarHuecosParticionado(unittest.TestCase):
+    """El enrutador rechaza el paso antes de consultar a las particiones."""
+
+    def setUp(self):
+        logging.disable(logging.CRITICAL)
+
+    def tearDown(self):
+        logging.disable(logging.NOTSET)
+
+    def test_paso_no_positivo(self):
+        with ServicioParticionado("Negocio", "Calle 1", "900", num_particiones=2) as enrutador:
+            servicio_id = enrutador.crear_servicio("Corte", "Corte clásico", 30, 10.0)
+            with self.assertRaises(ValueError):
+                enrutador.buscar_huecos(servicio_id, paso=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,122 @@
+"""
+Módulo: tests/test_multinegocio.py
+Descripción: Pruebas de la carga y descarga de negocios de ServicioMultinegocio desde
+             varios hilos.
+"""
+
+import logging
+import threading
+import unittest
+
+from multinegocio import ServicioMultinegocio
+from repositorio import RepositorioSQLite
+
+
+class TestCargaConcurrente(unittest.TestCase):
+    """Una carga lenta no bloquea a los demás negocios ni se repite."""
+
+    def setUp(self):
+        logging.disable(logging.CRITICAL)
+        self.empezada = threading.Event()
+        self.continuar = threading.Event()
+        self.aperturas = []
+
+    def tearDown(self):
+        self.continuar.set()
+        logging.disable(logging.NOTSET)
+
+    def _fabrica(self, clave: str) -> RepositorioSQLite:
+        self.aperturas.append(clave)
+        if clave == "lento":
+            self.empezada.set()
+            self.continuar.wait(5)
+        return RepositorioSQLite(":memory:")
+
+    def test_carga_lenta_no_bloquea_otros_negocios(self):
+        conjunto = ServicioMultinegocio(self._fabrica)
+        conjunto.registrar_negocio("rapido", "Rápido", "Calle 1", "900")
+        conjunto.registrar_negocio("lento", "Lento", "Calle 2", "901")
+        conjunto.servicio("rapido")
+
+        servicios = []
+        hilos = [threading.Thread(target=lambda: servicios.append(conjunto.servicio("lento")))
+                 for _ in range(3)]
+        for hilo in hilos:
+            hilo.start()
+        self.assertTrue(self.empezada.wait(5))
+        # Mientras "lento" se carga, el otro negocio sigue atendiendo
+        with conjunto.negocio("rapido") as servicio:
+            servicio.registrar_usuario("cliente", "Ana", "ana@mail.com")
+        self.assertEqual(conjunto.residentes(), ["rapido"])
+
+        self.continuar.set()
+        for hilo in hilos:
+            hilo.join(5)
+        self.assertEqual(self.aperturas.count("lento"), 1)
+        self.assertEqual(conjunto.cargas, 2)
+        self.assertEqual(len({id(servicio) for servicio in servicios}), 1)
+        conjunto.cerrar()
+
+
+class _RepositorioCierreLento(RepositorioSQLite):
+    """Repositorio cuyo cierre espera a que la prueba lo deje terminar."""
+
+    def __init__(self, prueba: "TestDescargaConcurrente"):
+        super().__init__(":memory:")
+        self.prueba = prueba
+
+    def cerrar(self):
+        self.prueba.cerrando.set()
+        self.prueba.continuar.wait(5)
+        self.prueba.eventos.append("cerrado")
+        super().cerrar()
+
+
+class TestDescargaConcurrente(unittest.TestCase):
+    """El cierre de un negocio descargado no bloquea el conjunto ni se solapa con su recarga."""
+
+    def setUp(self):
+        logging.disable(logging.CRITICAL)
+        self.cerrando = threading.Event()
+        self.continuar = threading.Event()
+        self.eventos = []
+
+    def tearDown(self):
+        self.continuar.set()
+        logging.disable(logging.NOTSET)
+
+    def _fabrica(self, clave: str) -> RepositorioSQLite:
+        self.eventos.append(f"abierto {clave}")
+        if clave == "a":
+            return _RepositorioCierreLento(self)
+        return RepositorioSQLite(":memory:")
+
+    def test_cierre_lento_fuera_del_cerrojo(self):
+        conjunto = ServicioMultinegocio(self._fabrica, max_residentes=1)
+        conjunto.registrar_negocio("a", "A", "Calle 1", "900")
+        conjunto.registrar_negocio("b", "B", "Calle 2", "901")
+        conjunto.servicio("a")
+
+        # Cargar "b" descarga "a", cuyo cierre queda a medias
+        hilo_b = threading.Thread(target=conjunto.servicio, args=("b",))
+        hilo_b.start()
+        self.assertTrue(self.cerrando.wait(5))
+        self.assertEqual(conjunto.residentes(), ["b"])
+        conjunto.registrar_negocio("c", "C", "Calle 3", "902")
+
+        # Quien pide "a" espera al cierre antes de abrirlo de nuevo
+        hilo_a = threading.Thread(target=conjunto.servicio, args=("a",))
+        hilo_a.start()
+        hilo_a.join(0.1)
+        self.assertTrue(hilo_a.is_alive())
+        self.continuar.set()
+        for hilo in (hilo_b, hilo_a):
+            hilo.join(5)
+        self.assertEqual(self.eventos, ["abierto a", "abierto b", "cerrado", "abierto a"])
+        self.assertEqual(conjunto.descargas, 2)
+        self.assertEqual(conjunto.residentes(), ["a"])
+        conjunto.cerrar()
+
+
+if __name__ == "__main__":
+    unittest.main()
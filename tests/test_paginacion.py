@@ -0,0 +1,71 @@
+"""
+Módulo: tests/test_paginacion.py
+Descripción: Pruebas de la paginación por cursor en orden de alta: los cursores siguen
+             valiendo aunque entretanto salgan citas o usuarios de las listas.
+"""
+
+import logging
+import unittest
+
+from bookme_service import BookMeService
+from identificadores import GeneradorIds
+from tiempo import fecha_a_minutos
+
+
+class TestPaginacionPorAlta(unittest.TestCase):
+    """Las páginas en orden "id" no saltan ni repiten elementos."""
+
+    def setUp(self):
+        logging.disable(logging.CRITICAL)
+        self.service = BookMeService("Negocio", "Calle 1", "900", ids=GeneradorIds())
+        self.cliente = self.service.registrar_usuario("cliente", "Ana", "ana@mail.com")
+        self.empleado = self.service.registrar_usuario("empleado", "Luis", "luis@mail.com")
+        self.servicio = self.service.crear_servicio("Corte", "Corte clásico", 30, 10.0)
+        self.citas = [self.service.reservar_cita(self.cliente.id, self.empleado.id,
+                                                 self.servicio.id, f"2026-10-{dia:02d} 10:00")
+                      for dia in range(1, 7)]
+
+    def tearDown(self):
+        logging.disable(logging.NOTSET)
+
+    def _ids(self, elementos) -> list:
+        return [elemento.id for elemento in elementos]
+
+    def test_archivar_no_invalida_el_cursor(self):
+        filtros = ({}, {"empleado_id": self.empleado.id}, {"cliente_id": self.cliente.id})
+        cursores = []
+        for filtro in filtros:
+            pagina, cursor = self.service.pagina_citas(limite=2, **filtro)
+            self.assertEqual(self._ids(pagina), self._ids(self.citas[:2]))
+            cursores.append(cursor)
+
+        # Las tres primeras salen de las listas: con cursores por posición se saltarían citas
+        for cita in self.citas[:3]:
+            cita.marcar_completada()
+        archivadas = self.service.archivar_citas(dias=1, ahora=fecha_a_minutos("2026-10-10 00:00"))
+        self.assertEqual(archivadas, 3)
+        for filtro, cursor in zip(filtros, cursores):
+            with self.subTest(**filtro):
+                siguiente, cursor = self.service.pagina_citas(limite=2, cursor=cursor, **filtro)
+                self.assertEqual(self._ids(siguiente), self._ids(self.citas[3:5]))
+                ultima, fin = self.service.pagina_citas(limite=2, cursor=cursor, **filtro)
+                self.assertEqual(self._ids(ultima), self._ids(self.citas[5:]))
+                self.assertIsNone(fin)
+
+    def test_usuarios_por_tipo_tras_deshacer_un_alta(self):
+        clientes = [self.service.registrar_usuario("cliente", f"Cliente {i}", f"c{i}@mail.com")
+                    for i in range(3)]
+        pagina, cursor = self.service.pagina_usuarios(limite=2, tipo="cliente")
+        self.assertEqual(self._ids(pagina), [self.cliente.id, clientes[0].id])
+
+        with self.assertRaises(RuntimeError):
+            with self.service._operacion():
+                self.service.registrar_usuario("cliente", "Eva", "eva@mail.com")
+                raise RuntimeError("fallo a mitad de operación")
+        siguiente, fin = self.service.pagina_usuarios(limite=2, cursor=cursor, tipo="cliente")
+        self.assertEqual(self._ids(siguiente), self._ids(clientes[1:]))
+        self.assertIsNone(fin)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,122 @@
+"""
+Módulo: tests/test_particiones.py
+Descripción: Pruebas de ServicioParticionado al volver a arrancar sobre particiones con
+             repositorio persistente, altas replicadas que fallan y reparto de empleados
+             registrados desde varios hilos.
+"""
+
+import functools
+import logging
+import os
+import tempfile
+import threading
+import unittest
+
+from particiones import ServicioParticionado
+from repositorio import RepositorioSQLite
+
+
+def _repositorio_particion(directorio: str, indice: int) -> RepositorioSQLite:
+    """Repositorio SQLite de una partición dentro de `directorio`."""
+    return RepositorioSQLite(os.path.join(directorio, f"particion{indice}.db"))
+
+
+class _RepositorioQueFalla(RepositorioSQLite):
+    """Repositorio en memoria que no puede guardar a los usuarios llamados "Eva"."""
+
+    def guardar_usuario(self, usuario):
+        if usuario.nombre == "Eva":
+            raise OSError("disco lleno")
+        super().guardar_usuario(usuario)
+
+
+def _repositorio_falla_en_uno(indice: int) -> RepositorioSQLite:
+    """La partición 1 falla al guardar a "Eva"; las demás funcionan (función privada)."""
+    return _RepositorioQueFalla(":memory:") if indice == 1 else RepositorioSQLite(":memory:")
+
+
+class TestArranqueParticionado(unittest.TestCase):
+    """El enrutador recupera rutas y numeración de las particiones al arrancar."""
+
+    def setUp(self):
+        logging.disable(logging.CRITICAL)
+        self.directorio = tempfile.TemporaryDirectory()
+        self.fabrica = functools.partial(_repositorio_particion, self.directorio.name)
+
+    def tearDown(self):
+        self.directorio.cleanup()
+        logging.disable(logging.NOTSET)
+
+    def _enrutador(self) -> ServicioParticionado:
+        return ServicioParticionado("Negocio", "Calle 1", "900", num_particiones=2,
+                                    fabrica_repositorio=self.fabrica)
+
+    def test_rutas_e_ids_sobreviven_al_reinicio(self):
+        with self._enrutador() as enrutador:
+            cliente = enrutador.registrar_usuario("cliente", "Ana", "ana@mail.com")
+            empleados = [enrutador.registrar_usuario("empleado", f"Empleado {i}",
+                                                     f"e{i}@mail.com")
+                         for i in range(3)]
+            servicio = enrutador.crear_servicio("Corte", "Corte clásico", 30, 10.0)
+            particiones = [enrutador.particion_de_empleado(e) for e in empleados]
+
+        with self._enrutador() as enrutador:
+            self.assertEqual([enrutador.particion_de_empleado(e) for e in empleados],
+                             particiones)
+            nuevo = enrutador.registrar_usuario("cliente", "Eva", "eva@mail.com")
+            self.assertNotIn(nuevo, [cliente] + empleados)
+            self.assertNotEqual(enrutador.crear_servicio("Tinte", "Color", 60, 30.0),
+                                servicio)
+            cita_id = enrutador.crear_cita(cliente, empleados[2], servicio,
+                                           "2026-10-20 10:00")
+            self.assertIsNotNone(cita_id)
+            self.assertEqual(enrutador.particion_de_cita(cita_id), particiones[2])
+
+
+class TestAltasParticionadas(unittest.TestCase):
+    """Altas validadas antes de difundirse y reparto de empleados por turnos."""
+
+    def setUp(self):
+        logging.disable(logging.CRITICAL)
+
+    def tearDown(self):
+        logging.disable(logging.NOTSET)
+
+    def _clientes(self, enrutador: ServicioParticionado) -> list:
+        return [enrutador._llamar(indice, "estadisticas")["cliente"]
+                for indice in range(enrutador.num_particiones)]
+
+    def test_datos_no_validos_no_llegan_a_ninguna_particion(self):
+        with ServicioParticionado("Negocio", "Calle 1", "900", num_particiones=2) as enrutador:
+            self.assertIsNone(enrutador.registrar_usuario("cliente", "Ana", "ana@mail.com",
+                                                          ["no es un diccionario"]))
+            self.assertEqual(self._clientes(enrutador), [0, 0])
+
+    def test_fallo_parcial_indica_las_particiones(self):
+        with ServicioParticionado("Negocio", "Calle 1", "900", num_particiones=2,
+                                  fabrica_repositorio=_repositorio_falla_en_uno) as enrutador:
+            enrutador.registrar_usuario("cliente", "Ana", "ana@mail.com")
+            with self.assertRaisesRegex(RuntimeError, r"particiones \[1\]"):
+                enrutador.registrar_usuario("cliente", "Eva", "eva@mail.com")
+            # La partición que falló deshizo el alta también en memoria
+            self.assertEqual(self._clientes(enrutador), [2, 1])
+            self.assertEqual(enrutador._llamar(1, "estadisticas", True)["usuarios"], 1)
+
+    def test_empleados_a_la_vez_se_reparten_por_turnos(self):
+        with ServicioParticionado("Negocio", "Calle 1", "900", num_particiones=2) as enrutador:
+            empleados = []
+            hilos = [threading.Thread(target=lambda i=i: empleados.append(
+                         enrutador.registrar_usuario("empleado", f"Empleado {i}",
+                                                     f"e{i}@mail.com")))
+                     for i in range(8)]
+            for hilo in hilos:
+                hilo.start()
+            for hilo in hilos:
+                hilo.join(10)
+            particiones = [enrutador.particion_de_empleado(e) for e in empleados]
+            self.assertEqual(sorted(particiones), [0] * 4 + [1] * 4)
+            self.assertEqual(sorted(enrutador._orden_empleados.values()), list(range(8)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+"""
+Módulo: tests/test_recordatorios.py
+Descripción: Pruebas de procesar_recordatorios con un reloj simulado: los recordatorios vencen
+             en el minuto justo y se reprograman o se descartan al mover o cancelar la cita.
+"""
+
+import logging
+import unittest
+
+from bookme_service import BookMeService
+from identificadores import GeneradorIds
+from tiempo import fecha_a_minutos
+
+
+class _Reloj:
+    """Reloj manual: devuelve el minuto fijado por la prueba."""
+
+    def __init__(self, ahora: int):
+        self.ahora = ahora
+
+    def __call__(self) -> int:
+        return self.ahora
+
+
+class TestRecordatorios(unittest.TestCase):
+    """Recordatorios emitidos según el reloj inyectado en el servicio."""
+
+    ANTELACION = 60
+
+    def setUp(self):
+        logging.disable(logging.CRITICAL)
+        self.reloj = _Reloj(fecha_a_minutos("2026-10-19 08:00"))
+        self.service = BookMeService("Negocio", "Calle 1", "900", ids=GeneradorIds(),
+                                     antelacion_recordatorio=self.ANTELACION, reloj=self.reloj)
+        self.cliente = self.service.registrar_usuario("cliente", "Ana", "ana@mail.com")
+        self.empleado = self.service.registrar_usuario("empleado", "Luis", "luis@mail.com")
+        self.servicio = self.service.crear_servicio("Corte", "Corte clásico", 30, 10.0)
+
+    def tearDown(self):
+        logging.disable(logging.NOTSET)
+
+    def _reservar(self, fecha_hora: str):
+        return self.service.reservar_cita(self.cliente.id, self.empleado.id,
+                                          self.servicio.id, fecha_hora)
+
+    def _procesar_en(self, fecha_hora: str) -> list:
+        """Avanza el reloj hasta `fecha_hora` y procesa los recordatorios vencidos."""
+        self.reloj.ahora = fecha_a_minutos(fecha_hora)
+        return self.service.procesar_recordatorios()
+
+    def test_vence_en_el_minuto_exacto(self):
+        self._reservar("2026-10-20 10:00")
+        self.assertEqual(self._procesar_en("2026-10-20 08:59"), [])
+        enviados = self._procesar_en("2026-10-20 09:00")
+        self.assertEqual(len(enviados), 1)
+        self.assertEqual(enviados[0].destinatario, self.cliente)
+        self.assertEqual(enviados[0].tipo, "recordatorio")
+        # Ya emitido: no se repite
+        self.assertEqual(self._procesar_en("2026-10-20 09:30"), [])
+
+    def test_reprogramar_mueve_el_recordatorio(self):
+        cita = self._reservar("2026-10-20 10:00")
+        self.service.reprogramar_cita(cita.id, "2026-10-20 12:00")
+        self.assertEqual(self._procesar_en("2026-10-20 09:00"), [])
+        self.assertEqual(self._procesar_en("2026-10-20 10:59"), [])
+        self.assertEqual(len(self._procesar_en("2026-10-20 11:00")), 1)
+
+    def test_adelantar_la_cita_adelanta_el_recordatorio(self):
+        cita = self._reservar("2026-10-20 12:00")
+        self.service.reprogramar_cita(cita.id, "2026-10-20 10:00")
+        self.assertEqual(len(self._procesar_en("2026-10-20 09:00")), 1)
+        self.assertEqual(self._procesar_en("2026-10-20 11:00"), [])
+
+    def test_modificar_cita_mueve_el_recordatorio(self):
+        cita = self._reservar("2026-10-20 10:00")
+        self.assertIsNotNone(self.service.modificar_cita(cita.id, "2026-10-21 10:00"))
+        self.assertEqual(self._procesar_en("2026-10-20 09:00"), [])
+        self.assertEqual(self._procesar_en("2026-10-21 08:59"), [])
+        self.assertEqual(len(self._procesar_en("2026-10-21 09:00")), 1)
+
+    def test_cancelar_descarta_el_recordatorio(self):
+        cita = self._reservar("2026-10-20 10:00")
+        otra = self._reservar("2026-10-20 11:00")
+        self.service.cancelar_cita(cita.id, "prueba")
+        self.assertEqual(self._procesar_en("2026-10-20 09:30"), [])
+        enviados = self._procesar_en("2026-10-20 10:00")
+        self.assertEqual(len(enviados), 1)
+        self.assertEqual(len(self.service.recordatorios), 0)
+        self.assertEqual(otra.estado, "confirmada")
+
+    def test_serie_recuerda_cada_ocurrencia(self):
+        self.service.reservar_serie(self.cliente.id, self.empleado.id, self.servicio.id,
+                                    "2026-10-20 10:00", "FREQ=WEEKLY;COUNT=2")
+        self.assertEqual(self._procesar_en("2026-10-20 08:59"), [])
+        self.assertEqual(len(self._procesar_en("2026-10-20 09:00")), 1)
+        self.assertEqual(self._procesar_en("2026-10-27 08:59"), [])
+        self.assertEqual(len(self._procesar_en("2026-10-27 09:00")), 1)
+        self.assertEqual(self._procesar_en("2026-11-03 09:00"), [])
+
+    def test_cancelar_serie_descarta_sus_recordatorios(self):
+        serie = self.service.reservar_serie(self.cliente.id, self.empleado.id, self.servicio.id,
+                                            "2026-10-20 10:00", "FREQ=WEEKLY;COUNT=3")
+        self.assertEqual(len(self._procesar_en("2026-10-20 09:00")), 1)
+        self.service.cancelar_serie(serie.id, "2026-10-21 00:00")
+        self.assertEqual(self._procesar_en("2026-10-27 09:00"), [])
+        self.assertEqual(self._procesar_en("2026-11-03 09:00"), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
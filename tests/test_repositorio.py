@@ -0,0 +1,276 @@
+"""
+Módulo: tests/test_repositorio.py
+Descripción: Pruebas de RepositorioSQLite: transacciones agrupadas por lotes, operaciones
+             que se deshacen también en memoria si el repositorio falla y recarga
+             del servicio desde la base de datos.
+"""
+
+import logging
+import os
+import tempfile
+import unittest
+from contextlib import contextmanager
+
+from bookme_service import BookMeService
+from errores import HorarioOcupado, OperacionNoValida
+from repositorio import RepositorioSQLite
+from tiempo import fecha_a_minutos
+from usuario import Cliente
+
+
+class TestTransaccionesSQLite(unittest.TestCase):
+    """Un bloque que falla solo deshace sus propias escrituras."""
+
+    def setUp(self):
+        logging.disable(logging.CRITICAL)
+        self.directorio = tempfile.TemporaryDirectory()
+        self.ruta = os.path.join(self.directorio.name, "bookme.db")
+
+    def tearDown(self):
+        self.directorio.cleanup()
+        logging.disable(logging.NOTSET)
+
+    def _servicio(self, tam_lote=1):
+        return BookMeService("Negocio", "Calle 1", "900",
+                             repositorio=RepositorioSQLite(self.ruta, tam_lote=tam_lote))
+
+    def test_fallo_no_deshace_operaciones_anteriores_del_lote(self):
+        service = self._servicio(tam_lote=50)
+        cliente = service.registrar_usuario("cliente", "Ana", "ana@mail.com")
+        empleado = service.registrar_usuario("empleado", "Luis", "luis@mail.com")
+        servicio = service.crear_servicio("Corte", "Corte clásico", 30, 10.0)
+        cita = service.reservar_cita(cliente.id, empleado.id, servicio.id, "2026-10-20 10:00")
+        service.anular_cita(cita.id)
+        with self.assertRaises(OperacionNoValida):
+            service.anular_cita(cita.id)
+        service.reservar_cita(cliente.id, empleado.id, servicio.id, "2026-10-20 11:00")
+        service.cerrar()
+
+        recargado = self._servicio()
+        estadisticas = recargado.estadisticas()
+        self.assertEqual(estadisticas["usuarios"], 2)
+        self.assertEqual(estadisticas["citas"], 2)
+        self.assertEqual(estadisticas["cancelada"], 1)
+        recargado.cerrar()
+
+    def test_bloque_anidado_que_falla_solo_descarta_lo_suyo(self):
+        repositorio = RepositorioSQLite(self.ruta, tam_lote=50)
+        service = BookMeService("Negocio", "Calle 1", "900", repositorio=repositorio)
+        with repositorio.transaccion():
+            service.registrar_usuario("cliente", "Ana", "ana@mail.com")
+            with self.assertRaises(RuntimeError):
+                with repositorio.transaccion():
+                    repositorio.guardar_usuario(Cliente("Eva", "eva@mail.com", "600"))
+                    raise RuntimeError("fallo a mitad de bloque")
+        service.cerrar()
+
+        recargado = self._servicio()
+        nombres = [usuario.nombre for usuario in recargado._indice_usuarios.values()]
+        self.assertEqual(nombres, ["Ana"])
+        recargado.cerrar()
+
+    def test_validacion_fallida_no_abre_transaccion(self):
+        repositorio = RepositorioSQLite(self.ruta, tam_lote=50)
+        service = BookMeService("Negocio", "Calle 1", "900", repositorio=repositorio)
+        cliente = service.registrar_usuario("cliente", "Ana", "ana@mail.com")
+        empleado = service.registrar_usuario("empleado", "Luis", "luis@mail.com")
+        servicio = service.crear_servicio("Corte", "Corte clásico", 30, 10.0)
+        cita = service.reservar_cita(cliente.id, empleado.id, servicio.id, "2026-10-20 10:00")
+        service.anular_cita(cita.id)
+        transacciones = []
+        transaccion = repositorio.transaccion
+        repositorio.transaccion = lambda: transacciones.append(1) or transaccion()
+        with self.assertRaises(OperacionNoValida):
+            service.anular_cita(cita.id)
+        self.assertEqual(transacciones, [])
+        service.cerrar()
+
+    def test_carga_omite_citas_huerfanas(self):
+        service = self._servicio()
+        cliente = service.registrar_usuario("cliente", "Ana", "ana@mail.com")
+        empleado = service.registrar_usuario("empleado", "Luis", "luis@mail.com")
+        servicio = service.crear_servicio("Corte", "Corte clásico", 30, 10.0)
+        service.reservar_cita(cliente.id, empleado.id, servicio.id, "2026-10-20 10:00")
+        service.repositorio._conexion.execute(
+            "INSERT INTO cita VALUES ('CIT9999', 'USR9999', ?, ?, 0, 30, 'pendiente')",
+            (empleado.id, servicio.id))
+        service.cerrar()
+
+        recargado = self._servicio()
+        self.assertEqual(recargado.estadisticas()["citas"], 1)
+        recargado.cerrar()
+
+
+class _RepositorioQueFalla(RepositorioSQLite):
+    """Repositorio cuyo guardado de notificaciones falla mientras `fallar` sea cierto."""
+
+    fallar = False
+
+    def guardar_notificacion(self, notificacion):
+        if self.fallar:
+            raise OSError("disco lleno")
+        super().guardar_notificacion(notificacion)
+
+
+class _Reloj:
+    """Reloj manual: devuelve el minuto fijado por la prueba."""
+
+    def __init__(self, ahora: int):
+        self.ahora = ahora
+
+    def __call__(self) -> int:
+        return self.ahora
+
+
+class TestOperacionesFallidas(unittest.TestCase):
+    """Si el repositorio falla, la operación se deshace también en memoria."""
+
+    def setUp(self):
+        logging.disable(logging.CRITICAL)
+        self.directorio = tempfile.TemporaryDirectory()
+        self.ruta = os.path.join(self.directorio.name, "bookme.db")
+        self.reloj = _Reloj(fecha_a_minutos("2026-10-19 08:00"))
+        self.repositorio = _RepositorioQueFalla(self.ruta)
+        self.service = self._servicio(self.repositorio)
+        self.cliente = self.service.registrar_usuario("cliente", "Ana", "ana@mail.com")
+        self.empleado = self.service.registrar_usuario("empleado", "Luis", "luis@mail.com")
+        self.servicio = self.service.crear_servicio("Corte", "Corte clásico", 30, 10.0)
+
+    def tearDown(self):
+        self.directorio.cleanup()
+        logging.disable(logging.NOTSET)
+
+    def _servicio(self, repositorio):
+        return BookMeService("Negocio", "Calle 1", "900", repositorio=repositorio,
+                             antelacion_recordatorio=60, reloj=self.reloj)
+
+    def _reservar(self, fecha_hora: str):
+        return self.service.reservar_cita(self.cliente.id, self.empleado.id,
+                                          self.servicio.id, fecha_hora)
+
+    @contextmanager
+    def _fallando(self):
+        """Contexto en el que la operación debe fallar con el error del repositorio."""
+        self.repositorio.fallar = True
+        try:
+            with self.assertRaises(OSError):
+                yield
+        finally:
+            self.repositorio.fallar = False
+
+    def _comprobar_recarga(self):
+        """El servicio vivo y uno recargado del disco coinciden."""
+        self.assertEqual(self.service.verificar_estadisticas(), {})
+        esperadas = sorted((c.id, c.inicio, c.fin, c.estado) for c in self.service.lista_citas)
+        self.service.cerrar()
+        recargado = self._servicio(RepositorioSQLite(self.ruta))
+        self.assertEqual(sorted((c.id, c.inicio, c.fin, c.estado)
+                                for c in recargado.lista_citas), esperadas)
+        self.assertEqual(recargado.estadisticas(), recargado.estadisticas(verificar=True))
+        recargado.cerrar()
+
+    def test_reserva_fallida_no_deja_cita_fantasma(self):
+        with self._fallando():
+            self._reservar("2026-10-20 10:00")
+        self.assertEqual(self.service.lista_citas, [])
+        self.assertEqual(self.service.estadisticas()["citas"], 0)
+        self.assertEqual(self.service.contar_no_leidas(self.cliente.id), 0)
+        self.assertEqual(len(self.service.recordatorios), 0)
+
+        cita = self._reservar("2026-10-20 10:00")
+        self.assertEqual(self.service.obtener_cita(cita.id), cita)
+        self.assertEqual(self.service.contar_no_leidas(self.cliente.id), 1)
+        self._comprobar_recarga()
+
+    def test_reprogramacion_fallida_conserva_el_hueco_original(self):
+        cita = self._reservar("2026-10-20 10:00")
+        with self._fallando():
+            self.service.reprogramar_cita(cita.id, "2026-10-20 12:00")
+        self.assertEqual(cita.fecha_hora_inicio, "2026-10-20 10:00")
+        with self.assertRaises(HorarioOcupado):
+            self._reservar("2026-10-20 10:00")
+        self.assertIsNotNone(self._reservar("2026-10-20 12:00"))
+        self.reloj.ahora = fecha_a_minutos("2026-10-20 09:00")
+        self.assertEqual(len(self.service.procesar_recordatorios()), 1)
+        self._comprobar_recarga()
+
+    def test_anulacion_fallida_mantiene_la_cita(self):
+        cita = self._reservar("2026-10-20 10:00")
+        with self._fallando():
+            self.service.anular_cita(cita.id)
+        self.assertEqual(cita.estado, "confirmada")
+        with self.assertRaises(HorarioOcupado):
+            self._reservar("2026-10-20 10:00")
+        self._comprobar_recarga()
+
+    def test_series_fallidas_no_cambian_el_calendario(self):
+        with self._fallando():
+            self.service.reservar_serie(self.cliente.id, self.empleado.id, self.servicio.id,
+                                        "2026-10-20 10:00", "FREQ=WEEKLY;COUNT=3")
+        self.assertIsNotNone(self._reservar("2026-10-27 10:00"))
+
+        serie = self.service.reservar_serie(self.cliente.id, self.empleado.id,
+                                            self.servicio.id, "2026-10-20 12:00",
+                                            "FREQ=WEEKLY;COUNT=3")
+        with self._fallando():
+            self.service.cancelar_ocurrencia(serie.id, "2026-10-27 12:00")
+        with self._fallando():
+            self.service.cancelar_serie(serie.id, "2026-10-21 00:00")
+        self.assertEqual(serie.excepciones, {})
+        for fecha in ("2026-10-20", "2026-10-27", "2026-11-03"):
+            with self.assertRaises(HorarioOcupado):
+                self._reservar(f"{fecha} 12:00")
+        self._comprobar_recarga()
+
+    def test_recordatorio_fallido_se_reintenta(self):
+        self._reservar("2026-10-20 10:00")
+        self.reloj.ahora = fecha_a_minutos("2026-10-20 09:00")
+        with self._fallando():
+            self.service.procesar_recordatorios()
+        self.assertEqual(len(self.service.recordatorios), 1)
+        enviados = self.service.procesar_recordatorios()
+        self.assertEqual([n.tipo for n in enviados], ["recordatorio"])
+
+
+class TestCargaBandejas(unittest.TestCase):
+    """Las bandejas de notificaciones se reconstruyen al arrancar."""
+
+    def setUp(self):
+        logging.disable(logging.CRITICAL)
+        self.directorio = tempfile.TemporaryDirectory()
+        self.ruta = os.path.join(self.directorio.name, "bookme.db")
+
+    def tearDown(self):
+        self.directorio.cleanup()
+        logging.disable(logging.NOTSET)
+
+    def _servicio(self):
+        return BookMeService("Negocio", "Calle 1", "900",
+                             repositorio=RepositorioSQLite(self.ruta))
+
+    def test_no_leidas_y_paginas_tras_reinicio(self):
+        service = self._servicio()
+        cliente = service.registrar_usuario("cliente", "Ana", "ana@mail.com")
+        empleado = service.registrar_usuario("empleado", "Luis", "luis@mail.com")
+        servicio = service.crear_servicio("Corte", "Corte clásico", 30, 10.0)
+        for hora in ("10:00", "11:00", "12:00"):
+            service.reservar_cita(cliente.id, empleado.id, servicio.id, f"2026-10-20 {hora}")
+        service.obtener_notificaciones(cliente.id)[-1].marcar_como_leida()
+        esperadas = [n.id for n in service.obtener_notificaciones(cliente.id)]
+        service.cerrar()
+
+        recargado = self._servicio()
+        self.assertEqual(recargado.contar_no_leidas(cliente.id), 2)
+        self.assertEqual([n.id for n in recargado.obtener_notificaciones(cliente.id)],
+                         esperadas)
+        pagina, cursor = recargado.pagina_notificaciones(cliente.id, limite=2,
+                                                         solo_no_leidas=True)
+        self.assertEqual([n.id for n in pagina], esperadas[:2])
+        self.assertIsNone(cursor)
+        pagina[0].marcar_como_leida()
+        self.assertEqual(recargado.contar_no_leidas(cliente.id), 1)
+        recargado.cerrar()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+"""
+Módulo: tests/test_reservas_lote.py
+Descripción: Pruebas de reservar_citas_lote cuando el guardado falla a mitad del lote.
+"""
+
+import logging
+import unittest
+
+from bookme_service import BookMeService
+from identificadores import GeneradorIds
+from repositorio import RepositorioSQLite
+
+
+class _RepositorioQueFalla(RepositorioSQLite):
+    """Repositorio en memoria cuya escritura de cita número `fallo` lanza OSError."""
+
+    def __init__(self, fallo: int):
+        super().__init__(":memory:")
+        self.fallo = fallo
+        self.citas_guardadas = 0
+
+    def guardar_cita(self, cita):
+        self.citas_guardadas += 1
+        if self.citas_guardadas == self.fallo:
+            raise OSError("disco lleno")
+        super().guardar_cita(cita)
+
+
+class TestLoteTodoONada(unittest.TestCase):
+    """Un fallo del repositorio deja el servicio como antes del lote."""
+
+    def setUp(self):
+        logging.disable(logging.CRITICAL)
+
+    def tearDown(self):
+        logging.disable(logging.NOTSET)
+
+    def test_fallo_de_escritura_deshace_el_lote_en_memoria(self):
+        repositorio = _RepositorioQueFalla(fallo=3)
+        service = BookMeService("Negocio", "Calle 1", "900", repositorio=repositorio,
+                                ids=GeneradorIds())
+        cliente = service.registrar_usuario("cliente", "Ana", "ana@mail.com")
+        empleado = service.registrar_usuario("empleado", "Luis", "luis@mail.com")
+        servicio = service.crear_servicio("Corte", "Corte clásico", 30, 10.0)
+        antes = service.estadisticas()
+        reservas = [(cliente.id, empleado.id, servicio.id, f"2026-10-20 {hora}")
+                    for hora in ("10:00", "11:00", "12:00")]
+
+        with self.assertRaises(OSError):
+            service.reservar_citas_lote(reservas)
+
+        self.assertEqual(service.estadisticas(), antes)
+        self.assertEqual(service.lista_citas, [])
+        self.assertEqual(cliente.historial, [])
+        self.assertEqual(service.citas_del_dia("2026-10-20"), [])
+        self.assertEqual(service.contar_no_leidas(cliente.id), 0)
+        self.assertEqual(service.estadisticas(verificar=True), antes)
+        repositorio.fallo = 0
+        self.assertEqual(len(service.reservar_citas_lote(reservas)), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+"""
+Módulo: tests/test_series.py
+Descripción: Pruebas de persistencia de las series de citas periódicas en los repositorios
+             SQLite y de eventos.
+"""
+
+import logging
+import os
+import tempfile
+import unittest
+
+from bookme_service import BookMeService
+from errores import HorarioOcupado
+from eventos import RepositorioEventos
+from identificadores import GeneradorIds
+from repositorio import RepositorioSQLite
+from tiempo import fecha_a_minutos
+
+
+class _PruebasPersistenciaSeries:
+    """Casos comunes; cada subclase indica cómo abrir su repositorio."""
+
+    def setUp(self):
+        logging.disable(logging.CRITICAL)
+        self.directorio = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directorio.cleanup()
+        logging.disable(logging.NOTSET)
+
+    def _repositorio(self):
+        raise NotImplementedError
+
+    def _servicio(self) -> BookMeService:
+        return BookMeService("Negocio", "Calle 1", "900", repositorio=self._repositorio(),
+                             ids=GeneradorIds())
+
+    def test_serie_y_excepciones_sobreviven_al_reinicio(self):
+        service = self._servicio()
+        cliente = service.registrar_usuario("cliente", "Ana", "ana@mail.com")
+        empleado = service.registrar_usuario("empleado", "Luis", "luis@mail.com")
+        servicio = service.crear_servicio("Corte", "Corte clásico", 30, 10.0)
+        serie = service.reservar_serie(cliente.id, empleado.id, servicio.id,
+                                       "2026-10-20 10:00", "FREQ=WEEKLY;COUNT=6")
+        service.cancelar_ocurrencia(serie.id, "2026-10-27 10:00")
+        cita = service.mover_ocurrencia(serie.id, "2026-11-03 10:00", "2026-11-03 12:00")
+        service.cancelar_serie(serie.id, desde="2026-11-17 00:00")
+        excepciones = dict(serie.excepciones)
+        service.cerrar()
+
+        recargado = self._servicio()
+        serie_cargada = recargado.obtener_serie(serie.id)
+        self.assertIsNotNone(serie_cargada)
+        self.assertEqual(serie_cargada.repeticiones, 4)
+        self.assertEqual(serie_cargada.excepciones, excepciones)
+        self.assertEqual(serie_cargada.excepciones[fecha_a_minutos("2026-11-03 10:00")],
+                         cita.id)
+        self.assertEqual(len(serie_cargada), 2)
+        with self.assertRaises(HorarioOcupado):
+            recargado.reservar_cita(cliente.id, empleado.id, servicio.id, "2026-11-10 10:00")
+        recargado.reservar_cita(cliente.id, empleado.id, servicio.id, "2026-10-27 10:00")
+        nueva = recargado.reservar_serie(cliente.id, empleado.id, servicio.id,
+                                         "2026-12-01 10:00", "FREQ=DAILY;COUNT=2")
+        self.assertNotEqual(nueva.id, serie.id)
+        recargado.cerrar()
+
+
+class TestSeriesSQLite(_PruebasPersistenciaSeries, unittest.TestCase):
+
+    def _repositorio(self):
+        return RepositorioSQLite(os.path.join(self.directorio.name, "bookme.db"))
+
+
+class TestSeriesEventos(_PruebasPersistenciaSeries, unittest.TestCase):
+
+    def _repositorio(self):
+        return RepositorioEventos(self.directorio.name)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+"""
+Módulo: tests/test_transferencia.py
+Descripción: Pruebas de la importación masiva: filas mal formadas, IDs no válidos, campos
+             obligatorios y fallos del repositorio a mitad de lote.
+"""
+
+import io
+import logging
+import os
+import tempfile
+import unittest
+
+from bookme_service import BookMeService
+from identificadores import GeneradorIds
+from repositorio import RepositorioSQLite
+
+
+class TestImportacion(unittest.TestCase):
+    """Cada fila errónea se anota en el resumen sin afectar al resto."""
+
+    def setUp(self):
+        logging.disable(logging.CRITICAL)
+        self.service = BookMeService("Negocio", "Calle 1", "900", ids=GeneradorIds())
+
+    def tearDown(self):
+        logging.disable(logging.NOTSET)
+
+    def test_id_no_valido_no_se_inserta(self):
+        origen = io.StringIO("id,tipo,nombre,email,telefono,especialidad\n"
+                             "ABC,cliente,Ana,ana@mail.com,,\n"
+                             "USR1500,cliente,Eva,eva@mail.com,,\n")
+        resumen = self.service.importar_usuarios(origen)
+        self.assertEqual(resumen["importados"], 1)
+        self.assertEqual([fila for fila, _ in resumen["errores"]], [1])
+        self.assertNotIn("ABC", self.service._indice_usuarios)
+        nuevo = self.service.registrar_usuario("cliente", "Luis", "luis@mail.com")
+        self.assertEqual(nuevo.id, "USR1501")
+
+    def test_linea_jsonl_mal_formada_no_detiene_la_importacion(self):
+        origen = io.StringIO('{"nombre": "Corte", "duracion": 30, "precio": 10}\n'
+                             '{"nombre": "Tinte", "dura\n'
+                             '[1, 2]\n'
+                             '{"nombre": "Peinado", "duracion": 45, "precio": 15}\n')
+        resumen = self.service.importar_servicios(origen, formato="jsonl")
+        self.assertEqual(resumen["importados"], 2)
+        self.assertEqual([fila for fila, _ in resumen["errores"]], [2, 3])
+
+    def test_fila_csv_incompleta_se_rechaza(self):
+        origen = io.StringIO("tipo,nombre,email,telefono\n"
+                             "cliente,Ana\n"
+                             "cliente,Eva,eva@mail.com,600\n"
+                             "cliente,,luis@mail.com,600\n")
+        resumen = self.service.importar_usuarios(origen)
+        self.assertEqual(resumen["importados"], 1)
+        self.assertEqual([fila for fila, _ in resumen["errores"]], [1, 3])
+
+
+class _RepositorioQueFalla(RepositorioSQLite):
+    """Repositorio que falla al guardar el usuario número `fallar_en`."""
+
+    fallar_en = None
+
+    def guardar_usuario(self, usuario):
+        if self.fallar_en is not None:
+            self.fallar_en -= 1
+            if self.fallar_en == 0:
+                raise OSError("disco lleno")
+        super().guardar_usuario(usuario)
+
+
+class TestImportacionConFallos(unittest.TestCase):
+    """Un error del repositorio deshace el lote en curso en disco y en memoria."""
+
+    def setUp(self):
+        logging.disable(logging.CRITICAL)
+        self.directorio = tempfile.TemporaryDirectory()
+        self.ruta = os.path.join(self.directorio.name, "bookme.db")
+
+    def tearDown(self):
+        self.directorio.cleanup()
+        logging.disable(logging.NOTSET)
+
+    def test_fallo_del_repositorio_deshace_el_lote(self):
+        repositorio = _RepositorioQueFalla(self.ruta)
+        service = BookMeService("Negocio", "Calle 1", "900", repositorio=repositorio)
+        repositorio.fallar_en = 4
+        origen = io.StringIO("tipo,nombre,email\n" + "".join(
+            f"cliente,Cliente {i},c{i}@mail.com\n" for i in range(1, 6)))
+        with self.assertRaises(OSError):
+            service.importar_usuarios(origen, tam_lote=2)
+        nombres = sorted(u.nombre for u in service.lista_usuarios)
+        self.assertEqual(nombres, ["Cliente 1", "Cliente 2"])
+        self.assertEqual(service.estadisticas()["cliente"], 2)
+        self.assertEqual(service.verificar_estadisticas(), {})
+        service.cerrar()
+
+        recargado = BookMeService("Negocio", "Calle 1", "900",
+                                  repositorio=RepositorioSQLite(self.ruta))
+        self.assertEqual(sorted(u.nombre for u in recargado.lista_usuarios), nombres)
+        recargado.cerrar()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,196 @@
+"""
+Módulo: tiempo.py
+Descripción: Funciones auxiliares para convertir fechas "YYYY-MM-DD HH:MM" en minutos enteros
+             (minutos desde 1970-01-01 00:00) y viceversa. Trabajar con enteros permite
+             comparar y ordenar citas sin volver a interpretar cadenas de texto.
+"""
+
+import unicodedata
+from datetime import date, datetime
+from typing import Optional, Union
+
+
+FORMATO_FECHA_HORA = "%Y-%m-%d %H:%M"
+MINUTOS_DIA = 1440
+
+DIAS_SEMANA = ("lunes", "martes", "miercoles", "jueves", "viernes", "sabado", "domingo")
+
+_ORDINAL_EPOCA = date(1970, 1, 1).toordinal()
+
+
+def fecha_a_minutos(fecha_hora: str) -> int:
+    """
+    Convierte una fecha "YYYY-MM-DD HH:MM" en minutos desde la época.
+
+    Args:
+        fecha_hora (str): Fecha y hora en formato "YYYY-MM-DD HH:MM"
+
+    Returns:
+        int: Minutos transcurridos desde 1970-01-01 00:00
+
+    Raises:
+        ValueError: Si la fecha no tiene el formato esperado
+    """
+    # Camino rápido para el formato canónico; strptime solo como respaldo
+    try:
+        if (len(fecha_hora) == 16 and fecha_hora[4] == "-" and fecha_hora[7] == "-"
+                and fecha_hora[10] == " " and fecha_hora[13] == ":"):
+            horas = int(fecha_hora[11:13])
+            minutos = int(fecha_hora[14:16])
+            if 0 <= horas < 24 and 0 <= minutos < 60:
+                dia = date(int(fecha_hora[0:4]), int(fecha_hora[5:7]),
+                           int(fecha_hora[8:10])).toordinal()
+                return (dia - _ORDINAL_EPOCA) * MINUTOS_DIA + horas * 60 + minutos
+    except (ValueError, TypeError):
+        pass
+
+    try:
+        fecha = datetime.strptime(fecha_hora, FORMATO_FECHA_HORA)
+    except TypeError:
+        raise ValueError(f"Fecha inválida: {fecha_hora!r}")
+    dia = fecha.toordinal() - _ORDINAL_EPOCA
+    return dia * MINUTOS_DIA + fecha.hour * 60 + fecha.minute
+
+
+def minutos_a_fecha(minutos: int) -> str:
+    """
+    Convierte minutos desde la época en una fecha "YYYY-MM-DD HH:MM".
+
+    Args:
+        minutos (int): Minutos transcurridos desde 1970-01-01 00:00
+
+    Returns:
+        str: Fecha y hora formateada
+    """
+    dia, resto = divmod(minutos, MINUTOS_DIA)
+    fecha = date.fromordinal(dia + _ORDINAL_EPOCA)
+    return f"{fecha.isoformat()} {resto // 60:02d}:{resto % 60:02d}"
+
+
+def instante_a_minutos(valor: Union[str, int]) -> int:
+    """
+    Convierte un límite de rango en minutos desde la época.
+
+    Args:
+        valor: Minutos enteros, fecha "YYYY-MM-DD HH:MM" o día "YYYY-MM-DD" (a las 00:00)
+
+    Returns:
+        int: Minutos transcurridos desde 1970-01-01 00:00
+
+    Raises:
+        ValueError: Si la fecha no tiene un formato válido
+    """
+    if isinstance(valor, int):
+        return valor
+    if len(valor) == 10:
+        return fecha_a_minutos(valor + " 00:00")
+    return fecha_a_minutos(valor)
+
+
+def ahora_minutos() -> int:
+    """
+    Obtiene el instante actual (hora local) en minutos desde la época.
+
+    Returns:
+        int: Minutos transcurridos desde 1970-01-01 00:00
+    """
+    ahora = datetime.now()
+    return (ahora.toordinal() - _ORDINAL_EPOCA) * MINUTOS_DIA + ahora.hour * 60 + ahora.minute
+
+
+def hora_a_minutos(hora: str) -> int:
+    """
+    Convierte una hora "HH:MM" en minutos desde medianoche.
+
+    Args:
+        hora (str): Hora en formato "HH:MM"
+
+    Returns:
+        int: Minutos desde las 00:00
+    """
+    h, m = map(int, hora.split(':'))
+    return h * 60 + m
+
+
+def minutos_a_hora(minutos: int) -> str:
+    """
+    Convierte minutos desde medianoche en una hora "HH:MM".
+
+    Args:
+        minutos (int): Minutos desde las 00:00
+
+    Returns:
+        str: Hora formateada
+    """
+    return f"{minutos // 60:02d}:{minutos % 60:02d}"
+
+
+def indice_dia_semana(nombre: str) -> Optional[int]:
+    """
+    Obtiene el índice (0 = lunes) de un día de la semana escrito en español.
+
+    Args:
+        nombre (str): Nombre del día, con o sin tildes ("Miércoles", "sabado"...)
+
+    Returns:
+        int: Índice del día o None si no se reconoce
+    """
+    normalizado = unicodedata.normalize("NFKD", nombre.strip().lower())
+    normalizado = "".join(c for c in normalizado if not unicodedata.combining(c))
+    try:
+        return DIAS_SEMANA.index(normalizado)
+    except ValueError:
+        return None
+
+
+def dia_semana(dia: int) -> int:
+    """
+    Obtiene el día de la semana (0 = lunes) de un día contado desde la época.
+
+    Args:
+        dia (int): Días desde 1970-01-01 (que fue jueves)
+
+    Returns:
+        int: Índice del día de la semana
+    """
+    return (dia + 3) % 7
+
+
+def dia_a_fecha(dia: int) -> date:
+    """
+    Convierte un día contado desde la época en una fecha.
+
+    Args:
+        dia (int): Días desde 1970-01-01
+
+    Returns:
+        date: Fecha correspondiente
+    """
+    return date.fromordinal(dia + _ORDINAL_EPOCA)
+
+
+def mes_de_dia(dia: int) -> int:
+    """
+    Obtiene el mes al que pertenece un día, contado como año * 12 + (mes - 1).
+
+    Args:
+        dia (int): Días desde 1970-01-01
+
+    Returns:
+        int: Número de mes
+    """
+    fecha = dia_a_fecha(dia)
+    return fecha.year * 12 + fecha.month - 1
+
+
+def primer_dia_mes(mes: int) -> int:
+    """
+    Obtiene el primer día de un mes contado como en mes_de_dia.
+
+    Args:
+        mes (int): Número de mes (año * 12 + (mes - 1))
+
+    Returns:
+        int: Días desde 1970-01-01 hasta el día 1 de ese mes
+    """
+    return date(mes // 12, mes % 12 + 1, 1).toordinal() - _ORDINAL_EPOCA
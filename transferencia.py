@@ -0,0 +1,180 @@
+"""
+Módulo: transferencia.py
+Descripción: Lectura y escritura en streaming de ficheros CSV y JSONL para la importación y
+             exportación masiva de usuarios, servicios y citas. Todo se procesa con generadores
+             para que la memoria usada no dependa del tamaño del fichero.
+"""
+
+import csv
+import json
+from contextlib import contextmanager
+from itertools import islice
+from typing import Dict, IO, Iterable, Iterator, List, Sequence, Union
+
+
+CAMPOS_USUARIO = ("id", "tipo", "nombre", "email", "telefono", "especialidad")
+CAMPOS_SERVICIO = ("id", "nombre", "descripcion", "duracion", "precio")
+CAMPOS_CITA = ("id", "cliente_id", "empleado_id", "servicio_id", "inicio", "estado")
+
+FORMATOS = ("csv", "jsonl")
+
+
+@contextmanager
+def _abrir(fichero: Union[str, IO], modo: str) -> Iterator[IO]:
+    """
+    Abre una ruta o reutiliza un objeto fichero ya abierto.
+
+    Args:
+        fichero: Ruta o fichero de texto abierto
+        modo (str): "r" o "w"
+
+    Yields:
+        IO: Fichero de texto
+    """
+    if isinstance(fichero, str):
+        with open(fichero, modo, newline="", encoding="utf-8") as f:
+            yield f
+    else:
+        yield fichero
+
+
+def _comprobar_formato(formato: str):
+    """Lanza ValueError si el formato no está soportado."""
+    if formato not in FORMATOS:
+        raise ValueError(f"Formato '{formato}' no soportado (use {', '.join(FORMATOS)})")
+
+
+def leer_registros(origen: Union[str, IO], formato: str = "csv") -> Iterator[Union[Dict, str]]:
+    """
+    Recorre los registros de un fichero CSV (con cabecera) o JSONL sin interpretarlos.
+
+    Así un registro mal formado puede tratarse como error de su fila sin
+    detener la lectura del resto (ver interpretar_registro).
+
+    Args:
+        origen: Ruta o fichero de texto abierto
+        formato (str): "csv" o "jsonl"
+
+    Yields:
+        Dict o str: Fila CSV como diccionario, o línea JSONL no vacía
+    """
+    _comprobar_formato(formato)
+    with _abrir(origen, "r") as f:
+        if formato == "csv":
+            yield from csv.DictReader(f)
+        else:
+            for linea in f:
+                if linea.strip():
+                    yield linea
+
+
+def interpretar_registro(registro: Union[Dict, str], formato: str = "csv") -> Dict:
+    """
+    Convierte un registro de leer_registros en una fila campo -> valor.
+
+    Args:
+        registro: Fila CSV o línea JSONL
+        formato (str): "csv" o "jsonl"
+
+    Returns:
+        Dict: Fila como diccionario campo -> valor
+
+    Raises:
+        ValueError: Si la línea JSONL no es un objeto JSON válido o la fila CSV
+            no tiene tantas columnas como la cabecera
+    """
+    if formato == "csv":
+        # DictReader rellena con None las columnas que faltan y guarda las que sobran en None
+        if None in registro:
+            raise ValueError("La fila tiene más columnas que la cabecera")
+        if None in registro.values():
+            raise ValueError("La fila tiene menos columnas que la cabecera")
+        return registro
+    fila = json.loads(registro)
+    if not isinstance(fila, dict):
+        raise ValueError("La línea no es un objeto JSON")
+    return fila
+
+
+def leer_filas(origen: Union[str, IO], formato: str = "csv") -> Iterator[Dict]:
+    """
+    Recorre las filas de un fichero CSV (con cabecera) o JSONL.
+
+    Args:
+        origen: Ruta o fichero de texto abierto
+        formato (str): "csv" o "jsonl"
+
+    Yields:
+        Dict: Fila como diccionario campo -> valor
+
+    Raises:
+        ValueError: Al llegar a una fila mal formada
+    """
+    for registro in leer_registros(origen, formato):
+        yield interpretar_registro(registro, formato)
+
+
+def exigir_campos(fila: Dict, campos: Sequence[str]):
+    """
+    Comprueba que una fila tiene valor en los campos obligatorios.
+
+    Args:
+        fila (Dict): Fila campo -> valor
+        campos (Sequence[str]): Campos obligatorios
+
+    Raises:
+        ValueError: Si algún campo falta o está vacío
+    """
+    for campo in campos:
+        if fila.get(campo) in (None, ""):
+            raise ValueError(f"Falta el campo obligatorio '{campo}'")
+
+
+def escribir_filas(destino: Union[str, IO], filas: Iterable[Sequence],
+                   campos: Sequence[str], formato: str = "csv") -> int:
+    """
+    Escribe filas en CSV (con cabecera) o JSONL a medida que se generan.
+
+    Args:
+        destino: Ruta o fichero de texto abierto
+        filas (Iterable): Filas como secuencias en el orden de `campos`
+        campos (Sequence[str]): Nombres de las columnas
+        formato (str): "csv" o "jsonl"
+
+    Returns:
+        int: Número de filas escritas
+    """
+    _comprobar_formato(formato)
+    total = 0
+    with _abrir(destino, "w") as f:
+        if formato == "csv":
+            escritor = csv.writer(f)
+            escritor.writerow(campos)
+            for fila in filas:
+                escritor.writerow(fila)
+                total += 1
+        else:
+            for fila in filas:
+                f.write(json.dumps(dict(zip(campos, fila)), ensure_ascii=False))
+                f.write("\n")
+                total += 1
+    return total
+
+
+def por_lotes(filas: Iterable, tam_lote: int) -> Iterator[List]:
+    """
+    Agrupa un iterable en listas de como mucho `tam_lote` elementos.
+
+    Args:
+        filas (Iterable): Elementos a agrupar
+        tam_lote (int): Tamaño máximo de cada lote
+
+    Yields:
+        List: Lote de elementos
+    """
+    iterador = iter(filas)
+    while True:
+        lote = list(islice(iterador, tam_lote))
+        if not lote:
+            return
+        yield lote
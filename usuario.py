@@ -4,8 +4,11 @@ Descripción: Define las clases para gestionar los diferentes tipos de usuarios
              Incluye Usuario base, Cliente, Empleado y Administrador.
 """
 
+import threading
 from datetime import datetime
 from typing import List
+import presentacion
+from tiempo import MINUTOS_DIA, instante_a_minutos
 
 
 class Usuario:
@@ -16,22 +19,34 @@ class Usuario:
         id (str): Identificador único del usuario
         nombre (str): Nombre completo del usuario
         email (str): Correo electrónico del usuario
+        alta (int): Orden de alta en el servicio, creciente (None hasta que se añade a uno)
+    
+    Todas las subclases declaran __slots__, así que los usuarios no tienen
+    __dict__ por instancia.
     """
     
+    __slots__ = ("id", "nombre", "email", "alta")
+    
     contador_id = 1000
+    _lock_id = threading.Lock()
     
-    def __init__(self, nombre: str, email: str):
+    def __init__(self, nombre: str, email: str, id: str = None):
         """
         Inicializa un usuario.
         
         Args:
             nombre (str): Nombre del usuario
             email (str): Email del usuario
+            id (str): ID ya existente (al restaurar desde almacenamiento); por defecto se genera
         """
-        self.id = f"USR{Usuario.contador_id}"
-        Usuario.contador_id += 1
+        if id is None:
+            with Usuario._lock_id:
+                id = f"USR{Usuario.contador_id}"
+                Usuario.contador_id += 1
+        self.id = id
         self.nombre = nombre
         self.email = email
+        self.alta = None
     
     def iniciar_sesion(self) -> str:
         """Simula el inicio de sesión del usuario."""
@@ -60,7 +75,9 @@ class Cliente(Usuario):
         historial (List): Lista de citas realizadas por el cliente
     """
     
-    def __init__(self, nombre: str, email: str, teléfono: str):
+    __slots__ = ("teléfono", "historial")
+    
+    def __init__(self, nombre: str, email: str, teléfono: str, id: str = None):
         """
         Inicializa un cliente.
         
@@ -68,8 +85,9 @@ class Cliente(Usuario):
             nombre (str): Nombre del cliente
             email (str): Email del cliente
             teléfono (str): Número de teléfono del cliente
+            id (str): ID ya existente; por defecto se genera
         """
-        super().__init__(nombre, email)
+        super().__init__(nombre, email, id)
         self.teléfono = teléfono
         self.historial = []
     
@@ -108,9 +126,12 @@ class Empleado(Usuario):
     Atributos:
         especialidad (str): Especialidad o servicio que ofrece el empleado
         horario: Objeto Horario del empleado
+        calendario: Calendario del servicio con sus citas (lo asigna BookMeService)
     """
     
-    def __init__(self, nombre: str, email: str, especialidad: str):
+    __slots__ = ("especialidad", "horario", "calendario")
+    
+    def __init__(self, nombre: str, email: str, especialidad: str, id: str = None):
         """
         Inicializa un empleado.
         
@@ -118,22 +139,31 @@ class Empleado(Usuario):
             nombre (str): Nombre del empleado
             email (str): Email del empleado
             especialidad (str): Especialidad del empleado
+            id (str): ID ya existente; por defecto se genera
         """
-        super().__init__(nombre, email)
+        super().__init__(nombre, email, id)
         self.especialidad = especialidad
         self.horario = None
+        self.calendario = None
     
     def ver_agenda(self, fecha: str) -> str:
         """
         Visualiza la agenda del empleado para una fecha determinada.
         
+        Las citas salen del calendario del servicio en el que está registrado;
+        un empleado suelto no tiene citas.
+        
         Args:
             fecha (str): Fecha en formato "YYYY-MM-DD"
         
         Returns:
-            str: Mensaje con la agenda del empleado
+            str: Agenda formateada del empleado
         """
-        return f"Agenda del empleado {self.nombre} para la fecha {fecha}"
+        citas = []
+        if self.calendario is not None:
+            citas = self.calendario.del_empleado(self.id,
+                                                 instante_a_minutos(fecha) // MINUTOS_DIA)
+        return presentacion.agenda_empleado(self, fecha, citas)
     
     def actualizar_estado_cita(self, cita, nuevo_estado: str) -> str:
         """
@@ -163,15 +193,18 @@ class Administrador(Usuario):
         permisos (List): Lista de permisos del administrador
     """
     
-    def __init__(self, nombre: str, email: str):
+    __slots__ = ("permisos",)
+    
+    def __init__(self, nombre: str, email: str, id: str = None):
         """
         Inicializa un administrador.
         
         Args:
             nombre (str): Nombre del administrador
             email (str): Email del administrador
+            id (str): ID ya existente; por defecto se genera
         """
-        super().__init__(nombre, email)
+        super().__init__(nombre, email, id)
         self.permisos = ["gestionar_empleados", "gestionar_servicios", 
                         "gestionar_horarios", "consultar_estadisticas"]
     